@@ -4,14 +4,21 @@ Database Locking System Design
 Implements various database locking mechanisms and concurrency control.
 
 Key components:
-- Optimistic locking with versioning
+- Optimistic locking with versioning, and multi-key transactions over
+  lock-free MVCC snapshots
 - Pessimistic locking with row-level locks
 - Distributed locks with Redis
 - Deadlock detection and prevention
 """
 
-from .optimistic_lock import OptimisticLockManager
-from .pessimistic_lock import PessimisticLockManager
+from .optimistic_lock import OptimisticLockManager, SnapshotTooOldError
+from .pessimistic_lock import DeadlockError, PessimisticLockManager
 from .distributed_lock import DistributedLockManager
 
-__all__ = ["OptimisticLockManager", "PessimisticLockManager", "DistributedLockManager"]
+__all__ = [
+    "OptimisticLockManager",
+    "PessimisticLockManager",
+    "DistributedLockManager",
+    "DeadlockError",
+    "SnapshotTooOldError",
+]
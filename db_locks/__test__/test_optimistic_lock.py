@@ -0,0 +1,193 @@
+import threading
+
+import pytest
+from db_locks import OptimisticLockManager, SnapshotTooOldError
+
+
+def test_versioned_read_and_write():
+    """
+    BASIC: Writes succeed only against the current version, which each
+    write increments.
+    """
+    manager = OptimisticLockManager()
+    assert manager.read("row") is None
+    assert manager.write("row", "a", expected_version=0)
+    assert not manager.write("row", "b", expected_version=0)
+
+    current = manager.read("row")
+    assert (current.value, current.version) == ("a", 1)
+    assert manager.write("row", "b", expected_version=1)
+    assert manager.read("row").value == "b"
+
+
+def test_update_with_retry_under_threads():
+    manager = OptimisticLockManager()
+
+    def increment():
+        for _ in range(200):
+            assert manager.update_with_retry(
+                "counter", lambda value: (value or 0) + 1, max_retries=1000
+            )
+
+    threads = [threading.Thread(target=increment) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert manager.read("counter").value == 800
+
+
+def test_single_key_read_during_install_with_one_version():
+    """
+    INTERMEDIATE: With max_versions=1, a read racing with a commit (new
+    version stored, commit counter not yet advanced) still finds a version.
+    """
+    manager = OptimisticLockManager(max_versions=1)
+    seen = []
+
+    class ReadDuringInstall(dict):
+        def __setitem__(self, key, chain):
+            super().__setitem__(key, chain)
+            seen.append(manager.read(key).version)
+
+    manager.data_store = ReadDuringInstall()
+    assert manager.write("row", "a", expected_version=0)
+    assert manager.update_with_retry("row", lambda value: value + "b")
+
+    assert seen == [1, 2]
+    assert manager.read("row").value == "ab"
+
+
+def test_transaction_reads_a_consistent_snapshot():
+    """
+    INTERMEDIATE: A transaction keeps seeing the state as of its start,
+    even after another transaction commits changes to the same keys.
+    """
+    manager = OptimisticLockManager()
+    assert manager.transact(lambda txn: (txn.write("a", 50), txn.write("b", 50)))
+
+    reader = manager.begin()
+    assert reader.read("a") == 50
+
+    def move(txn):
+        txn.write("a", txn.read("a") - 10)
+        txn.write("b", txn.read("b") + 10)
+
+    assert manager.transact(move)
+    assert reader.read("b") == 50  # still the old snapshot
+    assert reader.read("new") is None
+    assert reader.commit()  # read-only: nothing to validate
+    assert manager.read("a").value == 40 and manager.read("b").value == 60
+
+
+def test_read_only_commit_skips_the_commit_mutex():
+    manager = OptimisticLockManager()
+    manager.write("a", 1, expected_version=0)
+    reader = manager.begin()
+    assert reader.read("a") == 1
+
+    results = []
+    with manager.commit_lock:  # a writer mid-commit
+        committer = threading.Thread(target=lambda: results.append(reader.commit()))
+        committer.start()
+        committer.join(timeout=2)
+        assert not committer.is_alive()
+    assert results == [True]
+    assert manager.commits == 1
+
+
+def test_commit_rejects_stale_reads_and_writes():
+    manager = OptimisticLockManager()
+    manager.write("a", 1, expected_version=0)
+
+    first, second = manager.begin(), manager.begin()
+    first.write("a", first.read("a") + 1)
+    second.write("a", second.read("a") + 1)
+    assert first.commit()
+    assert not second.commit()
+
+    # A blind write conflicts with any commit to the key after the snapshot
+    blind = manager.begin()
+    manager.write("a", 10, expected_version=2)
+    blind.write("a", 0)
+    blind.write("b", 0)
+    assert not blind.commit()
+    assert manager.read("b") is None  # nothing of a failed commit is applied
+    assert manager.conflicts == 2
+
+    with pytest.raises(RuntimeError):
+        first.commit()
+
+
+def test_bounded_history_and_snapshot_too_old():
+    manager = OptimisticLockManager(max_versions=2)
+    manager.write("a", 0, expected_version=0)
+    old = manager.begin()
+    for version in range(1, 4):
+        manager.write("a", version, expected_version=version)
+
+    assert len(manager.data_store["a"]) == 2
+    with pytest.raises(SnapshotTooOldError):
+        old.read("a")
+
+    calls = []
+
+    def body(txn):
+        calls.append(txn.snapshot)
+        if len(calls) == 1:
+            # Another writer outruns the history this snapshot needs
+            for version in range(4, 7):
+                manager.write("a", version, expected_version=version)
+            txn.read("a")
+        txn.write("a", txn.read("a") + 1)
+
+    # The first run's snapshot no longer has a retained version of "a"
+    assert manager.transact(body)
+    assert len(calls) == 2
+    assert manager.read("a").value == 7
+
+
+def test_concurrent_transfers_preserve_total():
+    """
+    ADVANCED: Transfers between accounts from several threads, with snapshot
+    audits running alongside, never create or lose money.
+    """
+    manager = OptimisticLockManager()
+    keys = [f"account-{i}" for i in range(5)]
+    for key in keys:
+        manager.write(key, 100, expected_version=0)
+    totals = []
+    stop = threading.Event()
+
+    def transfer(n):
+        for i in range(300):
+            source, target = keys[(n + i) % 5], keys[(n + 2 * i + 1) % 5]
+            if source == target:
+                continue
+
+            def move(txn, source=source, target=target):
+                txn.write(source, txn.read(source) - 1)
+                txn.write(target, txn.read(target) + 1)
+
+            assert manager.transact(move, max_retries=1000)
+
+    def audit():
+        while not stop.is_set():
+            txn = manager.begin()
+            try:
+                totals.append(sum(txn.read(key) for key in keys))
+            except SnapshotTooOldError:
+                pass  # Writers outran the retained history; start over
+
+    auditor = threading.Thread(target=audit)
+    auditor.start()
+    workers = [threading.Thread(target=transfer, args=(n,)) for n in range(4)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    stop.set()
+    auditor.join()
+
+    assert set(totals) == {500}
+    assert sum(manager.read(key).value for key in keys) == 500
@@ -0,0 +1,404 @@
+import threading
+import time
+
+import pytest
+from db_locks import DeadlockError, PessimisticLockManager
+from db_locks.pessimistic_lock import ReadWriteLock
+
+
+def hold_in_thread(acquire, release, started, done):
+    """Acquire in a new thread, signal, and release once `done` is set."""
+
+    def run():
+        assert acquire()
+        started.set()
+        done.wait()
+        release()
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    assert started.wait(1)
+    return thread
+
+
+def hold_key(manager, key, started, done):
+    """Write-lock a key through the manager in a new thread until `done`."""
+
+    def run():
+        with manager.acquire_lock(key):
+            started.set()
+            done.wait()
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    assert started.wait(1)
+    return thread
+
+
+def test_read_write_round_trip():
+    """
+    BASIC: Writes are visible to later reads; missing keys read as None.
+    """
+    manager = PessimisticLockManager()
+    manager.write("row", {"balance": 10})
+    assert manager.read("row") == {"balance": 10}
+    assert manager.read("missing") is None
+
+
+def test_readers_share_the_lock():
+    lock = ReadWriteLock()
+    started, done = threading.Event(), threading.Event()
+    thread = hold_in_thread(lock.acquire_read, lock.release_read, started, done)
+
+    assert lock.acquire_read(timeout=0.1)
+    lock.release_read()
+    assert not lock.acquire_write(timeout=0.05)
+
+    done.set()
+    thread.join()
+    assert lock.acquire_write(timeout=0.1)
+    lock.release_write()
+
+
+def test_waiting_writer_blocks_new_readers():
+    """
+    INTERMEDIATE: Writer preference - once a writer waits, new readers queue
+    behind it, and get in when it gives up.
+    """
+    lock = ReadWriteLock()
+    started, done = threading.Event(), threading.Event()
+    reader = hold_in_thread(lock.acquire_read, lock.release_read, started, done)
+
+    writer_result = []
+    writer = threading.Thread(
+        target=lambda: writer_result.append(lock.acquire_write(timeout=0.3))
+    )
+    writer.start()
+    time.sleep(0.05)
+    assert not lock.acquire_read(timeout=0.05)
+
+    writer.join()
+    assert writer_result == [False]
+    assert lock.acquire_read(timeout=0.1)
+    lock.release_read()
+    done.set()
+    reader.join()
+
+
+def test_queued_writer_stays_visible_until_it_withdraws():
+    lock = ReadWriteLock()
+    started, done = threading.Event(), threading.Event()
+    reader = hold_in_thread(lock.acquire_read, lock.release_read, started, done)
+
+    def probe_read():
+        result = []
+
+        def attempt():
+            result.append(lock.acquire_read(0))
+            if result[0]:
+                lock.release_read()
+
+        thread = threading.Thread(target=attempt)
+        thread.start()
+        thread.join()
+        return result[0]
+
+    assert lock.try_write_or_queue() is False
+    assert threading.get_ident() in lock.blockers(reader.ident, exclusive=False)
+    assert probe_read() is False
+    lock.withdraw_writer()
+    assert lock.blockers(reader.ident, exclusive=False) == set()
+    assert probe_read() is True
+    done.set()
+    reader.join()
+    assert lock.try_write_or_queue() is True
+    lock.release_write()
+
+
+def test_reentrancy_and_misuse():
+    lock = ReadWriteLock()
+    assert lock.acquire_write()
+    assert lock.acquire_write()
+    assert lock.acquire_read()  # the writer may also read
+    lock.release_read()
+    lock.release_write()
+    lock.release_write()
+
+    assert lock.acquire_read()
+    assert lock.acquire_read()
+    with pytest.raises(RuntimeError):
+        lock.acquire_write()
+    lock.release_read()
+    lock.release_read()
+    with pytest.raises(RuntimeError):
+        lock.release_read()
+    with pytest.raises(RuntimeError):
+        lock.release_write()
+
+
+def test_acquire_lock_times_out():
+    manager = PessimisticLockManager()
+    started, done = threading.Event(), threading.Event()
+    holder = hold_key(manager, "row", started, done)
+
+    with pytest.raises(TimeoutError):
+        with manager.acquire_lock("row", timeout=0.05, exclusive=False):
+            pass
+    with pytest.raises(TimeoutError):
+        manager.write("row", 1, timeout=0.05)
+
+    done.set()
+    holder.join()
+    manager.write("row", 2, timeout=0.1)
+    assert manager.read("row") == 2
+
+
+def test_concurrent_increments_are_serialized():
+    manager = PessimisticLockManager()
+    manager.write("counter", 0)
+
+    def increment():
+        for _ in range(200):
+            with manager.acquire_lock("counter"):
+                manager.data_store["counter"] += 1
+
+    threads = [threading.Thread(target=increment) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert manager.read("counter") == 1600
+
+
+def lock_in_order(manager, first, second, ready, results, name):
+    """Lock `first`, wait until every thread holds its first key, then lock
+    `second`, recording the outcome."""
+    try:
+        with manager.acquire_lock(first, timeout=2):
+            ready.wait()
+            start = time.perf_counter()
+            with manager.acquire_lock(second, timeout=2):
+                results[name] = "ok"
+    except DeadlockError:
+        results[name] = ("deadlock", time.perf_counter() - start)
+
+
+def test_opposite_order_aborts_one_thread_immediately():
+    """
+    INTERMEDIATE: Two threads locking two keys in opposite order - the one
+    closing the cycle is aborted at once, and the other then completes.
+    """
+    manager = PessimisticLockManager()
+    ready = threading.Barrier(2)
+    results = {}
+    threads = [
+        threading.Thread(target=lock_in_order, args=(manager, a, b, ready, results, a))
+        for a, b in (("x", "y"), ("y", "x"))
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    outcomes = sorted(results.values(), key=str)
+    assert outcomes[1] == "ok"
+    assert outcomes[0][0] == "deadlock"
+    assert outcomes[0][1] < 0.5
+    assert manager.deadlocks == 1
+    assert manager.waits_for == {}
+
+
+def test_three_thread_cycle_through_shared_locks():
+    """
+    ADVANCED: A cycle running through a shared lock (a writer waiting for
+    readers) is found as well.
+    """
+    manager = PessimisticLockManager()
+    ready = threading.Barrier(3)
+    results = {}
+
+    def run(name, first, second, shared_first):
+        try:
+            with manager.acquire_lock(first, timeout=2, exclusive=not shared_first):
+                ready.wait()
+                time.sleep(0.05 * "abc".index(name))
+                with manager.acquire_lock(second, timeout=2):
+                    results[name] = "ok"
+        except DeadlockError:
+            results[name] = "deadlock"
+
+    specs = [("a", "k1", "k2", True), ("b", "k2", "k3", False), ("c", "k3", "k1", True)]
+    threads = [threading.Thread(target=run, args=spec) for spec in specs]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(results.values()) == ["deadlock", "ok", "ok"]
+    assert results["c"] == "deadlock"
+
+
+def test_mixed_reader_writer_cycles_never_stall():
+    """
+    ADVANCED: Readers queued behind a waiting writer, writers waiting for
+    readers, and two threads each reading one key then writing the other:
+    every cycle is caught at once, so no thread ever waits out its timeout.
+    """
+    manager = PessimisticLockManager()
+    timeouts = []
+    done = []
+
+    def run(first, second, write_second):
+        for _ in range(150):
+            while True:
+                try:
+                    with manager.acquire_lock(first, timeout=2, exclusive=False):
+                        time.sleep(0.0002)  # let the others take their first lock
+                        with manager.acquire_lock(
+                            second, timeout=2, exclusive=write_second
+                        ):
+                            pass
+                    break
+                except DeadlockError:
+                    time.sleep(0)
+                except TimeoutError:
+                    timeouts.append(first)
+                    return
+        done.append(first)
+
+    specs = [("a", "b", False), ("b", "a", False), ("a", "b", True), ("b", "a", True)]
+    threads = [threading.Thread(target=run, args=spec) for spec in specs]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert timeouts == []
+    assert len(done) == len(specs)
+    assert manager.deadlocks > 0
+    assert manager.waits_for == {}
+    assert manager.lock_count() == 0
+
+
+def test_without_detection_deadlock_waits_for_timeout():
+    manager = PessimisticLockManager(detect_deadlocks=False)
+    ready = threading.Barrier(2)
+    errors = []
+
+    def run(first, second):
+        try:
+            with manager.acquire_lock(first):
+                ready.wait()
+                with manager.acquire_lock(second, timeout=0.1):
+                    pass
+        except TimeoutError:
+            errors.append(first)
+
+    threads = [threading.Thread(target=run, args=ab) for ab in (("x", "y"), ("y", "x"))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors
+
+
+def test_acquire_many_locks_sorted_and_releases_on_timeout():
+    manager = PessimisticLockManager()
+    with manager.acquire_many(["b", "a", "b", "c"]) as held:
+        assert len(set(map(id, held))) == 3
+        assert manager.lock_count() == 3
+
+    started, done = threading.Event(), threading.Event()
+    holder = hold_key(manager, "c", started, done)
+    with pytest.raises(TimeoutError):
+        with manager.acquire_many(["a", "b", "c"], timeout=0.05):
+            pass
+    # a and b were released and freed when c timed out
+    assert manager.lock_count() == 1
+    with manager.acquire_lock("a", timeout=0):
+        pass
+    done.set()
+    holder.join()
+    assert manager.lock_count() == 0
+
+
+def test_acquire_many_never_deadlocks():
+    manager = PessimisticLockManager()
+    keys = [f"account-{i}" for i in range(4)]
+    manager.data_store.update(dict.fromkeys(keys, 100))
+
+    def transfer(n: int) -> None:
+        for i in range(200):
+            source, target = keys[(n + i) % 4], keys[(n + 3 * i + 1) % 4]
+            with manager.acquire_many([source, target]):
+                manager.data_store[source] -= 1
+                manager.data_store[target] += 1
+
+    threads = [threading.Thread(target=transfer, args=(n,)) for n in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sum(manager.data_store.values()) == 400
+    assert manager.deadlocks == 0
+
+
+def test_lock_table_frees_unused_locks():
+    """
+    INTERMEDIATE: A key's lock exists only while some thread holds or waits
+    for it, so memory stays flat over a long stream of unique keys.
+    """
+    import tracemalloc
+
+    manager = PessimisticLockManager()
+
+    def lock_keys(start: int, count: int) -> None:
+        for i in range(start, start + count):
+            with manager.acquire_lock(f"row-{i}"):
+                pass
+
+    lock_keys(0, 2_000)  # warm up allocator pools
+    tracemalloc.start()
+    lock_keys(2_000, 2_000)
+    after_first, _ = tracemalloc.get_traced_memory()
+    lock_keys(4_000, 30_000)
+    after_second, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert manager.lock_count() == 0
+    assert after_second - after_first < 64 * 1024
+
+
+def test_lock_stays_while_threads_wait_for_it():
+    manager = PessimisticLockManager(num_shards=1)
+    started, done = threading.Event(), threading.Event()
+    holder = hold_key(manager, "row", started, done)
+
+    waiter = threading.Thread(target=manager.write, args=("row", 1))
+    waiter.start()
+    time.sleep(0.05)
+    assert manager.lock_count() == 1
+    done.set()
+    holder.join()
+    waiter.join()
+
+    assert manager.read("row") == 1
+    assert manager.lock_count() == 0
+
+
+def test_striped_mode_uses_fixed_locks():
+    manager = PessimisticLockManager(num_stripes=4)
+    for i in range(1000):
+        manager.write(f"row-{i}", i)
+    assert manager.lock_count() == 4
+
+    # Keys on the same stripe are locked once, so this never self-blocks
+    keys = [f"row-{i}" for i in range(20)]
+    with manager.acquire_many(keys, timeout=0.1) as held:
+        assert len(held) == len(set(map(id, held))) <= 4
+        for key in keys:
+            manager.data_store[key] = -1
+    assert manager.read("row-0") == -1
+
+    with pytest.raises(ValueError):
+        PessimisticLockManager(num_stripes=0)
@@ -0,0 +1,98 @@
+import threading
+import time
+
+from db_locks import DeadlockError, PessimisticLockManager
+
+THREADS = 4
+TRANSFERS = 20
+HOLD_SECONDS = 0.001
+LOCK_TIMEOUT = 0.05
+
+
+def run_transfers(manager, ordered: bool) -> dict:
+    """
+    Threads move money between two hot accounts, half of them locking
+    them in the opposite order. A transfer aborted by a deadlock or a
+    timeout is retried.
+    """
+    manager.data_store.update({"a": 1000, "b": 1000})
+    aborts = []
+    lock = threading.Lock()
+
+    def transfer(source: str, target: str) -> None:
+        if ordered:
+            with manager.acquire_many([source, target], timeout=LOCK_TIMEOUT):
+                time.sleep(HOLD_SECONDS)
+                manager.data_store[source] -= 1
+                manager.data_store[target] += 1
+            return
+        with manager.acquire_lock(source, timeout=LOCK_TIMEOUT):
+            time.sleep(HOLD_SECONDS)
+            start = time.perf_counter()
+            try:
+                with manager.acquire_lock(target, timeout=LOCK_TIMEOUT):
+                    manager.data_store[source] -= 1
+                    manager.data_store[target] += 1
+            except (DeadlockError, TimeoutError):
+                with lock:
+                    aborts.append(time.perf_counter() - start)
+                raise
+
+    def worker(n: int) -> None:
+        source, target = ("a", "b") if n % 2 else ("b", "a")
+        for _ in range(TRANSFERS):
+            while True:
+                try:
+                    transfer(source, target)
+                    break
+                except (DeadlockError, TimeoutError):
+                    # Back off by thread so the retry does not collide again
+                    time.sleep(HOLD_SECONDS * n)
+
+    workers = [threading.Thread(target=worker, args=(n,)) for n in range(THREADS)]
+    start = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    assert manager.data_store["a"] + manager.data_store["b"] == 2000
+    return {
+        "transfers_per_second": THREADS * TRANSFERS / elapsed,
+        "aborts": len(aborts),
+        "abort_ms": 1000 * sum(aborts) / len(aborts) if aborts else 0.0,
+        "elapsed": elapsed,
+    }
+
+
+def test_deadlock_detection_vs_timeouts():
+    """
+    BENCHMARK: two hot accounts locked in opposite orders by 4 threads.
+    Without detection each deadlock stalls until the 50 ms lock timeout;
+    the wait-for graph aborts the victim as soon as it would block, and
+    acquire_many's sorted order never deadlocks.
+    """
+    results = {
+        "timeout only": run_transfers(
+            PessimisticLockManager(detect_deadlocks=False), ordered=False
+        ),
+        "wait-for graph": run_transfers(PessimisticLockManager(), ordered=False),
+        "acquire_many": run_transfers(PessimisticLockManager(), ordered=True),
+    }
+
+    print(f"\n{'mode':<16}{'transfers/s':>12}{'aborts':>8}{'ms per abort':>14}")
+    for name, result in results.items():
+        print(
+            f"{name:<16}{result['transfers_per_second']:>12,.0f}"
+            f"{result['aborts']:>8}{result['abort_ms']:>14.3f}"
+        )
+
+    detected = results["wait-for graph"]
+    assert detected["aborts"] and detected["abort_ms"] < 1.0
+    assert results["timeout only"]["abort_ms"] >= LOCK_TIMEOUT * 1000
+    assert (
+        detected["transfers_per_second"]
+        > results["timeout only"]["transfers_per_second"]
+    )
+    assert results["acquire_many"]["aborts"] == 0
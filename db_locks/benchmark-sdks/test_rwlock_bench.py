@@ -0,0 +1,91 @@
+import threading
+import time
+from contextlib import contextmanager
+
+from db_locks import PessimisticLockManager
+
+HOLD_SECONDS = 0.002
+DURATION = 0.3
+
+
+class RLockManager:
+    """One RLock per key, as the manager used before, as a baseline."""
+
+    def __init__(self):
+        self.lock = threading.RLock()
+
+    @contextmanager
+    def acquire_lock(self, key, timeout=None, exclusive=True):
+        with self.lock:
+            yield
+
+
+def reads_per_second(manager, threads: int) -> float:
+    """Threads repeatedly read one hot key, each read holding the lock for
+    HOLD_SECONDS (I/O or a slow index lookup under the row lock)."""
+    stop = threading.Event()
+    counts = [0] * threads
+
+    def reader(index: int) -> None:
+        while not stop.is_set():
+            with manager.acquire_lock("hot", exclusive=False):
+                time.sleep(HOLD_SECONDS)
+            counts[index] += 1
+
+    workers = [threading.Thread(target=reader, args=(i,)) for i in range(threads)]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    time.sleep(DURATION)
+    stop.set()
+    for worker in workers:
+        worker.join()
+    return sum(counts) / (time.perf_counter() - start)
+
+
+def test_hot_key_read_scaling():
+    """
+    BENCHMARK: reads/s on one hot key by reader thread count, with shared
+    read locks against one exclusive RLock per key. Shared locks let the
+    reads overlap; the RLock holds throughput at one thread's rate.
+    """
+    print(f"\n{'threads':<10}{'RLock reads/s':>15}{'RW lock reads/s':>17}")
+    results = {}
+    for threads in (1, 2, 4, 8):
+        results[threads] = (
+            reads_per_second(RLockManager(), threads),
+            reads_per_second(PessimisticLockManager(), threads),
+        )
+        baseline, shared = results[threads]
+        print(f"{threads:<10}{baseline:>15,.0f}{shared:>17,.0f}")
+
+    assert results[8][1] > 4 * results[1][1]
+    assert results[8][0] < 1.5 * results[1][0]
+
+
+def test_writer_is_not_starved_by_readers():
+    """
+    BENCHMARK: time for a write on a key that 8 threads keep reading.
+    Writer preference admits it after the current reads finish.
+    """
+    manager = PessimisticLockManager()
+    stop = threading.Event()
+
+    def reader() -> None:
+        while not stop.is_set():
+            with manager.acquire_lock("hot", exclusive=False):
+                time.sleep(HOLD_SECONDS)
+
+    workers = [threading.Thread(target=reader) for _ in range(8)]
+    for worker in workers:
+        worker.start()
+    time.sleep(0.05)
+    start = time.perf_counter()
+    manager.write("hot", 1, timeout=1.0)
+    wait_ms = (time.perf_counter() - start) * 1000
+    stop.set()
+    for worker in workers:
+        worker.join()
+
+    print(f"\nwrite wait under 8 readers: {wait_ms:.2f} ms")
+    assert wait_ms < 10 * HOLD_SECONDS * 1000
@@ -2,18 +2,103 @@
 Optimistic Locking Implementation
 
 Implements optimistic concurrency control using versioning.
+
+Every key keeps a short chain of committed versions (multi-version
+concurrency control), and a global commit counter stamps each commit:
+
+- A transaction's reads see the database as of the commit counter when it
+  began: each key resolves to its newest version stamped at or before that
+  point. Readers take no locks; a commit publishes all of its versions
+  before advancing the counter, so a snapshot never shows half of one
+- Writes are buffered in the transaction. ``commit`` validates every key it
+  read or wrote against the latest versions and, if none changed, installs
+  all of its writes as one new commit: a compare-and-swap over the whole
+  batch, done under a single short-lived commit mutex
+- Chains keep the newest ``max_versions`` entries. A long-running
+  transaction whose snapshot predates all of a key's retained versions
+  cannot read it consistently and fails with ``SnapshotTooOldError``
+
+The single-key ``read``/``write``/``update_with_retry`` API runs on the same
+versions, so both styles can be mixed.
 """
 
-from typing import Any, Optional
+import threading
+from typing import Any, Callable, Optional
 from dataclasses import dataclass
 
 
+class SnapshotTooOldError(RuntimeError):
+    """Raised when the versions a snapshot needs were already discarded."""
+
+
 @dataclass
 class VersionedData:
     """Data with version tracking for optimistic locking."""
 
     value: Any
     version: int
+    # Commit counter value of the commit that wrote this version
+    commit_ts: int = 0
+
+
+class Transaction:
+    """
+    Optimistic multi-key transaction with snapshot reads.
+
+    Created by OptimisticLockManager.begin(). Not thread-safe: use one
+    transaction per thread.
+    """
+
+    def __init__(self, manager: "OptimisticLockManager"):
+        self.manager = manager
+        self.snapshot = manager.commit_ts
+        # key -> version read (0 if the key did not exist)
+        self.reads: dict[str, int] = {}
+        self.writes: dict[str, Any] = {}
+        self.committed = False
+
+    def read(self, key: str) -> Optional[Any]:
+        """
+        Read a key as of the transaction's snapshot (or its own write).
+
+        Args:
+            key: The key to read
+
+        Returns:
+            The value if found, None otherwise
+
+        Raises:
+            SnapshotTooOldError: If the version in the snapshot was discarded
+        """
+        if key in self.writes:
+            return self.writes[key]
+        data = self.manager._read_at(key, self.snapshot)
+        self.reads[key] = 0 if data is None else data.version
+        return None if data is None else data.value
+
+    def write(self, key: str, value: Any) -> None:
+        """
+        Buffer a write until commit.
+
+        Args:
+            key: The key to write
+            value: The new value
+        """
+        self.writes[key] = value
+
+    def commit(self) -> bool:
+        """
+        Validate and install all buffered writes atomically.
+
+        Returns:
+            True if committed, False if another commit changed a key this
+            transaction read or wrote since its snapshot
+        """
+        if self.committed:
+            raise RuntimeError("Transaction already committed")
+        committed = self.manager._commit(self.snapshot, self.reads, self.writes)
+        self.committed = committed
+        return committed
 
 
 class OptimisticLockManager:
@@ -24,24 +109,124 @@ class OptimisticLockManager:
     - Version-based conflict detection
     - Automatic retry on conflict
     - No blocking - optimistic approach
+    - Multi-key transactions with lock-free snapshot reads
+
+    Args:
+        max_versions: Committed versions kept per key
     """
 
-    def __init__(self):
+    def __init__(self, max_versions: int = 8):
         """Initialize the optimistic lock manager."""
-        self.data_store: dict[str, VersionedData] = {}
+        if max_versions < 1:
+            raise ValueError("max_versions must be at least 1")
+        self.max_versions = max_versions
+        # key -> committed versions, oldest first. Chains are immutable
+        # tuples replaced whole, so readers never see one mid-update
+        self.data_store: dict[str, tuple[VersionedData, ...]] = {}
+        # Stamp of the latest fully installed commit
+        self.commit_ts = 0
+        self.commit_lock = threading.Lock()
+        # Commits that installed writes. Read-only commits are not counted,
+        # so they never contend for commit_lock
+        self.commits = 0
+        self.conflicts = 0
+
+    def _read_at(self, key: str, snapshot: int) -> Optional[VersionedData]:
+        """Newest version of a key committed at or before `snapshot`."""
+        chain = self.data_store.get(key)
+        if not chain:
+            return None
+        for data in reversed(chain):
+            if data.commit_ts <= snapshot:
+                return data
+        if chain[0].version == 1:
+            # The key was created after the snapshot
+            return None
+        raise SnapshotTooOldError(
+            f"Versions of {key!r} visible at commit {snapshot} were discarded"
+        )
+
+    def _commit(
+        self, snapshot: int, reads: dict[str, int], writes: dict[str, Any]
+    ) -> bool:
+        """Check-and-set all of a transaction's keys in one step."""
+        if not writes:
+            # Read-only: the snapshot was consistent, nothing to validate
+            return True
+        store = self.data_store
+        with self.commit_lock:
+            for key, version in reads.items():
+                chain = store.get(key)
+                if (chain[-1].version if chain else 0) != version:
+                    self.conflicts += 1
+                    return False
+            for key in writes.keys() - reads.keys():
+                chain = store.get(key)
+                if chain and chain[-1].commit_ts > snapshot:
+                    self.conflicts += 1
+                    return False
+            self._install(writes)
+            self.commits += 1
+            return True
+
+    def _install(self, writes: dict[str, Any]) -> None:
+        """Publish new versions, then the commit stamp. Holds commit_lock."""
+        commit_ts = self.commit_ts + 1
+        store = self.data_store
+        for key, value in writes.items():
+            chain = store.get(key, ())
+            version = chain[-1].version + 1 if chain else 1
+            store[key] = (chain + (VersionedData(value, version, commit_ts),))[
+                -self.max_versions :
+            ]
+        self.commit_ts = commit_ts
+
+    def begin(self) -> Transaction:
+        """Start a transaction reading the latest committed snapshot."""
+        return Transaction(self)
+
+    def transact(
+        self, body: Callable[[Transaction], Any], max_retries: int = 3
+    ) -> bool:
+        """
+        Run `body` in a transaction, retrying it on conflict.
+
+        Args:
+            body: Function reading and writing through the transaction it is
+                given; it may run several times, so it should have no other
+                side effects
+            max_retries: Maximum number of retries
+
+        Returns:
+            True if a run committed, False if max retries exceeded
+        """
+        for _ in range(max_retries + 1):
+            transaction = self.begin()
+            try:
+                body(transaction)
+            except SnapshotTooOldError:
+                continue
+            if transaction.commit():
+                return True
+        return False
 
     def read(self, key: str) -> Optional[VersionedData]:
         """
         Read data with its current version.
 
+        Takes the newest version in the key's chain, which may belong to a
+        commit still being installed. A single key needs no snapshot, and
+        reading at commit_ts instead could find that version's predecessor
+        already discarded (always so with max_versions=1).
+
         Args:
             key: The key to read
 
         Returns:
             VersionedData if found, None otherwise
         """
-        # TODO: Implement versioned read
-        pass
+        chain = self.data_store.get(key)
+        return chain[-1] if chain else None
 
     def write(self, key: str, value: Any, expected_version: int) -> bool:
         """
@@ -50,13 +235,19 @@ class OptimisticLockManager:
         Args:
             key: The key to write
             value: The new value
-            expected_version: Expected current version
+            expected_version: Expected current version (0 to create the key)
 
         Returns:
             True if write succeeded, False if version conflict
         """
-        # TODO: Implement optimistic write with version check
-        pass
+        with self.commit_lock:
+            chain = self.data_store.get(key)
+            if (chain[-1].version if chain else 0) != expected_version:
+                self.conflicts += 1
+                return False
+            self._install({key: value})
+            self.commits += 1
+            return True
 
     def update_with_retry(self, key: str, update_fn, max_retries: int = 3) -> bool:
         """
@@ -64,11 +255,19 @@ class OptimisticLockManager:
 
         Args:
             key: The key to update
-            update_fn: Function to apply to current value
+            update_fn: Function to apply to current value (None if the key
+                does not exist)
             max_retries: Maximum number of retries
 
         Returns:
             True if update succeeded, False if max retries exceeded
         """
-        # TODO: Implement retry logic
-        pass
+        for _ in range(max_retries + 1):
+            current = self.read(key)
+            if current is None:
+                value, version = None, 0
+            else:
+                value, version = current.value, current.version
+            if self.write(key, update_fn(value), version):
+                return True
+        return False
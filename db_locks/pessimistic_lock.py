@@ -2,13 +2,219 @@
 Pessimistic Locking Implementation
 
 Implements pessimistic concurrency control with explicit locks.
+
+Each key has a ``ReadWriteLock``: reads take it shared, so any number of
+them proceed together on a hot row, and writes take it exclusively. Once a
+writer is waiting, new readers queue behind it, so a steady stream of reads
+cannot starve writes.
+
+Deadlocks are detected, not waited out. The manager keeps a wait-for graph:
+a thread about to block records the lock it waits for, and edges run from
+it to that lock's current holders. If following the edges leads back to the
+thread, blocking would complete a cycle, so the thread is aborted at once
+with ``DeadlockError`` instead of stalling until a timeout. The victim is
+always the thread closing the cycle; the others keep waiting and proceed
+once it backs off and releases its locks. ``acquire_many`` avoids the
+problem altogether by locking keys in one global (sorted) order.
+
+Locks live in a reference-counted table, so memory follows the keys in use,
+not every key ever touched. Each lock counts the threads holding or waiting
+for it through the manager, and the last one out removes it from the table.
+The table is split into shards, each guarded by its own registry mutex, so
+lookups of different keys rarely contend. Alternatively, ``num_stripes``
+maps keys onto a fixed array of locks: constant memory and no table
+upkeep, at the price of unrelated keys on the same stripe blocking each
+other.
 """
 
 import threading
-from typing import Any, Optional
+import time
+from typing import Any, Iterable, Optional
 from contextlib import contextmanager
 
 
+class DeadlockError(RuntimeError):
+    """Raised in the thread chosen as victim when lock waits form a cycle."""
+
+
+class ReadWriteLock:
+    """
+    Shared/exclusive lock with writer preference.
+
+    Any number of threads may hold the lock shared, or one thread may hold it
+    exclusively. A reader arriving while a writer holds or waits for the lock
+    waits too. Both modes are reentrant, and the exclusive holder may also
+    take the lock shared. A shared holder cannot upgrade to exclusive: two
+    readers upgrading at once would wait for each other forever.
+    """
+
+    __slots__ = ("_cond", "_readers", "_writer", "_writes", "_waiting_writers", "users")
+
+    def __init__(self):
+        self._cond = threading.Condition(threading.Lock())
+        # Thread id -> number of shared holds
+        self._readers: dict[int, int] = {}
+        self._writer: Optional[int] = None
+        self._writes = 0
+        self._waiting_writers: set[int] = set()
+        # Threads holding or waiting for the lock through a lock table
+        self.users = 0
+
+    def _can_read(self) -> bool:
+        return self._writer is None and not self._waiting_writers
+
+    def _can_write(self) -> bool:
+        return self._writer is None and not self._readers
+
+    def acquire_read(self, timeout: Optional[float] = None) -> bool:
+        """
+        Take the lock shared.
+
+        Args:
+            timeout: Seconds to wait; None waits indefinitely
+
+        Returns:
+            True if acquired, False on timeout
+        """
+        me = threading.get_ident()
+        with self._cond:
+            held = self._readers.get(me)
+            if held or self._writer == me:
+                # Reentrant: never queue behind writers that wait on us
+                self._readers[me] = (held or 0) + 1
+                return True
+            if not self._cond.wait_for(self._can_read, timeout):
+                return False
+            self._readers[me] = 1
+            return True
+
+    def release_read(self) -> None:
+        """
+        Release one shared hold of the calling thread.
+
+        Raises:
+            RuntimeError: If the thread does not hold the lock shared
+        """
+        me = threading.get_ident()
+        with self._cond:
+            held = self._readers.get(me)
+            if not held:
+                raise RuntimeError("Cannot release an unheld read lock")
+            if held > 1:
+                self._readers[me] = held - 1
+                return
+            del self._readers[me]
+            if not self._readers:
+                self._cond.notify_all()
+
+    def acquire_write(self, timeout: Optional[float] = None) -> bool:
+        """
+        Take the lock exclusively.
+
+        Args:
+            timeout: Seconds to wait; None waits indefinitely
+
+        Returns:
+            True if acquired, False on timeout
+
+        Raises:
+            RuntimeError: If the thread holds the lock shared
+        """
+        me = threading.get_ident()
+        with self._cond:
+            if self._writer == me:
+                self._writes += 1
+                return True
+            if me in self._readers:
+                raise RuntimeError("Cannot upgrade a read lock to a write lock")
+            # Already there if queued by try_write_or_queue
+            self._waiting_writers.add(me)
+            try:
+                acquired = self._cond.wait_for(self._can_write, timeout)
+            finally:
+                self._waiting_writers.discard(me)
+            if not acquired:
+                # Readers held back for this writer may go ahead now
+                self._cond.notify_all()
+                return False
+            self._writer = me
+            self._writes = 1
+            return True
+
+    def try_write_or_queue(self) -> bool:
+        """
+        Take the lock exclusively if that needs no wait, otherwise queue.
+
+        A queued thread counts as a waiting writer right away: new readers
+        wait behind it and blockers() reports it, so a deadlock check made
+        next sees exactly the state the thread will wait in. It must then
+        call acquire_write, or withdraw_writer to give up.
+
+        Returns:
+            True if acquired, False if queued
+
+        Raises:
+            RuntimeError: If the thread holds the lock shared
+        """
+        me = threading.get_ident()
+        with self._cond:
+            if self._writer == me:
+                self._writes += 1
+                return True
+            if me in self._readers:
+                raise RuntimeError("Cannot upgrade a read lock to a write lock")
+            if self._can_write():
+                self._writer = me
+                self._writes = 1
+                return True
+            self._waiting_writers.add(me)
+            return False
+
+    def withdraw_writer(self) -> None:
+        """Leave the writer queue joined by try_write_or_queue."""
+        with self._cond:
+            self._waiting_writers.discard(threading.get_ident())
+            # Readers held back for this writer may go ahead now
+            self._cond.notify_all()
+
+    def release_write(self) -> None:
+        """
+        Release one exclusive hold of the calling thread.
+
+        Raises:
+            RuntimeError: If the thread does not hold the lock exclusively
+        """
+        with self._cond:
+            if self._writer != threading.get_ident():
+                raise RuntimeError("Cannot release an unheld write lock")
+            self._writes -= 1
+            if not self._writes:
+                self._writer = None
+                self._cond.notify_all()
+
+    def blockers(self, thread: int, exclusive: bool) -> set[int]:
+        """
+        Threads a request by `thread` currently has to wait for.
+
+        Args:
+            thread: Identifier of the requesting thread
+            exclusive: Whether the request is for the write lock
+
+        Returns:
+            The holders the request conflicts with and, for a read, the
+            writers queued ahead of it
+        """
+        with self._cond:
+            if exclusive:
+                threads = set(self._readers)
+            else:
+                threads = set(self._waiting_writers)
+            if self._writer is not None:
+                threads.add(self._writer)
+            threads.discard(thread)
+            return threads
+
+
 class PessimisticLockManager:
     """
     Pessimistic Lock Manager with explicit locking.
@@ -18,59 +224,255 @@ class PessimisticLockManager:
     - Deadlock detection
     - Lock timeout support
     - Read and write locks
+
+    Args:
+        detect_deadlocks: Check the wait-for graph whenever a thread is about
+            to block; otherwise deadlocked threads wait for their timeout
+        num_shards: Independently locked shards of the lock table
+        num_stripes: Use this many fixed locks shared by all keys instead of
+            one lock per key in use
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        detect_deadlocks: bool = True,
+        num_shards: int = 16,
+        num_stripes: Optional[int] = None,
+    ):
         """Initialize the pessimistic lock manager."""
+        if num_shards < 1:
+            raise ValueError("num_shards must be at least 1")
+        if num_stripes is not None and num_stripes < 1:
+            raise ValueError("num_stripes must be at least 1")
         self.data_store: dict[str, Any] = {}
-        self.locks: dict[str, threading.RLock] = {}
-        self.lock_registry = threading.Lock()
+        self.num_shards = num_shards
+        self.lock_tables: list[dict[str, ReadWriteLock]] = [
+            {} for _ in range(num_shards)
+        ]
+        self.registry_locks = [threading.Lock() for _ in range(num_shards)]
+        self.stripes: Optional[list[ReadWriteLock]] = (
+            None
+            if num_stripes is None
+            else [ReadWriteLock() for _ in range(num_stripes)]
+        )
+        self.detect_deadlocks = detect_deadlocks
+        # Wait-for graph: blocked thread -> (lock, exclusive) it waits for.
+        # Edges to the lock's holders are read from the lock when needed, so
+        # they follow every acquire and release without bookkeeping
+        self.waits_for: dict[int, tuple[ReadWriteLock, bool]] = {}
+        self.graph_lock = threading.Lock()
+        self.deadlocks = 0
+
+    def lock_count(self) -> int:
+        """Number of lock objects currently allocated."""
+        if self.stripes is not None:
+            return len(self.stripes)
+        return sum(len(table) for table in self.lock_tables)
+
+    def _get_lock(self, key: str) -> ReadWriteLock:
+        """
+        Get or create a key's lock, counting the caller as a user.
+
+        Every call must be paired with _put_lock once the caller has
+        released the lock or given up waiting for it.
+        """
+        if self.stripes is not None:
+            return self.stripes[hash(key) % len(self.stripes)]
+        shard = hash(key) % self.num_shards
+        with self.registry_locks[shard]:
+            table = self.lock_tables[shard]
+            lock = table.get(key)
+            if lock is None:
+                lock = table[key] = ReadWriteLock()
+            lock.users += 1
+            return lock
+
+    def _put_lock(self, key: str, lock: ReadWriteLock) -> None:
+        """Drop a use of a key's lock, freeing it after the last one."""
+        if self.stripes is not None:
+            return
+        shard = hash(key) % self.num_shards
+        with self.registry_locks[shard]:
+            lock.users -= 1
+            if not lock.users:
+                del self.lock_tables[shard][key]
 
-    def _get_lock(self, key: str) -> threading.RLock:
-        """Get or create a lock for a key."""
-        with self.lock_registry:
-            if key not in self.locks:
-                self.locks[key] = threading.RLock()
-            return self.locks[key]
+    def _lock_order(self, keys: Iterable[str]) -> list[str]:
+        """Distinct keys to lock, one per lock, in the global lock order."""
+        if self.stripes is None:
+            return sorted(set(keys))
+        count = len(self.stripes)
+        by_stripe = {hash(key) % count: key for key in keys}
+        return [by_stripe[stripe] for stripe in sorted(by_stripe)]
+
+    def _acquire(
+        self, key: str, lock: ReadWriteLock, exclusive: bool, timeout: Optional[float]
+    ) -> None:
+        """
+        Take a key's lock, checking for a deadlock before blocking.
+
+        Raises:
+            DeadlockError: If waiting would close a cycle in the wait-for graph
+            TimeoutError: If the lock cannot be acquired within timeout
+        """
+        acquire = lock.acquire_write if exclusive else lock.acquire_read
+        if self.detect_deadlocks:
+            # A writer that cannot get the lock stays queued from the probe
+            # through the wait, so no check ever misses the edges from the
+            # readers held back behind it
+            if lock.try_write_or_queue() if exclusive else acquire(0):
+                return
+            me = threading.get_ident()
+            # Registration and the cycle check happen under one lock, so of
+            # two threads blocking on each other the second always sees the
+            # first and becomes the victim
+            with self.graph_lock:
+                self.waits_for[me] = (lock, exclusive)
+                if self._closes_cycle(me):
+                    del self.waits_for[me]
+                    if exclusive:
+                        lock.withdraw_writer()
+                    self.deadlocks += 1
+                    raise DeadlockError(
+                        f"Deadlock detected waiting for lock on {key!r}"
+                    )
+            try:
+                acquired = acquire(timeout)
+            finally:
+                with self.graph_lock:
+                    del self.waits_for[me]
+        else:
+            acquired = acquire(timeout)
+        if not acquired:
+            mode = "write" if exclusive else "read"
+            raise TimeoutError(f"Timed out waiting for {mode} lock on {key!r}")
+
+    def _closes_cycle(self, start: int) -> bool:
+        """Whether the threads `start` waits for (transitively) wait for it."""
+        stack = [start]
+        seen = {start}
+        while stack:
+            waiter = stack.pop()
+            wait = self.waits_for.get(waiter)
+            if wait is None:
+                continue
+            lock, exclusive = wait
+            for holder in lock.blockers(waiter, exclusive):
+                if holder == start:
+                    return True
+                if holder not in seen:
+                    seen.add(holder)
+                    stack.append(holder)
+        return False
+
+    @staticmethod
+    def _release(lock: ReadWriteLock, exclusive: bool) -> None:
+        if exclusive:
+            lock.release_write()
+        else:
+            lock.release_read()
 
     @contextmanager
-    def acquire_lock(self, key: str, timeout: Optional[float] = None):
+    def acquire_lock(
+        self, key: str, timeout: Optional[float] = None, exclusive: bool = True
+    ):
         """
         Context manager for acquiring a lock.
 
         Args:
             key: The key to lock
             timeout: Lock timeout in seconds
+            exclusive: Take the lock exclusively (write) rather than shared
+                (read)
 
         Yields:
             Lock context
 
         Raises:
             TimeoutError: If lock cannot be acquired within timeout
+            DeadlockError: If waiting for the lock would deadlock; the caller
+                is the victim and should release its locks and retry
         """
-        # TODO: Implement lock acquisition with timeout
-        pass
+        lock = self._get_lock(key)
+        try:
+            self._acquire(key, lock, exclusive, timeout)
+            try:
+                yield lock
+            finally:
+                self._release(lock, exclusive)
+        finally:
+            self._put_lock(key, lock)
 
-    def read(self, key: str) -> Optional[Any]:
+    @contextmanager
+    def acquire_many(
+        self,
+        keys: Iterable[str],
+        timeout: Optional[float] = None,
+        exclusive: bool = True,
+    ):
+        """
+        Context manager locking several keys in sorted order.
+
+        Threads that only lock through acquire_many take locks in the same
+        global order, so they can never deadlock with each other. With
+        striping, keys sharing a stripe are locked once.
+
+        Args:
+            keys: The keys to lock (duplicates are locked once)
+            timeout: Seconds allowed for acquiring all of the locks
+            exclusive: Take the locks exclusively (write) rather than shared
+                (read)
+
+        Yields:
+            Lock context
+
+        Raises:
+            TimeoutError: If the locks cannot be acquired within timeout
+            DeadlockError: If a thread locking keys one by one closes a cycle
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        held: list[ReadWriteLock] = []
+        ordered = self._lock_order(keys)
+        try:
+            for key in ordered:
+                remaining = (
+                    None if deadline is None else max(0.0, deadline - time.monotonic())
+                )
+                lock = self._get_lock(key)
+                try:
+                    self._acquire(key, lock, exclusive, remaining)
+                except BaseException:
+                    self._put_lock(key, lock)
+                    raise
+                held.append(lock)
+            yield held
+        finally:
+            for key, lock in reversed(list(zip(ordered, held))):
+                self._release(lock, exclusive)
+                self._put_lock(key, lock)
+
+    def read(self, key: str, timeout: Optional[float] = None) -> Optional[Any]:
         """
         Read data with lock protection.
 
         Args:
             key: The key to read
+            timeout: Lock timeout in seconds
 
         Returns:
             The value if found, None otherwise
         """
-        # TODO: Implement locked read
-        pass
+        with self.acquire_lock(key, timeout, exclusive=False):
+            return self.data_store.get(key)
 
-    def write(self, key: str, value: Any) -> None:
+    def write(self, key: str, value: Any, timeout: Optional[float] = None) -> None:
         """
         Write data with lock protection.
 
         Args:
             key: The key to write
             value: The value to store
+            timeout: Lock timeout in seconds
         """
-        # TODO: Implement locked write
-        pass
+        with self.acquire_lock(key, timeout):
+            self.data_store[key] = value
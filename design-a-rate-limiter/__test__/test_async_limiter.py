@@ -0,0 +1,121 @@
+import asyncio
+
+import pytest
+from token_bucket import AsyncTokenBucketRateLimiter
+
+
+async def test_try_acquire_consumes_available_tokens():
+    """
+    BASIC: try_acquire behaves like allow_request and never waits.
+    """
+    limiter = AsyncTokenBucketRateLimiter(capacity=2, refill_rate=1)
+
+    assert limiter.try_acquire("alice") is True
+    assert limiter.try_acquire("alice") is True
+    assert limiter.try_acquire("alice") is False
+    assert limiter.get_wait_time("alice") == pytest.approx(1.0, abs=0.01)
+
+
+async def test_acquire_waits_for_exact_refill_time():
+    """
+    INTERMEDIATE: A waiter is woken when its tokens have refilled, not later.
+    """
+    limiter = AsyncTokenBucketRateLimiter(capacity=1, refill_rate=20)
+    loop = asyncio.get_running_loop()
+    assert await limiter.acquire("alice") is True
+
+    start = loop.time()
+    assert await limiter.acquire("alice") is True
+    elapsed = loop.time() - start
+
+    assert 0.045 <= elapsed < 0.1
+
+
+async def test_waiters_are_served_in_fifo_order():
+    """
+    HARD: A large request at the head of the queue is not overtaken by
+    smaller requests that arrive after it.
+    """
+    limiter = AsyncTokenBucketRateLimiter(capacity=3, refill_rate=100)
+    assert limiter.try_acquire("alice", tokens=3) is True
+    order = []
+
+    async def waiter(name, tokens):
+        await limiter.acquire("alice", tokens)
+        order.append(name)
+
+    tasks = [
+        asyncio.create_task(waiter("big", 3)),
+        asyncio.create_task(waiter("small-1", 1)),
+        asyncio.create_task(waiter("small-2", 1)),
+    ]
+    await asyncio.sleep(0)
+    assert limiter.try_acquire("alice") is False
+
+    await asyncio.gather(*tasks)
+    assert order == ["big", "small-1", "small-2"]
+
+
+async def test_acquire_timeout_returns_false_and_unblocks_queue():
+    """
+    INTERMEDIATE: A timed-out head waiter leaves the queue so the next one can run.
+    """
+    limiter = AsyncTokenBucketRateLimiter(capacity=2, refill_rate=10)
+    assert limiter.try_acquire("alice", tokens=2) is True
+
+    big = asyncio.create_task(limiter.acquire("alice", tokens=2, timeout=0.05))
+    small = asyncio.create_task(limiter.acquire("alice", tokens=1))
+
+    assert await big is False
+    assert await small is True
+    assert limiter.get_user_stats("alice")["waiters"] == 0
+
+
+async def test_cancelled_waiter_is_removed():
+    limiter = AsyncTokenBucketRateLimiter(capacity=1, refill_rate=1)
+    assert limiter.try_acquire("alice") is True
+
+    task = asyncio.create_task(limiter.acquire("alice"))
+    await asyncio.sleep(0)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    assert limiter.get_user_stats("alice")["waiters"] == 0
+
+
+async def test_waiter_cancelled_after_admission_returns_its_tokens():
+    """
+    INTERMEDIATE: Tokens granted to a waiter that is cancelled before it resumes
+    go back to the bucket and to the next waiter.
+    """
+    limiter = AsyncTokenBucketRateLimiter(capacity=2, refill_rate=0.001)
+    assert limiter.try_acquire("alice", tokens=2) is True
+
+    first = asyncio.create_task(limiter.acquire("alice", tokens=2))
+    second = asyncio.create_task(limiter.acquire("alice", tokens=2))
+    await asyncio.sleep(0)
+    limiter.reset_user("alice")  # grants the first waiter's future
+    first.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await first
+
+    assert await asyncio.wait_for(second, timeout=1) is True
+
+
+async def test_reset_user_admits_queued_waiters():
+    limiter = AsyncTokenBucketRateLimiter(capacity=2, refill_rate=0.001)
+    assert limiter.try_acquire("alice", tokens=2) is True
+
+    task = asyncio.create_task(limiter.acquire("alice", tokens=2))
+    await asyncio.sleep(0)
+    limiter.reset_user("alice")
+
+    assert await asyncio.wait_for(task, timeout=1) is True
+
+
+async def test_acquire_rejects_requests_larger_than_capacity():
+    limiter = AsyncTokenBucketRateLimiter(capacity=2, refill_rate=1)
+
+    with pytest.raises(ValueError):
+        await limiter.acquire("alice", tokens=3)
@@ -0,0 +1,104 @@
+import numpy as np
+import pytest
+from gcra import GCRARateLimiter
+from token_bucket import CompactTokenBucketRateLimiter, TokenBucketRateLimiter
+from token_bucket.batch import consume_batch
+
+LIMITERS = [TokenBucketRateLimiter, CompactTokenBucketRateLimiter]
+
+
+def sequential_decisions(limiter_cls, user_ids, tokens):
+    limiter = limiter_cls(capacity=5, refill_rate=0.0001)
+    return [limiter.allow_request(u, t) for u, t in zip(user_ids, tokens)]
+
+
+@pytest.mark.parametrize("limiter_cls", LIMITERS)
+def test_batch_returns_boolean_mask(limiter_cls):
+    """
+    BASIC: One decision per request, as a NumPy boolean mask.
+    """
+    limiter = limiter_cls(capacity=2, refill_rate=0.0001)
+
+    mask = limiter.allow_requests_batch(["a", "b", "c"])
+
+    assert mask.dtype == bool
+    assert mask.tolist() == [True, True, True]
+    assert limiter.allow_requests_batch([]).tolist() == []
+
+
+@pytest.mark.parametrize("limiter_cls", LIMITERS)
+def test_batch_handles_duplicate_users(limiter_cls):
+    """
+    INTERMEDIATE: A user repeated in one batch drains a single bucket in order.
+    """
+    limiter = limiter_cls(capacity=3, refill_rate=0.0001)
+
+    mask = limiter.allow_requests_batch(["a", "b", "a", "a", "a", "b"])
+
+    assert mask.tolist() == [True, True, True, True, False, True]
+    assert limiter.allow_request("a") is False
+    assert limiter.allow_request("b") is True
+
+
+@pytest.mark.parametrize("limiter_cls", LIMITERS)
+def test_batch_matches_sequential_with_mixed_token_counts(limiter_cls):
+    """
+    HARD: A rejected large request must not block a later small one for the
+    same user, exactly like sequential allow_request calls.
+    """
+    user_ids = ["a", "a", "a", "b", "a", "b", "b"]
+    tokens = [2, 4, 1, 5, 2, 1, 1]
+
+    limiter = limiter_cls(capacity=5, refill_rate=0.0001)
+    mask = limiter.allow_requests_batch(user_ids, tokens)
+
+    assert mask.tolist() == sequential_decisions(limiter_cls, user_ids, tokens)
+    assert mask.tolist() == [True, False, True, True, True, False, False]
+
+
+@pytest.mark.parametrize("limiter_cls", LIMITERS)
+def test_batch_random_workload_matches_sequential(limiter_cls):
+    rng = np.random.default_rng(42)
+    user_ids = [f"user-{i}" for i in rng.integers(0, 20, size=500)]
+    tokens = rng.integers(1, 4, size=500).tolist()
+
+    limiter = limiter_cls(capacity=5, refill_rate=0.0001)
+    mask = limiter.allow_requests_batch(user_ids, tokens)
+
+    assert mask.tolist() == sequential_decisions(limiter_cls, user_ids, tokens)
+
+
+@pytest.mark.parametrize("limiter_cls", LIMITERS)
+def test_batch_rejects_misaligned_tokens(limiter_cls):
+    limiter = limiter_cls(capacity=5, refill_rate=1)
+
+    with pytest.raises(ValueError):
+        limiter.allow_requests_batch(["a", "b"], [1, 2, 3])
+
+
+@pytest.mark.parametrize(
+    "limiter_cls", LIMITERS + [GCRARateLimiter], ids=lambda cls: cls.__name__
+)
+def test_batch_accepts_numpy_scalar_tokens(limiter_cls):
+    """
+    BASIC: NumPy integer scalars count as one token value for the whole batch,
+    and the default (looping) implementation also returns a boolean mask.
+    """
+    limiter = limiter_cls(capacity=4, refill_rate=0.0001)
+
+    mask = limiter.allow_requests_batch(["a", "a", "a"], np.int64(2))
+
+    assert isinstance(mask, np.ndarray)
+    assert mask.dtype == bool
+    assert mask.tolist() == [True, True, False]
+
+
+def test_consume_batch_reports_tokens_consumed_per_bucket():
+    available = np.array([3.0, 1.0])
+    groups = np.array([0, 1, 0, 1, 0, 0])
+    tokens = np.ones(6)
+
+    admitted, consumed = consume_batch(available, groups, tokens)
+
+    assert admitted.tolist() == [True, True, True, False, True, False]
+    assert consumed.tolist() == [3.0, 1.0]
@@ -0,0 +1,77 @@
+import time
+
+import pytest
+from clock import CachedClock, VirtualClock
+from token_bucket import (
+    CompactTokenBucketRateLimiter,
+    ShardedTokenBucketRateLimiter,
+    TokenBucketGlobalLimiter,
+    TokenBucketRateLimiter,
+)
+
+LIMITERS = [
+    TokenBucketRateLimiter,
+    ShardedTokenBucketRateLimiter,
+    CompactTokenBucketRateLimiter,
+]
+
+
+def test_virtual_clock_moves_only_forward():
+    """
+    BASIC: VirtualClock advances on request and never goes backwards.
+    """
+    clock = VirtualClock(start=5.0)
+    assert clock() == 5.0
+    assert clock.advance(2.5) == 7.5
+    clock.set(10)
+    assert clock() == 10
+
+    with pytest.raises(ValueError):
+        clock.advance(-1)
+    with pytest.raises(ValueError):
+        clock.set(9)
+
+
+def test_cached_clock_ticks():
+    clock = CachedClock(resolution=0.001)
+    try:
+        first = clock()
+        time.sleep(0.05)
+        assert clock() > first
+    finally:
+        clock.stop()
+    frozen = clock()
+    time.sleep(0.01)
+    assert clock() == frozen
+
+
+@pytest.mark.parametrize("limiter_class", LIMITERS)
+def test_limiters_refill_on_virtual_time(limiter_class):
+    """
+    INTERMEDIATE: Refill follows the injected clock, so an hour of refill
+    happens instantly and the wait time is exact.
+    """
+    clock = VirtualClock(start=1_000.0)
+    limiter = limiter_class(capacity=10, refill_rate=0.5, clock=clock)
+
+    assert limiter.allow_request("user", 10)
+    assert not limiter.allow_request("user")
+    assert limiter.get_wait_time("user", 3) == pytest.approx(6.0)
+
+    clock.advance(5.9)
+    assert not limiter.allow_request("user", 3)
+    clock.advance(0.1)
+    assert limiter.allow_request("user", 3)
+
+    clock.advance(3600)
+    assert limiter.cleanup_inactive_users(inactive_threshold=60) == 1
+    assert limiter.get_user_stats("user")["tokens_available"] == 10
+
+
+def test_global_limiter_uses_clock():
+    clock = VirtualClock()
+    limiter = TokenBucketGlobalLimiter(capacity=2, refill_rate=1, clock=clock)
+    assert limiter.allow_request(2)
+    assert limiter.get_wait_time() == pytest.approx(1)
+    clock.advance(1)
+    assert limiter.allow_request()
@@ -0,0 +1,95 @@
+import random
+import time
+
+from token_bucket import CompactTokenBucketRateLimiter
+
+
+def test_compact_store_enforces_capacity_per_user():
+    """
+    BASIC: Behaves like the object-per-user limiter for admission decisions.
+    """
+    limiter = CompactTokenBucketRateLimiter(capacity=2, refill_rate=0.001)
+
+    assert limiter.allow_request("alice") is True
+    assert limiter.allow_request("alice") is True
+    assert limiter.allow_request("alice") is False
+    assert limiter.allow_request("bob", tokens=2) is True
+    assert limiter.get_config()["active_users"] == 2
+
+
+def test_compact_store_refills_over_time():
+    """
+    INTERMEDIATE: Tokens refill from the last_refill array on the next access.
+    """
+    limiter = CompactTokenBucketRateLimiter(capacity=5, refill_rate=10)
+    assert limiter.allow_request("alice", tokens=5) is True
+    assert limiter.get_wait_time("alice", tokens=5) > 0
+
+    limiter.last_refill[limiter._lookup(hash("alice"))] -= 1.0
+
+    assert limiter.get_wait_time("alice", tokens=5) == 0.0
+    assert limiter.allow_request("alice", tokens=5) is True
+
+
+def test_compact_store_reads_do_not_allocate_slots():
+    limiter = CompactTokenBucketRateLimiter(capacity=3, refill_rate=1)
+
+    stats = limiter.get_user_stats("ghost")
+
+    assert stats["tokens_available"] == 3
+    assert stats["wait_time_for_1_token"] == 0.0
+    assert len(limiter.key_hashes) == 0
+
+
+def test_compact_store_cleanup_keeps_dense_arrays():
+    """
+    INTERMEDIATE: Removing keys swaps the last slot into the hole, so the arrays
+    stay dense and surviving users keep their state.
+    """
+    limiter = CompactTokenBucketRateLimiter(capacity=3, refill_rate=0.001)
+    for i in range(10):
+        limiter.allow_request(f"user-{i}")
+
+    limiter.reset_user("user-3")
+    for i in range(0, 10, 2):
+        limiter.last_refill[limiter._lookup(hash(f"user-{i}"))] = time.time() - 100
+    assert limiter.cleanup_inactive_users(inactive_threshold=50) == 5
+
+    assert len(limiter.tokens) == 4
+    for i in (1, 5, 7, 9):
+        assert limiter.get_user_stats(f"user-{i}")["tokens_available"] < 3
+
+
+def test_compact_store_index_survives_random_churn():
+    """
+    HARD: Random inserts and deletes (with index resizes and backward-shift
+    deletion) must keep every live key reachable.
+    """
+    limiter = CompactTokenBucketRateLimiter(capacity=1, refill_rate=0.0001)
+    rng = random.Random(7)
+    live = set()
+    for _ in range(5000):
+        user_id = f"user-{rng.randrange(800)}"
+        if user_id in live and rng.random() < 0.5:
+            limiter.reset_user(user_id)
+            live.discard(user_id)
+        else:
+            limiter.allow_request(user_id)
+            live.add(user_id)
+
+    assert len(limiter.key_hashes) == len(live)
+    for user_id in live:
+        assert limiter.allow_request(user_id) is False
+    assert limiter.allow_request("never-seen") is True
+
+
+def test_compact_store_memory_report():
+    limiter = CompactTokenBucketRateLimiter(capacity=1, refill_rate=1)
+    for i in range(1000):
+        limiter.allow_request(f"user-{i}")
+
+    usage = limiter.memory_usage()
+
+    assert usage["keys"] == 1000
+    assert usage["total_bytes"] == usage["arrays_bytes"] + usage["index_bytes"]
+    assert 24 <= usage["bytes_per_key"] < 64
@@ -0,0 +1,78 @@
+import pytest
+from clock import VirtualClock
+from gcra import GCRAGlobalLimiter, GCRARateLimiter
+from token_bucket import TokenBucketRateLimiter
+
+
+def test_burst_then_deny():
+    """
+    BASIC: A fresh key admits exactly `capacity` tokens in a burst.
+    """
+    limiter = GCRARateLimiter(capacity=5, refill_rate=1)
+
+    assert [limiter.allow_request("alice") for _ in range(6)] == [True] * 5 + [False]
+    assert limiter.allow_request("bob")
+
+
+def test_full_burst_with_fractional_interval():
+    clock = VirtualClock(start=123.456)
+    limiter = GCRARateLimiter(capacity=20, refill_rate=5, clock=clock)
+
+    assert sum(limiter.allow_request("u") for _ in range(25)) == 20
+
+
+def test_matches_token_bucket_decisions():
+    """
+    INTERMEDIATE: GCRA makes the same decisions as a token bucket with the same
+    capacity and refill rate on an identical request sequence.
+    """
+    clock = VirtualClock(start=1000.0)
+    gcra = GCRARateLimiter(capacity=4, refill_rate=2, clock=clock)
+    bucket = TokenBucketRateLimiter(capacity=4, refill_rate=2, clock=clock)
+
+    pattern = [(0.0, 1), (0.0, 2), (0.1, 1), (0.2, 2), (0.5, 1), (1.5, 3), (0.0, 2)]
+    for step, tokens in pattern * 5:
+        clock.advance(step)
+        assert gcra.allow_request("u", tokens) == bucket.allow_request("u", tokens)
+
+
+def test_wait_time_and_stats():
+    clock = VirtualClock(start=50.0)
+    limiter = GCRARateLimiter(capacity=2, refill_rate=4, clock=clock)
+
+    assert limiter.get_wait_time("u") == 0
+    assert limiter.allow_request("u", 2)
+    assert limiter.get_wait_time("u") == pytest.approx(0.25)
+    assert limiter.get_wait_time("u", 2) == pytest.approx(0.5)
+    assert limiter.get_user_stats("u")["tokens_available"] == pytest.approx(0)
+
+    clock.advance(0.25)
+    assert limiter.allow_request("u")
+    assert not limiter.allow_request("u")
+
+
+def test_state_is_one_float_per_key_and_cleanup():
+    clock = VirtualClock(start=0.0)
+    limiter = GCRARateLimiter(capacity=10, refill_rate=1, clock=clock)
+    for i in range(5):
+        limiter.allow_request(f"user-{i}", 10)
+    assert all(isinstance(tat, float) for tat in limiter.tats.values())
+
+    clock.set(15)
+    limiter.allow_request("user-0")
+    assert limiter.cleanup_inactive_users(inactive_threshold=1) == 4
+    assert list(limiter.tats) == ["user-0"]
+
+    limiter.reset_user("user-0")
+    assert limiter.get_config()["active_users"] == 0
+
+
+def test_global_limiter():
+    clock = VirtualClock(start=10.0)
+    limiter = GCRAGlobalLimiter(capacity=3, refill_rate=1, clock=clock)
+
+    assert all(limiter.allow_request() for _ in range(3))
+    assert not limiter.allow_request()
+    assert limiter.get_wait_time() == pytest.approx(1)
+    clock.advance(1)
+    assert limiter.allow_request()
@@ -0,0 +1,96 @@
+import pytest
+from clock import VirtualClock
+from hierarchical import HierarchicalRateLimiter, LimitLevel
+
+
+def tenant_of(user_id: str) -> str:
+    return user_id.split("/")[0]
+
+
+@pytest.fixture
+def clock():
+    return VirtualClock(start=100.0)
+
+
+def make_limiter(clock, global_capacity=100):
+    return HierarchicalRateLimiter.user_tenant_global(
+        tenant_of,
+        user_capacity=3,
+        user_refill_rate=1,
+        tenant_capacity=5,
+        tenant_refill_rate=1,
+        global_capacity=global_capacity,
+        global_refill_rate=1,
+        clock=clock,
+    )
+
+
+def test_each_level_is_enforced(clock):
+    """
+    BASIC: The user, tenant and global limits all apply.
+    """
+    limiter = make_limiter(clock, global_capacity=7)
+
+    assert [limiter.allow_request("acme/alice") for _ in range(4)] == [True] * 3 + [
+        False
+    ]
+    # Tenant has 2 tokens left after alice's 3
+    assert [limiter.allow_request("acme/bob") for _ in range(3)] == [True] * 2 + [False]
+    # Global has 2 tokens left after acme's 5
+    assert limiter.allow_request("globex/carol", 2)
+    assert not limiter.allow_request("globex/carol")
+    assert limiter.get_user_stats("globex/carol")["limiting_level"] == "global"
+
+
+def test_rejection_consumes_nothing(clock):
+    """
+    INTERMEDIATE: A request rejected by an outer level leaves inner buckets
+    untouched, unlike chaining independent limiters.
+    """
+    limiter = make_limiter(clock, global_capacity=1)
+    assert limiter.allow_request("acme/alice")
+
+    for _ in range(10):
+        assert not limiter.allow_request("acme/bob")
+
+    levels = limiter.get_user_stats("acme/bob")["levels"]
+    assert levels["user"]["tokens_available"] == 3
+    assert levels["tenant"]["tokens_available"] == 4
+    assert levels["global"]["tokens_available"] == 0
+
+
+def test_wait_time_is_max_over_levels(clock):
+    limiter = make_limiter(clock, global_capacity=100)
+    assert limiter.allow_request("acme/alice", 3)
+    assert limiter.allow_request("acme/bob", 2)
+
+    # bob's own bucket has 1 token, but the tenant bucket is empty
+    assert limiter.get_wait_time("acme/bob") == pytest.approx(1)
+    assert limiter.get_wait_time("acme/bob", 3) == pytest.approx(3)
+    clock.advance(1)
+    assert limiter.allow_request("acme/bob")
+
+
+def test_reset_and_cleanup(clock):
+    limiter = make_limiter(clock)
+    limiter.allow_request("acme/alice", 3)
+    limiter.reset_user("acme/alice")
+    stats = limiter.get_user_stats("acme/alice")["levels"]
+    assert stats["user"]["tokens_available"] == 3
+    assert stats["tenant"]["tokens_available"] == 2
+
+    clock.advance(10)
+    limiter.allow_request("globex/carol")
+    assert limiter.cleanup_inactive_users(inactive_threshold=5) == 2
+    assert [level["active_keys"] for level in limiter.get_config()["levels"]] == [
+        1,
+        1,
+        1,
+    ]
+
+
+def test_level_validation():
+    with pytest.raises(ValueError):
+        HierarchicalRateLimiter([])
+    with pytest.raises(ValueError):
+        HierarchicalRateLimiter([LimitLevel("a", 1, 1), LimitLevel("a", 1, 1)])
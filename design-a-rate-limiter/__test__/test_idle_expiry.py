@@ -0,0 +1,102 @@
+import time
+
+import pytest
+from token_bucket import ShardedTokenBucketRateLimiter, TokenBucketRateLimiter
+from token_bucket.expiry import IdleExpiryHeap
+
+LIMITERS = [
+    lambda **kw: TokenBucketRateLimiter(capacity=5, refill_rate=1, **kw),
+    lambda **kw: ShardedTokenBucketRateLimiter(capacity=5, refill_rate=1, **kw),
+]
+
+
+def age_buckets(limiter, user_ids, seconds):
+    for user_id in user_ids:
+        limiter._get_bucket(user_id).last_refill_time -= seconds
+
+
+def test_pop_due_is_bounded_and_ordered():
+    """
+    BASIC: Only due entries are popped, earliest first, at most max_items.
+    """
+    heap = IdleExpiryHeap(idle_timeout=10)
+    for i, last_active in enumerate([5.0, 1.0, 3.0, 100.0]):
+        heap.track(f"user-{i}", object(), last_active)
+
+    assert [user for user, _ in heap.pop_due(now=14, max_items=2)] == [
+        "user-1",
+        "user-2",
+    ]
+    assert [user for user, _ in heap.pop_due(now=14, max_items=10)] == []
+    assert [user for user, _ in heap.pop_due(now=15, max_items=10)] == ["user-0"]
+    assert len(heap) == 1
+
+
+@pytest.mark.parametrize("make_limiter", LIMITERS)
+def test_expire_idle_users_evicts_only_idle_buckets(make_limiter):
+    """
+    INTERMEDIATE: Buckets used after creation are re-armed, not evicted.
+    """
+    limiter = make_limiter(idle_timeout=60)
+    users = [f"user-{i}" for i in range(10)]
+    for user_id in users:
+        limiter.allow_request(user_id)
+
+    age_buckets(limiter, users[:6], 120)
+    limiter.expiry.heap = [
+        (deadline - 120, seq, user_id, bucket)
+        for deadline, seq, user_id, bucket in limiter.expiry.heap
+    ]
+
+    assert limiter.expire_idle_users() == 6
+    assert sorted(limiter.buckets) == sorted(users[6:])
+    assert len(limiter.expiry) == 4
+
+
+@pytest.mark.parametrize("make_limiter", LIMITERS)
+def test_expire_idle_users_respects_max_work(make_limiter):
+    limiter = make_limiter(idle_timeout=0.01)
+    for i in range(50):
+        limiter.allow_request(f"user-{i}")
+    time.sleep(0.02)
+
+    assert limiter.expire_idle_users(max_work=20) == 20
+    assert limiter.expire_idle_users(max_work=20) == 20
+    assert limiter.expire_idle_users(max_work=20) == 10
+    assert limiter.get_config()["active_users"] == 0
+
+
+def test_reset_bucket_entries_are_dropped():
+    """
+    INTERMEDIATE: A stale heap entry for a reset-and-recreated user never
+    evicts the new bucket.
+    """
+    limiter = TokenBucketRateLimiter(capacity=5, refill_rate=1, idle_timeout=0.01)
+    limiter.allow_request("alice")
+    limiter.reset_user("alice")
+    time.sleep(0.02)
+    limiter.allow_request("alice")
+
+    assert limiter.expire_idle_users() == 0
+    assert "alice" in limiter.buckets
+
+
+def test_background_reaper_evicts_idle_buckets():
+    limiter = TokenBucketRateLimiter(capacity=5, refill_rate=1, idle_timeout=0.01)
+    for i in range(100):
+        limiter.allow_request(f"user-{i}")
+
+    limiter.start_reaper(interval=0.005, max_work=25)
+    deadline = time.time() + 2
+    while limiter.buckets and time.time() < deadline:
+        time.sleep(0.01)
+    limiter.stop_reaper()
+
+    assert limiter.buckets == {}
+
+
+def test_expiry_requires_idle_timeout():
+    limiter = TokenBucketRateLimiter(capacity=5, refill_rate=1)
+
+    with pytest.raises(RuntimeError):
+        limiter.expire_idle_users()
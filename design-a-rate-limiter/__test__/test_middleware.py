@@ -0,0 +1,85 @@
+import httpx
+from clock import VirtualClock
+from common_server import create_app
+from middleware import RateLimitMiddleware
+from sliding_window_counter import SlidingWindowCounterRateLimiter
+from src.service.api.main import app as audit_app
+from token_bucket import TokenBucketRateLimiter
+
+
+def client_for(app) -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://test"
+    )
+
+
+async def test_rejects_with_retry_after():
+    """
+    BASIC: Requests over the limit get a 429 with RateLimit-* and Retry-After.
+    """
+    clock = VirtualClock()
+    limiter = TokenBucketRateLimiter(capacity=2, refill_rate=0.25, clock=clock)
+    app = create_app(limiter, headers_on_success=False)
+
+    async with client_for(app) as client:
+        headers = {"X-API-Key": "alice"}
+        assert (await client.get("/api/request", headers=headers)).status_code == 200
+        assert (await client.get("/api/request", headers=headers)).status_code == 200
+
+        response = await client.get("/api/request", headers=headers)
+        assert response.status_code == 429
+        assert response.json() == {"detail": "Too Many Requests"}
+        assert response.headers["retry-after"] == "4"
+        assert response.headers["ratelimit-limit"] == "2"
+        assert response.headers["ratelimit-remaining"] == "0"
+        assert response.headers["ratelimit-reset"] == "4"
+
+        # Other keys and exempt paths are unaffected
+        response = await client.get("/api/request", headers={"X-API-Key": "bob"})
+        assert response.status_code == 200
+        assert (await client.get("/health", headers=headers)).status_code == 200
+
+        clock.advance(4)
+        assert (await client.get("/api/request", headers=headers)).status_code == 200
+
+
+async def test_headers_on_success():
+    limiter = TokenBucketRateLimiter(capacity=5, refill_rate=1, clock=VirtualClock())
+    async with client_for(create_app(limiter)) as client:
+        response = await client.get("/api/request", headers={"X-API-Key": "alice"})
+
+    assert response.status_code == 200
+    assert response.headers["ratelimit-limit"] == "5"
+    assert response.headers["ratelimit-remaining"] == "4"
+    assert response.headers["ratelimit-reset"] == "0"
+
+
+async def test_protects_audit_ingest_app():
+    """
+    INTERMEDIATE: The middleware wraps an existing FastAPI service unchanged,
+    keyed by client address when no API key header is sent.
+    """
+    limiter = TokenBucketRateLimiter(capacity=1, refill_rate=0.001)
+    app = RateLimitMiddleware(audit_app, limiter)
+
+    async with client_for(app) as client:
+        first = await client.get("/v1/events/search", params={"actor_id": "a"})
+        second = await client.get("/v1/events/search", params={"actor_id": "a"})
+
+    assert first.status_code == 200
+    assert second.status_code == 429
+    assert list(limiter.buckets) == ["127.0.0.1"]
+
+
+async def test_unsatisfiable_request_has_no_retry_after():
+    limiter = SlidingWindowCounterRateLimiter(limit=5, window_seconds=1)
+
+    async def ok(scope, receive, send):  # pragma: no cover - never admitted
+        raise AssertionError("request should have been rejected")
+
+    app = RateLimitMiddleware(ok, limiter, tokens=10, key_func=lambda s: "k")
+    async with client_for(app) as client:
+        response = await client.get("/")
+
+    assert response.status_code == 429
+    assert "retry-after" not in response.headers
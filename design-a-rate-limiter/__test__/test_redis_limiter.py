@@ -0,0 +1,179 @@
+import threading
+import time
+
+import pytest
+from token_bucket import LocalRedis, RedisTokenBucketRateLimiter
+from token_bucket.redis_limiter import run_token_bucket_script
+
+
+def test_script_refills_and_grants_within_bounds():
+    """
+    BASIC: The Python mirror of the Lua script grants between min and max tokens.
+    """
+    granted, left, ttl = run_token_bucket_script(None, 100.0, 10, 1, 1, 4)
+    assert (granted, left) == (4, 6)
+    assert ttl == pytest.approx(5.0)
+
+    granted, left, _ = run_token_bucket_script((0.5, 100.0), 100.0, 10, 1, 1, 4)
+    assert (granted, left) == (0, 0.5)
+
+    granted, left, _ = run_token_bucket_script((0.0, 100.0), 102.5, 10, 1, 1, 4)
+    assert (granted, left) == (2, 0.5)
+
+
+def test_plain_mode_one_round_trip_per_request():
+    limiter = RedisTokenBucketRateLimiter(capacity=3, refill_rate=0.001)
+
+    assert [limiter.allow_request("alice") for _ in range(4)] == [
+        True,
+        True,
+        True,
+        False,
+    ]
+    metrics = limiter.get_metrics()
+    assert metrics["round_trips"] == 4
+    assert metrics["admitted"] == 3
+    assert metrics["rejected"] == 1
+
+
+def test_nodes_share_buckets_through_redis():
+    """
+    INTERMEDIATE: Two nodes on the same Redis enforce one shared limit.
+    """
+    redis = LocalRedis()
+    node_a = RedisTokenBucketRateLimiter(4, 0.001, redis_client=redis)
+    node_b = RedisTokenBucketRateLimiter(4, 0.001, redis_client=redis)
+
+    assert node_a.allow_request("alice", tokens=3) is True
+    assert node_b.allow_request("alice", tokens=2) is False
+    assert node_b.allow_request("alice") is True
+    assert node_a.get_wait_time("alice") > 0
+
+
+def test_lease_mode_serves_most_requests_locally():
+    """
+    INTERMEDIATE: A lease of 10 tokens serves 10 requests per round trip.
+    """
+    limiter = RedisTokenBucketRateLimiter(
+        capacity=100, refill_rate=0.001, lease_size=10
+    )
+
+    assert all(limiter.allow_request("alice") for _ in range(100))
+    assert limiter.allow_request("alice") is False
+    metrics = limiter.get_metrics()
+    assert metrics["round_trips"] == 11
+    assert metrics["round_trips_per_admitted"] == pytest.approx(0.11)
+
+
+def test_leases_never_exceed_the_global_limit():
+    """
+    HARD: Several nodes leasing concurrently can never admit more than capacity.
+    """
+    redis = LocalRedis()
+    nodes = [
+        RedisTokenBucketRateLimiter(50, 0.0001, redis_client=redis, lease_size=7)
+        for _ in range(4)
+    ]
+    admitted = []
+
+    def worker(node):
+        admitted.append(sum(node.allow_request("hot-user") for _ in range(40)))
+
+    threads = [threading.Thread(target=worker, args=(node,)) for node in nodes]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert sum(admitted) <= 50
+
+
+def test_threads_sharing_a_lease_never_spend_it_twice():
+    """
+    HARD: While one thread tops up a partial lease from Redis, another thread
+    of the same node cannot spend the tokens it already counted on.
+    """
+    limiter = RedisTokenBucketRateLimiter(capacity=5, refill_rate=0.0001, lease_size=4)
+    assert limiter.allow_request("alice", tokens=2) is True  # lease 2, shared 1
+    script = limiter._script
+    results = []
+    interleaved = []
+
+    def claim_while_another_thread_runs(keys, args):
+        if not interleaved:
+            interleaved.append(True)
+            other = threading.Thread(
+                target=lambda: results.append(limiter.allow_request("alice", 2))
+            )
+            other.start()
+            other.join()
+        return script(keys=keys, args=args)
+
+    limiter._script = claim_while_another_thread_runs
+    results.append(limiter.allow_request("alice", tokens=3))
+
+    # 2 tokens spent already; of the 2 + 3 requested next only one fits
+    assert results.count(True) == 1
+    assert limiter.get_metrics()["admitted"] == 2
+
+
+def test_concurrent_lease_top_ups_never_exceed_the_limit():
+    """
+    HARD: Threads of one node sharing leases never admit more than capacity.
+    """
+    node = RedisTokenBucketRateLimiter(
+        60, 0.0001, redis_client=LocalRedis(latency=0.001), lease_size=5
+    )
+    spent = []
+
+    def worker(tokens):
+        spent.append(
+            sum(tokens for _ in range(30) if node.allow_request("hot-user", tokens))
+        )
+
+    threads = [threading.Thread(target=worker, args=(2 + i % 2,)) for i in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert sum(spent) <= 60
+
+
+def test_stats_read_the_bucket_without_consuming():
+    limiter = RedisTokenBucketRateLimiter(capacity=10, refill_rate=0.001)
+    assert limiter.get_user_stats("alice")["tokens_available"] == 10
+    assert limiter.allow_request("alice", tokens=4) is True
+
+    for _ in range(3):
+        available = limiter.get_user_stats("alice")["tokens_available"]
+        assert available == pytest.approx(6, abs=0.01)
+    assert limiter.get_wait_time("alice", tokens=6) == 0.0
+    assert limiter.get_metrics()["round_trips"] == 1
+
+
+def test_expired_leases_are_discarded():
+    limiter = RedisTokenBucketRateLimiter(
+        capacity=10, refill_rate=0.001, lease_size=5, lease_ttl=0.01
+    )
+    assert limiter.allow_request("alice") is True
+    time.sleep(0.02)
+
+    assert limiter.cleanup_inactive_users() == 1
+    assert limiter.allow_request("alice") is True
+    assert limiter.get_metrics()["round_trips"] == 2
+
+
+def test_reset_user_deletes_shared_bucket_and_lease():
+    limiter = RedisTokenBucketRateLimiter(capacity=2, refill_rate=0.001, lease_size=2)
+    assert limiter.allow_request("alice", tokens=2) is True
+    assert limiter.allow_request("alice") is False
+
+    limiter.reset_user("alice")
+
+    assert limiter.allow_request("alice", tokens=2) is True
+
+
+def test_local_redis_rejects_unknown_scripts():
+    with pytest.raises(NotImplementedError):
+        LocalRedis().register_script("return 1")
@@ -0,0 +1,136 @@
+import multiprocessing
+import time
+
+import pytest
+from token_bucket import SharedMemoryTokenBucketRateLimiter
+
+
+@pytest.fixture
+def table_path(tmp_path):
+    return str(tmp_path / "buckets.shm")
+
+
+def test_shared_limiter_enforces_capacity(table_path):
+    """
+    BASIC: Same admission behaviour as the in-process token bucket.
+    """
+    limiter = SharedMemoryTokenBucketRateLimiter(
+        capacity=2, refill_rate=0.001, num_slots=64, path=table_path
+    )
+
+    assert limiter.allow_request("alice") is True
+    assert limiter.allow_request("alice") is True
+    assert limiter.allow_request("alice") is False
+    assert limiter.allow_request("bob") is True
+    assert limiter.get_config()["active_users"] == 2
+    limiter.close()
+
+
+def test_two_handles_share_buckets(table_path):
+    """
+    INTERMEDIATE: A second mapping of the same table sees the same buckets,
+    just like a second worker process would.
+    """
+    worker_a = SharedMemoryTokenBucketRateLimiter(
+        3, 0.001, num_slots=64, path=table_path
+    )
+    worker_b = SharedMemoryTokenBucketRateLimiter(
+        3, 0.001, num_slots=64, path=table_path
+    )
+
+    assert worker_a.allow_request("alice", tokens=2) is True
+    assert worker_b.get_user_stats("alice")["tokens_available"] == pytest.approx(
+        1, abs=0.01
+    )
+    assert worker_b.allow_request("alice", tokens=2) is False
+    assert worker_b.allow_request("alice") is True
+
+    worker_a.close()
+    worker_b.close()
+
+
+def test_mismatched_configuration_is_rejected(table_path):
+    SharedMemoryTokenBucketRateLimiter(3, 1, num_slots=64, path=table_path).close()
+
+    with pytest.raises(ValueError):
+        SharedMemoryTokenBucketRateLimiter(5, 1, num_slots=64, path=table_path)
+
+
+def test_reset_and_cleanup_leave_reusable_tombstones(table_path):
+    """
+    INTERMEDIATE: Removed keys become tombstones that keep probe chains intact
+    and are reused by new keys.
+    """
+    limiter = SharedMemoryTokenBucketRateLimiter(
+        1, 0.0001, num_slots=8, path=table_path
+    )
+    for i in range(6):
+        assert limiter.allow_request(f"user-{i}") is True
+
+    limiter.reset_user("user-0")
+    assert limiter.allow_request("user-0") is True
+    for i in range(1, 6):
+        assert limiter.allow_request(f"user-{i}") is False
+
+    time.sleep(0.02)
+    assert limiter.cleanup_inactive_users(inactive_threshold=0.01) == 6
+    assert limiter.active_users() == 0
+    for i in range(8):
+        assert limiter.allow_request(f"new-{i}") is True
+    limiter.close()
+
+
+def test_full_table_reuses_refilled_buckets(table_path):
+    limiter = SharedMemoryTokenBucketRateLimiter(1, 1000, num_slots=4, path=table_path)
+    for i in range(4):
+        limiter.allow_request(f"user-{i}")
+
+    time.sleep(0.01)
+    assert limiter.allow_request("late-user") is True
+    limiter.close()
+
+
+def test_full_table_of_active_buckets_raises(table_path):
+    limiter = SharedMemoryTokenBucketRateLimiter(
+        1, 0.0001, num_slots=4, path=table_path
+    )
+    for i in range(4):
+        limiter.allow_request(f"user-{i}")
+
+    with pytest.raises(RuntimeError):
+        limiter.allow_request("one-too-many")
+    limiter.close()
+
+
+def _worker(path, start, admitted):
+    limiter = SharedMemoryTokenBucketRateLimiter(100, 0.0001, num_slots=64, path=path)
+    start.wait()
+    count = sum(limiter.allow_request("shared-user") for _ in range(60))
+    with admitted.get_lock():
+        admitted.value += count
+    limiter.close()
+
+
+def test_limit_is_enforced_across_processes(table_path):
+    """
+    HARD: Four worker processes hammering one key admit exactly `capacity`
+    requests in total instead of 4x the limit.
+    """
+    SharedMemoryTokenBucketRateLimiter(
+        100, 0.0001, num_slots=64, path=table_path
+    ).close()
+    ctx = multiprocessing.get_context("fork")
+    start = ctx.Event()
+    admitted = ctx.Value("i", 0)
+    workers = [
+        ctx.Process(target=_worker, args=(table_path, start, admitted))
+        for _ in range(4)
+    ]
+    for worker in workers:
+        worker.start()
+    start.set()
+    for worker in workers:
+        worker.join(timeout=30)
+
+    assert all(worker.exitcode == 0 for worker in workers)
+    assert admitted.value == 100
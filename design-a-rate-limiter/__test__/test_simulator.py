@@ -0,0 +1,67 @@
+import pytest
+from gcra import GCRARateLimiter
+from simulator import generate_workload, reference_decisions, run_simulation
+from sliding_window_counter import SlidingWindowCounterRateLimiter
+from token_bucket import TokenBucketRateLimiter
+
+
+def test_generate_workload_is_deterministic_and_skewed():
+    """
+    BASIC: Same seed gives the same stream, and Zipf skew concentrates traffic.
+    """
+    first = generate_workload(5_000, num_users=1_000, duration=10, seed=7)
+    second = generate_workload(5_000, num_users=1_000, duration=10, seed=7)
+
+    assert first.timestamps == second.timestamps
+    assert first.user_ids == second.user_ids
+    assert first.timestamps == sorted(first.timestamps)
+    assert first.user_ids.count("user-0") > len(first) * 0.05
+
+
+def test_bursts_and_churn():
+    bursty = generate_workload(
+        1_000, num_users=100, duration=10, burst_probability=0.1, burst_size=5
+    )
+    assert len(bursty) > 1_000
+
+    steady = generate_workload(5_000, num_users=100, duration=100)
+    churned = generate_workload(5_000, num_users=100, duration=100, churn_per_second=5)
+    assert churned.distinct_users() > steady.distinct_users() * 3
+
+
+def test_reference_decisions():
+    workload = generate_workload(2_000, num_users=5, duration=10, seed=1)
+    decisions = reference_decisions(workload, capacity=3, refill_rate=1)
+
+    # Each user gets at most capacity + rate * duration admissions
+    assert 0 < sum(decisions) <= 5 * (3 + 10)
+
+
+def test_run_simulation_reports_accuracy():
+    """
+    INTERMEDIATE: An exact token bucket agrees with the reference; the sliding
+    window approximation does not have to.
+    """
+    workload = generate_workload(
+        3_000, num_users=50, duration=20, burst_probability=0.05, seed=3
+    )
+
+    for make_limiter in (
+        lambda clock: TokenBucketRateLimiter(capacity=5, refill_rate=2, clock=clock),
+        lambda clock: GCRARateLimiter(capacity=5, refill_rate=2, clock=clock),
+    ):
+        report = run_simulation(make_limiter, workload, capacity=5, refill_rate=2)
+        assert report["agreement"] == pytest.approx(1.0, abs=1e-3)
+        assert report["over_admission"] == pytest.approx(0.0, abs=1e-3)
+        assert report["p99_us"] >= report["p50_us"] > 0
+        assert report["bytes_per_key"] > 0
+
+    report = run_simulation(
+        lambda clock: SlidingWindowCounterRateLimiter(5, 2.5, clock=clock),
+        workload,
+        capacity=5,
+        refill_rate=2,
+        measure_memory=False,
+    )
+    assert report["bytes_per_key"] is None
+    assert 0 < report["agreement"] < 1
@@ -0,0 +1,86 @@
+import math
+
+import pytest
+from clock import VirtualClock
+from sliding_window_counter import (
+    SlidingWindowCounterGlobalLimiter,
+    SlidingWindowCounterRateLimiter,
+)
+
+
+@pytest.fixture
+def clock():
+    return VirtualClock(start=1000.0)
+
+
+def test_limit_within_window(clock):
+    """
+    BASIC: At most `limit` requests are admitted inside one window.
+    """
+    limiter = SlidingWindowCounterRateLimiter(limit=3, window_seconds=10, clock=clock)
+
+    assert [limiter.allow_request("alice") for _ in range(4)] == [True] * 3 + [False]
+    assert limiter.allow_request("bob")
+
+
+def test_previous_window_is_weighted(clock):
+    """
+    INTERMEDIATE: The previous window's count decays linearly across the
+    current window instead of resetting at the boundary.
+    """
+    limiter = SlidingWindowCounterRateLimiter(limit=10, window_seconds=10, clock=clock)
+    assert limiter.allow_request("u", 10)
+
+    clock.advance(10)  # start of next window: previous=10 weighted at 1.0
+    assert not limiter.allow_request("u")
+
+    clock.advance(3)  # previous weighted at 0.7 -> estimate 7
+    assert limiter.allow_request("u", 3)
+    assert not limiter.allow_request("u")
+
+    clock.advance(10)  # two windows later: only the count of 3 remains, weighted 0.7
+    stats = limiter.get_user_stats("u")
+    assert stats["previous_window_count"] == 3
+    assert stats["current_window_count"] == 0
+    assert stats["estimated_count"] == pytest.approx(2.1)
+
+
+def test_wait_time(clock):
+    limiter = SlidingWindowCounterRateLimiter(limit=4, window_seconds=10, clock=clock)
+    assert limiter.get_wait_time("u") == 0
+    assert limiter.allow_request("u", 4)
+
+    # Current window is full; next window starts in 10s with previous=4 at weight 1
+    # and one slot opens once the weight drops to 3/4, 2.5s into it.
+    assert limiter.get_wait_time("u") == pytest.approx(12.5)
+    assert limiter.get_wait_time("u", 5) == math.inf
+
+    clock.advance(12.5)
+    assert limiter.get_wait_time("u") == pytest.approx(0)
+    assert limiter.allow_request("u")
+    assert not limiter.allow_request("u")
+
+
+def test_cleanup_and_reset(clock):
+    limiter = SlidingWindowCounterRateLimiter(limit=5, window_seconds=10, clock=clock)
+    for i in range(4):
+        limiter.allow_request(f"user-{i}")
+
+    clock.advance(100)
+    limiter.allow_request("user-0")
+    assert limiter.cleanup_inactive_users(inactive_threshold=60) == 3
+    assert list(limiter.windows) == ["user-0"]
+
+    limiter.reset_user("user-0")
+    assert limiter.get_config()["active_users"] == 0
+
+
+def test_global_limiter(clock):
+    limiter = SlidingWindowCounterGlobalLimiter(limit=2, window_seconds=1, clock=clock)
+
+    assert limiter.allow_request() and limiter.allow_request()
+    assert not limiter.allow_request()
+    assert limiter.get_wait_time() > 0
+    clock.advance(2)
+    assert limiter.allow_request()
+    assert limiter.get_stats()["current_window_count"] == 1
@@ -0,0 +1,167 @@
+import pytest
+from clock import VirtualClock
+from token_bucket import ShardedTokenBucketRateLimiter, TokenBucketRateLimiter
+from token_bucket.snapshot import BucketSnapshot, write_snapshot
+
+LIMITERS = [TokenBucketRateLimiter, ShardedTokenBucketRateLimiter]
+
+
+def make_limiter(limiter_class, clock, wall_clock):
+    limiter = limiter_class(capacity=10, refill_rate=1, clock=clock)
+    limiter.wall_clock = wall_clock
+    return limiter
+
+
+@pytest.mark.parametrize("limiter_class", LIMITERS)
+def test_restart_keeps_drained_buckets(tmp_path, limiter_class):
+    """
+    BASIC: A restarted limiter does not hand drained users a fresh burst.
+    """
+    path = str(tmp_path / "buckets.snap")
+    wall = VirtualClock(start=1_700_000_000.0)
+    before = make_limiter(limiter_class, VirtualClock(start=500.0), wall)
+    assert before.allow_request("abuser", 10)
+    assert before.allow_request("casual", 2)
+    before.allow_request("idle")  # refills to full before the snapshot
+
+    wall.advance(1)
+    before.clock.advance(1)
+    # Full buckets are not written
+    assert before.save_snapshot(path) == 2
+
+    # New process: its own clock starts over, three seconds of downtime pass
+    wall.advance(3)
+    after = make_limiter(limiter_class, VirtualClock(start=0.0), wall)
+    assert after.restore_snapshot(path) == 2
+
+    # abuser had 1 token at snapshot time + 3s downtime = 4
+    assert after.get_user_stats("abuser")["tokens_available"] == pytest.approx(4)
+    assert after.allow_request("abuser", 4)
+    assert not after.allow_request("abuser")
+    assert after.get_user_stats("casual")["tokens_available"] == pytest.approx(10)
+    assert after.get_user_stats("newcomer")["tokens_available"] == 10
+
+
+def test_entries_restore_once_and_carry_over(tmp_path):
+    """
+    INTERMEDIATE: A reset user is not resurrected from the snapshot, and users
+    who have not returned yet survive a second restart.
+    """
+    path = str(tmp_path / "buckets.snap")
+    wall = VirtualClock(start=100.0)
+    first = make_limiter(TokenBucketRateLimiter, VirtualClock(), wall)
+    first.allow_request("alice", 10)
+    first.allow_request("bob", 10)
+    first.save_snapshot(path)
+
+    second = make_limiter(TokenBucketRateLimiter, VirtualClock(), wall)
+    second.restore_snapshot(path)
+    assert not second.allow_request("alice")
+    second.reset_user("alice")
+    assert second.allow_request("alice", 10)
+
+    # bob never came back to the second process but must survive its restart
+    wall.advance(2)
+    assert second.save_snapshot(path) == 2
+    third = make_limiter(TokenBucketRateLimiter, VirtualClock(), wall)
+    third.restore_snapshot(path)
+    assert third.get_wait_time("bob", 3) == pytest.approx(1)
+
+
+@pytest.mark.parametrize("limiter_class", LIMITERS)
+def test_reset_before_return_discards_saved_state(tmp_path, limiter_class):
+    path = str(tmp_path / "buckets.snap")
+    wall = VirtualClock(start=100.0)
+    first = make_limiter(limiter_class, VirtualClock(), wall)
+    first.allow_request("alice", 10)
+    first.save_snapshot(path)
+
+    second = make_limiter(limiter_class, VirtualClock(), wall)
+    assert second.restore_snapshot(path) == 1
+    second.reset_user("alice")  # before alice's bucket was restored
+
+    assert second.allow_request("alice", 10)
+
+
+@pytest.mark.parametrize("limiter_class", LIMITERS)
+def test_restored_bucket_is_not_reaped_on_arrival(tmp_path, limiter_class):
+    """
+    INTERMEDIATE: The back-dated refill time of a restored bucket does not make
+    its returning user look idle to the reaper.
+    """
+    path = str(tmp_path / "buckets.snap")
+    wall = VirtualClock(start=1_000.0)
+    first = limiter_class(capacity=10, refill_rate=0.01, clock=VirtualClock())
+    first.wall_clock = wall
+    first.allow_request("alice", 10)
+    first.save_snapshot(path)
+
+    wall.advance(100)  # downtime longer than idle_timeout
+    second = limiter_class(
+        capacity=10, refill_rate=0.01, idle_timeout=50, clock=VirtualClock()
+    )
+    second.wall_clock = wall
+    second.restore_snapshot(path)
+    bucket = second._get_bucket("alice")
+
+    assert second.expire_idle_users() == 0
+    assert second._get_bucket("alice") is bucket
+    assert second.get_user_stats("alice")["tokens_available"] == pytest.approx(1)
+
+
+def test_stale_missing_and_mismatched_snapshots(tmp_path):
+    path = str(tmp_path / "buckets.snap")
+    wall = VirtualClock(start=100.0)
+    limiter = make_limiter(TokenBucketRateLimiter, VirtualClock(), wall)
+    assert limiter.restore_snapshot(path) == 0
+
+    limiter.allow_request("alice", 10)
+    limiter.save_snapshot(path)
+    wall.advance(10)  # every bucket has refilled by now
+    assert limiter.restore_snapshot(path) == 0
+
+    other = TokenBucketRateLimiter(capacity=20, refill_rate=1)
+    with pytest.raises(ValueError):
+        other.restore_snapshot(path)
+
+    (tmp_path / "garbage.snap").write_bytes(b"not a snapshot" * 10)
+    with pytest.raises(ValueError):
+        limiter.restore_snapshot(str(tmp_path / "garbage.snap"))
+
+
+def test_snapshot_file_lookup(tmp_path):
+    path = str(tmp_path / "raw.snap")
+    entries = [(f"user-{i}", float(i % 7)) for i in range(5_000)] + [("ключ", 2.5)]
+    assert write_snapshot(path, entries, 10, 1, taken_at=42.0) == 5_001
+
+    snapshot = BucketSnapshot(path)
+    try:
+        assert (snapshot.capacity, snapshot.refill_rate, snapshot.taken_at) == (
+            10,
+            1,
+            42.0,
+        )
+        assert snapshot.pop("user-4321") == 4321 % 7
+        assert snapshot.pop("user-4321") is None
+        assert snapshot.pop("ключ") == 2.5
+        assert snapshot.pop("missing") is None
+        assert len(list(snapshot.items())) == 4_999
+    finally:
+        snapshot.close()
+
+    # Taken entries live only in the private mapping, never in the file
+    reopened = BucketSnapshot(path)
+    assert reopened.pop("user-4321") == 4321 % 7
+    reopened.close()
+
+
+def test_snapshotter_saves_on_stop(tmp_path):
+    path = str(tmp_path / "buckets.snap")
+    limiter = TokenBucketRateLimiter(capacity=10, refill_rate=0.01)
+    assert limiter.start_snapshotter(path, interval=60) == 0
+    limiter.allow_request("alice", 10)
+    limiter.stop_snapshotter()
+
+    restarted = TokenBucketRateLimiter(capacity=10, refill_rate=0.01)
+    assert restarted.restore_snapshot(path) == 1
+    assert not restarted.allow_request("alice")
@@ -0,0 +1,89 @@
+import threading
+import time
+
+import pytest
+from token_bucket import ShardedTokenBucketRateLimiter, TokenBucketRateLimiter
+
+
+def test_sharded_limiter_enforces_capacity_per_user():
+    """
+    BASIC: Each user gets an independent bucket, exactly like the unsharded limiter.
+    """
+    limiter = ShardedTokenBucketRateLimiter(capacity=3, refill_rate=0.001, num_shards=4)
+
+    assert [limiter.allow_request("alice") for _ in range(4)] == [
+        True,
+        True,
+        True,
+        False,
+    ]
+    assert limiter.allow_request("bob") is True
+    assert limiter.get_config()["active_users"] == 2
+
+
+def test_sharded_limiter_returns_same_bucket_without_recreating():
+    """
+    BASIC: Lookups of an existing user return the bucket stored in its shard.
+    """
+    limiter = ShardedTokenBucketRateLimiter(capacity=5, refill_rate=1, num_shards=8)
+
+    first = limiter._get_bucket("user-1")
+    second = limiter._get_bucket("user-1")
+
+    assert first is second
+    assert "user-1" in limiter.buckets
+
+
+def test_sharded_limiter_reset_and_cleanup():
+    """
+    INTERMEDIATE: reset_user and cleanup_inactive_users operate shard by shard.
+    """
+    limiter = ShardedTokenBucketRateLimiter(capacity=2, refill_rate=1, num_shards=4)
+    for i in range(20):
+        limiter.allow_request(f"user-{i}")
+
+    limiter.reset_user("user-0")
+    assert "user-0" not in limiter.buckets
+
+    for bucket in limiter.buckets.values():
+        bucket.last_refill_time = time.time() - 10
+    assert limiter.cleanup_inactive_users(inactive_threshold=5) == 19
+    assert limiter.buckets == {}
+
+
+def test_sharded_limiter_rejects_invalid_shard_count():
+    with pytest.raises(ValueError):
+        ShardedTokenBucketRateLimiter(capacity=1, refill_rate=1, num_shards=0)
+
+
+def test_sharded_limiter_concurrent_creation_is_exact():
+    """
+    HARD: Racing threads on a brand-new user must share one bucket, so exactly
+    `capacity` requests are admitted in total.
+    """
+    capacity = 50
+    limiter = ShardedTokenBucketRateLimiter(
+        capacity=capacity, refill_rate=0.0001, num_shards=2
+    )
+    admitted = []
+    barrier = threading.Barrier(8)
+
+    def worker():
+        barrier.wait()
+        admitted.append(sum(limiter.allow_request("hot-user") for _ in range(20)))
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert sum(admitted) == capacity
+
+
+def test_unsharded_limiter_is_unchanged():
+    limiter = TokenBucketRateLimiter(capacity=1, refill_rate=0.001)
+
+    assert limiter.allow_request("alice") is True
+    assert limiter.allow_request("alice") is False
+    assert isinstance(limiter.buckets, dict)
@@ -5,7 +5,39 @@ This module defines the interface that all rate limiting algorithms must impleme
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, Optional
+from typing import Dict, Optional, Sequence, Union
+
+import numpy as np
+
+
+def as_token_array(
+    tokens: Optional[Union[int, Sequence[int]]],
+    size: int,
+    dtype: type = np.float64,
+) -> np.ndarray:
+    """
+    Normalize the tokens argument of allow_requests_batch to an array.
+
+    Args:
+        tokens: None (1 token each), a scalar (Python or NumPy) applied to every
+            request, or a sequence with one entry per request
+        size: Number of requests in the batch
+        dtype: dtype of the returned array
+
+    Returns:
+        Array of length `size` with the tokens of each request
+
+    Raises:
+        ValueError: If a sequence does not have one entry per request
+    """
+    if tokens is None:
+        return np.ones(size, dtype=dtype)
+    if np.isscalar(tokens) or np.ndim(tokens) == 0:
+        return np.full(size, tokens, dtype=dtype)
+    token_array = np.asarray(tokens, dtype=dtype)
+    if token_array.shape != (size,):
+        raise ValueError("tokens must be a scalar or have one entry per user_id")
+    return token_array
 
 
 class RateLimiter(ABC):
@@ -30,6 +62,37 @@ class RateLimiter(ABC):
         """
         pass
 
+    def allow_requests_batch(
+        self,
+        user_ids: Sequence[str],
+        tokens: Optional[Union[int, Sequence[int]]] = None,
+    ) -> np.ndarray:
+        """
+        Check a batch of requests, as if each were passed to allow_request in order.
+
+        Implementations may override this with a vectorized version; the default
+        simply loops over allow_request.
+
+        Args:
+            user_ids: User identifier of each request
+            tokens: Tokens per request - a sequence aligned with user_ids, a single
+                int (Python or NumPy) applied to every request, or None for 1 token
+                each
+
+        Returns:
+            NumPy boolean mask aligned with user_ids (True where the request is
+            allowed)
+        """
+        counts = as_token_array(tokens, len(user_ids), np.int64).tolist()
+        return np.fromiter(
+            (
+                self.allow_request(user_id, count)
+                for user_id, count in zip(user_ids, counts)
+            ),
+            dtype=bool,
+            count=len(user_ids),
+        )
+
     @abstractmethod
     def get_user_stats(self, user_id: str) -> Dict[str, any]:
         """
@@ -141,3 +204,87 @@ class GlobalRateLimiter(ABC):
             Time in seconds until allowed (0 if already allowed)
         """
         pass
+
+
+class AsyncRateLimiter(ABC):
+    """
+    Abstract base class for asyncio-native rate limiting algorithms.
+
+    Implementations are bound to a single event loop and never block it: callers
+    wait for capacity by awaiting acquire instead of polling get_wait_time.
+    """
+
+    @abstractmethod
+    async def acquire(
+        self, user_id: str, tokens: int = 1, timeout: Optional[float] = None
+    ) -> bool:
+        """
+        Wait until the request can be admitted, then consume its tokens.
+
+        Args:
+            user_id: Unique identifier for the user
+            tokens: Number of tokens/requests to consume (default: 1)
+            timeout: Maximum time in seconds to wait (None waits indefinitely)
+
+        Returns:
+            True once the tokens were consumed, False if the timeout expired first
+        """
+        pass
+
+    @abstractmethod
+    def try_acquire(self, user_id: str, tokens: int = 1) -> bool:
+        """
+        Consume tokens only if the request can be admitted immediately.
+
+        Args:
+            user_id: Unique identifier for the user
+            tokens: Number of tokens/requests to consume (default: 1)
+
+        Returns:
+            True if the request is allowed, False otherwise
+        """
+        pass
+
+    @abstractmethod
+    def get_wait_time(self, user_id: str, tokens: int = 1) -> float:
+        """
+        Get the time in seconds until a new acquire would be admitted.
+
+        Args:
+            user_id: Unique identifier for the user
+            tokens: Number of tokens/requests needed
+
+        Returns:
+            Time in seconds until the request would be allowed (0 if already allowed)
+        """
+        pass
+
+    @abstractmethod
+    def reset_user(self, user_id: str) -> None:
+        """
+        Reset rate limiting state for a specific user.
+
+        Args:
+            user_id: Unique identifier for the user
+        """
+        pass
+
+    @abstractmethod
+    def get_algorithm_name(self) -> str:
+        """
+        Get the name of the rate limiting algorithm.
+
+        Returns:
+            Name of the algorithm
+        """
+        pass
+
+    @abstractmethod
+    def get_config(self) -> Dict[str, any]:
+        """
+        Get the configuration parameters of the rate limiter.
+
+        Returns:
+            Dictionary containing configuration parameters
+        """
+        pass
@@ -0,0 +1,78 @@
+import gc
+import time
+import tracemalloc
+
+from gcra import GCRARateLimiter
+from sliding_window_counter import SlidingWindowCounterRateLimiter
+from token_bucket import CompactTokenBucketRateLimiter, TokenBucketRateLimiter
+
+NUM_KEYS = 50_000
+HOT_KEYS = 1_000
+NUM_REQUESTS = 200_000
+
+ALGORITHMS = {
+    "Token Bucket": lambda: TokenBucketRateLimiter(capacity=10, refill_rate=1),
+    "Compact Token Bucket": lambda: CompactTokenBucketRateLimiter(
+        capacity=10, refill_rate=1
+    ),
+    "GCRA": lambda: GCRARateLimiter(capacity=10, refill_rate=1),
+    "Sliding Window Counter": lambda: SlidingWindowCounterRateLimiter(
+        limit=10, window_seconds=10
+    ),
+}
+
+
+def measure_bytes_per_key(limiter, user_ids) -> float:
+    """Bytes allocated per key while admitting one request for every user."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        for user_id in user_ids:
+            limiter.allow_request(user_id)
+        gc.collect()
+        after, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return (after - before) / len(user_ids)
+
+
+def measure_ops_per_second(limiter, requests) -> float:
+    """Single-threaded allow_request throughput over a pre-built request stream."""
+    allow = limiter.allow_request
+    start = time.perf_counter()
+    for user_id in requests:
+        allow(user_id)
+    return len(requests) / (time.perf_counter() - start)
+
+
+def test_algorithm_memory_and_cpu():
+    """
+    BENCHMARK: bytes/key and allow_request ops/s for each per-key algorithm.
+    GCRA and the sliding window counter keep O(1) state per key and must not
+    use more memory per key than the object-per-user token bucket.
+    """
+    user_ids = [f"api-key-{i:012d}" for i in range(NUM_KEYS)]
+    hot = user_ids[:HOT_KEYS]
+    requests = [hot[i % HOT_KEYS] for i in range(NUM_REQUESTS)]
+
+    results = {}
+    for name, make_limiter in ALGORITHMS.items():
+        bytes_per_key = measure_bytes_per_key(make_limiter(), user_ids)
+        ops = measure_ops_per_second(make_limiter(), requests)
+        results[name] = (bytes_per_key, ops)
+
+    print(f"\n{'Algorithm':<24}{'bytes/key':>12}{'ops/s':>14}")
+    for name, (bytes_per_key, ops) in results.items():
+        print(f"{name:<24}{bytes_per_key:>12,.1f}{ops:>14,.0f}")
+
+    token_bucket_bytes, token_bucket_ops = results["Token Bucket"]
+    for name in ("GCRA", "Sliding Window Counter"):
+        bytes_per_key, ops = results[name]
+        assert bytes_per_key < token_bucket_bytes, (
+            f"{name} uses {bytes_per_key:.0f} bytes/key vs "
+            f"{token_bucket_bytes:.0f} for the token bucket"
+        )
+    assert results["GCRA"][1] > token_bucket_ops, (
+        "GCRA should be cheaper per request than the locked token bucket"
+    )
@@ -0,0 +1,45 @@
+import asyncio
+import gc
+import time
+import tracemalloc
+
+from token_bucket import AsyncTokenBucketRateLimiter
+
+NUM_WAITERS = 10_000
+REFILL_RATE = 1.0  # every drained token is back one second later
+MAX_DRAIN_SECONDS = 3.0
+
+
+async def test_concurrent_waiters_on_one_event_loop():
+    """
+    BENCHMARK: park NUM_WAITERS acquire calls (one per drained user) on a single
+    event loop and report memory per waiter and time to serve them all.
+    """
+    limiter = AsyncTokenBucketRateLimiter(capacity=1, refill_rate=REFILL_RATE)
+    user_ids = [f"user-{i}" for i in range(NUM_WAITERS)]
+    for user_id in user_ids:
+        assert limiter.try_acquire(user_id) is True
+
+    gc.collect()
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    start = time.perf_counter()
+    tasks = [asyncio.create_task(limiter.acquire(user_id)) for user_id in user_ids]
+    await asyncio.sleep(0)
+    parked, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    waiting = limiter.get_config()["waiters"]
+
+    results = await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - start
+
+    bytes_per_waiter = (parked - before) / NUM_WAITERS
+    print(f"\nWaiters parked:   {waiting:,}")
+    print(f"Memory/waiter:    {bytes_per_waiter:,.0f} bytes (task + future + timer)")
+    print(
+        f"All served in:    {elapsed * 1000:,.1f} ms (ideal {1000 / REFILL_RATE:.0f} ms)"
+    )
+
+    assert waiting == NUM_WAITERS
+    assert all(results)
+    assert elapsed < MAX_DRAIN_SECONDS
@@ -0,0 +1,44 @@
+import time
+
+import numpy as np
+from token_bucket import CompactTokenBucketRateLimiter, TokenBucketRateLimiter
+
+BATCH_SIZE = 1_000
+NUM_BATCHES = 50
+NUM_USERS = 10_000
+
+
+def make_batches():
+    rng = np.random.default_rng(0)
+    return [
+        [f"user-{i}" for i in rng.zipf(1.3, size=BATCH_SIZE) % NUM_USERS]
+        for _ in range(NUM_BATCHES)
+    ]
+
+
+def measure(fn, batches) -> float:
+    start = time.perf_counter()
+    for batch in batches:
+        fn(batch)
+    return len(batches) * BATCH_SIZE / (time.perf_counter() - start)
+
+
+def test_batch_vs_per_request_admission():
+    """
+    BENCHMARK: admissions/sec of allow_requests_batch vs one allow_request per item.
+    """
+    batches = make_batches()
+    print(f"\n{'limiter':<32} {'per-request/s':>15} {'batch/s':>15}")
+    for limiter_cls in (TokenBucketRateLimiter, CompactTokenBucketRateLimiter):
+        looped = limiter_cls(capacity=10**9, refill_rate=1)
+        batched = limiter_cls(capacity=10**9, refill_rate=1)
+        single = measure(
+            lambda batch, limiter=looped: [
+                limiter.allow_request(user_id) for user_id in batch
+            ],
+            batches,
+        )
+        vectorized = measure(batched.allow_requests_batch, batches)
+        print(f"{limiter_cls.__name__:<32} {single:>15,.0f} {vectorized:>15,.0f}")
+
+        assert vectorized > single, f"{limiter_cls.__name__} batch path is slower"
@@ -0,0 +1,48 @@
+import gc
+import tracemalloc
+
+from token_bucket import CompactTokenBucketRateLimiter, TokenBucketRateLimiter
+
+NUM_KEYS = 100_000
+MIN_MEMORY_REDUCTION = 5.0
+
+
+def measure_bytes_per_key(limiter, user_ids) -> float:
+    """Bytes allocated per key while admitting one request for every user."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        for user_id in user_ids:
+            limiter.allow_request(user_id)
+        gc.collect()
+        after, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return (after - before) / len(user_ids)
+
+
+def test_compact_store_bytes_per_key():
+    """
+    BENCHMARK: per-key memory of the array-backed store vs object-per-user buckets.
+    Key strings are allocated up front so only the limiter's own overhead is counted.
+    """
+    user_ids = [f"api-key-{i:012d}" for i in range(NUM_KEYS)]
+
+    object_layout = measure_bytes_per_key(
+        TokenBucketRateLimiter(capacity=10, refill_rate=1), user_ids
+    )
+    compact = CompactTokenBucketRateLimiter(capacity=10, refill_rate=1)
+    compact_layout = measure_bytes_per_key(compact, user_ids)
+    reported = compact.memory_usage()["bytes_per_key"]
+
+    reduction = object_layout / compact_layout
+    print(f"\nObject-per-user: {object_layout:,.1f} bytes/key")
+    print(
+        f"Compact arrays:  {compact_layout:,.1f} bytes/key (reported {reported:,.1f})"
+    )
+    print(f"Reduction:       {reduction:.1f}x (target {MIN_MEMORY_REDUCTION}x)")
+
+    assert reduction >= MIN_MEMORY_REDUCTION, (
+        f"Compact store only {reduction:.1f}x smaller than object-per-user layout"
+    )
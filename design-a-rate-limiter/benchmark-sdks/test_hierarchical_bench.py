@@ -0,0 +1,78 @@
+import time
+
+from hierarchical import HierarchicalRateLimiter
+from token_bucket import TokenBucketGlobalLimiter, TokenBucketRateLimiter
+
+NUM_TENANTS = 50
+USERS_PER_TENANT = 20
+NUM_REQUESTS = 200_000
+MIN_SPEEDUP = 1.3
+
+
+def tenant_of(user_id: str) -> str:
+    return user_id.split("/")[0]
+
+
+class NaiveChain:
+    """Three independent limiters called one after another."""
+
+    def __init__(self):
+        self.users = TokenBucketRateLimiter(capacity=1_000, refill_rate=100)
+        self.tenants = TokenBucketRateLimiter(capacity=20_000, refill_rate=2_000)
+        self.world = TokenBucketGlobalLimiter(capacity=150_000, refill_rate=20_000)
+        self.wasted = 0
+
+    def allow_request(self, user_id: str) -> bool:
+        if not self.users.allow_request(user_id):
+            return False
+        if (
+            self.tenants.allow_request(tenant_of(user_id))
+            and self.world.allow_request()
+        ):
+            return True
+        # The user's token is already gone; the chain cannot give it back
+        self.wasted += 1
+        return False
+
+
+def run(allow, requests) -> float:
+    start = time.perf_counter()
+    for user_id in requests:
+        allow(user_id)
+    return len(requests) / (time.perf_counter() - start)
+
+
+def test_hierarchical_vs_naive_chain():
+    """
+    BENCHMARK: admissions/s of the single-lock hierarchy vs chaining three
+    token bucket limiters, plus user tokens the chain loses when an outer level rejects.
+    """
+    users = [
+        f"tenant-{t}/user-{u}"
+        for t in range(NUM_TENANTS)
+        for u in range(USERS_PER_TENANT)
+    ]
+    requests = [users[(i * 7919) % len(users)] for i in range(NUM_REQUESTS)]
+
+    naive = NaiveChain()
+    hierarchical = HierarchicalRateLimiter.user_tenant_global(
+        tenant_of,
+        user_capacity=1_000,
+        user_refill_rate=100,
+        tenant_capacity=20_000,
+        tenant_refill_rate=2_000,
+        global_capacity=150_000,
+        global_refill_rate=20_000,
+    )
+
+    naive_ops = run(naive.allow_request, requests)
+    hierarchical_ops = run(hierarchical.allow_request, requests)
+
+    print(f"\nNaive chain:  {naive_ops:,.0f} checks/s")
+    print(f"Hierarchical: {hierarchical_ops:,.0f} checks/s")
+    print(f"Speedup:      {hierarchical_ops / naive_ops:.1f}x")
+    print(f"Naive chain user tokens lost to outer rejections: {naive.wasted:,}")
+
+    assert hierarchical_ops >= naive_ops * MIN_SPEEDUP, (
+        f"Hierarchical limiter only {hierarchical_ops / naive_ops:.1f}x faster"
+    )
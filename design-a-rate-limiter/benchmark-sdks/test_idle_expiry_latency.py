@@ -0,0 +1,84 @@
+import statistics
+import threading
+import time
+
+from token_bucket import TokenBucketRateLimiter
+
+NUM_IDLE_USERS = 200_000
+NUM_ACTIVE_USERS = 100
+REQUEST_INTERVAL = 0.0002  # one admission scheduled every 200us
+MEASURE_SECONDS = 0.5
+
+
+def build_limiter() -> TokenBucketRateLimiter:
+    """A limiter holding NUM_IDLE_USERS buckets that are all due for eviction."""
+    limiter = TokenBucketRateLimiter(capacity=10**9, refill_rate=1, idle_timeout=60)
+    for i in range(NUM_IDLE_USERS):
+        limiter.allow_request(f"idle-{i}")
+    for bucket in limiter.buckets.values():
+        bucket.last_refill_time -= 120
+    limiter.expiry.heap = [
+        (deadline - 120, seq, user_id, bucket)
+        for deadline, seq, user_id, bucket in limiter.expiry.heap
+    ]
+    return limiter
+
+
+def admission_latencies(limiter, run_cleanup) -> list:
+    """
+    Issue admissions on a fixed schedule while `run_cleanup` runs in another
+    thread. Latency is measured from each request's scheduled start, so a stall
+    is charged to every request that should have run during it.
+    """
+    active = [f"active-{i}" for i in range(NUM_ACTIVE_USERS)]
+    cleaner = threading.Thread(target=run_cleanup)
+    samples = []
+    start = time.perf_counter()
+    cleaner.start()
+    i = 0
+    while True:
+        scheduled = start + i * REQUEST_INTERVAL
+        if scheduled - start > MEASURE_SECONDS:
+            break
+        while time.perf_counter() < scheduled:
+            pass
+        limiter.allow_request(active[i % NUM_ACTIVE_USERS])
+        samples.append(time.perf_counter() - scheduled)
+        i += 1
+    cleaner.join()
+    return samples
+
+
+def test_p99_admission_latency_during_cleanup():
+    """
+    BENCHMARK: p99 allow_request latency while NUM_IDLE_USERS buckets are
+    removed by a full cleanup_inactive_users scan vs the incremental reaper.
+    """
+    full_scan = build_limiter()
+    full_samples = admission_latencies(
+        full_scan, lambda: full_scan.cleanup_inactive_users(inactive_threshold=60)
+    )
+
+    incremental = build_limiter()
+
+    def reap():
+        while incremental.expire_idle_users(max_work=500):
+            time.sleep(0.0005)
+
+    incremental_samples = admission_latencies(incremental, reap)
+
+    assert full_scan.buckets.keys() == incremental.buckets.keys()
+    results = {}
+    print(f"\n{'cleanup':<14} {'p50 (us)':>10} {'p99 (us)':>10} {'max (ms)':>10}")
+    for name, samples in (
+        ("full scan", full_samples),
+        ("incremental", incremental_samples),
+    ):
+        cuts = statistics.quantiles(samples, n=100)
+        results[name] = cuts[98]
+        print(
+            f"{name:<14} {cuts[49] * 1e6:>10.1f} {cuts[98] * 1e6:>10.1f}"
+            f" {max(samples) * 1e3:>10.2f}"
+        )
+
+    assert results["incremental"] < results["full scan"] / 5
@@ -0,0 +1,102 @@
+import asyncio
+import time
+
+from base import RateLimiter
+from middleware import RateLimitMiddleware
+from token_bucket import TokenBucketRateLimiter
+
+NUM_REQUESTS = 200_000
+MAX_GLUE_OVERHEAD_US = 3.0
+
+
+class AllowAll(RateLimiter):
+    """Limiter that admits everything, isolating the middleware's own cost."""
+
+    def allow_request(self, user_id: str, tokens: int = 1) -> bool:
+        return True
+
+    def get_user_stats(self, user_id: str):
+        return {}
+
+    def get_wait_time(self, user_id: str, tokens: int = 1) -> float:
+        return 0.0
+
+    def reset_user(self, user_id: str) -> None:
+        pass
+
+    def cleanup_inactive_users(self, inactive_threshold: float = 3600) -> int:
+        return 0
+
+    def get_algorithm_name(self) -> str:
+        return "Allow All"
+
+    def get_config(self):
+        return {"algorithm": self.get_algorithm_name()}
+
+
+async def endpoint(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"{}"})
+
+
+async def receive():
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+async def send(message):
+    pass
+
+
+def make_scopes(count: int):
+    """Realistic HTTP scopes with a handful of headers and 1k API keys."""
+    return [
+        {
+            "type": "http",
+            "method": "GET",
+            "path": "/v1/events/search",
+            "headers": [
+                (b"host", b"audit.internal"),
+                (b"user-agent", b"audit-sdk/1.0"),
+                (b"accept", b"application/json"),
+                (b"x-api-key", f"key-{i % 1000}".encode()),
+            ],
+            "client": ("10.0.0.1", 50000),
+        }
+        for i in range(count)
+    ]
+
+
+async def time_app(app, scopes) -> float:
+    """Mean microseconds per request through an ASGI app."""
+    start = time.perf_counter()
+    for scope in scopes:
+        await app(scope, receive, send)
+    return (time.perf_counter() - start) / len(scopes) * 1e6
+
+
+def test_middleware_per_request_overhead():
+    """
+    BENCHMARK: microseconds the middleware adds to each admitted request, split
+    into the middleware's own glue (key extraction, dispatch) and the limiter.
+    """
+    scopes = make_scopes(NUM_REQUESTS)
+    limiter = TokenBucketRateLimiter(capacity=1_000_000, refill_rate=1_000_000)
+
+    async def run():
+        bare = await time_app(endpoint, scopes)
+        glue = await time_app(RateLimitMiddleware(endpoint, AllowAll()), scopes)
+        full = await time_app(RateLimitMiddleware(endpoint, limiter), scopes)
+        headers = await time_app(
+            RateLimitMiddleware(endpoint, limiter, headers_on_success=True), scopes
+        )
+        return bare, glue, full, headers
+
+    bare, glue, full, headers = asyncio.run(run())
+    print(f"\nBare endpoint:                {bare:6.2f} us/request")
+    print(f"Middleware glue (allow-all):  {glue - bare:+6.2f} us/request")
+    print(f"Middleware + token bucket:    {full - bare:+6.2f} us/request")
+    print(f"  ... with success headers:   {headers - bare:+6.2f} us/request")
+
+    assert glue - bare < MAX_GLUE_OVERHEAD_US, (
+        f"Middleware glue adds {glue - bare:.2f} us per request"
+    )
@@ -0,0 +1,45 @@
+import statistics
+import time
+
+from token_bucket import LocalRedis, RedisTokenBucketRateLimiter
+
+SIMULATED_RTT = 0.0002  # 200us to Redis
+NUM_USERS = 10
+NUM_REQUESTS = 10_000
+
+
+def run_workload(limiter):
+    samples = []
+    for i in range(NUM_REQUESTS):
+        start = time.perf_counter()
+        limiter.allow_request(f"user-{i % NUM_USERS}")
+        samples.append(time.perf_counter() - start)
+    cuts = statistics.quantiles(samples, n=100)
+    return limiter.get_metrics(), cuts[49] * 1000, cuts[98] * 1000
+
+
+def test_lease_mode_round_trips_and_latency():
+    """
+    BENCHMARK: round trips per admitted request and p99 admission latency for
+    the plain Redis script vs lease mode, over a simulated 200us round trip.
+    """
+    print(f"\n{'mode':<10} {'round trips/admit':>18} {'p50 (ms)':>10} {'p99 (ms)':>10}")
+    results = {}
+    for lease_size in (0, 16, 256):
+        limiter = RedisTokenBucketRateLimiter(
+            capacity=10_000,
+            refill_rate=1_000,
+            redis_client=LocalRedis(latency=SIMULATED_RTT),
+            lease_size=lease_size,
+        )
+        metrics, p50_ms, p99_ms = run_workload(limiter)
+        results[lease_size] = (metrics["round_trips_per_admitted"], p99_ms)
+        mode = f"lease={lease_size}" if lease_size else "plain"
+        print(
+            f"{mode:<10} {metrics['round_trips_per_admitted']:>18.3f}"
+            f" {p50_ms:>10.3f} {p99_ms:>10.3f}"
+        )
+
+    assert results[0][0] == 1.0
+    assert results[16][0] < 0.1, "Lease mode should need <0.1 round trips per admit"
+    assert results[256][1] < results[0][1] / 5, "Leases should cut p99 latency"
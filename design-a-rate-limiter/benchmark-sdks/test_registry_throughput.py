@@ -0,0 +1,82 @@
+import sys
+import threading
+import time
+
+from token_bucket import ShardedTokenBucketRateLimiter, TokenBucketRateLimiter
+
+THREAD_COUNTS = [1, 2, 4, 8]
+REQUESTS_PER_THREAD = 20_000
+USERS = 1_000
+# Best of several runs, so one badly scheduled run does not decide the ratio
+RUNS = 5
+
+
+def measure_admissions_per_sec(limiter, num_threads: int) -> float:
+    """Drive `limiter` from `num_threads` threads and return admission checks/sec."""
+    user_ids = [f"user-{i}" for i in range(USERS)]
+    for user_id in user_ids:
+        limiter.allow_request(user_id)
+
+    barrier = threading.Barrier(num_threads + 1)
+
+    def worker(offset: int):
+        barrier.wait()
+        for i in range(REQUESTS_PER_THREAD):
+            limiter.allow_request(user_ids[(offset + i) % USERS])
+
+    threads = [
+        threading.Thread(target=worker, args=(n * 97,)) for n in range(num_threads)
+    ]
+    for t in threads:
+        t.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+    return num_threads * REQUESTS_PER_THREAD / elapsed
+
+
+def test_registry_throughput_by_thread_count():
+    """
+    BENCHMARK: admissions/sec for the global-lock registry vs the sharded registry.
+
+    On a free-threaded interpreter the sharded registry scales with threads while
+    the global lock stays flat; under the GIL both are bounded by one core, but the
+    sharded registry must never fall behind the global-lock one.
+    """
+    gil_enabled = getattr(sys, "_is_gil_enabled", lambda: True)()
+    results = {}
+    for num_threads in THREAD_COUNTS:
+        # Interleave the runs so both registries see the same machine load
+        global_lock = sharded = 0.0
+        for _ in range(RUNS):
+            global_lock = max(
+                global_lock,
+                measure_admissions_per_sec(
+                    TokenBucketRateLimiter(capacity=10**9, refill_rate=1), num_threads
+                ),
+            )
+            sharded = max(
+                sharded,
+                measure_admissions_per_sec(
+                    ShardedTokenBucketRateLimiter(
+                        capacity=10**9, refill_rate=1, num_shards=64
+                    ),
+                    num_threads,
+                ),
+            )
+        results[num_threads] = (global_lock, sharded)
+
+    print(f"\nRegistry throughput (GIL enabled: {gil_enabled})")
+    print(f"{'threads':>8} {'global lock/s':>15} {'sharded/s':>15}")
+    for num_threads, (global_lock, sharded) in results.items():
+        print(f"{num_threads:>8} {global_lock:>15,.0f} {sharded:>15,.0f}")
+
+    for global_lock, sharded in results.values():
+        assert sharded > 0.8 * global_lock, "Sharded registry slower than global lock"
+
+    if not gil_enabled:
+        assert results[THREAD_COUNTS[-1]][1] > 1.5 * results[1][1], (
+            "Sharded registry throughput did not grow with threads"
+        )
@@ -0,0 +1,46 @@
+import statistics
+import time
+
+from token_bucket import SharedMemoryTokenBucketRateLimiter, TokenBucketRateLimiter
+
+NUM_USERS = 1_000
+NUM_REQUESTS = 20_000
+SLO_MAX_P99_US = 100.0  # no network hop: must stay in the in-process latency class
+
+
+def latency_percentiles_us(limiter):
+    user_ids = [f"user-{i}" for i in range(NUM_USERS)]
+    for user_id in user_ids:
+        limiter.allow_request(user_id)
+
+    samples = []
+    clock = time.perf_counter
+    for i in range(NUM_REQUESTS):
+        user_id = user_ids[i % NUM_USERS]
+        start = clock()
+        limiter.allow_request(user_id)
+        samples.append(clock() - start)
+
+    cuts = statistics.quantiles(samples, n=100)
+    return cuts[49] * 1e6, cuts[98] * 1e6
+
+
+def test_shared_memory_admission_latency(tmp_path):
+    """
+    BENCHMARK: allow_request latency of the host-wide shared-memory table vs the
+    per-process dict of buckets.
+    """
+    in_process = latency_percentiles_us(
+        TokenBucketRateLimiter(capacity=10**9, refill_rate=1)
+    )
+    shared = SharedMemoryTokenBucketRateLimiter(
+        capacity=10**9, refill_rate=1, num_slots=4096, path=str(tmp_path / "bench.shm")
+    )
+    host_wide = latency_percentiles_us(shared)
+    shared.close()
+
+    print(f"\n{'backend':<16} {'p50 (us)':>10} {'p99 (us)':>10}")
+    print(f"{'in-process':<16} {in_process[0]:>10.2f} {in_process[1]:>10.2f}")
+    print(f"{'shared memory':<16} {host_wide[0]:>10.2f} {host_wide[1]:>10.2f}")
+
+    assert host_wide[1] < SLO_MAX_P99_US, f"p99 {host_wide[1]:.1f}us exceeds SLO"
@@ -0,0 +1,55 @@
+import time
+
+from token_bucket import TokenBucketRateLimiter
+from token_bucket.snapshot import write_snapshot
+
+NUM_KEYS = 1_000_000
+LIVE_KEYS = 200_000
+TOUCHED_KEYS = 100_000
+MAX_RESTORE_MS = 50.0
+
+
+def test_snapshot_restore_time(tmp_path):
+    """
+    BENCHMARK: restoring a one-million-key snapshot only maps the file, so it
+    takes milliseconds; buckets are then restored lazily on first use.
+    """
+    path = str(tmp_path / "buckets.snap")
+    user_ids = [f"api-key-{i:012d}" for i in range(NUM_KEYS)]
+
+    start = time.perf_counter()
+    write_snapshot(path, ((u, 1.0) for u in user_ids), 10, 0.001, taken_at=time.time())
+    write_seconds = time.perf_counter() - start
+
+    limiter = TokenBucketRateLimiter(capacity=10, refill_rate=0.001)
+    start = time.perf_counter()
+    restored = limiter.restore_snapshot(path)
+    restore_ms = (time.perf_counter() - start) * 1e3
+    assert restored == NUM_KEYS
+
+    touched = user_ids[:: NUM_KEYS // TOUCHED_KEYS]
+    start = time.perf_counter()
+    for user_id in touched:
+        limiter.allow_request(user_id)
+    first_touch_us = (time.perf_counter() - start) / len(touched) * 1e6
+
+    start = time.perf_counter()
+    for user_id in touched:
+        limiter.allow_request(user_id)
+    warm_us = (time.perf_counter() - start) / len(touched) * 1e6
+    assert not limiter.allow_request(touched[0])
+
+    live = TokenBucketRateLimiter(capacity=10, refill_rate=0.001)
+    for user_id in user_ids[:LIVE_KEYS]:
+        live.allow_request(user_id, 5)
+    start = time.perf_counter()
+    live.save_snapshot(str(tmp_path / "live.snap"))
+    save_seconds = time.perf_counter() - start
+
+    print(f"\nwrite_snapshot ({NUM_KEYS:,} keys):   {write_seconds:8.2f} s")
+    print(f"restore_snapshot ({NUM_KEYS:,} keys): {restore_ms:8.2f} ms")
+    print(f"first request per restored key:    {first_touch_us:8.2f} us")
+    print(f"later requests:                    {warm_us:8.2f} us")
+    print(f"save_snapshot ({LIVE_KEYS:,} live buckets): {save_seconds:8.2f} s")
+
+    assert restore_ms < MAX_RESTORE_MS, f"Restore took {restore_ms:.1f} ms"
@@ -0,0 +1,65 @@
+from gcra import GCRARateLimiter
+from simulator import generate_workload, run_simulation
+from sliding_window_counter import SlidingWindowCounterRateLimiter
+from token_bucket import (
+    CompactTokenBucketRateLimiter,
+    ShardedTokenBucketRateLimiter,
+    TokenBucketRateLimiter,
+)
+
+CAPACITY = 20
+REFILL_RATE = 5.0
+NUM_REQUESTS = 50_000
+
+LIMITERS = {
+    "token-bucket": lambda clock: TokenBucketRateLimiter(
+        CAPACITY, REFILL_RATE, clock=clock
+    ),
+    "sharded": lambda clock: ShardedTokenBucketRateLimiter(
+        CAPACITY, REFILL_RATE, clock=clock
+    ),
+    "compact": lambda clock: CompactTokenBucketRateLimiter(
+        CAPACITY, REFILL_RATE, clock=clock
+    ),
+    "gcra": lambda clock: GCRARateLimiter(CAPACITY, REFILL_RATE, clock=clock),
+    "sliding-window": lambda clock: SlidingWindowCounterRateLimiter(
+        CAPACITY, CAPACITY / REFILL_RATE, clock=clock
+    ),
+}
+
+WORKLOADS = {
+    "zipf": dict(num_users=10_000, duration=600),
+    "bursty": dict(
+        num_users=10_000, duration=600, burst_probability=0.02, burst_size=50
+    ),
+    "churn": dict(num_users=10_000, duration=600, churn_per_second=200),
+}
+
+
+def test_workload_simulator_report():
+    """
+    BENCHMARK: ten simulated minutes of Zipf, bursty and churning traffic per
+    limiter, replayed on a virtual clock. Exact token bucket variants must
+    agree with the reference on every decision.
+    """
+    header = (
+        f"{'workload':<10}{'limiter':<16}{'ops/s':>12}{'p50 us':>9}{'p99 us':>9}"
+        f"{'B/key':>9}{'agree':>8}{'over':>8}"
+    )
+    print(f"\n{header}")
+    for workload_name, params in WORKLOADS.items():
+        workload = generate_workload(NUM_REQUESTS, seed=42, **params)
+        for limiter_name, make_limiter in LIMITERS.items():
+            report = run_simulation(make_limiter, workload, CAPACITY, REFILL_RATE)
+            print(
+                f"{workload_name:<10}{limiter_name:<16}"
+                f"{report['throughput_ops']:>12,.0f}"
+                f"{report['p50_us']:>9.2f}{report['p99_us']:>9.2f}"
+                f"{report['bytes_per_key']:>9.0f}"
+                f"{report['agreement']:>8.2%}{report['over_admission']:>8.2%}"
+            )
+            if limiter_name != "sliding-window":
+                assert report["agreement"] > 0.999, (
+                    f"{limiter_name} diverged from the exact token bucket on "
+                    f"{workload_name}: {report['agreement']:.4%}"
+                )
@@ -0,0 +1,97 @@
+"""
+Clock sources for rate limiting algorithms.
+
+A clock is any zero-argument callable returning the current time in seconds
+as a float. Limiters only ever subtract two readings of the same clock, so
+any epoch works:
+
+- ``time.time`` (the default) reads the wall clock
+- ``time.monotonic`` is immune to NTP steps and manual clock changes
+- CachedClock serves a timestamp refreshed by a background ticker, trading
+  resolution for a plain attribute read on the hot path
+- VirtualClock only moves when told to, for deterministic tests and
+  time-compressed simulations
+"""
+
+import threading
+import time
+from typing import Callable
+
+Clock = Callable[[], float]
+
+
+class CachedClock:
+    """
+    Clock that returns a timestamp refreshed every `resolution` seconds by a
+    daemon thread.
+
+    Readings are at most `resolution` seconds stale, so use a resolution well
+    below the smallest refill interval the limiter must honor.
+
+    Args:
+        resolution: Seconds between refreshes
+        source: Underlying clock to sample (defaults to time.monotonic)
+    """
+
+    def __init__(self, resolution: float = 0.001, source: Clock = time.monotonic):
+        self.resolution = resolution
+        self.source = source
+        self.now = source()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._tick, name="cached-clock", daemon=True
+        )
+        self._thread.start()
+
+    def _tick(self) -> None:
+        while not self._stop.wait(self.resolution):
+            self.now = self.source()
+
+    def __call__(self) -> float:
+        return self.now
+
+    def stop(self, timeout: float = 1.0) -> None:
+        """Stop the ticker thread; readings freeze at the last sample."""
+        self._stop.set()
+        self._thread.join(timeout)
+
+
+class VirtualClock:
+    """
+    Manually driven clock for deterministic tests and simulations.
+
+    Args:
+        start: Initial reading in seconds
+    """
+
+    def __init__(self, start: float = 0.0):
+        self.now = start
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> float:
+        """
+        Move the clock forward.
+
+        Args:
+            seconds: Non-negative amount of time to advance
+
+        Returns:
+            The new reading
+        """
+        if seconds < 0:
+            raise ValueError("VirtualClock cannot move backwards")
+        self.now += seconds
+        return self.now
+
+    def set(self, now: float) -> None:
+        """
+        Jump the clock to an absolute reading no earlier than the current one.
+
+        Args:
+            now: New reading in seconds
+        """
+        if now < self.now:
+            raise ValueError("VirtualClock cannot move backwards")
+        self.now = now
@@ -0,0 +1,75 @@
+"""
+Generic FastAPI server for any RateLimiter.
+
+Every route under ``/api`` is protected by RateLimitMiddleware, so the same
+server works with every algorithm:
+
+    from common_server import run_server
+    run_server(TokenBucketRateLimiter(capacity=10, refill_rate=5))
+
+Clients identify themselves with the ``X-API-Key`` header (or are keyed by
+IP address) and receive 429 responses with Retry-After when limited.
+"""
+
+from typing import Optional
+
+from fastapi import FastAPI
+
+from base import RateLimiter
+from middleware import RateLimitMiddleware
+
+EXEMPT_PATHS = ("/health", "/config", "/stats")
+
+
+def create_app(limiter: RateLimiter, headers_on_success: bool = True) -> FastAPI:
+    """
+    Build a FastAPI app whose /api routes are rate limited by `limiter`.
+
+    Args:
+        limiter: Rate limiter deciding each request
+        headers_on_success: Add RateLimit-* headers to admitted responses
+
+    Returns:
+        The FastAPI application
+    """
+    app = FastAPI(title=f"Rate Limiter Demo - {limiter.get_algorithm_name()}")
+    app.add_middleware(
+        RateLimitMiddleware,
+        limiter=limiter,
+        exempt_paths=EXEMPT_PATHS,
+        headers_on_success=headers_on_success,
+    )
+
+    @app.get("/api/request")
+    async def handle_request():
+        return {"status": "allowed"}
+
+    @app.get("/health")
+    async def health():
+        return {"status": "ok"}
+
+    @app.get("/config")
+    async def config():
+        return limiter.get_config()
+
+    @app.get("/stats")
+    async def stats(user_id: str):
+        return limiter.get_user_stats(user_id)
+
+    return app
+
+
+def run_server(
+    limiter: RateLimiter, host: str = "127.0.0.1", port: Optional[int] = 8000
+) -> None:
+    """
+    Serve create_app(limiter) with uvicorn.
+
+    Args:
+        limiter: Rate limiter deciding each request
+        host: Interface to bind
+        port: Port to listen on
+    """
+    import uvicorn
+
+    uvicorn.run(create_app(limiter), host=host, port=port)
@@ -0,0 +1,40 @@
+"""
+Shared pytest setup for the rate limiter designs.
+
+Algorithm packages live in hyphenated directories (``token-bucket/``), which
+cannot be imported by name. Each one is registered under an importable alias
+(``token-bucket`` -> ``token_bucket``) so tests can simply write
+``from token_bucket import TokenBucketRateLimiter``.
+"""
+
+import importlib.util
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+
+def _register_algorithm_packages() -> None:
+    """Import every ``<algorithm>/__init__.py`` under an underscore alias."""
+    for entry in sorted(os.listdir(ROOT)):
+        package_dir = os.path.join(ROOT, entry)
+        init_file = os.path.join(package_dir, "__init__.py")
+        if not os.path.isfile(init_file) or entry.startswith("__"):
+            continue
+
+        alias = entry.replace("-", "_")
+        if alias in sys.modules:
+            continue
+
+        spec = importlib.util.spec_from_file_location(
+            alias, init_file, submodule_search_locations=[package_dir]
+        )
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[alias] = module
+        spec.loader.exec_module(module)
+
+
+_register_algorithm_packages()
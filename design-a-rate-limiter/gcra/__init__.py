@@ -0,0 +1,5 @@
+"""Generic Cell Rate Algorithm (GCRA) Rate Limiter Package"""
+
+from .limiter import GCRAGlobalLimiter, GCRARateLimiter
+
+__all__ = ["GCRARateLimiter", "GCRAGlobalLimiter"]
@@ -0,0 +1,231 @@
+"""
+Generic Cell Rate Algorithm (GCRA) Rate Limiter Implementation.
+
+GCRA is a token bucket expressed as a single timestamp. Instead of storing a
+token count and a refill time, it stores the *theoretical arrival time* (TAT):
+the time at which the key's bucket would be full again.
+
+- Each token is worth one emission interval ``T = 1 / refill_rate`` seconds
+- A request for ``n`` tokens pushes the TAT forward by ``n * T``
+- The request is allowed if the new TAT is at most ``capacity * T`` seconds in
+  the future (the burst tolerance); otherwise it is denied and nothing changes
+- A key whose TAT is in the past is indistinguishable from a brand-new key
+
+Admission decisions are identical to the token bucket with the same capacity
+and refill rate, but the per-key state is one float and there is no per-key
+lock: one limiter-wide lock guards a few arithmetic operations.
+"""
+
+import time
+import threading
+from typing import Dict, Optional
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from base import RateLimiter, GlobalRateLimiter
+from clock import Clock
+
+# Absorbs float rounding when many emission intervals are added to a TAT, so a
+# burst of exactly `capacity` requests is never rejected on its last token
+ROUNDING_SLACK = 1e-9
+
+
+class GCRARateLimiter(RateLimiter):
+    """
+    GCRA rate limiter for multiple users implementing the RateLimiter interface.
+
+    Args:
+        capacity: Maximum burst size in tokens per user
+        refill_rate: Number of tokens regained per second per user
+        clock: Time source in seconds (defaults to time.time)
+    """
+
+    def __init__(
+        self, capacity: int, refill_rate: float, clock: Optional[Clock] = None
+    ):
+        self.capacity = capacity
+        self.refill_rate = refill_rate
+        self.clock = clock if clock is not None else time.time
+        self.emission_interval = 1.0 / refill_rate
+        self.burst_tolerance = capacity * self.emission_interval + ROUNDING_SLACK
+        self.tats: Dict[str, float] = {}
+        self.lock = threading.Lock()
+
+    def allow_request(self, user_id: str, tokens: int = 1) -> bool:
+        """
+        Check if a request from a user should be allowed.
+
+        Args:
+            user_id: Unique identifier for the user
+            tokens: Number of tokens to consume
+
+        Returns:
+            True if request is allowed, False otherwise
+        """
+        with self.lock:
+            now = self.clock()
+            tat = self.tats.get(user_id, now)
+            new_tat = (tat if tat > now else now) + tokens * self.emission_interval
+            if new_tat - now > self.burst_tolerance:
+                return False
+            self.tats[user_id] = new_tat
+            return True
+
+    def _backlog(self, user_id: str) -> float:
+        """Seconds the user's TAT is ahead of now (0 for a full bucket)."""
+        with self.lock:
+            tat = self.tats.get(user_id)
+        if tat is None:
+            return 0.0
+        return max(0.0, tat - self.clock())
+
+    def get_user_stats(self, user_id: str) -> Dict[str, any]:
+        """
+        Get current rate limiting statistics for a user.
+
+        Args:
+            user_id: Unique identifier for the user
+
+        Returns:
+            Dictionary containing tokens available and wait time
+        """
+        backlog = self._backlog(user_id)
+        return {
+            "tokens_available": self.capacity - backlog * self.refill_rate,
+            "capacity": self.capacity,
+            "refill_rate": self.refill_rate,
+            "theoretical_arrival_time": self.tats.get(user_id),
+            "wait_time_for_1_token": self._wait_time(backlog, 1),
+        }
+
+    def _wait_time(self, backlog: float, tokens: int) -> float:
+        return max(
+            0.0, backlog + tokens * self.emission_interval - self.burst_tolerance
+        )
+
+    def get_wait_time(self, user_id: str, tokens: int = 1) -> float:
+        """
+        Get the time until tokens will be available for a user.
+
+        Args:
+            user_id: Unique identifier for the user
+            tokens: Number of tokens needed
+
+        Returns:
+            Time in seconds until tokens available
+        """
+        return self._wait_time(self._backlog(user_id), tokens)
+
+    def reset_user(self, user_id: str) -> None:
+        """
+        Reset rate limiting state for a specific user.
+
+        Args:
+            user_id: Unique identifier for the user
+        """
+        with self.lock:
+            self.tats.pop(user_id, None)
+
+    def cleanup_inactive_users(self, inactive_threshold: float = 3600) -> int:
+        """
+        Remove users whose TAT is more than `inactive_threshold` in the past.
+
+        Args:
+            inactive_threshold: Time in seconds after which a user is considered inactive
+
+        Returns:
+            Number of users removed
+        """
+        with self.lock:
+            cutoff = self.clock() - inactive_threshold
+            users_to_remove = [
+                user_id for user_id, tat in self.tats.items() if tat < cutoff
+            ]
+            for user_id in users_to_remove:
+                del self.tats[user_id]
+            return len(users_to_remove)
+
+    def get_algorithm_name(self) -> str:
+        """Get the name of the rate limiting algorithm."""
+        return "GCRA"
+
+    def get_config(self) -> Dict[str, any]:
+        """Get the configuration parameters of the rate limiter."""
+        return {
+            "algorithm": self.get_algorithm_name(),
+            "capacity": self.capacity,
+            "refill_rate": self.refill_rate,
+            "emission_interval": self.emission_interval,
+            "active_users": len(self.tats),
+        }
+
+
+class GCRAGlobalLimiter(GlobalRateLimiter):
+    """
+    Global GCRA rate limiter implementing the GlobalRateLimiter interface.
+
+    Args:
+        capacity: Maximum burst size in tokens
+        refill_rate: Number of tokens regained per second
+        clock: Time source in seconds (defaults to time.time)
+    """
+
+    def __init__(
+        self, capacity: int, refill_rate: float, clock: Optional[Clock] = None
+    ):
+        self.capacity = capacity
+        self.refill_rate = refill_rate
+        self.clock = clock if clock is not None else time.time
+        self.emission_interval = 1.0 / refill_rate
+        self.burst_tolerance = capacity * self.emission_interval + ROUNDING_SLACK
+        self.tat = 0.0
+        self.lock = threading.Lock()
+
+    def allow_request(self, tokens: int = 1) -> bool:
+        """
+        Check if a request should be allowed globally.
+
+        Args:
+            tokens: Number of tokens to consume
+
+        Returns:
+            True if request is allowed, False otherwise
+        """
+        with self.lock:
+            now = self.clock()
+            new_tat = max(self.tat, now) + tokens * self.emission_interval
+            if new_tat - now > self.burst_tolerance:
+                return False
+            self.tat = new_tat
+            return True
+
+    def get_stats(self) -> Dict[str, any]:
+        """
+        Get global rate limiting statistics.
+
+        Returns:
+            Dictionary containing global statistics
+        """
+        backlog = max(0.0, self.tat - self.clock())
+        return {
+            "tokens_available": self.capacity - backlog * self.refill_rate,
+            "capacity": self.capacity,
+            "refill_rate": self.refill_rate,
+        }
+
+    def get_wait_time(self, tokens: int = 1) -> float:
+        """
+        Get time until request would be allowed.
+
+        Args:
+            tokens: Number of tokens needed
+
+        Returns:
+            Time in seconds until allowed
+        """
+        backlog = max(0.0, self.tat - self.clock())
+        return max(
+            0.0, backlog + tokens * self.emission_interval - self.burst_tolerance
+        )
@@ -0,0 +1,5 @@
+"""Hierarchical (user -> tenant -> global) Rate Limiter Package"""
+
+from .limiter import HierarchicalRateLimiter, LimitLevel
+
+__all__ = ["HierarchicalRateLimiter", "LimitLevel"]
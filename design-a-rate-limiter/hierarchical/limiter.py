@@ -0,0 +1,281 @@
+"""
+Hierarchical Rate Limiter Implementation.
+
+Enforces several token bucket limits at once, e.g. per user, per tenant and
+global, as one atomic operation:
+
+- Each level maps the user id to a bucket key (the user id itself, the user's
+  tenant, or one shared key for a global level)
+- A request is checked against every level first and only consumes tokens if
+  all levels can afford it, so a request rejected by the global level never
+  drains the user's or tenant's bucket
+- One lock covers the whole check-and-consume, instead of one lock per
+  limiter when chaining separate limiters
+
+Buckets are plain ``[tokens, last_refill_time]`` lists refilled lazily, so no
+per-bucket lock or object is needed.
+"""
+
+import time
+import threading
+from typing import Callable, Dict, List, Optional, Sequence
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from base import RateLimiter
+from clock import Clock
+
+# Positions inside a bucket list [tokens, last_refill_time]
+TOKENS, LAST_REFILL = 0, 1
+
+GLOBAL_KEY = "*"
+
+
+class LimitLevel:
+    """
+    One level of a rate limiting hierarchy.
+
+    Args:
+        name: Level name used in stats (e.g. "user", "tenant", "global")
+        capacity: Maximum number of tokens per bucket at this level
+        refill_rate: Number of tokens added per second per bucket
+        key_func: Maps a user id to this level's bucket key; None means a
+            single bucket shared by every user (a global level)
+    """
+
+    __slots__ = ("name", "capacity", "refill_rate", "key_func", "buckets")
+
+    def __init__(
+        self,
+        name: str,
+        capacity: int,
+        refill_rate: float,
+        key_func: Optional[Callable[[str], str]] = None,
+    ):
+        self.name = name
+        self.capacity = capacity
+        self.refill_rate = refill_rate
+        self.key_func = key_func
+        self.buckets: Dict[str, List[float]] = {}
+
+    def key_for(self, user_id: str) -> str:
+        """Bucket key at this level for a user."""
+        return GLOBAL_KEY if self.key_func is None else self.key_func(user_id)
+
+    def refilled(self, key: str, now: float) -> List[float]:
+        """Return the bucket for `key`, refilled up to `now` (caller holds the lock)."""
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            bucket = self.buckets[key] = [self.capacity, now]
+            return bucket
+        tokens = bucket[TOKENS] + (now - bucket[LAST_REFILL]) * self.refill_rate
+        bucket[TOKENS] = tokens if tokens < self.capacity else self.capacity
+        bucket[LAST_REFILL] = now
+        return bucket
+
+
+class HierarchicalRateLimiter(RateLimiter):
+    """
+    Composite token bucket limiter enforcing every level of a hierarchy in one
+    atomic check-and-consume.
+
+    Args:
+        levels: Levels ordered from most specific (per user) to least
+            specific (global)
+        clock: Time source in seconds (defaults to time.time)
+    """
+
+    def __init__(self, levels: Sequence[LimitLevel], clock: Optional[Clock] = None):
+        if not levels:
+            raise ValueError("At least one level is required")
+        names = [level.name for level in levels]
+        if len(set(names)) != len(names):
+            raise ValueError(f"Level names must be unique, got {names}")
+        self.levels = list(levels)
+        self.clock = clock if clock is not None else time.time
+        self.lock = threading.Lock()
+
+    @classmethod
+    def user_tenant_global(
+        cls,
+        tenant_of: Callable[[str], str],
+        user_capacity: int,
+        user_refill_rate: float,
+        tenant_capacity: int,
+        tenant_refill_rate: float,
+        global_capacity: int,
+        global_refill_rate: float,
+        clock: Optional[Clock] = None,
+    ) -> "HierarchicalRateLimiter":
+        """
+        Build the common user -> tenant -> global hierarchy.
+
+        Args:
+            tenant_of: Maps a user id to its tenant id
+            user_capacity: Bucket capacity per user
+            user_refill_rate: Refill rate per user
+            tenant_capacity: Bucket capacity per tenant
+            tenant_refill_rate: Refill rate per tenant
+            global_capacity: Capacity of the shared global bucket
+            global_refill_rate: Refill rate of the shared global bucket
+            clock: Time source in seconds (defaults to time.time)
+
+        Returns:
+            A HierarchicalRateLimiter with "user", "tenant" and "global" levels
+        """
+        return cls(
+            [
+                LimitLevel("user", user_capacity, user_refill_rate, lambda u: u),
+                LimitLevel("tenant", tenant_capacity, tenant_refill_rate, tenant_of),
+                LimitLevel("global", global_capacity, global_refill_rate),
+            ],
+            clock=clock,
+        )
+
+    def allow_request(self, user_id: str, tokens: int = 1) -> bool:
+        """
+        Check a request against every level and consume from all of them only
+        if all of them allow it.
+
+        Args:
+            user_id: Unique identifier for the user
+            tokens: Number of tokens to consume at each level
+
+        Returns:
+            True if every level allowed the request, False otherwise
+        """
+        with self.lock:
+            now = self.clock()
+            buckets = []
+            # Phase 1: refill and check every level; bail out before consuming
+            for level in self.levels:
+                key_func = level.key_func
+                key = GLOBAL_KEY if key_func is None else key_func(user_id)
+                bucket = level.buckets.get(key)
+                if bucket is None:
+                    bucket = level.buckets[key] = [level.capacity, now]
+                else:
+                    available = (
+                        bucket[TOKENS] + (now - bucket[LAST_REFILL]) * level.refill_rate
+                    )
+                    if available > level.capacity:
+                        available = level.capacity
+                    bucket[TOKENS] = available
+                    bucket[LAST_REFILL] = now
+                if bucket[TOKENS] < tokens:
+                    return False
+                buckets.append(bucket)
+            # Phase 2: every level can afford the request, consume from all
+            for bucket in buckets:
+                bucket[TOKENS] -= tokens
+            return True
+
+    def get_user_stats(self, user_id: str) -> Dict[str, any]:
+        """
+        Get current rate limiting statistics for a user at every level.
+
+        Args:
+            user_id: Unique identifier for the user
+
+        Returns:
+            Dictionary with the tightest level's available tokens, the level
+            that currently limits the user, and per-level details
+        """
+        with self.lock:
+            now = self.clock()
+            levels = {}
+            for level in self.levels:
+                key = level.key_for(user_id)
+                bucket = level.refilled(key, now)
+                levels[level.name] = {
+                    "key": key,
+                    "tokens_available": bucket[TOKENS],
+                    "capacity": level.capacity,
+                    "refill_rate": level.refill_rate,
+                }
+        limiting = min(levels, key=lambda name: levels[name]["tokens_available"])
+        return {
+            "tokens_available": levels[limiting]["tokens_available"],
+            "limiting_level": limiting,
+            "levels": levels,
+            "wait_time_for_1_token": self.get_wait_time(user_id, 1),
+        }
+
+    def get_wait_time(self, user_id: str, tokens: int = 1) -> float:
+        """
+        Get the time until every level has `tokens` available for a user.
+
+        Args:
+            user_id: Unique identifier for the user
+            tokens: Number of tokens needed
+
+        Returns:
+            Time in seconds until tokens available at all levels
+        """
+        wait = 0.0
+        with self.lock:
+            now = self.clock()
+            for level in self.levels:
+                bucket = level.refilled(level.key_for(user_id), now)
+                if bucket[TOKENS] < tokens:
+                    deficit = tokens - bucket[TOKENS]
+                    wait = max(wait, deficit / level.refill_rate)
+        return wait
+
+    def reset_user(self, user_id: str) -> None:
+        """
+        Reset the user's own bucket at the most specific level.
+
+        Shared tenant and global buckets are left untouched.
+
+        Args:
+            user_id: Unique identifier for the user
+        """
+        level = self.levels[0]
+        with self.lock:
+            level.buckets.pop(level.key_for(user_id), None)
+
+    def cleanup_inactive_users(self, inactive_threshold: float = 3600) -> int:
+        """
+        Remove buckets at every level that have not been touched recently.
+
+        Args:
+            inactive_threshold: Time in seconds after which a bucket is considered inactive
+
+        Returns:
+            Number of buckets removed across all levels
+        """
+        removed = 0
+        with self.lock:
+            cutoff = self.clock() - inactive_threshold
+            for level in self.levels:
+                stale = [
+                    key
+                    for key, bucket in level.buckets.items()
+                    if bucket[LAST_REFILL] < cutoff
+                ]
+                for key in stale:
+                    del level.buckets[key]
+                removed += len(stale)
+        return removed
+
+    def get_algorithm_name(self) -> str:
+        """Get the name of the rate limiting algorithm."""
+        return "Hierarchical Token Bucket"
+
+    def get_config(self) -> Dict[str, any]:
+        """Get the configuration parameters of the rate limiter."""
+        return {
+            "algorithm": self.get_algorithm_name(),
+            "levels": [
+                {
+                    "name": level.name,
+                    "capacity": level.capacity,
+                    "refill_rate": level.refill_rate,
+                    "active_keys": len(level.buckets),
+                }
+                for level in self.levels
+            ],
+        }
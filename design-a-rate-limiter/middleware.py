@@ -0,0 +1,134 @@
+"""
+Pure-ASGI rate limiting middleware.
+
+Wraps any ASGI application (FastAPI, Starlette, ...) and admits each HTTP
+request through a RateLimiter before the application sees it:
+
+    app.add_middleware(RateLimitMiddleware, limiter=TokenBucketRateLimiter(10, 5))
+
+The admitted path allocates no per-request dicts, closures or header lists:
+the key is read straight from the raw ASGI header list, and the request is
+handed to the wrapped app with the original receive/send callables.
+Rejected requests get a 429 with ``Retry-After`` and ``RateLimit-Limit`` /
+``RateLimit-Remaining`` / ``RateLimit-Reset`` headers derived from
+``get_wait_time``. ``RateLimit-*`` headers on successful responses need a
+wrapped ``send`` and a ``get_user_stats`` call, so they are opt-in.
+
+allow_request is called inline on the event loop, so the limiter must not
+block; the in-process limiters qualify, the Redis limiter only with leasing.
+"""
+
+import math
+from typing import Awaitable, Callable, List, Optional, Sequence, Tuple
+
+from base import RateLimiter
+
+Scope = dict
+Receive = Callable[[], Awaitable[dict]]
+Send = Callable[[dict], Awaitable[None]]
+ASGIApp = Callable[[Scope, Receive, Send], Awaitable[None]]
+
+ANONYMOUS_KEY = "anonymous"
+REJECTION_BODY = b'{"detail":"Too Many Requests"}'
+
+
+class RateLimitMiddleware:
+    """
+    ASGI middleware enforcing a RateLimiter per client key.
+
+    Args:
+        app: The ASGI application to protect
+        limiter: Rate limiter deciding each request
+        key_header: Request header carrying the client key; requests without
+            it are keyed by client IP address
+        key_func: Custom key extractor taking the ASGI scope; overrides
+            key_header
+        tokens: Tokens consumed per request
+        exempt_paths: Paths that bypass rate limiting (e.g. health checks)
+        limit: Value of the RateLimit-Limit header (defaults to the limiter's
+            configured capacity or limit)
+        headers_on_success: Also add RateLimit-* headers to admitted responses
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        limiter: RateLimiter,
+        key_header: str = "x-api-key",
+        key_func: Optional[Callable[[Scope], str]] = None,
+        tokens: int = 1,
+        exempt_paths: Sequence[str] = (),
+        limit: Optional[int] = None,
+        headers_on_success: bool = False,
+    ):
+        self.app = app
+        self.limiter = limiter
+        self.key_header = key_header.lower().encode("latin-1")
+        self.key_func = key_func
+        self.tokens = tokens
+        self.exempt_paths = frozenset(exempt_paths)
+        self.headers_on_success = headers_on_success
+        if limit is None:
+            config = limiter.get_config()
+            limit = config.get("capacity", config.get("limit"))
+        self.limit = limit
+        self._limit_headers: List[Tuple[bytes, bytes]] = (
+            [] if limit is None else [(b"ratelimit-limit", str(limit).encode())]
+        )
+
+    def _key(self, scope: Scope) -> str:
+        """Client key from the key header, falling back to the client address."""
+        key_header = self.key_header
+        for name, value in scope["headers"]:
+            if name == key_header:
+                return value.decode("latin-1")
+        client = scope.get("client")
+        return client[0] if client else ANONYMOUS_KEY
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in self.exempt_paths:
+            await self.app(scope, receive, send)
+            return
+
+        key = self.key_func(scope) if self.key_func is not None else self._key(scope)
+        if not self.limiter.allow_request(key, self.tokens):
+            await self._reject(key, send)
+        elif self.headers_on_success:
+            await self.app(scope, receive, self._with_headers(key, send))
+        else:
+            await self.app(scope, receive, send)
+
+    def _with_headers(self, key: str, send: Send) -> Send:
+        """Wrap `send` to append RateLimit-* headers to the response start."""
+
+        async def send_with_headers(message: dict) -> None:
+            if message["type"] == "http.response.start":
+                stats = self.limiter.get_user_stats(key)
+                remaining = max(0, math.floor(stats.get("tokens_available", 0)))
+                wait = self.limiter.get_wait_time(key, self.tokens)
+                message["headers"] = [
+                    *message.get("headers", ()),
+                    *self._limit_headers,
+                    (b"ratelimit-remaining", str(remaining).encode()),
+                    (b"ratelimit-reset", str(math.ceil(wait)).encode()),
+                ]
+            await send(message)
+
+        return send_with_headers
+
+    async def _reject(self, key: str, send: Send) -> None:
+        """Send a 429 response with Retry-After and RateLimit-* headers."""
+        wait = self.limiter.get_wait_time(key, self.tokens)
+        headers = [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(REJECTION_BODY)).encode()),
+            *self._limit_headers,
+            (b"ratelimit-remaining", b"0"),
+        ]
+        if math.isfinite(wait):
+            # Round up so a client retrying on time is never rejected again
+            seconds = str(max(1, math.ceil(wait))).encode()
+            headers.append((b"ratelimit-reset", seconds))
+            headers.append((b"retry-after", seconds))
+        await send({"type": "http.response.start", "status": 429, "headers": headers})
+        await send({"type": "http.response.body", "body": REJECTION_BODY})
@@ -0,0 +1,212 @@
+"""
+Workload simulator for rate limiting algorithms.
+
+Generates synthetic request streams and replays them through any RateLimiter
+on a VirtualClock, so hours of traffic run in seconds and every run is
+deterministic:
+
+- Users are drawn from a Zipf distribution (a few hot keys, a long tail)
+- Optional bursts repeat a request several times at the same instant
+- Optional key churn retires keys over time and replaces them with new ones
+
+run_simulation reports throughput, p50/p99 allow_request latency, limiter
+memory per key, and limit accuracy measured against an exact token bucket
+replay of the same stream.
+"""
+
+import gc
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+
+import numpy as np
+
+from base import RateLimiter
+from clock import Clock, VirtualClock
+
+
+class Workload:
+    """
+    A generated request stream.
+
+    Args:
+        timestamps: Non-decreasing request times in seconds from 0
+        user_ids: User identifier of each request
+        duration: Length of the simulated period in seconds
+    """
+
+    __slots__ = ("timestamps", "user_ids", "duration")
+
+    def __init__(self, timestamps: List[float], user_ids: List[str], duration: float):
+        self.timestamps = timestamps
+        self.user_ids = user_ids
+        self.duration = duration
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def distinct_users(self) -> int:
+        """Number of distinct keys in the stream."""
+        return len(set(self.user_ids))
+
+
+def generate_workload(
+    num_requests: int,
+    num_users: int,
+    duration: float,
+    zipf_exponent: float = 1.1,
+    burst_probability: float = 0.0,
+    burst_size: int = 10,
+    churn_per_second: float = 0.0,
+    seed: int = 0,
+) -> Workload:
+    """
+    Build a synthetic request stream.
+
+    Args:
+        num_requests: Number of base arrivals (bursts add more)
+        num_users: Size of the active key space at any instant
+        duration: Simulated period in seconds; arrivals are uniform over it
+        zipf_exponent: Skew of user popularity (0 = uniform)
+        burst_probability: Chance that an arrival is repeated as a burst
+        burst_size: Requests per burst, including the original arrival
+        churn_per_second: Keys retired and replaced per second; the popularity
+            ranks slide onto fresh keys as time passes
+        seed: Random seed
+
+    Returns:
+        The generated Workload
+    """
+    rng = np.random.default_rng(seed)
+    timestamps = np.sort(rng.uniform(0.0, duration, num_requests))
+
+    weights = 1.0 / np.arange(1, num_users + 1) ** zipf_exponent
+    ranks = rng.choice(num_users, size=num_requests, p=weights / weights.sum())
+    keys = ranks + np.floor(timestamps * churn_per_second).astype(np.int64)
+
+    if burst_probability > 0:
+        repeats = np.where(rng.random(num_requests) < burst_probability, burst_size, 1)
+        timestamps = np.repeat(timestamps, repeats)
+        keys = np.repeat(keys, repeats)
+
+    # One string object per key, shared by all of its requests
+    names: Dict[int, str] = {}
+    user_ids = [
+        names.get(key) or names.setdefault(key, f"user-{key}") for key in keys.tolist()
+    ]
+    return Workload(timestamps.tolist(), user_ids, duration)
+
+
+def reference_decisions(
+    workload: Workload, capacity: float, refill_rate: float
+) -> List[bool]:
+    """
+    Exact token bucket decisions for a workload, used as the accuracy baseline.
+
+    Args:
+        workload: Request stream to replay
+        capacity: Bucket capacity per user
+        refill_rate: Tokens added per second per user
+
+    Returns:
+        Whether each request would be admitted by an exact token bucket
+    """
+    buckets: Dict[str, List[float]] = {}
+    decisions = []
+    for now, user_id in zip(workload.timestamps, workload.user_ids):
+        bucket = buckets.get(user_id)
+        if bucket is None:
+            bucket = buckets[user_id] = [capacity, now]
+        tokens = min(capacity, bucket[0] + (now - bucket[1]) * refill_rate)
+        bucket[1] = now
+        allowed = tokens >= 1
+        bucket[0] = tokens - 1 if allowed else tokens
+        decisions.append(allowed)
+    return decisions
+
+
+def _replay(limiter: RateLimiter, clock: VirtualClock, workload: Workload) -> None:
+    allow = limiter.allow_request
+    for now, user_id in zip(workload.timestamps, workload.user_ids):
+        clock.now = now
+        allow(user_id)
+
+
+def run_simulation(
+    make_limiter: Callable[[Clock], RateLimiter],
+    workload: Workload,
+    capacity: float,
+    refill_rate: float,
+    measure_memory: bool = True,
+) -> Dict[str, any]:
+    """
+    Replay a workload through a limiter and report performance and accuracy.
+
+    Each measurement uses a fresh limiter built by `make_limiter` around its
+    own VirtualClock: one untimed pass for throughput, one pass timing every
+    allow_request call, and one pass under tracemalloc for memory.
+
+    Args:
+        make_limiter: Builds the limiter under test from a clock
+        workload: Request stream to replay
+        capacity: Burst size the limiter is configured for (accuracy baseline)
+        refill_rate: Sustained rate the limiter is configured for
+        measure_memory: Whether to run the tracemalloc pass
+
+    Returns:
+        Dictionary with algorithm, requests, throughput_ops, p50_us, p99_us,
+        bytes_per_key, admitted, reference_admitted, over_admission
+        (extra admissions relative to the reference) and agreement (fraction
+        of identical decisions)
+    """
+    clock = VirtualClock()
+    limiter = make_limiter(clock)
+    start = time.perf_counter()
+    _replay(limiter, clock, workload)
+    throughput = len(workload) / (time.perf_counter() - start)
+
+    clock = VirtualClock()
+    limiter = make_limiter(clock)
+    allow = limiter.allow_request
+    perf_counter_ns = time.perf_counter_ns
+    latencies = np.empty(len(workload), dtype=np.int64)
+    decisions = []
+    for i, (now, user_id) in enumerate(zip(workload.timestamps, workload.user_ids)):
+        clock.now = now
+        t0 = perf_counter_ns()
+        allowed = allow(user_id)
+        latencies[i] = perf_counter_ns() - t0
+        decisions.append(allowed)
+    p50, p99 = np.percentile(latencies, [50, 99]) / 1000.0
+
+    bytes_per_key = None
+    if measure_memory:
+        clock = VirtualClock()
+        limiter = make_limiter(clock)
+        gc.collect()
+        tracemalloc.start()
+        try:
+            before, _ = tracemalloc.get_traced_memory()
+            _replay(limiter, clock, workload)
+            gc.collect()
+            after, _ = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        bytes_per_key = (after - before) / workload.distinct_users()
+
+    reference = reference_decisions(workload, capacity, refill_rate)
+    admitted = sum(decisions)
+    reference_admitted = sum(reference)
+    agreement = sum(a == b for a, b in zip(decisions, reference)) / len(workload)
+    return {
+        "algorithm": limiter.get_algorithm_name(),
+        "requests": len(workload),
+        "throughput_ops": throughput,
+        "p50_us": float(p50),
+        "p99_us": float(p99),
+        "bytes_per_key": bytes_per_key,
+        "admitted": admitted,
+        "reference_admitted": reference_admitted,
+        "over_admission": (admitted - reference_admitted) / reference_admitted,
+        "agreement": agreement,
+    }
@@ -0,0 +1,5 @@
+"""Sliding Window Counter Rate Limiter Package"""
+
+from .limiter import SlidingWindowCounterGlobalLimiter, SlidingWindowCounterRateLimiter
+
+__all__ = ["SlidingWindowCounterRateLimiter", "SlidingWindowCounterGlobalLimiter"]
@@ -0,0 +1,290 @@
+"""
+Sliding Window Counter Rate Limiter Implementation.
+
+The sliding window counter approximates a true sliding log with two fixed
+window counters per key:
+
+- Time is cut into fixed windows of ``window_seconds``
+- Each key remembers the index of its current window, the count in that
+  window, and the count in the window just before it
+- The estimated number of requests in the last ``window_seconds`` is the
+  current count plus the previous count weighted by how much of the previous
+  window still overlaps the sliding window
+- A request is allowed if the estimate plus the request cost stays within
+  ``limit``
+
+State is O(1) per key (three numbers) regardless of request volume, unlike a
+sliding log that stores one timestamp per request.
+"""
+
+import math
+import time
+import threading
+from typing import Dict, List, Optional
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from base import RateLimiter, GlobalRateLimiter
+from clock import Clock
+
+# Positions inside a per-key state list [window_index, previous_count, current_count]
+WINDOW, PREVIOUS, CURRENT = 0, 1, 2
+
+
+def _roll(state: List[int], window_index: int) -> None:
+    """Advance a window state in place to `window_index`."""
+    gap = window_index - state[WINDOW]
+    if gap == 0:
+        return
+    state[PREVIOUS] = state[CURRENT] if gap == 1 else 0
+    state[CURRENT] = 0
+    state[WINDOW] = window_index
+
+
+def _wait_time(
+    state: List[int], elapsed: float, limit: int, window: float, tokens: int
+) -> float:
+    """
+    Time until `tokens` more requests fit under `limit` for a rolled state.
+
+    Args:
+        state: Window state already rolled to the current window
+        elapsed: Seconds since the start of the current window
+        limit: Maximum requests per window
+        window: Window length in seconds
+        tokens: Number of requests needed
+
+    Returns:
+        Time in seconds until allowed (inf if `tokens` exceeds `limit`)
+    """
+    if tokens > limit:
+        return math.inf
+    previous, current = state[PREVIOUS], state[CURRENT]
+    if current + tokens <= limit:
+        if previous == 0:
+            return 0.0
+        # previous * (1 - e / window) + current + tokens <= limit
+        needed = window * (1 - (limit - current - tokens) / previous)
+        return max(0.0, needed - elapsed)
+    # Must wait for the next window, where the current count becomes previous
+    needed = window * (1 - (limit - tokens) / current)
+    return (window - elapsed) + max(0.0, needed)
+
+
+class SlidingWindowCounterRateLimiter(RateLimiter):
+    """
+    Sliding window counter rate limiter for multiple users implementing the
+    RateLimiter interface.
+
+    Args:
+        limit: Maximum number of requests per sliding window per user
+        window_seconds: Length of the sliding window in seconds
+        clock: Time source in seconds (defaults to time.time)
+    """
+
+    def __init__(
+        self, limit: int, window_seconds: float, clock: Optional[Clock] = None
+    ):
+        self.limit = limit
+        self.window_seconds = window_seconds
+        self.clock = clock if clock is not None else time.time
+        self.windows: Dict[str, List[int]] = {}
+        self.lock = threading.Lock()
+
+    def _state(self, user_id: str, now: float):
+        """Return the user's rolled state and time elapsed in the window (lock held)."""
+        window_index = int(now // self.window_seconds)
+        state = self.windows.get(user_id)
+        if state is None:
+            state = self.windows[user_id] = [window_index, 0, 0]
+        else:
+            _roll(state, window_index)
+        return state, now - window_index * self.window_seconds
+
+    def _estimate(self, state: List[int], elapsed: float) -> float:
+        weight = 1.0 - elapsed / self.window_seconds
+        return state[PREVIOUS] * weight + state[CURRENT]
+
+    def allow_request(self, user_id: str, tokens: int = 1) -> bool:
+        """
+        Check if a request from a user should be allowed.
+
+        Args:
+            user_id: Unique identifier for the user
+            tokens: Number of tokens to consume
+
+        Returns:
+            True if request is allowed, False otherwise
+        """
+        with self.lock:
+            state, elapsed = self._state(user_id, self.clock())
+            if self._estimate(state, elapsed) + tokens > self.limit:
+                return False
+            state[CURRENT] += tokens
+            return True
+
+    def get_user_stats(self, user_id: str) -> Dict[str, any]:
+        """
+        Get current rate limiting statistics for a user.
+
+        Args:
+            user_id: Unique identifier for the user
+
+        Returns:
+            Dictionary containing window counts and estimated usage
+        """
+        with self.lock:
+            state, elapsed = self._state(user_id, self.clock())
+            estimate = self._estimate(state, elapsed)
+            wait = _wait_time(state, elapsed, self.limit, self.window_seconds, 1)
+            return {
+                "tokens_available": self.limit - estimate,
+                "limit": self.limit,
+                "window_seconds": self.window_seconds,
+                "current_window_count": state[CURRENT],
+                "previous_window_count": state[PREVIOUS],
+                "estimated_count": estimate,
+                "wait_time_for_1_token": wait,
+            }
+
+    def get_wait_time(self, user_id: str, tokens: int = 1) -> float:
+        """
+        Get the time until a request of `tokens` would be allowed for a user.
+
+        Args:
+            user_id: Unique identifier for the user
+            tokens: Number of tokens needed
+
+        Returns:
+            Time in seconds until allowed
+        """
+        with self.lock:
+            state, elapsed = self._state(user_id, self.clock())
+            return _wait_time(state, elapsed, self.limit, self.window_seconds, tokens)
+
+    def reset_user(self, user_id: str) -> None:
+        """
+        Reset rate limiting state for a specific user.
+
+        Args:
+            user_id: Unique identifier for the user
+        """
+        with self.lock:
+            self.windows.pop(user_id, None)
+
+    def cleanup_inactive_users(self, inactive_threshold: float = 3600) -> int:
+        """
+        Remove users with no requests in the last `inactive_threshold` seconds.
+
+        A user's last request happened before the end of its current window, so
+        users whose window ended more than `inactive_threshold` ago are removed.
+
+        Args:
+            inactive_threshold: Time in seconds after which a user is considered inactive
+
+        Returns:
+            Number of users removed
+        """
+        with self.lock:
+            cutoff = self.clock() - inactive_threshold
+            users_to_remove = [
+                user_id
+                for user_id, state in self.windows.items()
+                if (state[WINDOW] + 1) * self.window_seconds < cutoff
+            ]
+            for user_id in users_to_remove:
+                del self.windows[user_id]
+            return len(users_to_remove)
+
+    def get_algorithm_name(self) -> str:
+        """Get the name of the rate limiting algorithm."""
+        return "Sliding Window Counter"
+
+    def get_config(self) -> Dict[str, any]:
+        """Get the configuration parameters of the rate limiter."""
+        return {
+            "algorithm": self.get_algorithm_name(),
+            "limit": self.limit,
+            "window_seconds": self.window_seconds,
+            "active_users": len(self.windows),
+        }
+
+
+class SlidingWindowCounterGlobalLimiter(GlobalRateLimiter):
+    """
+    Global sliding window counter rate limiter implementing the
+    GlobalRateLimiter interface.
+
+    Args:
+        limit: Maximum number of requests per sliding window
+        window_seconds: Length of the sliding window in seconds
+        clock: Time source in seconds (defaults to time.time)
+    """
+
+    def __init__(
+        self, limit: int, window_seconds: float, clock: Optional[Clock] = None
+    ):
+        self.limit = limit
+        self.window_seconds = window_seconds
+        self.clock = clock if clock is not None else time.time
+        self.state = [0, 0, 0]
+        self.lock = threading.Lock()
+
+    def _rolled(self, now: float) -> float:
+        """Roll the window state to `now` and return elapsed time (lock held)."""
+        window_index = int(now // self.window_seconds)
+        _roll(self.state, window_index)
+        return now - window_index * self.window_seconds
+
+    def allow_request(self, tokens: int = 1) -> bool:
+        """
+        Check if a request should be allowed globally.
+
+        Args:
+            tokens: Number of tokens to consume
+
+        Returns:
+            True if request is allowed, False otherwise
+        """
+        with self.lock:
+            elapsed = self._rolled(self.clock())
+            weight = 1.0 - elapsed / self.window_seconds
+            estimate = self.state[PREVIOUS] * weight + self.state[CURRENT]
+            if estimate + tokens > self.limit:
+                return False
+            self.state[CURRENT] += tokens
+            return True
+
+    def get_stats(self) -> Dict[str, any]:
+        """
+        Get global rate limiting statistics.
+
+        Returns:
+            Dictionary containing global statistics
+        """
+        with self.lock:
+            self._rolled(self.clock())
+            return {
+                "limit": self.limit,
+                "window_seconds": self.window_seconds,
+                "current_window_count": self.state[CURRENT],
+                "previous_window_count": self.state[PREVIOUS],
+            }
+
+    def get_wait_time(self, tokens: int = 1) -> float:
+        """
+        Get time until request would be allowed.
+
+        Args:
+            tokens: Number of tokens needed
+
+        Returns:
+            Time in seconds until allowed
+        """
+        with self.lock:
+            elapsed = self._rolled(self.clock())
+            return _wait_time(
+                self.state, elapsed, self.limit, self.window_seconds, tokens
+            )
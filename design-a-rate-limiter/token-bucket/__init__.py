@@ -1,5 +1,26 @@
 """Token Bucket Rate Limiter Package"""
 
-from . import TokenBucket, UserTokenBucket
+from .limiter import (
+    TokenBucket,
+    TokenBucketRateLimiter,
+    ShardedTokenBucketRateLimiter,
+    TokenBucketGlobalLimiter,
+    UserTokenBucket,
+)
+from .compact_store import CompactTokenBucketRateLimiter
+from .async_limiter import AsyncTokenBucketRateLimiter
+from .shared_memory import SharedMemoryTokenBucketRateLimiter
+from .redis_limiter import LocalRedis, RedisTokenBucketRateLimiter
 
-__all__ = ["TokenBucket", "UserTokenBucket"]
+__all__ = [
+    "TokenBucket",
+    "TokenBucketRateLimiter",
+    "ShardedTokenBucketRateLimiter",
+    "TokenBucketGlobalLimiter",
+    "UserTokenBucket",
+    "CompactTokenBucketRateLimiter",
+    "AsyncTokenBucketRateLimiter",
+    "SharedMemoryTokenBucketRateLimiter",
+    "RedisTokenBucketRateLimiter",
+    "LocalRedis",
+]
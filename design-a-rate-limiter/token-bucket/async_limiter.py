@@ -0,0 +1,299 @@
+"""
+Asyncio-native Token Bucket Rate Limiter.
+
+Each user's bucket keeps a FIFO queue of waiting acquire calls. Instead of
+polling, the limiter computes the exact moment the head waiter's tokens will
+have refilled and schedules a single ``loop.call_at`` timer per user for that
+moment. When the timer fires, every waiter that now fits is woken in arrival
+order and the timer is re-armed for the next one.
+
+All state is only ever touched from the event loop thread, so no thread locks
+are needed and nothing blocks the loop. Times come from ``loop.time()``, the
+same monotonic clock the timers are scheduled on.
+"""
+
+import asyncio
+import sys
+import os
+from collections import deque
+from typing import Deque, Dict, Optional, Tuple
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from base import AsyncRateLimiter
+
+
+class AsyncTokenBucket:
+    """
+    Token bucket state plus the FIFO queue of waiters for one user.
+
+    Args:
+        capacity: Maximum number of tokens the bucket can hold
+        now: Current event loop time
+    """
+
+    __slots__ = ("tokens", "last_refill_time", "waiters", "timer")
+
+    def __init__(self, capacity: int, now: float):
+        self.tokens = float(capacity)
+        self.last_refill_time = now
+        self.waiters: Deque[Tuple[asyncio.Future, int]] = deque()
+        self.timer: Optional[asyncio.TimerHandle] = None
+
+
+class AsyncTokenBucketRateLimiter(AsyncRateLimiter):
+    """
+    Token bucket rate limiter with awaitable, FIFO-fair acquire.
+
+    Args:
+        capacity: Maximum number of tokens per user
+        refill_rate: Number of tokens added per second per user
+    """
+
+    def __init__(self, capacity: int, refill_rate: float):
+        self.capacity = capacity
+        self.refill_rate = refill_rate
+        self.buckets: Dict[str, AsyncTokenBucket] = {}
+
+    def _loop(self) -> asyncio.AbstractEventLoop:
+        return asyncio.get_running_loop()
+
+    def _refill(self, bucket: AsyncTokenBucket, now: float) -> None:
+        """Refill tokens based on elapsed loop time since the last refill."""
+        elapsed = now - bucket.last_refill_time
+        bucket.tokens = min(self.capacity, bucket.tokens + elapsed * self.refill_rate)
+        bucket.last_refill_time = now
+
+    def _get_bucket(self, user_id: str, now: float) -> AsyncTokenBucket:
+        """Get or create the bucket for a user, refilled up to `now`."""
+        bucket = self.buckets.get(user_id)
+        if bucket is None:
+            bucket = AsyncTokenBucket(self.capacity, now)
+            self.buckets[user_id] = bucket
+        else:
+            self._refill(bucket, now)
+        return bucket
+
+    def try_acquire(self, user_id: str, tokens: int = 1) -> bool:
+        """
+        Consume tokens only if the request can be admitted immediately.
+
+        Requests never jump the queue: while other callers are waiting for this
+        user, try_acquire returns False.
+
+        Args:
+            user_id: Unique identifier for the user
+            tokens: Number of tokens to consume
+
+        Returns:
+            True if the request is allowed, False otherwise
+        """
+        bucket = self._get_bucket(user_id, self._loop().time())
+        if not bucket.waiters and bucket.tokens >= tokens:
+            bucket.tokens -= tokens
+            return True
+        return False
+
+    async def acquire(
+        self, user_id: str, tokens: int = 1, timeout: Optional[float] = None
+    ) -> bool:
+        """
+        Wait in FIFO order until the tokens are available, then consume them.
+
+        Args:
+            user_id: Unique identifier for the user
+            tokens: Number of tokens to consume
+            timeout: Maximum time in seconds to wait (None waits indefinitely)
+
+        Returns:
+            True once the tokens were consumed, False if the timeout expired first
+
+        Raises:
+            ValueError: If tokens exceeds the bucket capacity (it could never fit)
+        """
+        if tokens > self.capacity:
+            raise ValueError(
+                f"Cannot acquire {tokens} tokens from a bucket of {self.capacity}"
+            )
+        if self.try_acquire(user_id, tokens):
+            return True
+        if timeout is not None and timeout <= 0:
+            return False
+
+        loop = self._loop()
+        bucket = self.buckets[user_id]
+        future = loop.create_future()
+        bucket.waiters.append((future, tokens))
+        if len(bucket.waiters) == 1:
+            self._schedule_wakeup(user_id, bucket)
+
+        timeout_handle = None
+        if timeout is not None:
+            timeout_handle = loop.call_later(timeout, self._expire, future)
+        try:
+            return await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled() and future.result():
+                # Admitted, but cancelled before it could resume: the caller
+                # never uses the tokens, so hand them back
+                self._refund(user_id, tokens)
+            raise
+        finally:
+            if timeout_handle is not None:
+                timeout_handle.cancel()
+            if not future.done() or future.cancelled() or not future.result():
+                self._discard_waiter(user_id, future)
+
+    def _expire(self, future: asyncio.Future) -> None:
+        """Timeout callback: resolve a still-pending waiter as not admitted."""
+        if not future.done():
+            future.set_result(False)
+
+    def _refund(self, user_id: str, tokens: int) -> None:
+        """Return tokens an admitted waiter did not use and wake the queue."""
+        bucket = self.buckets.get(user_id)
+        if bucket is None:
+            return
+        self._refill(bucket, self._loop().time())
+        bucket.tokens = min(self.capacity, bucket.tokens + tokens)
+        self._wake_waiters(user_id)
+
+    def _discard_waiter(self, user_id: str, future: asyncio.Future) -> None:
+        """Remove a timed-out or cancelled waiter and re-arm the user's timer."""
+        bucket = self.buckets.get(user_id)
+        if bucket is None:
+            return
+        was_head = bool(bucket.waiters) and bucket.waiters[0][0] is future
+        for i, (waiter, _) in enumerate(bucket.waiters):
+            if waiter is future:
+                del bucket.waiters[i]
+                break
+        else:
+            return
+        if was_head:
+            self._wake_waiters(user_id)
+
+    def _schedule_wakeup(self, user_id: str, bucket: AsyncTokenBucket) -> None:
+        """Arm a timer for the exact time the head waiter's tokens are refilled."""
+        if bucket.timer is not None:
+            bucket.timer.cancel()
+            bucket.timer = None
+        if not bucket.waiters:
+            return
+
+        _, needed = bucket.waiters[0]
+        deficit = max(0.0, needed - bucket.tokens)
+        wake_at = bucket.last_refill_time + deficit / self.refill_rate
+        bucket.timer = self._loop().call_at(wake_at, self._wake_waiters, user_id)
+
+    def _wake_waiters(self, user_id: str) -> None:
+        """Admit every waiter that fits, in FIFO order, then re-arm the timer."""
+        bucket = self.buckets.get(user_id)
+        if bucket is None:
+            return
+        bucket.timer = None
+        self._refill(bucket, self._loop().time())
+
+        while bucket.waiters:
+            future, needed = bucket.waiters[0]
+            if future.done():
+                bucket.waiters.popleft()
+                continue
+            if bucket.tokens < needed:
+                break
+            bucket.tokens -= needed
+            bucket.waiters.popleft()
+            future.set_result(True)
+
+        self._schedule_wakeup(user_id, bucket)
+
+    def get_wait_time(self, user_id: str, tokens: int = 1) -> float:
+        """
+        Get the time until a new acquire for the user would be admitted.
+
+        Tokens already claimed by queued waiters are counted first, since they
+        will be served before the new request.
+
+        Args:
+            user_id: Unique identifier for the user
+            tokens: Number of tokens needed
+
+        Returns:
+            Time in seconds until the request would be allowed
+        """
+        bucket = self._get_bucket(user_id, self._loop().time())
+        queued = sum(needed for future, needed in bucket.waiters if not future.done())
+        deficit = queued + tokens - bucket.tokens
+        return max(0.0, deficit / self.refill_rate)
+
+    def get_user_stats(self, user_id: str) -> Dict[str, any]:
+        """
+        Get current rate limiting statistics for a user.
+
+        Args:
+            user_id: Unique identifier for the user
+
+        Returns:
+            Dictionary containing tokens available and queued waiters
+        """
+        bucket = self._get_bucket(user_id, self._loop().time())
+        return {
+            "tokens_available": bucket.tokens,
+            "capacity": self.capacity,
+            "refill_rate": self.refill_rate,
+            "waiters": len(bucket.waiters),
+        }
+
+    def reset_user(self, user_id: str) -> None:
+        """
+        Reset a user's bucket to full capacity, admitting queued waiters that fit.
+
+        Args:
+            user_id: Unique identifier for the user
+        """
+        bucket = self.buckets.get(user_id)
+        if bucket is None:
+            return
+        if not bucket.waiters:
+            if bucket.timer is not None:
+                bucket.timer.cancel()
+            del self.buckets[user_id]
+            return
+        bucket.tokens = float(self.capacity)
+        bucket.last_refill_time = self._loop().time()
+        self._wake_waiters(user_id)
+
+    def cleanup_inactive_users(self, inactive_threshold: float = 3600) -> int:
+        """
+        Remove buckets of users with no waiters and no recent activity.
+
+        Args:
+            inactive_threshold: Time in seconds after which a user is considered inactive
+
+        Returns:
+            Number of users removed
+        """
+        now = self._loop().time()
+        users_to_remove = [
+            user_id
+            for user_id, bucket in self.buckets.items()
+            if not bucket.waiters
+            and (now - bucket.last_refill_time) > inactive_threshold
+        ]
+        for user_id in users_to_remove:
+            del self.buckets[user_id]
+        return len(users_to_remove)
+
+    def get_algorithm_name(self) -> str:
+        """Get the name of the rate limiting algorithm."""
+        return "Token Bucket (asyncio)"
+
+    def get_config(self) -> Dict[str, any]:
+        """Get the configuration parameters of the rate limiter."""
+        return {
+            "algorithm": self.get_algorithm_name(),
+            "capacity": self.capacity,
+            "refill_rate": self.refill_rate,
+            "active_users": len(self.buckets),
+            "waiters": sum(len(bucket.waiters) for bucket in self.buckets.values()),
+        }
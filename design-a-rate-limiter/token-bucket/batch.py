@@ -0,0 +1,93 @@
+"""
+Vectorized refill-and-consume kernel for batch admission.
+
+Both token bucket limiters gather the state of every distinct bucket touched by
+a batch, refill it once, and then use :func:`consume_batch` to decide every
+request in a handful of NumPy operations.
+
+A batch is admitted exactly as if its requests were passed to
+``allow_request`` one by one, in batch order. Requests for the same user are
+grouped with a stable sort and compared against a running (cumulative) sum of
+the tokens requested before them. That prefix rule is exact whenever a user's
+requests in the batch all ask for the same number of tokens; the rare groups
+that mix token counts *and* hit a rejection are replayed sequentially so that
+a later, smaller request can still use what a rejected larger one left behind.
+"""
+
+from typing import Tuple
+
+import numpy as np
+from base import as_token_array  # noqa: F401 - re-exported for the limiters
+
+
+def consume_batch(
+    available: np.ndarray, groups: np.ndarray, tokens: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Decide a batch of requests against already-refilled buckets.
+
+    Args:
+        available: Refilled token count of each distinct bucket (length G)
+        groups: Bucket index (0..G-1) of each request, in batch order (length N)
+        tokens: Tokens requested by each request, in batch order (length N)
+
+    Returns:
+        Tuple of (admitted mask of length N, tokens consumed per bucket of length G)
+    """
+    order = np.argsort(groups, kind="stable")
+    sorted_groups = groups[order]
+    sorted_tokens = tokens[order]
+
+    running = np.cumsum(sorted_tokens)
+    starts = np.flatnonzero(np.r_[True, sorted_groups[1:] != sorted_groups[:-1]])
+    counts = np.diff(np.r_[starts, len(sorted_groups)])
+    running -= np.repeat(running[starts] - sorted_tokens[starts], counts)
+
+    admitted_sorted = running <= available[sorted_groups]
+
+    rejected = np.flatnonzero(~admitted_sorted)
+    if rejected.size:
+        _replay_mixed_groups(
+            available,
+            sorted_groups,
+            sorted_tokens,
+            admitted_sorted,
+            starts,
+            counts,
+            np.unique(sorted_groups[rejected]),
+        )
+
+    admitted = np.empty_like(admitted_sorted)
+    admitted[order] = admitted_sorted
+    consumed = np.bincount(
+        groups, weights=np.where(admitted, tokens, 0.0), minlength=len(available)
+    )
+    return admitted, consumed
+
+
+def _replay_mixed_groups(
+    available: np.ndarray,
+    sorted_groups: np.ndarray,
+    sorted_tokens: np.ndarray,
+    admitted_sorted: np.ndarray,
+    starts: np.ndarray,
+    counts: np.ndarray,
+    rejected_groups: np.ndarray,
+) -> None:
+    """Sequentially re-decide groups that mix token counts and saw a rejection."""
+    group_start = dict(zip(sorted_groups[starts].tolist(), starts.tolist()))
+    group_count = dict(zip(sorted_groups[starts].tolist(), counts.tolist()))
+    for group in rejected_groups.tolist():
+        begin = group_start[group]
+        end = begin + group_count[group]
+        requested = sorted_tokens[begin:end]
+        if requested.min() == requested.max():
+            continue
+
+        remaining = available[group]
+        for i in range(begin, end):
+            if sorted_tokens[i] <= remaining:
+                remaining -= sorted_tokens[i]
+                admitted_sorted[i] = True
+            else:
+                admitted_sorted[i] = False
@@ -0,0 +1,355 @@
+"""
+Array-backed Token Bucket storage engine.
+
+The object-per-user layout in ``limiter.py`` costs a ``TokenBucket`` instance,
+a ``threading.Lock``, two float objects and a dictionary entry for every key.
+This module keeps the same token bucket state as a struct of arrays instead,
+laid out like CPython's compact dict:
+
+- ``key_hashes[slot]``, ``tokens[slot]`` and ``last_refill[slot]`` are dense,
+  contiguous ``array`` buffers (24 bytes per key)
+- ``index`` is an open-addressing ``array('i')`` hash table (linear probing)
+  mapping a key hash to its dense slot, kept at most 2/3 full
+- removing a key moves the last slot into the hole, so the dense arrays never
+  contain gaps
+
+Keys are identified by their 64-bit ``hash()`` and the key strings themselves
+are not retained. Two keys whose hashes collide would share one bucket; with
+64-bit hashes this is negligible even for tens of millions of keys.
+
+All state is guarded by one limiter-wide lock that is held only for the probe
+and the few arithmetic operations of a refill-and-consume. Because the state
+is already contiguous, ``allow_requests_batch`` runs the refill and consume
+math directly on NumPy views of the arrays.
+"""
+
+import sys
+import os
+import time
+import threading
+from array import array
+from typing import Dict, Optional, Sequence, Union
+
+import numpy as np
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from base import RateLimiter
+from clock import Clock
+from .batch import as_token_array, consume_batch
+
+EMPTY = -1
+MIN_INDEX_SIZE = 8
+
+
+class CompactTokenBucketRateLimiter(RateLimiter):
+    """
+    Token bucket rate limiter storing all buckets in typed arrays.
+
+    Args:
+        capacity: Maximum number of tokens per user
+        refill_rate: Number of tokens added per second per user
+        expected_keys: Number of keys to size the index for up front (default: 0)
+        clock: Time source in seconds (defaults to time.time)
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        refill_rate: float,
+        expected_keys: int = 0,
+        clock: Optional[Clock] = None,
+    ):
+        self.capacity = capacity
+        self.refill_rate = refill_rate
+        self.clock = clock if clock is not None else time.time
+        self.key_hashes = array("q")
+        self.tokens = array("d")
+        self.last_refill = array("d")
+        self.index = array("i")
+        self._mask = 0
+        self._resize_index(expected_keys)
+        self.lock = threading.Lock()
+
+    def _resize_index(self, num_keys: int) -> None:
+        """Rebuild the index with room for `num_keys` at <= 2/3 load."""
+        size = MIN_INDEX_SIZE
+        while size * 2 < num_keys * 3:
+            size *= 2
+        self.index = array("i", [EMPTY]) * size
+        self._mask = size - 1
+        for slot, key_hash in enumerate(self.key_hashes):
+            self.index[self._probe(key_hash)] = slot
+
+    def _probe(self, key_hash: int) -> int:
+        """Index position holding `key_hash`, or the empty position where it belongs."""
+        index = self.index
+        key_hashes = self.key_hashes
+        mask = self._mask
+        pos = key_hash & mask
+        while True:
+            slot = index[pos]
+            if slot == EMPTY or key_hashes[slot] == key_hash:
+                return pos
+            pos = (pos + 1) & mask
+
+    def _insert(self, key_hash: int, now: float) -> int:
+        """Append a full bucket for a new key and index it. Caller holds the lock."""
+        slot = len(self.key_hashes)
+        self.key_hashes.append(key_hash)
+        self.tokens.append(self.capacity)
+        self.last_refill.append(now)
+        if (slot + 1) * 3 > len(self.index) * 2:
+            self._resize_index(slot + 1)
+        else:
+            self.index[self._probe(key_hash)] = slot
+        return slot
+
+    def _lookup(self, key_hash: int) -> int:
+        """Dense slot for a key hash, or EMPTY. Caller holds the lock."""
+        return self.index[self._probe(key_hash)]
+
+    def _delete_index_entry(self, pos: int) -> None:
+        """Clear an index position, shifting later probe-chain entries back."""
+        index = self.index
+        key_hashes = self.key_hashes
+        mask = self._mask
+        index[pos] = EMPTY
+        nxt = (pos + 1) & mask
+        while index[nxt] != EMPTY:
+            home = key_hashes[index[nxt]] & mask
+            # Move the entry back unless its home lies cyclically in (pos, nxt]
+            if (nxt - home) & mask >= (nxt - pos) & mask:
+                index[pos] = index[nxt]
+                index[nxt] = EMPTY
+                pos = nxt
+            nxt = (nxt + 1) & mask
+
+    def _remove(self, key_hash: int) -> bool:
+        """Remove a key, filling its slot with the last one. Caller holds the lock."""
+        pos = self._probe(key_hash)
+        slot = self.index[pos]
+        if slot == EMPTY:
+            return False
+        self._delete_index_entry(pos)
+
+        last = len(self.key_hashes) - 1
+        if slot != last:
+            moved_hash = self.key_hashes[last]
+            self.index[self._probe(moved_hash)] = slot
+            self.key_hashes[slot] = moved_hash
+            self.tokens[slot] = self.tokens[last]
+            self.last_refill[slot] = self.last_refill[last]
+        self.key_hashes.pop()
+        self.tokens.pop()
+        self.last_refill.pop()
+        return True
+
+    def _refilled_tokens(self, slot: int, now: float) -> float:
+        """Tokens in a slot after refilling up to `now`. Caller holds the lock."""
+        elapsed = now - self.last_refill[slot]
+        return min(self.capacity, self.tokens[slot] + elapsed * self.refill_rate)
+
+    def _peek_tokens(self, user_id: str) -> float:
+        """Current token count for a user without allocating a slot."""
+        key_hash = hash(user_id)
+        with self.lock:
+            slot = self._lookup(key_hash)
+            if slot == EMPTY:
+                return float(self.capacity)
+            return self._refilled_tokens(slot, self.clock())
+
+    def allow_request(self, user_id: str, tokens: int = 1) -> bool:
+        """
+        Check if a request from a user should be allowed.
+
+        Args:
+            user_id: Unique identifier for the user
+            tokens: Number of tokens to consume
+
+        Returns:
+            True if request is allowed, False otherwise
+        """
+        key_hash = hash(user_id)
+        with self.lock:
+            now = self.clock()
+            slot = self._lookup(key_hash)
+            if slot == EMPTY:
+                slot = self._insert(key_hash, now)
+
+            available = self._refilled_tokens(slot, now)
+            self.last_refill[slot] = now
+            if available >= tokens:
+                self.tokens[slot] = available - tokens
+                return True
+            self.tokens[slot] = available
+            return False
+
+    def allow_requests_batch(
+        self,
+        user_ids: Sequence[str],
+        tokens: Optional[Union[int, Sequence[int]]] = None,
+    ) -> np.ndarray:
+        """
+        Check a batch of requests with vectorized refill and consume.
+
+        Slots are resolved (and allocated for new users) once per distinct key,
+        then the refill and consume math runs on NumPy views of the token and
+        timestamp arrays. The result matches calling allow_request for each
+        request in batch order.
+
+        Args:
+            user_ids: User identifier of each request
+            tokens: Tokens per request - a sequence aligned with user_ids, a single
+                int (Python or NumPy) applied to every request, or None for 1 token
+                each
+
+        Returns:
+            NumPy boolean mask aligned with user_ids
+        """
+        if len(user_ids) == 0:
+            return np.zeros(0, dtype=bool)
+        token_array = as_token_array(tokens, len(user_ids))
+
+        positions: Dict[int, int] = {}
+        groups = np.fromiter(
+            (
+                positions.setdefault(hash(user_id), len(positions))
+                for user_id in user_ids
+            ),
+            dtype=np.intp,
+            count=len(user_ids),
+        )
+
+        with self.lock:
+            now = self.clock()
+            slots = np.empty(len(positions), dtype=np.intp)
+            for i, key_hash in enumerate(positions):
+                slot = self._lookup(key_hash)
+                slots[i] = slot if slot != EMPTY else self._insert(key_hash, now)
+
+            # Views must be released before the arrays are resized again
+            token_view = np.frombuffer(self.tokens, dtype=np.float64)
+            refill_view = np.frombuffer(self.last_refill, dtype=np.float64)
+            try:
+                available = np.minimum(
+                    self.capacity,
+                    token_view[slots] + (now - refill_view[slots]) * self.refill_rate,
+                )
+                admitted, consumed = consume_batch(available, groups, token_array)
+                token_view[slots] = available - consumed
+                refill_view[slots] = now
+            finally:
+                del token_view, refill_view
+        return admitted
+
+    def get_user_stats(self, user_id: str) -> Dict[str, any]:
+        """
+        Get current rate limiting statistics for a user.
+
+        Unknown users are reported with a full bucket and are not given a slot.
+
+        Args:
+            user_id: Unique identifier for the user
+
+        Returns:
+            Dictionary containing tokens available and wait time
+        """
+        available = self._peek_tokens(user_id)
+        return {
+            "tokens_available": available,
+            "capacity": self.capacity,
+            "refill_rate": self.refill_rate,
+            "wait_time_for_1_token": self._wait_time(available, 1),
+        }
+
+    def _wait_time(self, available: float, tokens: int) -> float:
+        """Seconds until `tokens` are available given the current balance."""
+        if available >= tokens:
+            return 0.0
+        return (tokens - available) / self.refill_rate
+
+    def get_wait_time(self, user_id: str, tokens: int = 1) -> float:
+        """
+        Get the time until tokens will be available for a user.
+
+        Args:
+            user_id: Unique identifier for the user
+            tokens: Number of tokens needed
+
+        Returns:
+            Time in seconds until tokens available
+        """
+        return self._wait_time(self._peek_tokens(user_id), tokens)
+
+    def reset_user(self, user_id: str) -> None:
+        """
+        Reset rate limiting state for a specific user.
+
+        Args:
+            user_id: Unique identifier for the user
+        """
+        key_hash = hash(user_id)
+        with self.lock:
+            self._remove(key_hash)
+
+    def cleanup_inactive_users(self, inactive_threshold: float = 3600) -> int:
+        """
+        Remove buckets of users who haven't made requests recently.
+
+        Slots are scanned from the end so that the swap-with-last removal only
+        ever moves slots that have already been checked.
+
+        Args:
+            inactive_threshold: Time in seconds after which a user is considered inactive
+
+        Returns:
+            Number of users removed
+        """
+        with self.lock:
+            cutoff = self.clock() - inactive_threshold
+            removed = 0
+            for slot in range(len(self.key_hashes) - 1, -1, -1):
+                if self.last_refill[slot] < cutoff:
+                    self._remove(self.key_hashes[slot])
+                    removed += 1
+            return removed
+
+    def memory_usage(self) -> Dict[str, int]:
+        """
+        Report the bytes held by the bucket store.
+
+        Returns:
+            Dictionary with the size of the dense arrays, the index, the total
+            and the resulting bytes per key
+        """
+        with self.lock:
+            arrays = sum(
+                buf.buffer_info()[1] * buf.itemsize
+                for buf in (self.key_hashes, self.tokens, self.last_refill)
+            )
+            index = len(self.index) * self.index.itemsize
+            keys = len(self.key_hashes)
+
+        total = arrays + index
+        return {
+            "arrays_bytes": arrays,
+            "index_bytes": index,
+            "total_bytes": total,
+            "keys": keys,
+            "bytes_per_key": total / keys if keys else 0.0,
+        }
+
+    def get_algorithm_name(self) -> str:
+        """Get the name of the rate limiting algorithm."""
+        return "Token Bucket (compact)"
+
+    def get_config(self) -> Dict[str, any]:
+        """Get the configuration parameters of the rate limiter."""
+        return {
+            "algorithm": self.get_algorithm_name(),
+            "capacity": self.capacity,
+            "refill_rate": self.refill_rate,
+            "active_users": len(self.key_hashes),
+            "index_size": len(self.index),
+        }
@@ -0,0 +1,100 @@
+"""
+Incremental idle-bucket expiry for the token bucket limiters.
+
+``cleanup_inactive_users`` scans every bucket while holding the registry lock,
+so with millions of keys each cleanup stalls all admissions. This module keeps
+a lazily maintained min-heap of "may be idle from" deadlines instead:
+
+- a bucket is pushed once, when it is created
+- admissions never touch the heap; a bucket's ``last_refill_time`` already
+  records its last activity
+- :meth:`IdleExpiryHeap.pop_due` pops only due entries, at most ``max_items``
+  per call; the limiter evicts the buckets that are really idle and re-tracks
+  the ones used since they were pushed, with their real deadline
+
+Each eviction takes the registry lock just long enough to delete one key, so
+admissions are never blocked for more than a single dictionary operation.
+"""
+
+import heapq
+import itertools
+import threading
+from typing import Any, Callable, List, Optional, Tuple
+
+
+class IdleExpiryHeap:
+    """
+    Lazy expiry heap of bucket idle deadlines.
+
+    Args:
+        idle_timeout: Seconds without activity after which a bucket is evicted
+    """
+
+    def __init__(self, idle_timeout: float):
+        self.idle_timeout = idle_timeout
+        self.heap: List[Tuple[float, int, str, Any]] = []
+        self.lock = threading.Lock()
+        self._sequence = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self.heap)
+
+    def track(self, user_id: str, bucket: Any, last_active: float) -> None:
+        """Schedule an idle check for a bucket at `last_active + idle_timeout`."""
+        deadline = last_active + self.idle_timeout
+        entry = (deadline, next(self._sequence), user_id, bucket)
+        with self.lock:
+            heapq.heappush(self.heap, entry)
+
+    def pop_due(self, now: float, max_items: int) -> List[Tuple[str, Any]]:
+        """
+        Pop up to `max_items` entries whose idle deadline has passed.
+
+        Args:
+            now: Current time
+            max_items: Upper bound on the work done by this call
+
+        Returns:
+            List of (user_id, bucket) pairs to check; the caller evicts the idle
+            ones and re-tracks the rest
+        """
+        due = []
+        with self.lock:
+            heap = self.heap
+            while heap and len(due) < max_items and heap[0][0] <= now:
+                _, _, user_id, bucket = heapq.heappop(heap)
+                due.append((user_id, bucket))
+        return due
+
+
+class ReaperThread(threading.Thread):
+    """
+    Background thread that calls a bounded step at a fixed interval.
+
+    Args:
+        step: Callable performing one bounded pass and returning how many
+            items it processed
+        interval: Seconds to sleep between passes
+        name: Thread name
+    """
+
+    def __init__(
+        self,
+        step: Callable[[], int],
+        interval: float,
+        name: str = "token-bucket-reaper",
+    ):
+        super().__init__(name=name, daemon=True)
+        self.step = step
+        self.interval = interval
+        self.stopped = threading.Event()
+        self.processed = 0
+
+    def run(self) -> None:
+        while not self.stopped.wait(self.interval):
+            self.processed += self.step()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Signal the thread to exit and wait for it."""
+        self.stopped.set()
+        self.join(timeout)
@@ -12,15 +12,22 @@ The token bucket algorithm works as follows:
 This implementation is thread-safe and can be used in multi-threaded environments.
 """
 
+import atexit
 import time
 import threading
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Sequence, Union
 import sys
 import os
 
+import numpy as np
+
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from base import RateLimiter, GlobalRateLimiter
+from clock import Clock
+from .batch import as_token_array, consume_batch
+from .expiry import IdleExpiryHeap, ReaperThread
+from .snapshot import BucketSnapshot, write_snapshot
 
 
 class TokenBucket:
@@ -31,20 +38,26 @@ class TokenBucket:
         capacity: Maximum number of tokens the bucket can hold
         refill_rate: Number of tokens added per second
         initial_tokens: Initial number of tokens (defaults to capacity)
+        clock: Time source in seconds (defaults to time.time)
     """
 
     def __init__(
-        self, capacity: int, refill_rate: float, initial_tokens: Optional[int] = None
+        self,
+        capacity: int,
+        refill_rate: float,
+        initial_tokens: Optional[int] = None,
+        clock: Optional[Clock] = None,
     ):
         self.capacity = capacity
         self.refill_rate = refill_rate
         self.tokens = initial_tokens if initial_tokens is not None else capacity
-        self.last_refill_time = time.time()
+        self.clock = clock if clock is not None else time.time
+        self.last_refill_time = self.clock()
         self.lock = threading.Lock()
 
     def _refill(self) -> None:
         """Refill tokens based on elapsed time since last refill."""
-        now = time.time()
+        now = self.clock()
         elapsed = now - self.last_refill_time
 
         # Calculate tokens to add
@@ -108,22 +121,75 @@ class TokenBucketRateLimiter(RateLimiter):
     Token bucket rate limiter for multiple users implementing the RateLimiter interface.
     Each user has their own token bucket.
 
+    With ``idle_timeout`` set, buckets idle for that long are evicted
+    incrementally by expire_idle_users (or a background reaper started with
+    start_reaper) instead of by a full cleanup_inactive_users scan.
+
+    Bucket state survives restarts through save_snapshot / restore_snapshot
+    (or start_snapshotter, which also saves on shutdown). Restored buckets are
+    read lazily from the memory-mapped snapshot when their user first returns,
+    refilled for the time the process was down. ``wall_clock`` (default
+    time.time) measures that downtime, since ``clock`` may restart from zero.
+
     Args:
         capacity: Maximum number of tokens per user
         refill_rate: Number of tokens added per second per user
+        idle_timeout: Seconds of inactivity before a bucket may be evicted
+        clock: Time source in seconds shared by all buckets (defaults to time.time)
     """
 
-    def __init__(self, capacity: int, refill_rate: float):
+    def __init__(
+        self,
+        capacity: int,
+        refill_rate: float,
+        idle_timeout: Optional[float] = None,
+        clock: Optional[Clock] = None,
+    ):
         self.capacity = capacity
         self.refill_rate = refill_rate
+        self.clock = clock if clock is not None else time.time
         self.buckets: Dict[str, TokenBucket] = {}
         self.lock = threading.Lock()
+        self._init_expiry(idle_timeout)
+        self._init_snapshots()
+
+    def _init_expiry(self, idle_timeout: Optional[float]) -> None:
+        self.idle_timeout = idle_timeout
+        self.expiry = IdleExpiryHeap(idle_timeout) if idle_timeout else None
+        self.reaper: Optional[ReaperThread] = None
+
+    def _init_snapshots(self) -> None:
+        self.wall_clock: Clock = time.time
+        self.snapshot: Optional[BucketSnapshot] = None
+        self.snapshot_lock = threading.Lock()
+        self.snapshotter: Optional[ReaperThread] = None
+        self.snapshot_path: Optional[str] = None
+
+    def _registry_for(self, user_id: str):
+        """Return the (buckets dict, lock) pair that owns a user's bucket."""
+        return self.buckets, self.lock
+
+    def _bucket_items(self) -> List:
+        """Point-in-time list of (user_id, bucket) pairs."""
+        with self.lock:
+            return list(self.buckets.items())
+
+    def _new_bucket(self, user_id: str) -> TokenBucket:
+        """Create a bucket for a user and register it for idle expiry."""
+        bucket = TokenBucket(self.capacity, self.refill_rate, clock=self.clock)
+        if self.snapshot is not None:
+            self._restore_bucket(user_id, bucket)
+        if self.expiry is not None:
+            # A restored bucket's refill time is back-dated to credit the
+            # downtime; its user is active now, not then
+            self.expiry.track(user_id, bucket, self.clock())
+        return bucket
 
     def _get_bucket(self, user_id: str) -> TokenBucket:
         """Get or create a token bucket for a user."""
         with self.lock:
             if user_id not in self.buckets:
-                self.buckets[user_id] = TokenBucket(self.capacity, self.refill_rate)
+                self.buckets[user_id] = self._new_bucket(user_id)
             return self.buckets[user_id]
 
     def allow_request(self, user_id: str, tokens: int = 1) -> bool:
@@ -140,6 +206,66 @@ class TokenBucketRateLimiter(RateLimiter):
         bucket = self._get_bucket(user_id)
         return bucket.consume(tokens)
 
+    def allow_requests_batch(
+        self,
+        user_ids: Sequence[str],
+        tokens: Optional[Union[int, Sequence[int]]] = None,
+    ) -> np.ndarray:
+        """
+        Check a batch of requests with a single refill per distinct user.
+
+        The buckets touched by the batch are locked together (in a fixed order, so
+        concurrent batches cannot deadlock), refilled once with NumPy, and every
+        request is decided by consume_batch. The result matches calling
+        allow_request for each request in batch order.
+
+        Args:
+            user_ids: User identifier of each request
+            tokens: Tokens per request - a sequence aligned with user_ids, a single
+                int (Python or NumPy) applied to every request, or None for 1 token
+                each
+
+        Returns:
+            NumPy boolean mask aligned with user_ids
+        """
+        if len(user_ids) == 0:
+            return np.zeros(0, dtype=bool)
+        token_array = as_token_array(tokens, len(user_ids))
+
+        positions: Dict[str, int] = {}
+        groups = np.fromiter(
+            (positions.setdefault(user_id, len(positions)) for user_id in user_ids),
+            dtype=np.intp,
+            count=len(user_ids),
+        )
+        buckets = [self._get_bucket(user_id) for user_id in positions]
+        ordered_locks = [bucket.lock for bucket in sorted(buckets, key=id)]
+
+        for lock in ordered_locks:
+            lock.acquire()
+        try:
+            now = self.clock()
+            stored = np.fromiter(
+                (bucket.tokens for bucket in buckets), np.float64, len(buckets)
+            )
+            last_refill = np.fromiter(
+                (bucket.last_refill_time for bucket in buckets),
+                np.float64,
+                len(buckets),
+            )
+            available = np.minimum(
+                self.capacity, stored + (now - last_refill) * self.refill_rate
+            )
+            admitted, consumed = consume_batch(available, groups, token_array)
+
+            for bucket, remaining in zip(buckets, (available - consumed).tolist()):
+                bucket.tokens = remaining
+                bucket.last_refill_time = now
+        finally:
+            for lock in reversed(ordered_locks):
+                lock.release()
+        return admitted
+
     def get_user_stats(self, user_id: str) -> Dict[str, any]:
         """
         Get current rate limiting statistics for a user.
@@ -182,6 +308,7 @@ class TokenBucketRateLimiter(RateLimiter):
         with self.lock:
             if user_id in self.buckets:
                 del self.buckets[user_id]
+        self._drop_restored_state(user_id)
 
     def cleanup_inactive_users(self, inactive_threshold: float = 3600) -> int:
         """
@@ -194,7 +321,7 @@ class TokenBucketRateLimiter(RateLimiter):
             Number of users removed
         """
         with self.lock:
-            now = time.time()
+            now = self.clock()
             users_to_remove = []
 
             for user_id, bucket in self.buckets.items():
@@ -206,6 +333,201 @@ class TokenBucketRateLimiter(RateLimiter):
 
             return len(users_to_remove)
 
+    def expire_idle_users(self, max_work: int = 1000) -> int:
+        """
+        Evict buckets idle for longer than idle_timeout, doing bounded work.
+
+        At most `max_work` due expiry entries are examined, and the registry
+        lock is held only while a single bucket is removed, so admissions keep
+        flowing while expiry runs.
+
+        Args:
+            max_work: Maximum number of expiry entries to examine
+
+        Returns:
+            Number of users removed
+
+        Raises:
+            RuntimeError: If the limiter was created without idle_timeout
+        """
+        if self.expiry is None:
+            raise RuntimeError("Incremental expiry requires idle_timeout")
+
+        now = self.clock()
+        cutoff = now - self.idle_timeout
+        evicted = 0
+        for user_id, bucket in self.expiry.pop_due(now, max_work):
+            buckets, lock = self._registry_for(user_id)
+            with lock:
+                if buckets.get(user_id) is not bucket:
+                    continue
+                last_active = bucket.last_refill_time
+                if last_active <= cutoff:
+                    del buckets[user_id]
+                    evicted += 1
+                    continue
+            self.expiry.track(user_id, bucket, last_active)
+        return evicted
+
+    def start_reaper(self, interval: float = 1.0, max_work: int = 1000) -> None:
+        """
+        Run expire_idle_users(max_work) every `interval` seconds in a daemon thread.
+
+        Args:
+            interval: Seconds between expiry passes
+            max_work: Maximum expiry entries examined per pass
+        """
+        if self.expiry is None:
+            raise RuntimeError("Incremental expiry requires idle_timeout")
+        if self.reaper is not None:
+            return
+        self.reaper = ReaperThread(lambda: self.expire_idle_users(max_work), interval)
+        self.reaper.start()
+
+    def stop_reaper(self) -> None:
+        """Stop the background reaper thread, if running."""
+        if self.reaper is not None:
+            self.reaper.stop()
+            self.reaper = None
+
+    def _restore_bucket(self, user_id: str, bucket: TokenBucket) -> None:
+        """Seed a new bucket from the loaded snapshot, if it holds the user."""
+        with self.snapshot_lock:
+            snapshot = self.snapshot
+            if snapshot is None:
+                return
+            wall_now = self.wall_clock()
+            if wall_now >= snapshot.full_at():
+                self._release_snapshot()
+                return
+            available = snapshot.pop(user_id)
+        if available is not None:
+            bucket.tokens = available
+            # Back-date the refill so the next refill credits the downtime
+            bucket.last_refill_time -= wall_now - snapshot.taken_at
+
+    def _drop_restored_state(self, user_id: str) -> None:
+        """Take a user out of the loaded snapshot so a reset is not undone."""
+        with self.snapshot_lock:
+            if self.snapshot is not None:
+                self.snapshot.pop(user_id)
+
+    def _release_snapshot(self) -> None:
+        """Unmap the loaded snapshot (snapshot_lock held)."""
+        if self.snapshot is not None:
+            self.snapshot.close()
+            self.snapshot = None
+
+    def save_snapshot(self, path: str) -> int:
+        """
+        Write every bucket below capacity to a binary snapshot file.
+
+        Entries of a previously restored snapshot whose users have not
+        returned yet are carried over, so back-to-back restarts keep them.
+
+        Args:
+            path: Snapshot file, replaced atomically
+
+        Returns:
+            Number of buckets written
+        """
+        now = self.clock()
+        wall_now = self.wall_clock()
+        live = self._bucket_items()
+        entries = []
+        for user_id, bucket in live:
+            with bucket.lock:
+                elapsed = now - bucket.last_refill_time
+                available = bucket.tokens + elapsed * self.refill_rate
+            if available < self.capacity:
+                entries.append((user_id, available))
+
+        with self.snapshot_lock:
+            snapshot = self.snapshot
+            if snapshot is not None and wall_now >= snapshot.full_at():
+                self._release_snapshot()
+            elif snapshot is not None:
+                live_users = {user_id for user_id, _ in live}
+                refill = (wall_now - snapshot.taken_at) * self.refill_rate
+                for user_id, available in snapshot.items():
+                    if available + refill < self.capacity and user_id not in live_users:
+                        entries.append((user_id, available + refill))
+
+        return write_snapshot(
+            path, entries, self.capacity, self.refill_rate, taken_at=wall_now
+        )
+
+    def restore_snapshot(self, path: str) -> int:
+        """
+        Map a snapshot so returning users get their saved bucket state.
+
+        Only the header is read here; buckets are restored lazily as users
+        return. A missing file or a snapshot old enough that every bucket has
+        refilled is ignored.
+
+        Args:
+            path: Snapshot file written by save_snapshot
+
+        Returns:
+            Number of buckets available for restore
+
+        Raises:
+            ValueError: If the snapshot is corrupt or was taken with a
+                different capacity or refill rate
+        """
+        if not os.path.exists(path):
+            return 0
+        snapshot = BucketSnapshot(path)
+        if (snapshot.capacity, snapshot.refill_rate) != (
+            self.capacity,
+            self.refill_rate,
+        ):
+            snapshot.close()
+            raise ValueError(
+                f"Snapshot taken with capacity={snapshot.capacity}, "
+                f"refill_rate={snapshot.refill_rate}; limiter has "
+                f"capacity={self.capacity}, refill_rate={self.refill_rate}"
+            )
+        if self.wall_clock() >= snapshot.full_at():
+            snapshot.close()
+            return 0
+        with self.snapshot_lock:
+            self._release_snapshot()
+            self.snapshot = snapshot
+        return len(snapshot)
+
+    def start_snapshotter(self, path: str, interval: float = 30.0) -> int:
+        """
+        Restore from `path`, then save to it every `interval` seconds and on
+        interpreter exit.
+
+        Args:
+            path: Snapshot file
+            interval: Seconds between periodic snapshots
+
+        Returns:
+            Number of buckets available for restore
+        """
+        if self.snapshotter is not None:
+            return 0
+        restored = self.restore_snapshot(path)
+        self.snapshot_path = path
+        self.snapshotter = ReaperThread(
+            lambda: self.save_snapshot(path), interval, name="token-bucket-snapshotter"
+        )
+        self.snapshotter.start()
+        atexit.register(self.stop_snapshotter)
+        return restored
+
+    def stop_snapshotter(self) -> None:
+        """Stop periodic snapshots and write a final one (call on shutdown)."""
+        if self.snapshotter is None:
+            return
+        atexit.unregister(self.stop_snapshotter)
+        self.snapshotter.stop()
+        self.snapshotter = None
+        self.save_snapshot(self.snapshot_path)
+
     def get_algorithm_name(self) -> str:
         """Get the name of the rate limiting algorithm."""
         return "Token Bucket"
@@ -216,10 +538,140 @@ class TokenBucketRateLimiter(RateLimiter):
             "algorithm": self.get_algorithm_name(),
             "capacity": self.capacity,
             "refill_rate": self.refill_rate,
+            "idle_timeout": self.idle_timeout,
             "active_users": len(self.buckets),
         }
 
 
+class ShardedTokenBucketRateLimiter(TokenBucketRateLimiter):
+    """
+    Token bucket rate limiter with a striped (sharded) bucket registry.
+
+    The registry is split into ``num_shards`` independent dictionaries, each with
+    its own lock. Looking up an existing user's bucket is a plain dictionary read
+    and takes no lock at all; a shard lock is only taken to create or remove a
+    bucket, so concurrent users never queue behind a limiter-wide lock.
+
+    Args:
+        capacity: Maximum number of tokens per user
+        refill_rate: Number of tokens added per second per user
+        num_shards: Number of registry shards (default: 16)
+        idle_timeout: Seconds of inactivity before a bucket may be evicted
+        clock: Time source in seconds shared by all buckets (defaults to time.time)
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        refill_rate: float,
+        num_shards: int = 16,
+        idle_timeout: Optional[float] = None,
+        clock: Optional[Clock] = None,
+    ):
+        if num_shards < 1:
+            raise ValueError("num_shards must be at least 1")
+        self.capacity = capacity
+        self.refill_rate = refill_rate
+        self.clock = clock if clock is not None else time.time
+        self.num_shards = num_shards
+        self.shards: List[Dict[str, TokenBucket]] = [{} for _ in range(num_shards)]
+        self.shard_locks: List[threading.Lock] = [
+            threading.Lock() for _ in range(num_shards)
+        ]
+        self._init_expiry(idle_timeout)
+        self._init_snapshots()
+
+    @property
+    def buckets(self) -> Dict[str, TokenBucket]:
+        """Merged, point-in-time copy of the buckets across all shards."""
+        merged: Dict[str, TokenBucket] = {}
+        for shard in self.shards:
+            merged.update(shard)
+        return merged
+
+    def _shard_index(self, user_id: str) -> int:
+        """Map a user to the index of the shard that owns its bucket."""
+        return hash(user_id) % self.num_shards
+
+    def _registry_for(self, user_id: str):
+        """Return the (shard dict, shard lock) pair that owns a user's bucket."""
+        index = self._shard_index(user_id)
+        return self.shards[index], self.shard_locks[index]
+
+    def _bucket_items(self) -> List:
+        """Point-in-time list of (user_id, bucket) pairs, one shard at a time."""
+        items = []
+        for shard, shard_lock in zip(self.shards, self.shard_locks):
+            with shard_lock:
+                items.extend(shard.items())
+        return items
+
+    def _get_bucket(self, user_id: str) -> TokenBucket:
+        """Get or create a token bucket for a user (lock-free for existing users)."""
+        index = self._shard_index(user_id)
+        shard = self.shards[index]
+        bucket = shard.get(user_id)
+        if bucket is not None:
+            return bucket
+
+        with self.shard_locks[index]:
+            bucket = shard.get(user_id)
+            if bucket is None:
+                bucket = self._new_bucket(user_id)
+                shard[user_id] = bucket
+            return bucket
+
+    def reset_user(self, user_id: str) -> None:
+        """
+        Reset rate limiting state for a specific user.
+
+        Args:
+            user_id: Unique identifier for the user
+        """
+        index = self._shard_index(user_id)
+        with self.shard_locks[index]:
+            self.shards[index].pop(user_id, None)
+        self._drop_restored_state(user_id)
+
+    def cleanup_inactive_users(self, inactive_threshold: float = 3600) -> int:
+        """
+        Remove buckets for users who haven't made requests recently.
+
+        Shards are cleaned one at a time, so only users hashed to the shard being
+        scanned can be delayed while the cleanup runs.
+
+        Args:
+            inactive_threshold: Time in seconds after which a user is considered inactive
+
+        Returns:
+            Number of users removed
+        """
+        removed = 0
+        for shard, shard_lock in zip(self.shards, self.shard_locks):
+            with shard_lock:
+                now = self.clock()
+                users_to_remove = [
+                    user_id
+                    for user_id, bucket in shard.items()
+                    if (now - bucket.last_refill_time) > inactive_threshold
+                ]
+                for user_id in users_to_remove:
+                    del shard[user_id]
+                removed += len(users_to_remove)
+        return removed
+
+    def get_config(self) -> Dict[str, any]:
+        """Get the configuration parameters of the rate limiter."""
+        return {
+            "algorithm": self.get_algorithm_name(),
+            "capacity": self.capacity,
+            "refill_rate": self.refill_rate,
+            "num_shards": self.num_shards,
+            "idle_timeout": self.idle_timeout,
+            "active_users": sum(len(shard) for shard in self.shards),
+        }
+
+
 class TokenBucketGlobalLimiter(GlobalRateLimiter):
     """
     Global token bucket rate limiter implementing the GlobalRateLimiter interface.
@@ -227,10 +679,13 @@ class TokenBucketGlobalLimiter(GlobalRateLimiter):
     Args:
         capacity: Maximum number of tokens the bucket can hold
         refill_rate: Number of tokens added per second
+        clock: Time source in seconds (defaults to time.time)
     """
 
-    def __init__(self, capacity: int, refill_rate: float):
-        self.bucket = TokenBucket(capacity, refill_rate)
+    def __init__(
+        self, capacity: int, refill_rate: float, clock: Optional[Clock] = None
+    ):
+        self.bucket = TokenBucket(capacity, refill_rate, clock=clock)
         self.capacity = capacity
         self.refill_rate = refill_rate
 
@@ -0,0 +1,396 @@
+"""
+Redis-backed Token Bucket Rate Limiter for fleet-wide limits.
+
+Each bucket lives in a Redis hash (``tokens``, ``ts``) and is refilled and
+consumed by a single server-side Lua script, so concurrent nodes can never
+interleave a read-modify-write. The script reads the clock with ``TIME`` on
+the Redis server, so node clock skew does not matter, and sets a ``PEXPIRE``
+equal to the time needed to refill, so idle buckets vanish on their own.
+
+Lease mode trades a little accuracy for far fewer round trips: when a node
+has to go to Redis anyway, it claims up to ``lease_size`` tokens in that same
+script call and serves the following requests from the local lease until it
+runs out or expires after ``lease_ttl`` seconds. Leased tokens are already
+removed from the shared bucket, so the global limit is never exceeded;
+tokens left in an expired lease are simply lost.
+
+Without a Redis client the limiter runs against :class:`LocalRedis`, an
+in-process stand-in that executes the same script logic, for tests and local
+development.
+"""
+
+import sys
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from base import RateLimiter
+
+# KEYS[1] = bucket key
+# ARGV = capacity, refill_rate, min_tokens, max_tokens
+# Grants floor(min(tokens, max_tokens)) tokens if at least min_tokens are available.
+TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local min_tokens = tonumber(ARGV[3])
+local max_tokens = tonumber(ARGV[4])
+
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1])
+local ts = tonumber(state[2])
+if tokens == nil then
+    tokens = capacity
+    ts = now
+end
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+
+local granted = 0
+if tokens >= min_tokens then
+    granted = math.floor(math.min(tokens, max_tokens))
+    tokens = tokens - granted
+end
+
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil((capacity - tokens) / rate * 1000) + 1000)
+return {granted, tostring(tokens)}
+"""
+
+
+def run_token_bucket_script(
+    state: Optional[Tuple[float, float]],
+    now: float,
+    capacity: float,
+    rate: float,
+    min_tokens: float,
+    max_tokens: float,
+) -> Tuple[int, float, float]:
+    """
+    Python mirror of TOKEN_BUCKET_SCRIPT.
+
+    Returns:
+        Tuple of (tokens granted, tokens left, seconds until the key expires)
+    """
+    tokens, ts = state if state is not None else (capacity, now)
+    tokens = min(capacity, tokens + max(0.0, now - ts) * rate)
+
+    granted = 0
+    if tokens >= min_tokens:
+        granted = int(min(tokens, max_tokens))
+        tokens -= granted
+    ttl = (capacity - tokens) / rate + 1.0
+    return granted, tokens, ttl
+
+
+class LocalRedis:
+    """
+    In-process stand-in for the subset of the redis-py client the limiter uses.
+
+    Script calls run atomically under one lock, like commands on the
+    single-threaded Redis server. An optional ``latency`` (seconds) is slept on
+    every command to emulate a network round trip.
+
+    Args:
+        latency: Simulated round-trip time per command (default: 0)
+    """
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.store: Dict[str, Tuple[float, float, float]] = {}
+        self.lock = threading.Lock()
+
+    def _round_trip(self) -> None:
+        if self.latency:
+            time.sleep(self.latency)
+
+    def register_script(self, script: str):
+        """Return a callable running the token bucket script locally."""
+        if script != TOKEN_BUCKET_SCRIPT:
+            raise NotImplementedError("LocalRedis only runs TOKEN_BUCKET_SCRIPT")
+
+        def run(keys: Sequence[str], args: Sequence[float]) -> List:
+            self._round_trip()
+            capacity, rate, min_tokens, max_tokens = (float(arg) for arg in args)
+            with self.lock:
+                now = time.time()
+                entry = self.store.get(keys[0])
+                state = None
+                if entry is not None and entry[2] > now:
+                    state = (entry[0], entry[1])
+                granted, tokens, ttl = run_token_bucket_script(
+                    state, now, capacity, rate, min_tokens, max_tokens
+                )
+                self.store[keys[0]] = (tokens, now, now + ttl)
+            return [granted, repr(tokens)]
+
+        return run
+
+    def hmget(self, key: str, *fields: str) -> List[Optional[bytes]]:
+        """Read hash fields of a bucket ("tokens", "ts") like redis-py does."""
+        self._round_trip()
+        with self.lock:
+            entry = self.store.get(key)
+            if entry is None or entry[2] <= time.time():
+                return [None] * len(fields)
+            values = {"tokens": entry[0], "ts": entry[1]}
+        return [
+            repr(values[field]).encode() if field in values else None
+            for field in fields
+        ]
+
+    def delete(self, *keys: str) -> int:
+        """Delete keys, returning how many existed."""
+        self._round_trip()
+        with self.lock:
+            return sum(self.store.pop(key, None) is not None for key in keys)
+
+
+class RedisTokenBucketRateLimiter(RateLimiter):
+    """
+    Token bucket rate limiter with buckets shared by all nodes through Redis.
+
+    Args:
+        capacity: Maximum number of tokens per user
+        refill_rate: Number of tokens added per second per user
+        redis_client: redis-py client (uses an in-process LocalRedis if None)
+        lease_size: Tokens to pre-claim per round trip; 0 disables lease mode
+        lease_ttl: Seconds a local lease may be used before it is discarded
+        key_prefix: Namespace for the bucket keys in Redis
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        refill_rate: float,
+        redis_client=None,
+        lease_size: int = 0,
+        lease_ttl: float = 1.0,
+        key_prefix: str = "ratelimit:token-bucket:",
+    ):
+        self.capacity = capacity
+        self.refill_rate = refill_rate
+        self.redis = redis_client if redis_client is not None else LocalRedis()
+        self.lease_size = lease_size
+        self.lease_ttl = lease_ttl
+        self.key_prefix = key_prefix
+        self._script = self.redis.register_script(TOKEN_BUCKET_SCRIPT)
+        # user_id -> [tokens left in the lease, lease expiry (monotonic)]
+        self.leases: Dict[str, List[float]] = {}
+        self.lock = threading.Lock()
+        self.round_trips = 0
+        self.admitted = 0
+        self.rejected = 0
+
+    def _key(self, user_id: str) -> str:
+        return f"{self.key_prefix}{user_id}"
+
+    def _claim(
+        self, user_id: str, min_tokens: int, max_tokens: int
+    ) -> Tuple[int, float]:
+        """Run the refill-and-consume script: one round trip to Redis."""
+        granted, tokens_left = self._script(
+            keys=[self._key(user_id)],
+            args=[self.capacity, self.refill_rate, min_tokens, max_tokens],
+        )
+        with self.lock:
+            self.round_trips += 1
+        return int(granted), float(tokens_left)
+
+    def _take_from_lease(self, user_id: str, tokens: int) -> Tuple[bool, float]:
+        """
+        Serve from the local lease if possible.
+
+        When the lease is too small, whatever it holds is taken out of it so no
+        concurrent request can spend the same tokens while this one tops up
+        from Redis.
+
+        Returns:
+            Tuple of (served locally, tokens taken from a lease too small to
+            serve the request)
+        """
+        with self.lock:
+            lease = self.leases.get(user_id)
+            if lease is None:
+                return False, 0.0
+            if lease[1] <= time.monotonic():
+                del self.leases[user_id]
+                return False, 0.0
+            if lease[0] >= tokens:
+                lease[0] -= tokens
+                self.admitted += 1
+                return True, 0.0
+            taken, lease[0] = lease[0], 0.0
+            return False, taken
+
+    def allow_request(self, user_id: str, tokens: int = 1) -> bool:
+        """
+        Check if a request from a user should be allowed, fleet-wide.
+
+        Args:
+            user_id: Unique identifier for the user
+            tokens: Number of tokens to consume
+
+        Returns:
+            True if request is allowed, False otherwise
+        """
+        if not self.lease_size:
+            granted, _ = self._claim(user_id, tokens, tokens)
+            allowed = granted >= tokens
+            with self.lock:
+                if allowed:
+                    self.admitted += 1
+                else:
+                    self.rejected += 1
+            return allowed
+
+        served, taken = self._take_from_lease(user_id, tokens)
+        if served:
+            return True
+
+        needed = tokens - taken
+        granted, _ = self._claim(user_id, needed, max(needed, self.lease_size))
+        with self.lock:
+            now = time.monotonic()
+            lease = self.leases.get(user_id)
+            if lease is not None and lease[1] <= now:
+                del self.leases[user_id]
+                lease = None
+            if not granted:
+                # Hand the tokens taken out of the lease back, unless the
+                # lease expired in the meantime
+                if lease is not None:
+                    lease[0] += taken
+                self.rejected += 1
+                return False
+            if lease is None:
+                lease = self.leases[user_id] = [0.0, 0.0]
+            lease[0] += taken + granted - tokens
+            lease[1] = now + self.lease_ttl
+            self.admitted += 1
+            return True
+
+    def _available_tokens(self, user_id: str) -> float:
+        """
+        Tokens in the shared bucket plus any unexpired local lease.
+
+        Reads the bucket hash and refills it client-side instead of running
+        the script, so inspecting a bucket never writes to it and is not
+        counted as an admission round trip. The refill uses this node's clock,
+        so the figure is an estimate under clock skew.
+        """
+        tokens, ts = self.redis.hmget(self._key(user_id), "tokens", "ts")
+        if tokens is None or ts is None:
+            shared = float(self.capacity)
+        else:
+            elapsed = max(0.0, time.time() - float(ts))
+            shared = min(self.capacity, float(tokens) + elapsed * self.refill_rate)
+        with self.lock:
+            lease = self.leases.get(user_id)
+            if lease is not None and lease[1] > time.monotonic():
+                return shared + lease[0]
+        return shared
+
+    def get_user_stats(self, user_id: str) -> Dict[str, any]:
+        """
+        Get current rate limiting statistics for a user.
+
+        Args:
+            user_id: Unique identifier for the user
+
+        Returns:
+            Dictionary containing tokens available (shared + leased) and wait time
+        """
+        available = self._available_tokens(user_id)
+        return {
+            "tokens_available": available,
+            "capacity": self.capacity,
+            "refill_rate": self.refill_rate,
+            "wait_time_for_1_token": max(0.0, (1 - available) / self.refill_rate),
+        }
+
+    def get_wait_time(self, user_id: str, tokens: int = 1) -> float:
+        """
+        Get the time until tokens will be available for a user.
+
+        Args:
+            user_id: Unique identifier for the user
+            tokens: Number of tokens needed
+
+        Returns:
+            Time in seconds until tokens available
+        """
+        available = self._available_tokens(user_id)
+        return max(0.0, (tokens - available) / self.refill_rate)
+
+    def reset_user(self, user_id: str) -> None:
+        """
+        Reset rate limiting state for a user on every node.
+
+        Other nodes may still hold a lease for the user until it expires.
+
+        Args:
+            user_id: Unique identifier for the user
+        """
+        self.redis.delete(self._key(user_id))
+        with self.lock:
+            self.leases.pop(user_id, None)
+
+    def cleanup_inactive_users(self, inactive_threshold: float = 3600) -> int:
+        """
+        Drop expired local leases.
+
+        Buckets in Redis expire by themselves once fully refilled, so only the
+        node-local lease table needs cleaning.
+
+        Args:
+            inactive_threshold: Unused; leases expire after lease_ttl
+
+        Returns:
+            Number of leases removed
+        """
+        with self.lock:
+            now = time.monotonic()
+            expired = [
+                user_id for user_id, lease in self.leases.items() if lease[1] <= now
+            ]
+            for user_id in expired:
+                del self.leases[user_id]
+            return len(expired)
+
+    def get_metrics(self) -> Dict[str, float]:
+        """
+        Get round-trip accounting for this node.
+
+        Returns:
+            Dictionary with round trips, admissions, rejections and round trips
+            per admitted request
+        """
+        with self.lock:
+            return {
+                "round_trips": self.round_trips,
+                "admitted": self.admitted,
+                "rejected": self.rejected,
+                "round_trips_per_admitted": (
+                    self.round_trips / self.admitted if self.admitted else 0.0
+                ),
+            }
+
+    def get_algorithm_name(self) -> str:
+        """Get the name of the rate limiting algorithm."""
+        return "Token Bucket (Redis)"
+
+    def get_config(self) -> Dict[str, any]:
+        """Get the configuration parameters of the rate limiter."""
+        return {
+            "algorithm": self.get_algorithm_name(),
+            "capacity": self.capacity,
+            "refill_rate": self.refill_rate,
+            "lease_size": self.lease_size,
+            "lease_ttl": self.lease_ttl,
+            "active_leases": len(self.leases),
+        }
@@ -0,0 +1,371 @@
+"""
+Cross-process Token Bucket Rate Limiter backed by shared memory.
+
+When a server runs N worker processes, a per-process ``buckets`` dict lets
+every client through N times the configured limit. This limiter keeps all
+buckets in one fixed-size, memory-mapped hash table (a file under
+``/dev/shm`` by default) that every worker on the host maps, so the limit is
+enforced host-wide without a network hop.
+
+Table layout::
+
+    header  | magic, version, num_slots, capacity, refill_rate  (64 bytes)
+    slot[i] | key digest (16 bytes), tokens (f64), last refill (f64)
+
+Keys are stored as 128-bit BLAKE2b digests, which (unlike ``hash()``) are
+identical in every process. Slots are found by linear probing from the digest.
+
+Concurrency:
+- Every slot update happens under a lock on that slot's byte range
+  (``fcntl.lockf``), combined with a striped ``threading.Lock`` because POSIX
+  record locks do not exclude threads of the same process.
+- Claiming a slot for a new key additionally takes a table-wide insert lock
+  (the header's byte range) and re-probes, so two workers can never insert
+  the same key twice. Lookups of existing keys never take the insert lock.
+- Removing a key leaves a tombstone so probe chains stay intact. New keys may
+  reuse a tombstone, or any bucket that has refilled to capacity and is
+  therefore indistinguishable from a brand-new one.
+"""
+
+import fcntl
+import hashlib
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Tuple
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from base import RateLimiter
+
+MAGIC = b"TBSHM001"
+HEADER = struct.Struct("<8sIIdd")
+HEADER_SIZE = 64
+SLOT = struct.Struct("<16sdd")
+EMPTY = bytes(16)
+TOMBSTONE = b"\xff" * 16
+NUM_THREAD_STRIPES = 64
+
+
+def default_table_path(name: str) -> str:
+    """Path of a shared table, preferring the RAM-backed /dev/shm when present."""
+    directory = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    return os.path.join(directory, name)
+
+
+class SharedMemoryTokenBucketRateLimiter(RateLimiter):
+    """
+    Token bucket rate limiter whose buckets are shared by all processes on a host.
+
+    Every process that opens the same ``name`` (or ``path``) shares the same
+    buckets. The first process creates the table; later ones must use the same
+    capacity, refill rate and number of slots.
+
+    Args:
+        capacity: Maximum number of tokens per user
+        refill_rate: Number of tokens added per second per user
+        name: File name of the shared table (default: "token-bucket-limiter")
+        num_slots: Number of hash table slots, a power of two (default: 65536)
+        path: Explicit file path of the table, overrides name
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        refill_rate: float,
+        name: str = "token-bucket-limiter",
+        num_slots: int = 65536,
+        path: Optional[str] = None,
+    ):
+        if num_slots < 1 or num_slots & (num_slots - 1):
+            raise ValueError("num_slots must be a power of two")
+        self.capacity = capacity
+        self.refill_rate = refill_rate
+        self.num_slots = num_slots
+        self.path = path or default_table_path(name)
+        self._mask = num_slots - 1
+        self._size = HEADER_SIZE + num_slots * SLOT.size
+        self._stripes = [threading.Lock() for _ in range(NUM_THREAD_STRIPES)]
+        self._insert_lock = threading.Lock()
+
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            self._init_table()
+            self._mm = mmap.mmap(self._fd, self._size)
+        except Exception:
+            os.close(self._fd)
+            raise
+
+    def _init_table(self) -> None:
+        """Create the table if this is the first process, else validate it."""
+        fcntl.lockf(self._fd, fcntl.LOCK_EX, HEADER_SIZE, 0)
+        try:
+            if os.fstat(self._fd).st_size == 0:
+                os.ftruncate(self._fd, self._size)
+                header = HEADER.pack(
+                    MAGIC, 1, self.num_slots, self.capacity, self.refill_rate
+                )
+                os.pwrite(self._fd, header, 0)
+                return
+
+            magic, _, num_slots, capacity, refill_rate = HEADER.unpack(
+                os.pread(self._fd, HEADER.size, 0)
+            )
+            if magic != MAGIC:
+                raise ValueError(f"{self.path} is not a shared token bucket table")
+            if (num_slots, capacity, refill_rate) != (
+                self.num_slots,
+                self.capacity,
+                self.refill_rate,
+            ):
+                raise ValueError(
+                    f"{self.path} was created with num_slots={num_slots}, "
+                    f"capacity={capacity}, refill_rate={refill_rate}"
+                )
+        finally:
+            fcntl.lockf(self._fd, fcntl.LOCK_UN, HEADER_SIZE, 0)
+
+    @contextmanager
+    def _locked(self, offset: int, length: int, stripe: threading.Lock):
+        """Hold a byte-range lock across processes and a stripe lock across threads."""
+        with stripe:
+            fcntl.lockf(self._fd, fcntl.LOCK_EX, length, offset)
+            try:
+                yield
+            finally:
+                fcntl.lockf(self._fd, fcntl.LOCK_UN, length, offset)
+
+    def _slot_lock(self, index: int):
+        offset = HEADER_SIZE + index * SLOT.size
+        return self._locked(
+            offset, SLOT.size, self._stripes[index % NUM_THREAD_STRIPES]
+        )
+
+    def _probe_sequence(self, digest: bytes) -> Iterator[int]:
+        home = int.from_bytes(digest[:8], "little") & self._mask
+        for i in range(self.num_slots):
+            yield (home + i) & self._mask
+
+    def _read_slot(self, index: int) -> Tuple[bytes, float, float]:
+        return SLOT.unpack_from(self._mm, HEADER_SIZE + index * SLOT.size)
+
+    def _write_slot(
+        self, index: int, digest: bytes, tokens: float, last_refill: float
+    ) -> None:
+        SLOT.pack_into(
+            self._mm, HEADER_SIZE + index * SLOT.size, digest, tokens, last_refill
+        )
+
+    def _refilled(self, tokens: float, last_refill: float, now: float) -> float:
+        return min(self.capacity, tokens + (now - last_refill) * self.refill_rate)
+
+    def _consume_in_slot(self, index: int, digest: bytes, tokens: int) -> bool:
+        """Refill and consume in a slot already known to hold `digest`. Lock held."""
+        _, stored, last_refill = self._read_slot(index)
+        now = time.time()
+        available = self._refilled(stored, last_refill, now)
+        allowed = available >= tokens
+        if allowed:
+            available -= tokens
+        self._write_slot(index, digest, available, now)
+        return allowed
+
+    def _is_claimable(
+        self, slot_digest: bytes, stored: float, last_refill: float
+    ) -> bool:
+        """Whether a new key may take a slot (empty, tombstone or full bucket)."""
+        if slot_digest == EMPTY or slot_digest == TOMBSTONE:
+            return True
+        return self._refilled(stored, last_refill, time.time()) >= self.capacity
+
+    def _probe_for_insert(self, digest: bytes) -> int:
+        """Slot already holding `digest`, else the first slot a new key may claim."""
+        claimable = None
+        for index in self._probe_sequence(digest):
+            with self._slot_lock(index):
+                slot_digest, stored, last_refill = self._read_slot(index)
+            if slot_digest == digest:
+                return index
+            if slot_digest == EMPTY:
+                return index if claimable is None else claimable
+            if claimable is None and self._is_claimable(
+                slot_digest, stored, last_refill
+            ):
+                claimable = index
+        if claimable is None:
+            raise RuntimeError(f"Shared bucket table {self.path} is full")
+        return claimable
+
+    def _insert_and_consume(self, digest: bytes, tokens: int) -> bool:
+        """Claim a slot for a new key under the table-wide insert lock."""
+        with self._locked(0, HEADER_SIZE, self._insert_lock):
+            while True:
+                index = self._probe_for_insert(digest)
+                with self._slot_lock(index):
+                    slot_digest, stored, last_refill = self._read_slot(index)
+                    if slot_digest != digest:
+                        if not self._is_claimable(slot_digest, stored, last_refill):
+                            # The reused bucket became active again; probe again
+                            continue
+                        self._write_slot(index, digest, self.capacity, time.time())
+                    return self._consume_in_slot(index, digest, tokens)
+
+    def _find(self, digest: bytes) -> Optional[Tuple[float, float]]:
+        """Refill-free read of (tokens, last_refill) for a key, or None if absent."""
+        for index in self._probe_sequence(digest):
+            with self._slot_lock(index):
+                slot_digest, stored, last_refill = self._read_slot(index)
+            if slot_digest == digest:
+                return stored, last_refill
+            if slot_digest == EMPTY:
+                return None
+        return None
+
+    @staticmethod
+    def _digest(user_id: str) -> bytes:
+        return hashlib.blake2b(user_id.encode(), digest_size=16).digest()
+
+    def allow_request(self, user_id: str, tokens: int = 1) -> bool:
+        """
+        Check if a request from a user should be allowed, host-wide.
+
+        Args:
+            user_id: Unique identifier for the user
+            tokens: Number of tokens to consume
+
+        Returns:
+            True if request is allowed, False otherwise
+
+        Raises:
+            RuntimeError: If the key is new and every slot holds an active bucket
+        """
+        digest = self._digest(user_id)
+        for index in self._probe_sequence(digest):
+            offset = HEADER_SIZE + index * SLOT.size
+            with self._slot_lock(index):
+                slot_digest = self._mm[offset : offset + 16]
+                if slot_digest == digest:
+                    return self._consume_in_slot(index, digest, tokens)
+            if slot_digest == EMPTY:
+                break
+        return self._insert_and_consume(digest, tokens)
+
+    def _available_tokens(self, user_id: str) -> float:
+        found = self._find(self._digest(user_id))
+        if found is None:
+            return float(self.capacity)
+        return self._refilled(found[0], found[1], time.time())
+
+    def get_user_stats(self, user_id: str) -> Dict[str, any]:
+        """
+        Get current rate limiting statistics for a user.
+
+        Args:
+            user_id: Unique identifier for the user
+
+        Returns:
+            Dictionary containing tokens available and wait time
+        """
+        available = self._available_tokens(user_id)
+        return {
+            "tokens_available": available,
+            "capacity": self.capacity,
+            "refill_rate": self.refill_rate,
+            "wait_time_for_1_token": max(0.0, (1 - available) / self.refill_rate),
+        }
+
+    def get_wait_time(self, user_id: str, tokens: int = 1) -> float:
+        """
+        Get the time until tokens will be available for a user.
+
+        Args:
+            user_id: Unique identifier for the user
+            tokens: Number of tokens needed
+
+        Returns:
+            Time in seconds until tokens available
+        """
+        available = self._available_tokens(user_id)
+        return max(0.0, (tokens - available) / self.refill_rate)
+
+    def reset_user(self, user_id: str) -> None:
+        """
+        Reset rate limiting state for a specific user in every process.
+
+        Args:
+            user_id: Unique identifier for the user
+        """
+        digest = self._digest(user_id)
+        for index in self._probe_sequence(digest):
+            with self._slot_lock(index):
+                slot_digest, _, _ = self._read_slot(index)
+                if slot_digest == digest:
+                    self._write_slot(index, TOMBSTONE, 0.0, 0.0)
+                    return
+            if slot_digest == EMPTY:
+                return
+
+    def cleanup_inactive_users(self, inactive_threshold: float = 3600) -> int:
+        """
+        Tombstone buckets of users who haven't made requests recently.
+
+        Each slot is locked only while it is checked, so other workers keep
+        admitting requests during the scan.
+
+        Args:
+            inactive_threshold: Time in seconds after which a user is considered inactive
+
+        Returns:
+            Number of users removed
+        """
+        removed = 0
+        for index in range(self.num_slots):
+            with self._slot_lock(index):
+                slot_digest, _, last_refill = self._read_slot(index)
+                if slot_digest in (EMPTY, TOMBSTONE):
+                    continue
+                if (time.time() - last_refill) > inactive_threshold:
+                    self._write_slot(index, TOMBSTONE, 0.0, 0.0)
+                    removed += 1
+        return removed
+
+    def active_users(self) -> int:
+        """Count occupied slots (a full scan of the shared table)."""
+        count = 0
+        for index in range(self.num_slots):
+            slot_digest, _, _ = self._read_slot(index)
+            if slot_digest not in (EMPTY, TOMBSTONE):
+                count += 1
+        return count
+
+    def close(self) -> None:
+        """Unmap the table and close its file descriptor."""
+        self._mm.close()
+        os.close(self._fd)
+
+    def unlink(self) -> None:
+        """Delete the shared table file (other processes keep their mappings)."""
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+
+    def get_algorithm_name(self) -> str:
+        """Get the name of the rate limiting algorithm."""
+        return "Token Bucket (shared memory)"
+
+    def get_config(self) -> Dict[str, any]:
+        """Get the configuration parameters of the rate limiter."""
+        return {
+            "algorithm": self.get_algorithm_name(),
+            "capacity": self.capacity,
+            "refill_rate": self.refill_rate,
+            "num_slots": self.num_slots,
+            "path": self.path,
+            "active_users": self.active_users(),
+        }
@@ -0,0 +1,238 @@
+"""
+Binary snapshots of Token Bucket state for warm restarts.
+
+A restart empties the in-memory registry and hands every client a full
+burst. The limiter can instead write its partially drained buckets to a
+snapshot file and, on startup, map that file and restore buckets lazily:
+
+- Only buckets below capacity are written; a full bucket is indistinguishable
+  from a brand-new one
+- Each bucket is stored as its token count refilled up to the snapshot time,
+  and the snapshot records the wall-clock time it was taken, so restored
+  buckets are refilled for exactly the time the process was down
+- Restoring only maps the file and validates the header. Buckets are read
+  from the mapping the first time their key is seen, so restore time does
+  not grow with the number of keys
+
+File layout (little-endian, sections 8-byte aligned)::
+
+    header  | magic, version, table_size, count, capacity, refill_rate,
+            | taken_at                                        (64 bytes)
+    index   | u32[table_size]  open-addressing table -> entry, EMPTY if free
+    hashes  | u64[count]       64-bit BLAKE2b digest of each key
+    tokens  | f64[count]       tokens at snapshot time
+    offsets | u64[count + 1]   start of each key in the key blob
+    keys    | UTF-8 key bytes, concatenated
+
+Key digests use BLAKE2b rather than ``hash()`` so they are stable across
+processes and restarts. Files are written to a temporary path and renamed
+into place, so a crash mid-write never leaves a torn snapshot.
+"""
+
+import hashlib
+import math
+import mmap
+import os
+import struct
+from array import array
+from typing import Iterable, Iterator, Optional, Tuple
+
+MAGIC = b"TBSNAP01"
+VERSION = 1
+HEADER = struct.Struct("<8sIIQddd")
+HEADER_SIZE = 64
+EMPTY = 0xFFFFFFFF
+
+
+def key_digest(user_id: str) -> int:
+    """Stable 64-bit digest of a key."""
+    digest = hashlib.blake2b(user_id.encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+def _table_size(count: int) -> int:
+    """Power-of-two index size keeping the table at most half full."""
+    size = 8
+    while size < count * 2:
+        size *= 2
+    return size
+
+
+def _aligned(offset: int) -> int:
+    return (offset + 7) & ~7
+
+
+def write_snapshot(
+    path: str,
+    entries: Iterable[Tuple[str, float]],
+    capacity: float,
+    refill_rate: float,
+    taken_at: float,
+) -> int:
+    """
+    Atomically write a snapshot file.
+
+    Args:
+        path: Destination file
+        entries: (user_id, tokens) pairs, tokens refilled up to `taken_at`
+        capacity: Bucket capacity of the limiter
+        refill_rate: Refill rate of the limiter
+        taken_at: Wall-clock time the token counts refer to
+
+    Returns:
+        Number of buckets written
+    """
+    hashes = array("Q")
+    tokens = array("d")
+    offsets = array("Q", [0])
+    keys = bytearray()
+    for user_id, available in entries:
+        encoded = user_id.encode()
+        hashes.append(key_digest(user_id))
+        tokens.append(available)
+        keys += encoded
+        offsets.append(len(keys))
+
+    count = len(hashes)
+    table_size = _table_size(count)
+    mask = table_size - 1
+    index = array("I", [EMPTY]) * table_size
+    for entry, digest in enumerate(hashes):
+        position = digest & mask
+        while index[position] != EMPTY:
+            position = (position + 1) & mask
+        index[position] = entry
+
+    header = HEADER.pack(
+        MAGIC, VERSION, table_size, count, capacity, refill_rate, taken_at
+    )
+    temporary = f"{path}.tmp"
+    with open(temporary, "wb") as f:
+        f.write(header.ljust(HEADER_SIZE, b"\0"))
+        for section in (index, hashes, tokens, offsets):
+            f.write(section.tobytes())
+            f.write(b"\0" * (_aligned(f.tell()) - f.tell()))
+        f.write(keys)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporary, path)
+    return count
+
+
+class BucketSnapshot:
+    """
+    Memory-mapped, read-mostly view of a snapshot file.
+
+    The file is mapped copy-on-write: pop() marks an entry as taken in the
+    process's private copy of the page, so every entry is restored at most
+    once and the file on disk is never modified.
+
+    Args:
+        path: Snapshot file written by write_snapshot
+
+    Raises:
+        ValueError: If the file is not a snapshot of a supported version
+    """
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+        try:
+            self._map_sections()
+        except Exception:
+            self._mmap.close()
+            raise
+
+    def _map_sections(self) -> None:
+        if len(self._mmap) < HEADER_SIZE:
+            raise ValueError("Snapshot file is truncated")
+        (
+            magic,
+            version,
+            table_size,
+            count,
+            self.capacity,
+            self.refill_rate,
+            self.taken_at,
+        ) = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"Not a token bucket snapshot (version {version})")
+
+        self.count = count
+        self._mask = table_size - 1
+        view = memoryview(self._mmap)
+        offset = HEADER_SIZE
+        sections = []
+        for typecode, itemsize, length in (
+            ("I", 4, table_size),
+            ("Q", 8, count),
+            ("d", 8, count),
+            ("Q", 8, count + 1),
+        ):
+            end = offset + itemsize * length
+            if end > len(self._mmap):
+                raise ValueError("Snapshot file is truncated")
+            sections.append(view[offset:end].cast(typecode))
+            offset = _aligned(end)
+        self._index, self._hashes, self._tokens, self._offsets = sections
+        self._keys = view[offset:]
+        if offset + self._offsets[count] > len(self._mmap):
+            raise ValueError("Snapshot file is truncated")
+
+    def __len__(self) -> int:
+        return self.count
+
+    def full_at(self) -> float:
+        """Wall-clock time by which every bucket in the snapshot is full again."""
+        return self.taken_at + self.capacity / self.refill_rate
+
+    def _key(self, entry: int) -> str:
+        return bytes(
+            self._keys[self._offsets[entry] : self._offsets[entry + 1]]
+        ).decode()
+
+    def pop(self, user_id: str) -> Optional[float]:
+        """
+        Take a key's token count out of the snapshot.
+
+        Args:
+            user_id: Key to look up
+
+        Returns:
+            Tokens at snapshot time, or None if the key is absent or was
+            already taken
+        """
+        digest = key_digest(user_id)
+        index, hashes = self._index, self._hashes
+        position = digest & self._mask
+        while True:
+            entry = index[position]
+            if entry == EMPTY:
+                return None
+            if hashes[entry] == digest and self._key(entry) == user_id:
+                available = self._tokens[entry]
+                if math.isnan(available):
+                    return None
+                self._tokens[entry] = math.nan
+                return available
+            position = (position + 1) & self._mask
+
+    def items(self) -> Iterator[Tuple[str, float]]:
+        """Yield (user_id, tokens) for entries not yet taken."""
+        tokens = self._tokens
+        for entry in range(self.count):
+            available = tokens[entry]
+            if not math.isnan(available):
+                yield self._key(entry), available
+
+    def close(self) -> None:
+        """Unmap the snapshot file."""
+        for section in (
+            self._index,
+            self._hashes,
+            self._tokens,
+            self._offsets,
+            self._keys,
+        ):
+            section.release()
+        self._mmap.close()
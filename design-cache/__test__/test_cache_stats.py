@@ -0,0 +1,89 @@
+import pytest
+from cache import (
+    ConcurrentLRUCache,
+    LFUCache,
+    LRUCache,
+    TTLCache,
+    WindowTinyLFUCache,
+    cached,
+)
+from cache.stats import track_latency
+
+
+class FakeClock:
+    """Clock that only moves when advanced."""
+
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.mark.parametrize(
+    "make_cache",
+    [
+        lambda: LRUCache(2),
+        lambda: LFUCache(2),
+        lambda: WindowTinyLFUCache(2),
+        lambda: ConcurrentLRUCache(2, num_stripes=1),
+    ],
+    ids=["lru", "lfu", "tinylfu", "striped"],
+)
+def test_hits_misses_and_evictions(make_cache):
+    """
+    BASIC: Every size-bounded cache counts hits, misses and evictions.
+    """
+    cache = make_cache()
+    for key in "abc":
+        cache.get(key)
+        cache.put(key, key)
+    cache.get("c")
+
+    stats = cache.stats
+    assert (stats.hits, stats.misses) == (1, 3)
+    assert stats.evictions == 1
+    assert stats.hit_ratio() == 0.25
+
+    stats.reset()
+    assert cache.stats.snapshot()["misses"] == 0
+
+
+def test_ttl_expirations_and_weighted_rejections():
+    clock = FakeClock()
+    cache = TTLCache(10, clock=clock)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    clock.now += 11
+    assert cache.get("a") is None
+    assert cache.reap() == 1
+    assert cache.stats.snapshot()["expirations"] == 2
+    assert cache.stats.misses == 1
+
+    weighted = LRUCache(max_weight=100, weigher=lambda key, value: value)
+    weighted.put("huge", 50)
+    assert weighted.stats.evictions == 1
+
+
+def test_load_time_and_latency_histograms():
+    """
+    INTERMEDIATE: @cached records loads, and track_latency adds per-operation
+    histograms to one instance only.
+    """
+    cache = LRUCache(10)
+    histograms = track_latency(cache)
+
+    @cached(cache=cache)
+    def square(x):
+        return x * x
+
+    for x in (1, 2, 1, 1):
+        square(x)
+
+    snapshot = cache.stats.snapshot()
+    assert snapshot["loads"] == 2
+    assert snapshot["average_load_ms"] >= 0
+    assert histograms["get"].count == 4
+    assert histograms["put"].count == 2
+    assert 0 < snapshot["get_p50_us"] <= snapshot["get_p99_us"]
+    assert "get_p50_us" not in LRUCache(10).stats.snapshot()
@@ -0,0 +1,150 @@
+import pytest
+from cache import LFUCache, LRUCache, WindowTinyLFUCache
+from cache.lfu_cache import FrequencySketch
+
+
+def test_evicts_least_frequent_with_lru_tie_break():
+    """
+    BASIC: The lowest access count is evicted; among equals, the oldest.
+    """
+    cache = LFUCache(capacity=3)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.put("c", 3)
+    cache.get("a")
+    cache.get("a")
+    cache.get("c")
+
+    cache.put("d", 4)  # b has count 1 and is the only such key
+    assert "b" not in cache
+    cache.put("e", 5)  # d (count 1) is evicted before c (count 2)
+    assert "d" not in cache
+    assert cache.frequency("a") == 3 and cache.frequency("c") == 2
+    assert len(cache) == 3
+
+
+def test_update_counts_as_access_and_delete():
+    cache = LFUCache(capacity=2)
+    cache.put("a", 1)
+    cache.put("a", 2)
+    cache.put("b", 3)
+    cache.put("c", 4)  # b (count 1) goes, a (count 2) stays
+
+    assert cache.get("a") == 2
+    assert cache.get("b") is None
+    assert cache.delete("c")
+    assert not cache.delete("c")
+    cache.put("d", 5)
+    cache.put("e", 6)  # min count recomputed after delete: d goes
+    assert "d" not in cache and cache.get("a") == 2
+
+    with pytest.raises(ValueError):
+        LFUCache(capacity=0)
+
+
+def test_emptied_lowest_bucket_hands_eviction_to_the_next_count():
+    cache = LFUCache(
+        max_weight=30, weigher=lambda key, value: value, max_entry_weight=16
+    )
+    for key, accesses in (("a", 0), ("b", 2), ("c", 4)):
+        cache.put(key, 8)
+        for _ in range(accesses):
+            cache.get(key)
+    assert cache.delete("a")
+
+    cache.put("d", 8)  # fits: nothing evicted
+    cache.put("e", 8)  # d has the lowest count now
+    assert sorted(cache.entries) == ["b", "c", "e"]
+    cache.delete("e")
+    cache.put("f", 16)  # with e gone, b is the least frequent
+    assert sorted(cache.entries) == ["c", "f"]
+
+    counts = []
+    bucket = cache.root.next
+    while bucket is not cache.root:
+        counts.append(bucket.count)
+        bucket = bucket.next
+    assert counts == [1, 5]
+
+
+def test_sketch_estimates_and_decays():
+    sketch = FrequencySketch(capacity=100)
+    for _ in range(8):
+        sketch.increment("hot")
+    sketch.increment("warm")
+
+    assert sketch.frequency("hot") >= 8
+    assert sketch.frequency("warm") >= 1
+    assert sketch.frequency("cold") <= 1
+
+    # Filling the sample halves every counter
+    before = sketch.frequency("hot")
+    for i in range(sketch.sample_size):
+        sketch.increment(i)
+    assert sketch.frequency("hot") < before
+
+
+def test_tinylfu_rejects_one_hit_wonders():
+    """
+    INTERMEDIATE: A scan of never-repeated keys interleaved with a hot set
+    flushes an LRU cache of the same size but not the TinyLFU main area.
+    """
+    hot = [f"hot-{i}" for i in range(90)]
+    results = {}
+    for cache in (LRUCache(capacity=100), WindowTinyLFUCache(capacity=100)):
+        hits = 0
+        for i in range(20_000):
+            key = hot[i % len(hot)]
+            if cache.get(key) is None:
+                cache.put(key, key)
+            else:
+                hits += 1
+            scan = f"scan-{i}"
+            if cache.get(scan) is None:
+                cache.put(scan, i)
+        assert len(cache) <= 100
+        results[type(cache).__name__] = hits / 20_000
+
+    assert results["LRUCache"] < 0.1
+    assert results["WindowTinyLFUCache"] > 0.9
+
+
+def test_tinylfu_basic_operations():
+    cache = WindowTinyLFUCache(capacity=10)
+    cache.put("a", 1)
+    assert cache.get("a") == 1
+    cache.put("a", 2)
+    assert cache.get("a") == 2
+    assert cache.delete("a")
+    assert cache.get("a") is None
+    for i in range(50):
+        cache.put(i, i)
+    assert len(cache) == 10
+
+
+def test_lfu_weighted_mode():
+    """
+    INTERMEDIATE: Weighted eviction takes least frequently used entries
+    first and never evicts the entry being written.
+    """
+    cache = LFUCache(
+        max_weight=100, weigher=lambda key, value: len(value), max_entry_weight=60
+    )
+    for key in "abcd":
+        cache.put(key, "x" * 25)
+    cache.get("a")
+    cache.get("b")
+    cache.get("b")
+
+    cache.put("e", "x" * 40)  # evicts c and d, used once each
+    assert sorted(cache.entries) == ["a", "b", "e"]
+    assert cache.weight == 90
+
+    # Growing a rarely used entry evicts others, not the entry itself
+    cache.put("e", "x" * 60)
+    assert "e" in cache and cache.frequency("e") == 2
+    assert cache.weight <= 100
+
+    cache.put("e", "x" * 61)  # over max_entry_weight: dropped
+    assert "e" not in cache
+    assert cache.weight == sum(entry.weight for entry in cache.entries.values())
@@ -0,0 +1,142 @@
+import threading
+
+import pytest
+from cache import ConcurrentLRUCache, LRUCache
+
+
+def test_get_put_and_eviction_order():
+    """
+    BASIC: The least recently used entry is evicted first, and get refreshes
+    recency.
+    """
+    cache = LRUCache(capacity=3)
+    for key in (1, 2, 3):
+        cache.put(key, str(key))
+
+    assert cache.get(1) == "1"
+    cache.put(4, "4")  # evicts 2, the least recently used
+
+    assert cache.get(2) is None
+    assert cache.keys() == [4, 1, 3]
+    assert len(cache) == 3
+
+
+def test_update_moves_to_front_without_growing():
+    cache = LRUCache(capacity=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.put("a", 10)
+    cache.put("c", 3)  # evicts b
+
+    assert cache.get("a") == 10
+    assert "b" not in cache
+    assert len(cache) == 2
+
+
+def test_delete_and_clear():
+    cache = LRUCache(capacity=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+
+    assert cache.delete("a")
+    assert not cache.delete("a")
+    assert cache.keys() == ["b"]
+    cache.put("c", 3)
+    cache.put("d", 4)
+    assert cache.keys() == ["d", "c"]
+
+    cache.clear()
+    assert len(cache) == 0 and cache.keys() == []
+    cache.put("e", 5)
+    assert cache.get("e") == 5
+
+
+def test_pop_lru_removes_oldest_entry():
+    cache = LRUCache(capacity=3)
+    for key in "abc":
+        cache.put(key, key.upper())
+    cache.get("a")
+
+    assert cache.pop_lru() == ("b", "B")
+    assert cache.keys() == ["a", "c"]
+    cache.clear()
+    assert cache.pop_lru() is None
+
+
+def test_capacity_one_and_validation():
+    cache = LRUCache(capacity=1)
+    cache.put(1, "a")
+    cache.put(2, "b")
+    assert cache.get(1) is None and cache.get(2) == "b"
+
+    with pytest.raises(ValueError):
+        LRUCache(capacity=0)
+    with pytest.raises(ValueError):
+        ConcurrentLRUCache(capacity=4, num_stripes=8)
+
+
+def test_concurrent_cache_under_threads():
+    """
+    INTERMEDIATE: Many threads hammering the striped cache never exceed its
+    capacity or corrupt the per-segment lists.
+    """
+    cache = ConcurrentLRUCache(capacity=1_000, num_stripes=8)
+
+    def worker(offset: int) -> None:
+        for i in range(5_000):
+            key = (offset * 7 + i) % 3_000
+            if cache.get(key) is None:
+                cache.put(key, key * 2)
+
+    threads = [threading.Thread(target=worker, args=(t,)) for t in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(cache) <= 1_000
+    for segment in cache.segments:
+        assert len(segment.keys()) == len(segment) <= segment.capacity
+        assert all(segment.get(key) == key * 2 for key in segment.keys())
+
+
+def test_weighted_mode_evicts_by_budget():
+    """
+    INTERMEDIATE: With max_weight, LRU entries are evicted until the total
+    weight fits, and oversized values are not cached at all.
+    """
+    cache = LRUCache(
+        max_weight=100, weigher=lambda key, value: len(value), max_entry_weight=50
+    )
+    for key in "abcde":
+        cache.put(key, "x" * 20)
+    assert cache.weight == 100
+
+    cache.get("a")
+    cache.put("f", "x" * 30)  # evicts b and c, the least recently used
+    assert cache.keys() == ["f", "a", "e", "d"]
+    assert cache.weight == 90
+
+    # Above max_entry_weight: it would flush most of the cache, so skipped
+    cache.put("huge", "x" * 60)
+    assert "huge" not in cache
+    assert len(cache) == 4
+
+    cache.put("a", "x" * 5)
+    cache.delete("e")
+    assert cache.weight == 55
+
+
+def test_weighted_mode_with_count_limit_and_estimate():
+    cache = LRUCache(capacity=3, max_weight=10_000)
+    for i in range(5):
+        cache.put(i, b"x" * 100)
+    assert len(cache) == 3
+    assert 300 < cache.weight < 1_000
+
+    striped = ConcurrentLRUCache(num_stripes=4, max_weight=20_000)
+    for i in range(100):
+        striped.put(i, b"x" * 100)
+    assert 10_000 < striped.weight <= 20_000
+    with pytest.raises(ValueError):
+        LRUCache()
@@ -0,0 +1,268 @@
+import asyncio
+import threading
+import time
+
+import pytest
+from cache import ConcurrentLRUCache, LFUCache, LRUCache, TTLCache, cached
+
+
+class FakeClock:
+    """Clock that only moves when advanced."""
+
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.mark.parametrize(
+    "make_cache",
+    [lambda: LRUCache(10), lambda: LFUCache(10), lambda: TTLCache(60)],
+    ids=["lru", "lfu", "ttl"],
+)
+def test_memoizes_in_every_engine(make_cache):
+    """
+    BASIC: Results are computed once per key, including None, and can be
+    invalidated.
+    """
+    calls = []
+
+    @cached(cache=make_cache())
+    def lookup(user_id, suffix=""):
+        calls.append(user_id)
+        return None if user_id == "ghost" else f"{user_id}{suffix}"
+
+    assert lookup("alice") == "alice"
+    assert lookup("alice") == "alice"
+    assert lookup("alice", suffix="!") == "alice!"
+    assert lookup("ghost") is None
+    assert lookup("ghost") is None
+    assert calls == ["alice", "alice", "ghost"]
+
+    assert lookup.invalidate("alice") is True
+    lookup("alice")
+    assert calls[-1] == "alice" and len(calls) == 4
+    assert lookup.__name__ == "lookup"
+
+
+def test_custom_key():
+    @cached(cache=LRUCache(10), key=lambda request: request["id"])
+    def handle(request):
+        return request["body"]
+
+    assert handle({"id": 1, "body": "first"}) == "first"
+    assert handle({"id": 1, "body": "second"}) == "first"
+
+
+@pytest.mark.parametrize(
+    "make_cache",
+    [
+        lambda: LRUCache(max_weight=100_000, max_entry_weight=20_000),
+        lambda: ConcurrentLRUCache(
+            num_stripes=2, max_weight=100_000, max_entry_weight=20_000
+        ),
+    ],
+    ids=["lru", "concurrent-lru"],
+)
+def test_weighted_engines_weigh_the_memoized_result(make_cache):
+    """
+    INTERMEDIATE: The byte budget and the per-entry limit apply to the
+    results themselves, not to the small record wrapping them.
+    """
+    cache = make_cache()
+    calls = []
+
+    @cached(cache=cache)
+    def payload(size):
+        calls.append(size)
+        return b"x" * size
+
+    payload(10_000)
+    assert 10_000 < cache.weight < 11_000
+
+    payload(30_000)  # heavier than max_entry_weight: never cached
+    payload(30_000)
+    assert calls == [10_000, 30_000, 30_000]
+
+    for size in range(1_000, 60_000, 1_000):
+        payload(size)
+    assert cache.weight <= 100_000
+
+
+def test_concurrent_misses_are_coalesced():
+    """
+    INTERMEDIATE: Threads missing the same key wait for one computation and
+    share its result or its exception.
+    """
+    calls = []
+    release = threading.Event()
+
+    @cached(cache=TTLCache(60))
+    def slow(key):
+        calls.append(key)
+        release.wait(5)
+        if key == "bad":
+            raise RuntimeError("backend down")
+        return key.upper()
+
+    results, errors = [], []
+
+    def call(key):
+        try:
+            results.append(slow(key))
+        except RuntimeError as error:
+            errors.append(error)
+
+    threads = [
+        threading.Thread(target=call, args=(key,)) for key in ["hot"] * 8 + ["bad"] * 4
+    ]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.1)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(calls) == ["bad", "hot"]
+    assert results == ["HOT"] * 8
+    assert len(errors) == 4
+    # Failures are not cached
+    assert "bad" not in slow.cache
+
+
+class RacyMissCache(LRUCache):
+    """LRU cache whose next lookup runs a hook and then misses, as if a
+    concurrent leader published just after the lookup read the map."""
+
+    def __init__(self, capacity: int):
+        super().__init__(capacity)
+        self.during_miss = None
+
+    def get(self, key):
+        hook, self.during_miss = self.during_miss, None
+        if hook is None:
+            return super().get(key)
+        hook()
+        return None
+
+
+def test_miss_racing_a_finished_leader_reuses_its_result():
+    """
+    INTERMEDIATE: A caller whose lookup missed just before the leader
+    published must not recompute once the leader has gone.
+    """
+    cache = RacyMissCache(10)
+    calls = []
+
+    @cached(cache=cache)
+    def lookup(user_id):
+        calls.append(user_id)
+        return user_id.upper()
+
+    cache.during_miss = lambda: lookup("alice")
+    assert lookup("alice") == "ALICE"
+    assert calls == ["alice"]
+    assert cache.stats.misses == 1
+
+
+async def test_async_miss_racing_a_finished_load_reuses_its_result():
+    cache = RacyMissCache(10)
+    calls = []
+
+    @cached(cache=cache)
+    async def lookup(user_id):
+        calls.append(user_id)
+        return user_id.upper()
+
+    def load_on_another_loop():
+        other = threading.Thread(target=asyncio.run, args=(lookup("alice"),))
+        other.start()
+        other.join()
+
+    cache.during_miss = load_on_another_loop
+    assert await lookup("alice") == "ALICE"
+    assert calls == ["alice"]
+
+
+def test_stale_while_revalidate_sync():
+    """
+    ADVANCED: A stale value is served immediately while a single background
+    refresh replaces it.
+    """
+    clock = FakeClock()
+    version = [1]
+    refreshing = threading.Event()
+    release = threading.Event()
+
+    @cached(cache=LRUCache(10), stale_after=10, clock=clock)
+    def config(name):
+        if version[0] > 1:
+            refreshing.set()
+            release.wait(5)
+        return f"{name}-v{version[0]}"
+
+    assert config("db") == "db-v1"
+    version[0] = 2
+    clock.now += 11
+
+    assert config("db") == "db-v1"
+    assert refreshing.wait(5)
+    assert config("db") == "db-v1"
+    release.set()
+
+    deadline = time.monotonic() + 5
+    while config("db") != "db-v2" and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert config("db") == "db-v2"
+
+
+async def test_async_coalescing_and_cancellation():
+    """
+    INTERMEDIATE: Concurrent coroutines share one load, and a cancelled
+    caller does not cancel it for the others.
+    """
+    calls = []
+
+    @cached(cache=LFUCache(10))
+    async def fetch(key):
+        calls.append(key)
+        await asyncio.sleep(0.05)
+        return key * 2
+
+    first = asyncio.ensure_future(fetch(21))
+    await asyncio.sleep(0)
+    first.cancel()
+    results = await asyncio.gather(*(fetch(21) for _ in range(10)))
+
+    assert results == [42] * 10
+    assert calls == [21]
+    assert await fetch(21) == 42
+
+
+async def test_async_errors_and_stale_while_revalidate():
+    clock = FakeClock()
+    version = [1]
+
+    @cached(cache=TTLCache(60, clock=clock), stale_after=5, clock=clock)
+    async def fetch(key):
+        await asyncio.sleep(0.01)
+        if version[0] == 0:
+            raise ValueError(key)
+        return f"{key}-v{version[0]}"
+
+    assert await fetch("a") == "a-v1"
+    version[0] = 2
+    clock.now += 6
+    assert await fetch("a") == "a-v1"
+    await asyncio.sleep(0.05)
+    assert await fetch("a") == "a-v2"
+
+    version[0] = 0
+    with pytest.raises(ValueError):
+        await fetch("b")
+    # A failed background refresh keeps serving the stale value
+    clock.now += 6
+    assert await fetch("a") == "a-v2"
+    await asyncio.sleep(0.05)
+    assert await fetch("a") == "a-v2"
@@ -0,0 +1,137 @@
+import pickle
+import time
+
+import pytest
+from cache import LocalCacheServer, NearCache
+
+
+def wait_until(condition, timeout: float = 2.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.005)
+    return True
+
+
+class FakeClock:
+    """Clock that only moves when advanced."""
+
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def nodes():
+    server = LocalCacheServer()
+    clock = FakeClock()
+    a = NearCache(server, l1_ttl=30, clock=clock)
+    b = NearCache(server, l1_ttl=30, clock=clock)
+    yield server, clock, a, b
+    a.close()
+    b.close()
+
+
+def test_reads_are_served_from_l1_after_first_fetch(nodes):
+    """
+    BASIC: A value written on one node is fetched once from L2 by another,
+    then served from its L1.
+    """
+    server, _, a, b = nodes
+    a.put("user:1", {"name": "alice"})
+
+    commands = server.commands
+    assert b.get("user:1") == {"name": "alice"}
+    assert b.get("user:1") == {"name": "alice"}
+    assert server.commands == commands + 1
+    assert b.get("missing") is None
+
+    metrics = b.get_metrics()
+    assert (metrics["l1_hits"], metrics["l2_hits"], metrics["misses"]) == (1, 1, 1)
+
+
+def test_writes_invalidate_other_nodes(nodes):
+    """
+    INTERMEDIATE: Updates and deletes on one node drop the key from every
+    other node's L1.
+    """
+    _, _, a, b = nodes
+    a.put("config", 1)
+    assert b.get("config") == 1
+
+    a.put("config", 2)
+    assert wait_until(lambda: "config" not in b.l1)
+    assert b.get("config") == 2
+
+    b.delete("config")
+    assert wait_until(lambda: "config" not in a.l1)
+    assert a.get("config") is None
+    assert a.get_metrics()["invalidations"] == 1
+
+
+def test_get_many_uses_one_round_trip(nodes):
+    server, _, a, b = nodes
+    for i in range(10):
+        a.put(f"k{i}", i)
+    b.get("k0")
+
+    commands = server.commands
+    found = b.get_many([f"k{i}" for i in range(12)])
+    assert found == {f"k{i}": i for i in range(10)}
+    assert server.commands == commands + 1
+
+    assert b.get_many(["k1", "k2"]) == {"k1": 1, "k2": 2}
+    assert server.commands == commands + 1
+
+
+def test_l1_ttl_bounds_staleness_without_invalidations(nodes):
+    """
+    ADVANCED: A write that bypasses the invalidation channel is visible once
+    the L1 copy is older than l1_ttl.
+    """
+    server, clock, a, _ = nodes
+    a.put("price", 10)
+    server.set("cache:price", pickle.dumps(11))  # no invalidation published
+
+    assert a.get("price") == 10
+    clock.now += 31
+    assert a.get("price") == 11
+
+
+def test_fractional_ttl_is_sent_as_whole_milliseconds(nodes):
+    server, _, a, b = nodes
+    with pytest.raises(ValueError):
+        server.set("cache:raw", b"x", ex=0.5)  # redis-py refuses float expiries
+
+    a.put("session", "token", ttl_seconds=0.05)
+    assert server.get("cache:session") is not None
+    time.sleep(0.1)
+
+    assert b.get("session") is None
+
+
+def test_l1_never_outlives_the_l2_ttl(nodes):
+    """
+    INTERMEDIATE: L1 copies expire with the L2 key when its TTL is shorter
+    than l1_ttl, on writes and on read-through fills.
+    """
+    server, clock, a, b = nodes
+    a.put("session", "token", ttl_seconds=2)
+    assert a.l1.get("session")[1] == clock.now + 2
+
+    server.set("cache:otp", pickle.dumps(123456), px=2000)
+    server.set("cache:code", pickle.dumps(42), px=1500)
+    server.set("cache:plain", pickle.dumps(0))
+    assert b.get("otp") == 123456
+    assert b.get_many(["code", "plain"]) == {"code": 42, "plain": 0}
+    assert clock.now + 1 < b.l1.get("otp")[1] <= clock.now + 2
+    assert clock.now < b.l1.get("code")[1] <= clock.now + 1.5
+    assert b.l1.get("plain")[1] == clock.now + 30
+
+    clock.now += 2
+    server.delete("cache:session", "cache:otp")  # expired in L2 by now
+    assert a.get("session") is None
+    assert b.get("otp") is None
@@ -0,0 +1,180 @@
+import threading
+from collections import Counter
+
+import pytest
+from cache import HashRing, LRUCache, ShardedCache
+
+
+def make_shards(count: int):
+    return {f"node-{i}": LRUCache(10_000) for i in range(count)}
+
+
+def test_ring_is_stable_and_balanced():
+    """
+    BASIC: Placement is deterministic, and virtual nodes spread keys evenly.
+    """
+    ring = HashRing([f"node-{i}" for i in range(4)])
+    again = HashRing([f"node-{i}" for i in reversed(range(4))])
+    keys = [f"key-{i}" for i in range(20_000)]
+
+    assert all(ring.node_for(key) == again.node_for(key) for key in keys)
+    load = Counter(ring.node_for(key) for key in keys)
+    assert max(load.values()) / (len(keys) / 4) < 1.25
+
+
+def test_membership_changes_move_only_their_share():
+    """
+    INTERMEDIATE: Adding a fifth node moves about 1/5 of the keys, all onto
+    the new node; removing it moves exactly those keys back.
+    """
+    ring = HashRing([f"node-{i}" for i in range(4)])
+    keys = [f"key-{i}" for i in range(20_000)]
+    before = {key: ring.node_for(key) for key in keys}
+
+    ring.add_node("node-4")
+    moved = [key for key in keys if ring.node_for(key) != before[key]]
+    assert 0.15 < len(moved) / len(keys) < 0.25
+    assert all(ring.node_for(key) == "node-4" for key in moved)
+
+    ring.remove_node("node-4")
+    assert all(ring.node_for(key) == before[key] for key in keys)
+    with pytest.raises(ValueError):
+        ring.add_node("node-0")
+
+
+def test_lookups_during_membership_changes_see_a_whole_ring():
+    """
+    ADVANCED: Lock-free lookups racing with add/remove always answer from the
+    ring before or after the change, never from a half-updated one.
+    """
+    ring = HashRing([f"node-{i}" for i in range(4)], virtual_nodes=40)
+    keys = [f"key-{i}" for i in range(500)]
+    before = {key: ring.node_for(key) for key in keys}
+    stop = threading.Event()
+    wrong = []
+
+    def read():
+        while not stop.is_set():
+            for key in keys:
+                if ring.node_for(key) not in (before[key], "node-4"):
+                    wrong.append(key)
+                if ring.nodes_for(key, 2)[0] not in (before[key], "node-4"):
+                    wrong.append(key)
+
+    readers = [threading.Thread(target=read) for _ in range(3)]
+    for reader in readers:
+        reader.start()
+    for _ in range(100):
+        ring.add_node("node-4")
+        ring.remove_node("node-4")
+    stop.set()
+    for reader in readers:
+        reader.join()
+
+    assert wrong == []
+
+
+def test_nodes_for_returns_distinct_successors():
+    ring = HashRing(["a", "b", "c"])
+    nodes = ring.nodes_for("key", 5)
+    assert sorted(nodes) == ["a", "b", "c"]
+    assert nodes[0] == ring.node_for("key")
+    with pytest.raises(LookupError):
+        HashRing().node_for("key")
+
+
+def test_sharded_cache_routes_and_gets_many_in_parallel():
+    cache = ShardedCache(make_shards(4))
+    try:
+        for i in range(200):
+            cache.put(f"key-{i}", i)
+        assert cache.get("key-7") == 7
+        assert "key-7" in cache.shard_for("key-7")
+        assert sum(len(shard) for shard in cache.shards.values()) == 200
+
+        found = cache.get_many([f"key-{i}" for i in range(0, 220, 2)])
+        assert found == {f"key-{i}": i for i in range(0, 200, 2)}
+        assert cache.delete("key-7") is True
+        assert cache.get("key-7") is None
+    finally:
+        cache.close()
+
+
+def test_hot_keys_are_replicated_and_never_stale():
+    """
+    ADVANCED: Hot keys get copies on the next shards and reads spread over
+    them; writes refresh or drop the copies, so no read sees an old value.
+    """
+    cache = ShardedCache(make_shards(4), replicas=2, hot_threshold=4)
+    try:
+        cache.put("hot", 1)
+        for _ in range(10):
+            assert cache.get("hot") == 1
+        cache.put("hot", 2)
+        holders = [name for name, shard in cache.shards.items() if "hot" in shard]
+        assert len(holders) == 3
+        assert {cache.get("hot") for _ in range(50)} == {2}
+
+        cache.put("cold", 1)
+        assert [name for name, s in cache.shards.items() if "cold" in s] == [
+            cache.ring.node_for("cold")
+        ]
+        cache.delete("hot")
+        assert all("hot" not in shard for shard in cache.shards.values())
+    finally:
+        cache.close()
+
+
+class RacingKey:
+    """Key whose first ring lookup after arming runs a hook, e.g. a membership
+    change landing while a request is routing."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.during_lookup = None
+
+    def __str__(self) -> str:
+        hook, self.during_lookup = self.during_lookup, None
+        if hook is not None:
+            hook()
+        return self.name
+
+
+@pytest.mark.parametrize("replicas", [0, 2])
+def test_requests_racing_shard_removal_route_on_one_snapshot(replicas):
+    """
+    ADVANCED: A request that resolved its shard just before remove_shard
+    still reaches that shard's cache rather than failing with KeyError.
+    """
+    cache = ShardedCache(make_shards(4), replicas=replicas)
+    try:
+        key = RacingKey("key-1")
+        cache.put(key, 1)
+        owner = cache.ring.node_for("key-1")
+
+        key.during_lookup = lambda: cache.remove_shard(owner)
+        assert cache.get(key) == 1
+        assert owner not in cache.shards
+
+        other = RacingKey("key-2")
+        cache.put(other, 2)
+        other.during_lookup = lambda: cache.add_shard(owner, LRUCache(10))
+        assert cache.get_many([other]) == {other: 2}
+        assert owner in cache.shards
+    finally:
+        cache.close()
+
+
+def test_replicated_reads_take_no_global_lock():
+    cache = ShardedCache(make_shards(4), replicas=1)
+    try:
+        cache.put("key", 1)
+        with cache.lock:
+            reader = threading.Thread(
+                target=lambda: [cache.get("key") for _ in range(10)]
+            )
+            reader.start()
+            reader.join(timeout=2)
+            assert not reader.is_alive()
+    finally:
+        cache.close()
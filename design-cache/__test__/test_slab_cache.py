@@ -0,0 +1,190 @@
+import threading
+
+import pytest
+from cache import SlabCache
+from cache.slab_cache import SlabArena
+
+KB = 1024
+
+
+class FakeClock:
+    """Clock that only moves when advanced."""
+
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_arena_trims_and_merges_blocks():
+    """
+    BASIC: An allocation keeps only the blocks it needs, and freeing
+    everything merges the arena back into whole top-level blocks.
+    """
+    arena = SlabArena(64 * KB, min_block=KB, max_block=16 * KB)
+    first = arena.allocate(5 * KB)  # 4 KB + 1 KB blocks, not 8 KB
+    second = arena.allocate(3 * KB)
+    third = arena.allocate(1)
+
+    assert arena.free_bytes == 64 * KB - 9 * KB
+    assert len({first, second, third}) == 3
+    for offset, size in ((second, 3 * KB), (first, 5 * KB), (third, 1)):
+        arena.free(offset, size)
+
+    assert arena.free_bytes == 64 * KB
+    assert sorted(arena.free_lists[-1]) == [0, 16 * KB, 32 * KB, 48 * KB]
+    assert not any(arena.free_lists[:-1])
+    arena.close()
+
+
+def test_arena_reports_exhaustion_and_validates():
+    arena = SlabArena(32 * KB, min_block=KB, max_block=16 * KB)
+    assert arena.allocate(16 * KB) is not None
+    assert arena.allocate(16 * KB) is not None
+    assert arena.allocate(1) is None
+    arena.close()
+
+    with pytest.raises(ValueError):
+        SlabArena(32 * KB, min_block=1000)
+    with pytest.raises(ValueError):
+        SlabArena(8 * KB, min_block=KB, max_block=16 * KB)
+
+
+def test_arena_uses_a_size_that_is_not_a_multiple_of_max_block():
+    """
+    INTERMEDIATE: The remainder after the last whole max_block is carved into
+    smaller blocks instead of being dropped, and never merges past the end.
+    """
+    arena = SlabArena(21 * KB + 100, min_block=KB, max_block=8 * KB)
+    assert arena.size == arena.free_bytes == 21 * KB
+    offsets = [arena.allocate(KB) for _ in range(21)]
+    assert None not in offsets and arena.allocate(1) is None
+
+    for offset in offsets:
+        arena.free(offset, KB)
+    assert arena.free_bytes == 21 * KB
+    assert [sorted(free) for free in arena.free_lists] == [
+        [20 * KB],
+        [],
+        [16 * KB],
+        [0, 8 * KB],
+    ]
+    arena.close()
+
+
+def test_max_value_must_fit_its_rounded_block():
+    # 3 KB rounds up to a 4 KB block, which a 3 KB arena cannot hold
+    with pytest.raises(ValueError, match="4096-byte blocks"):
+        SlabCache(arena_bytes=3 * KB, max_value_bytes=3 * KB, min_block=KB)
+
+    cache = SlabCache(arena_bytes=100 * KB, max_value_bytes=12 * KB, min_block=KB)
+    assert cache.arena.max_block == 16 * KB
+    assert cache.arena.size == 100 * KB  # not rounded down to 96 KB
+    cache.put("big", bytes(12 * KB))
+    assert len(cache.get("big")) == 12 * KB
+    cache.close()
+
+
+def test_get_returns_readonly_view_without_copy():
+    cache = SlabCache(arena_bytes=256 * KB, min_block=KB)
+    payload = bytes(range(256)) * 40
+    cache.put("page", payload)
+
+    view = cache.get("page")
+    assert isinstance(view, memoryview)
+    assert view.readonly
+    assert view == payload
+    assert view.obj is cache.view.obj  # a window on the arena, not a copy
+    assert cache.weight == len(payload)
+    assert cache.get("missing") is None
+    assert cache.stats.hits == 1 and cache.stats.misses == 1
+
+
+def test_evicts_least_recently_used_values_when_full():
+    """
+    INTERMEDIATE: When no block is large enough, least recently used values
+    are freed until the new one fits.
+    """
+    cache = SlabCache(arena_bytes=64 * KB, max_value_bytes=16 * KB, min_block=KB)
+    for key in range(4):
+        cache.put(key, bytes([key]) * 16 * KB)
+    cache.get(0)
+
+    cache.put("new", b"x" * 10 * KB)
+
+    assert cache.get(1) is None
+    assert {0, 2, 3, "new"} <= set(cache.index.map)
+    assert cache.get("new") == b"x" * 10 * KB
+    assert cache.get(0) == b"\x00" * 16 * KB
+    assert cache.stats.evictions == 1
+
+
+def test_overwrite_delete_and_oversized_values_free_blocks():
+    cache = SlabCache(arena_bytes=64 * KB, max_value_bytes=16 * KB, min_block=KB)
+    cache.put("a", b"1" * 10 * KB)
+    cache.put("a", b"2" * 3 * KB)
+    assert cache.arena.free_bytes == 61 * KB
+    assert cache.get("a") == b"2" * 3 * KB
+
+    cache.put("a", b"3" * 20 * KB)  # too large: refused, old value dropped
+    assert "a" not in cache
+    assert cache.arena.free_bytes == 64 * KB
+
+    cache.put("b", bytearray(b"buffer"))
+    assert cache.delete("b") is True
+    assert cache.delete("b") is False
+    assert cache.weight == 0
+    assert cache.arena.free_bytes == 64 * KB
+
+
+def test_ttl_expiry_on_read_and_reap():
+    clock = FakeClock()
+    cache = SlabCache(
+        arena_bytes=64 * KB, min_block=KB, default_ttl_seconds=10, clock=clock
+    )
+    cache.put("short", b"s" * KB)
+    cache.put("long", b"l" * KB, ttl_seconds=60)
+    cache.put("expiring", b"e" * KB, ttl_seconds=5)
+
+    clock.now += 7
+    assert cache.get("expiring") is None
+    clock.now += 5
+    assert cache.reap() == 1
+    assert cache.get("long") == b"l" * KB
+    assert cache.stats.expirations == 2
+    assert cache.arena.free_bytes == 63 * KB
+
+
+def test_close_refuses_while_views_are_alive():
+    cache = SlabCache(arena_bytes=64 * KB, min_block=KB)
+    cache.put("a", b"a" * 100)
+    view = cache.get("a")
+    with pytest.raises(BufferError):
+        cache.arena.close()
+    view.release()
+    cache.close()
+
+
+def test_concurrent_puts_and_gets():
+    # Room for every key, so a view is only reused by its own thread
+    cache = SlabCache(arena_bytes=1024 * KB, max_value_bytes=8 * KB, min_block=KB)
+    errors = []
+
+    def worker(n: int) -> None:
+        for i in range(500):
+            key = (n, i % 40)
+            payload = bytes([n]) * (KB + i)
+            cache.put(key, payload)
+            if cache.get(key) != payload:
+                errors.append(key)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert len(cache) == 160
+    assert cache.weight <= cache.arena.size - cache.arena.free_bytes
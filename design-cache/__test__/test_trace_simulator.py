@@ -0,0 +1,67 @@
+import gzip
+
+import trace_simulator
+from trace_simulator import format_curves, main, read_trace, replay
+
+
+def write_trace(path, lines):
+    path.write_text("\n".join(lines) + "\n")
+    return str(path)
+
+
+def test_read_trace_streams_both_formats(tmp_path):
+    plain = write_trace(tmp_path / "trace.txt", ["# header", "a", "", "b"])
+    assert list(read_trace(plain)) == [(None, "a"), (None, "b")]
+
+    compressed = tmp_path / "trace.txt.gz"
+    with gzip.open(compressed, "wt") as f:
+        f.write("1.5 a\n2.0 b\n")
+    assert list(read_trace(str(compressed))) == [(1.5, "a"), (2.0, "b")]
+
+
+def test_replay_hit_ratio_curves(tmp_path, capsys):
+    """
+    BASIC: A loop over 4 keys hits only once the cache holds all of them,
+    and TTL caches miss once entries outlive their TTL.
+    """
+    trace = [(None, key) for key in "abcd" * 50]
+    results = replay(trace, [3, 4], ["lru", "lfu", "tinylfu"], [10.0, 1000.0])
+
+    assert results[("lru", 3)].hit_ratio() == 0.0
+    assert results[("lru", 4)].hit_ratio() == 0.98
+    assert results[("lfu", 4)].hit_ratio() == 0.98
+    assert results[("ttl", 1000.0)].hit_ratio() == 0.98
+    # Reused every 4 seconds but expiring 10 seconds after each put
+    assert results[("ttl", 10.0)].hit_ratio() == 0.66
+    assert "lru" in format_curves(results)
+
+    path = write_trace(
+        tmp_path / "trace.txt", [f"{i * 10} k{i % 4}" for i in range(40)]
+    )
+    assert main([path, "--capacities", "4", "--policies", "lru", "--ttls", "5"]) == 0
+    output = capsys.readouterr().out
+    assert "0.9000" in output  # LRU: 4 cold misses out of 40
+    assert "0.0000" in output  # TTL 5s: every key returns after 40s
+
+
+def test_replay_reaps_ttl_caches(monkeypatch):
+    """
+    INTERMEDIATE: TTL caches are reaped as an epoch-timestamped trace of
+    distinct keys advances, so they only hold keys still inside their TTL.
+    """
+    created = []
+
+    class RecordingTTLCache(trace_simulator.TTLCache):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            created.append(self)
+
+    monkeypatch.setattr(trace_simulator, "TTLCache", RecordingTTLCache)
+    start = 1_700_000_000.0
+    trace = [(start + i, f"k{i}") for i in range(5000)]
+    results = replay(trace, [], [], [10.0])
+
+    (cache,) = created
+    assert cache.wheel.current >= int(start)
+    assert len(cache) <= trace_simulator.REAP_EVERY + 10
+    assert results[("ttl", 10.0)].expirations >= 5000 - trace_simulator.REAP_EVERY - 10
@@ -0,0 +1,151 @@
+import random
+import time
+
+from cache import TTLCache
+from cache.ttl_cache import TimingWheel
+
+
+class FakeClock:
+    """Clock that only moves when advanced."""
+
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_get_expires_lazily():
+    """
+    BASIC: Entries are visible until their TTL passes, then reads miss and
+    drop them.
+    """
+    clock = FakeClock()
+    cache = TTLCache(default_ttl_seconds=10, clock=clock)
+    cache.put("a", 1)
+    cache.put("b", 2, ttl_seconds=30)
+
+    clock.now += 9.5
+    assert cache.get("a") == 1
+
+    clock.now += 0.5
+    assert cache.get("a") is None
+    assert "a" not in cache
+    assert cache.get("b") == 2
+    assert len(cache) == 1
+
+
+def test_put_refreshes_ttl():
+    clock = FakeClock()
+    cache = TTLCache(default_ttl_seconds=10, clock=clock)
+    cache.put("a", 1)
+    clock.now += 8
+    cache.put("a", 2)
+    clock.now += 8
+
+    assert cache.reap() == 0
+    assert cache.get("a") == 2
+    assert cache.delete("a") is True
+    assert cache.delete("a") is False
+
+
+def test_reap_is_bounded_and_only_removes_expired():
+    """
+    INTERMEDIATE: reap removes at most max_items per call and never touches
+    live entries.
+    """
+    clock = FakeClock()
+    cache = TTLCache(default_ttl_seconds=5, clock=clock)
+    for i in range(250):
+        cache.put(f"short-{i}", i)
+    for i in range(100):
+        cache.put(f"long-{i}", i, ttl_seconds=3600)
+
+    clock.now += 6
+    assert cache.reap(max_items=100) == 100
+    assert cache.reap(max_items=100) == 100
+    assert cache.reap(max_items=100) == 50
+    assert cache.reap(max_items=100) == 0
+    assert len(cache) == 100
+    assert cache.get("long-0") == 0
+
+
+def test_cleanup_expired_matches_a_full_scan():
+    """
+    ADVANCED: Random TTLs spanning several wheel levels expire exactly when a
+    full scan says they should, including entries that cascade down from
+    coarse buckets and entries beyond the wheel's span.
+    """
+    rng = random.Random(3)
+    clock = FakeClock()
+    cache = TTLCache(clock=clock, tick_seconds=0.5)
+    expiry = {}
+    for i in range(2000):
+        ttl = rng.choice([rng.uniform(0, 30), rng.uniform(0, 5000), 1e8])
+        cache.put(i, i, ttl_seconds=ttl)
+        expiry[i] = clock.now + ttl
+
+    for _ in range(40):
+        clock.now += rng.uniform(0, 200)
+        cache.cleanup_expired()
+        alive = {key for key, at in expiry.items() if at > clock.now}
+        # The reaper may lag by up to one tick; reads never do
+        assert alive <= set(cache.entries)
+        assert all(expiry[key] > clock.now - 0.5 for key in cache.entries)
+        assert {key for key in expiry if key in cache} == alive
+
+    assert len(cache.wheel) == len(cache.entries)
+
+
+def test_wheel_catches_up_when_empty():
+    wheel = TimingWheel(tick=1.0, start=0.0)
+    assert wheel.advance(1e6, max_items=10) == []
+    assert wheel.current == 1_000_000
+
+
+def test_reap_bounds_ticks_after_a_clock_jump():
+    """
+    INTERMEDIATE: a large clock jump with a long-lived entry still filed is
+    worked off over several bounded reaps rather than one pass per tick.
+    """
+    clock = FakeClock(0.0)
+    cache = TTLCache(default_ttl_seconds=10, clock=clock)
+    cache.put("forever", 0, ttl_seconds=1e9)
+    for i in range(50):
+        cache.put(i, i, ttl_seconds=random.uniform(1, 5e5))
+    clock.now = 2e6
+
+    turned = []
+    cascade = cache.wheel._cascade
+
+    def counting_cascade(tick):
+        turned.append(tick)
+        cascade(tick)
+
+    cache.wheel._cascade = counting_cascade
+    removed = 0
+    for _ in range(1000):
+        turned.clear()
+        removed += cache.reap(max_items=100)
+        assert len(turned) <= 100
+        if not cache.wheel.behind(clock.now):
+            break
+
+    assert removed == 50
+    assert list(cache.entries) == ["forever"]
+    assert "forever" in cache
+
+
+def test_background_reaper():
+    cache = TTLCache(default_ttl_seconds=0.05, tick_seconds=0.01)
+    for i in range(100):
+        cache.put(i, i)
+    cache.start_reaper(interval=0.02, max_items=50)
+    try:
+        deadline = time.monotonic() + 2
+        while len(cache) and time.monotonic() < deadline:
+            time.sleep(0.02)
+    finally:
+        cache.stop_reaper()
+
+    assert len(cache) == 0
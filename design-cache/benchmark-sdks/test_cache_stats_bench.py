@@ -0,0 +1,57 @@
+import time
+import tracemalloc
+
+from cache import LFUCache, LRUCache, TTLCache, WindowTinyLFUCache
+
+NUM_KEYS = 1_000
+NUM_OPS = 100_000
+
+
+def traced_peak(cache) -> int:
+    """Peak bytes allocated while looping over counted hits and misses."""
+    get = cache.get
+    keys = list(range(NUM_KEYS * 2))  # half of them miss
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        for _ in range(NUM_OPS // len(keys)):
+            for key in keys:
+                get(key)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak - before
+
+
+def ns_per_get(cache) -> float:
+    get = cache.get
+    keys = list(range(NUM_KEYS * 2))
+    start = time.perf_counter_ns()
+    for _ in range(NUM_OPS // len(keys)):
+        for key in keys:
+            get(key)
+    return (time.perf_counter_ns() - start) / NUM_OPS
+
+
+def test_counters_do_not_allocate():
+    """
+    BENCHMARK: get cost with the always-on counters, and peak memory
+    allocated over 100k counted gets. Counting must not build per-call
+    objects, so LRU and TTL gets stay within a few hundred bytes whatever the
+    op count. LFU-family gets also move keys between frequency buckets,
+    which allocates by design, so they are only reported.
+    """
+    results = {}
+    for make in (LRUCache, LFUCache, WindowTinyLFUCache, TTLCache):
+        cache = make(NUM_KEYS * 10) if make is not TTLCache else TTLCache(3600)
+        for key in range(NUM_KEYS):
+            cache.put(key, key)
+        results[make.__name__] = (ns_per_get(cache), traced_peak(cache))
+        assert cache.stats.hits and cache.stats.misses
+
+    print(f"\n{'cache':<22}{'ns/get':>10}{'peak bytes':>12}")
+    for name, (ns, peak) in results.items():
+        print(f"{name:<22}{ns:>10.0f}{peak:>12,}")
+
+    for name in ("LRUCache", "TTLCache"):
+        assert results[name][1] < 4_096, name
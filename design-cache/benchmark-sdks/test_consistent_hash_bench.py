@@ -0,0 +1,93 @@
+import time
+from collections import Counter
+
+from cache import HashRing, LocalCacheServer, NearCache, ShardedCache
+from cache.sharded_cache import ring_hash
+
+NUM_NODES = 10
+NUM_KEYS = 100_000
+SHARD_LATENCY = 0.001
+
+
+def imbalance(ring: HashRing, keys) -> float:
+    """Most loaded node's share relative to a perfectly even split."""
+    load = Counter(ring.node_for(key) for key in keys)
+    return max(load.values()) / (len(keys) / len(ring))
+
+
+def moved_share(before, after, keys) -> float:
+    return sum(before(key) != after(key) for key in keys) / len(keys)
+
+
+def test_ring_balance_and_key_movement():
+    """
+    BENCHMARK: load imbalance by virtual node count, and the share of keys
+    moved when an 11th node joins or one of 10 leaves, against modulo
+    hashing. The ideal share is 1/11 (9.1%) on join and 1/10 on leave.
+    """
+    keys = [f"key-{i}" for i in range(NUM_KEYS)]
+    nodes = [f"node-{i}" for i in range(NUM_NODES)]
+
+    print(f"\n{'virtual nodes':<16}{'max/mean load':>14}")
+    balance = {}
+    for virtual_nodes in (1, 10, 100, 160, 500):
+        balance[virtual_nodes] = imbalance(HashRing(nodes, virtual_nodes), keys)
+        print(f"{virtual_nodes:<16}{balance[virtual_nodes]:>14.3f}")
+
+    ring = HashRing(nodes)
+    grown = HashRing(nodes + ["node-10"])
+    shrunk = HashRing(nodes[1:])
+    join = moved_share(ring.node_for, grown.node_for, keys)
+    leave = moved_share(ring.node_for, shrunk.node_for, keys)
+    modulo_join = moved_share(
+        lambda key: ring_hash(key) % NUM_NODES,
+        lambda key: ring_hash(key) % (NUM_NODES + 1),
+        keys,
+    )
+    print(f"{'moved on join':<16}{join:>14.3f}  (modulo hashing: {modulo_join:.3f})")
+    print(f"{'moved on leave':<16}{leave:>14.3f}")
+
+    assert balance[160] < 1.2
+    assert balance[160] < balance[1]
+    assert join < 0.12
+    assert 0.08 < leave < 0.12
+    assert modulo_join > 0.8
+
+
+def test_parallel_get_many():
+    """
+    BENCHMARK: get_many of 200 keys over 8 shards, each behind a 1 ms round
+    trip, against fetching shard by shard.
+    """
+    shards = {
+        f"node-{i}": NearCache(LocalCacheServer(latency=SHARD_LATENCY), l1_capacity=1)
+        for i in range(8)
+    }
+    cache = ShardedCache(shards)
+    try:
+        keys = [f"key-{i}" for i in range(200)]
+        for i, key in enumerate(keys):
+            cache.put(key, i)
+
+        start = time.perf_counter()
+        parallel = cache.get_many(keys)
+        parallel_ms = (time.perf_counter() - start) * 1000
+
+        groups = {}
+        for key in keys:
+            groups.setdefault(cache.ring.node_for(key), []).append(key)
+        start = time.perf_counter()
+        sequential = {}
+        for node, group in groups.items():
+            sequential.update(shards[node].get_many(group))
+        sequential_ms = (time.perf_counter() - start) * 1000
+    finally:
+        cache.close()
+        for shard in shards.values():
+            shard.close()
+
+    print(
+        f"\nget_many: parallel {parallel_ms:.2f} ms, sequential {sequential_ms:.2f} ms"
+    )
+    assert parallel == sequential == {key: i for i, key in enumerate(keys)}
+    assert parallel_ms < sequential_ms
@@ -0,0 +1,73 @@
+import itertools
+import random
+
+from cache import LFUCache, LRUCache, WindowTinyLFUCache
+
+CAPACITY = 1_000
+KEY_SPACE = 50_000
+PHASE_OPS = 100_000
+ZIPF_EXPONENT = 0.9
+
+
+def zipf_phase(rng: random.Random, offset: int) -> list:
+    """Zipf-distributed accesses over a key range starting at `offset`."""
+    weights = (1.0 / rank**ZIPF_EXPONENT for rank in range(1, KEY_SPACE + 1))
+    ranks = rng.choices(
+        range(KEY_SPACE), cum_weights=list(itertools.accumulate(weights)), k=PHASE_OPS
+    )
+    return [offset + rank for rank in ranks]
+
+
+def scan(start: int, length: int) -> list:
+    """One-hit wonders: keys that are never requested again."""
+    return [f"scan-{i}" for i in range(start, start + length)]
+
+
+def build_trace() -> list:
+    """
+    Two skewed phases with disjoint hot sets, each interleaved with scans.
+    Phase one trains LFU counts that are useless in phase two.
+    """
+    rng = random.Random(11)
+    trace = []
+    for phase, offset in enumerate((0, KEY_SPACE)):
+        accesses = zipf_phase(rng, offset)
+        for chunk in range(0, PHASE_OPS, 10_000):
+            trace.extend(accesses[chunk : chunk + 10_000])
+            trace.extend(scan(phase * PHASE_OPS + chunk, 2_000))
+    return trace
+
+
+def hit_ratio(cache, trace) -> float:
+    get, put = cache.get, cache.put
+    hits = 0
+    for key in trace:
+        if get(key) is None:
+            put(key, key)
+        else:
+            hits += 1
+    return hits / len(trace)
+
+
+def test_hit_ratio_by_policy():
+    """
+    BENCHMARK: hit ratio of LRU, LFU and W-TinyLFU at the same capacity on a
+    skewed trace whose hot set shifts halfway through, with scans mixed in.
+    LRU is polluted by the scans; LFU keeps phase-one keys after the shift.
+    """
+    trace = build_trace()
+    results = {
+        name: hit_ratio(make(CAPACITY), trace)
+        for name, make in (
+            ("LRUCache", LRUCache),
+            ("LFUCache", LFUCache),
+            ("WindowTinyLFUCache", WindowTinyLFUCache),
+        )
+    }
+
+    print(f"\n{'policy':<22}{'hit ratio':>12}")
+    for name, ratio in results.items():
+        print(f"{name:<22}{ratio:>12.3f}")
+
+    assert results["WindowTinyLFUCache"] > results["LRUCache"] * 1.1
+    assert results["WindowTinyLFUCache"] > results["LFUCache"] * 1.1
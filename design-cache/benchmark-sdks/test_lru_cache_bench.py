@@ -0,0 +1,101 @@
+import functools
+import gc
+import random
+import time
+import tracemalloc
+from collections import OrderedDict
+
+from cache import ConcurrentLRUCache, LRUCache
+
+CAPACITY = 100_000
+NUM_OPS = 300_000
+
+
+class OrderedDictLRU:
+    """The usual OrderedDict recipe, as a baseline."""
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.data = OrderedDict()
+
+    def get(self, key):
+        try:
+            self.data.move_to_end(key)
+        except KeyError:
+            return None
+        return self.data[key]
+
+    def put(self, key, value):
+        self.data[key] = value
+        self.data.move_to_end(key)
+        if len(self.data) > self.capacity:
+            self.data.popitem(last=False)
+
+
+class FunctoolsLRU:
+    """functools.lru_cache around a value store, as a baseline."""
+
+    def __init__(self, capacity: int):
+        self.values = {}
+        self.cached = functools.lru_cache(maxsize=capacity)(self.values.get)
+
+    def get(self, key):
+        return self.cached(key)
+
+    def put(self, key, value):
+        self.values[key] = value
+        self.cached(key)
+
+
+def bytes_per_entry(make_cache, keys) -> float:
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        cache = make_cache(CAPACITY)
+        for key in keys:
+            cache.put(key, key)
+        gc.collect()
+        after, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return (after - before) / len(keys)
+
+
+def ops_per_second(make_cache, ops) -> float:
+    cache = make_cache(CAPACITY)
+    get, put = cache.get, cache.put
+    start = time.perf_counter()
+    for key in ops:
+        if get(key) is None:
+            put(key, key)
+    return len(ops) / (time.perf_counter() - start)
+
+
+def test_lru_cache_vs_stdlib():
+    """
+    BENCHMARK: get-or-put throughput on a skewed key stream and bytes per
+    entry, against OrderedDict and functools.lru_cache. functools keeps a
+    separate value store here, so its bytes/entry includes that dict.
+    """
+    rng = random.Random(7)
+    keys = list(range(CAPACITY))
+    ops = [int(rng.paretovariate(1.1)) % (CAPACITY * 2) for _ in range(NUM_OPS)]
+
+    candidates = {
+        "LRUCache": LRUCache,
+        "ConcurrentLRUCache": ConcurrentLRUCache,
+        "OrderedDict": OrderedDictLRU,
+        "functools.lru_cache": FunctoolsLRU,
+    }
+    results = {
+        name: (ops_per_second(make, ops), bytes_per_entry(make, keys))
+        for name, make in candidates.items()
+    }
+
+    print(f"\n{'cache':<22}{'ops/s':>14}{'bytes/entry':>14}")
+    for name, (ops_s, size) in results.items():
+        print(f"{name:<22}{ops_s:>14,.0f}{size:>14,.1f}")
+
+    # __slots__ nodes must stay within 2x of OrderedDict's C-level links
+    assert results["LRUCache"][1] < results["OrderedDict"][1] * 2
@@ -0,0 +1,77 @@
+import threading
+import time
+
+from cache import TTLCache, cached
+
+NUM_THREADS = 32
+ROUNDS = 5
+BACKEND_LATENCY = 0.02
+
+
+class Backend:
+    def __init__(self):
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def load(self, key):
+        with self.lock:
+            self.calls += 1
+        time.sleep(BACKEND_LATENCY)
+        return key
+
+
+def naive(cache, backend):
+    """Check-then-load memoization without coalescing, as a baseline."""
+
+    def get(key):
+        value = cache.get(key)
+        if value is None:
+            value = backend.load(key)
+            cache.put(key, value)
+        return value
+
+    return get
+
+
+def worker(get, key, barrier) -> None:
+    barrier.wait()
+    get(key)
+
+
+def herd(get) -> float:
+    """Expire the hot key every round and release all threads on it at once."""
+    elapsed = 0.0
+    for round_number in range(ROUNDS):
+        key = f"hot-{round_number}"
+        barrier = threading.Barrier(NUM_THREADS + 1)
+        threads = [
+            threading.Thread(target=worker, args=(get, key, barrier))
+            for _ in range(NUM_THREADS)
+        ]
+        for thread in threads:
+            thread.start()
+        start = time.perf_counter()
+        barrier.wait()
+        for thread in threads:
+            thread.join()
+        elapsed += time.perf_counter() - start
+    return elapsed
+
+
+def test_thundering_herd_coalescing():
+    """
+    BENCHMARK: backend calls when 32 threads miss the same key together,
+    with and without single-flight coalescing.
+    """
+    plain_backend = Backend()
+    plain_time = herd(naive(TTLCache(60), plain_backend))
+
+    coalesced_backend = Backend()
+    coalesced_time = herd(cached(cache=TTLCache(60))(coalesced_backend.load))
+
+    print(f"\n{'loader':<14}{'backend calls':>15}{'seconds':>10}")
+    print(f"{'naive':<14}{plain_backend.calls:>15}{plain_time:>10.3f}")
+    print(f"{'@cached':<14}{coalesced_backend.calls:>15}{coalesced_time:>10.3f}")
+
+    assert coalesced_backend.calls == ROUNDS
+    assert plain_backend.calls > ROUNDS * 4
@@ -0,0 +1,85 @@
+import random
+import time
+
+from cache import LocalCacheServer, NearCache
+
+NUM_NODES = 4
+NUM_KEYS = 5_000
+NUM_OPS = 8_000
+WRITE_SHARE = 0.02
+L2_LATENCY = 0.0002
+
+
+def build_ops(rng: random.Random):
+    return [
+        (
+            rng.randrange(NUM_NODES),
+            f"key-{int(rng.paretovariate(1.0)) % NUM_KEYS}",
+            rng.random() < WRITE_SHARE,
+        )
+        for _ in range(NUM_OPS)
+    ]
+
+
+def replay(nodes, ops) -> float:
+    start = time.perf_counter()
+    for node, key, is_write in ops:
+        cache = nodes[node]
+        if is_write:
+            cache.put(key, key)
+        elif cache.get(key) is None:
+            cache.put(key, key)
+    return (time.perf_counter() - start) / len(ops) * 1e6
+
+
+def invalidation_delays(writer, reader, samples: int = 50):
+    delays = []
+    for i in range(samples):
+        key = f"delay-{i}"
+        writer.put(key, 0)
+        reader.get(key)
+        start = time.perf_counter()
+        writer.put(key, 1)
+        while key in reader.l1:
+            time.sleep(0.0001)
+        delays.append((time.perf_counter() - start) * 1000)
+    return sorted(delays)
+
+
+def test_near_cache_keeps_reads_in_process():
+    """
+    BENCHMARK: four nodes sharing one L2 with a 0.2 ms round trip, on a
+    skewed 98% read workload. Reports the share of reads served from L1,
+    the mean cost per operation against nodes with a 1-entry L1, and how long an
+    invalidation takes to reach another node.
+    """
+    rng = random.Random(9)
+    ops = build_ops(rng)
+
+    results = {}
+    for name, l1_capacity in (("1-entry L1", 1), ("near cache", 1_000)):
+        server = LocalCacheServer(latency=L2_LATENCY)
+        nodes = [NearCache(server, l1_capacity=l1_capacity) for _ in range(NUM_NODES)]
+        try:
+            us_per_op = replay(nodes, ops)
+            metrics = [node.get_metrics() for node in nodes]
+            l1_hits = sum(m["l1_hits"] for m in metrics)
+            reads = l1_hits + sum(m["l2_hits"] + m["misses"] for m in metrics)
+            results[name] = (us_per_op, l1_hits / reads)
+            if name == "near cache":
+                delays = invalidation_delays(nodes[0], nodes[1])
+        finally:
+            for node in nodes:
+                node.close()
+
+    print(f"\n{'setup':<12}{'us/op':>10}{'L1 hit ratio':>14}")
+    for name, (us_per_op, ratio) in results.items():
+        print(f"{name:<12}{us_per_op:>10.1f}{ratio:>14.3f}")
+    print(
+        f"invalidation delay ms: p50 {delays[len(delays) // 2]:.2f}, "
+        f"max {delays[-1]:.2f}"
+    )
+
+    assert results["near cache"][1] > 0.5
+    assert results["near cache"][0] * 2 < results["1-entry L1"][0]
+    assert delays[-1] < 500
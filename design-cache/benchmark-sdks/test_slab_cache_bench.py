@@ -0,0 +1,129 @@
+import gc
+import math
+import os
+import random
+import time
+
+import pytest
+from cache import LRUCache, SlabCache
+
+MB = 1024 * 1024
+BUDGET = 64 * MB
+NUM_VALUES = 32
+VALUE_SIZE = 1 * MB
+CHUNK = 64 * 1024
+NUM_READS = 50_000
+
+
+def rss_bytes() -> int:
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+def payload_weigher(key, value) -> int:
+    return len(value)
+
+
+def reads_per_second(cache, keys, offsets, chunk: int) -> float:
+    start = time.perf_counter()
+    for key, offset in zip(keys, offsets):
+        value = cache.get(key)
+        if chunk:
+            # Serve one range of the payload, as for a ranged HTTP response
+            value[offset : offset + chunk]
+    return len(keys) / (time.perf_counter() - start)
+
+
+def test_read_throughput():
+    """
+    BENCHMARK: reads per second of 1 MB payloads from a weighted LRUCache of
+    bytes and from a SlabCache, returning the whole value and serving one
+    64 KB range of it. A bytes slice copies the range; a view slice does not.
+    """
+    rng = random.Random(3)
+    caches = {
+        "LRUCache": LRUCache(max_weight=BUDGET, weigher=payload_weigher),
+        "SlabCache": SlabCache(arena_bytes=BUDGET),
+    }
+    for cache in caches.values():
+        for i in range(NUM_VALUES):
+            cache.put(i, os.urandom(VALUE_SIZE))
+    keys = [rng.randrange(NUM_VALUES) for _ in range(NUM_READS)]
+    offsets = [rng.randrange(VALUE_SIZE - CHUNK) for _ in range(NUM_READS)]
+
+    results = {
+        name: (
+            reads_per_second(cache, keys, offsets, 0),
+            reads_per_second(cache, keys, offsets, CHUNK),
+        )
+        for name, cache in caches.items()
+    }
+    caches["SlabCache"].close()
+
+    print(f"\n{'cache':<12}{'get/s':>12}{'64 KB range/s':>16}")
+    for name, (whole, ranged) in results.items():
+        print(f"{name:<12}{whole:>12,.0f}{ranged:>16,.0f}")
+
+    assert results["SlabCache"][1] > results["LRUCache"][1]
+
+
+def churn(make_cache, keys, sizes) -> dict:
+    gc.collect()
+    baseline = rss_bytes()
+    cache = make_cache()
+    peak_rss = hits = 0
+    for i, key in enumerate(keys):
+        if cache.get(key) is None:
+            cache.put(key, b"\x01" * sizes[key])
+        else:
+            hits += 1
+        if i % 100 == 0:
+            peak_rss = max(peak_rss, rss_bytes() - baseline)
+    result = {
+        "hit_ratio": hits / len(keys),
+        "peak_rss": max(peak_rss, rss_bytes() - baseline),
+    }
+    if isinstance(cache, SlabCache):
+        cache.close()
+    del cache
+    gc.collect()
+    return result
+
+
+@pytest.mark.skipif(
+    not os.path.exists("/proc/self/statm"), reason="reads RSS from /proc"
+)
+def test_rss_under_mixed_payloads():
+    """
+    BENCHMARK: hit ratio and RSS growth when payloads of 100 B to 5 MB churn
+    through a 64 MB weighted LRUCache and a 64 MB SlabCache. The arena's
+    resident size never exceeds its mapping, whatever the size mix.
+    """
+    rng = random.Random(5)
+    num_keys = 2_000
+    sizes = [
+        int(math.exp(rng.uniform(math.log(100), math.log(5 * MB))))
+        for _ in range(num_keys)
+    ]
+    keys = [int(rng.paretovariate(0.7)) % num_keys for _ in range(4_000)]
+
+    results = {
+        "LRUCache": churn(
+            lambda: LRUCache(max_weight=BUDGET, weigher=payload_weigher),
+            keys,
+            sizes,
+        ),
+        "SlabCache": churn(
+            lambda: SlabCache(arena_bytes=BUDGET, max_value_bytes=8 * MB),
+            keys,
+            sizes,
+        ),
+    }
+
+    print(f"\n{'cache':<12}{'hit ratio':>10}{'peak RSS MB':>13}")
+    for name, result in results.items():
+        print(f"{name:<12}{result['hit_ratio']:>10.3f}{result['peak_rss'] / MB:>13.1f}")
+
+    # The arena plus the transient payload being copied in
+    assert results["SlabCache"]["peak_rss"] < BUDGET + 16 * MB
+    assert results["SlabCache"]["hit_ratio"] > 0.5 * results["LRUCache"]["hit_ratio"]
@@ -0,0 +1,114 @@
+import functools
+import gc
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+from cache import TTLCache
+
+NUM_ENTRIES = 200_000
+EXPIRE_PER_SECOND = 2_000
+
+
+class FakeClock:
+    def __init__(self, now: float = 0.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class ScanningTTLCache:
+    """datetime expiry plus a full-scan cleanup, as a baseline."""
+
+    def __init__(self, default_ttl_seconds: float, clock):
+        self.default_ttl = timedelta(seconds=default_ttl_seconds)
+        self.clock = clock
+        self.data = {}
+
+    def put(self, key, value, ttl_seconds=None):
+        ttl = (
+            self.default_ttl if ttl_seconds is None else timedelta(seconds=ttl_seconds)
+        )
+        self.data[key] = (value, datetime.fromtimestamp(self.clock()) + ttl)
+
+    def cleanup_expired(self) -> int:
+        now = datetime.fromtimestamp(self.clock())
+        expired = [key for key, (_, at) in self.data.items() if at <= now]
+        for key in expired:
+            del self.data[key]
+        return len(expired)
+
+
+def fill(cache) -> None:
+    # Expiries spread evenly over NUM_ENTRIES / EXPIRE_PER_SECOND seconds
+    for i in range(NUM_ENTRIES):
+        cache.put(i, i, ttl_seconds=1 + i / EXPIRE_PER_SECOND)
+
+
+def bytes_per_entry(make_cache) -> float:
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        cache = make_cache()
+        fill(cache)
+        gc.collect()
+        after, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del cache
+    return (after - before) / NUM_ENTRIES
+
+
+def worst_pause_ms(cache, clock, cleanup, seconds: int) -> float:
+    """Longest single cleanup call while one second of entries expires per call."""
+    worst = 0.0
+    for _ in range(seconds):
+        clock.now += 1
+        start = time.perf_counter()
+        cleanup(cache)
+        worst = max(worst, time.perf_counter() - start)
+    return worst * 1000
+
+
+def test_wheel_reaper_vs_full_scan():
+    """
+    BENCHMARK: memory per entry and worst cleanup pause with 200k live
+    entries, reaping once per second. The full scan's pause grows with the
+    cache size; the wheel's grows only with the number of expired entries,
+    and reap(max_items) caps it further. Float expiries offset most of the
+    memory the expiry index costs.
+    """
+    results = {}
+    for name, make, cleanup in (
+        (
+            "datetime + full scan",
+            ScanningTTLCache,
+            lambda cache: cache.cleanup_expired(),
+        ),
+        (
+            "wheel cleanup_expired",
+            TTLCache,
+            lambda cache: cache.cleanup_expired(),
+        ),
+        ("wheel reap(500)", TTLCache, lambda cache: cache.reap(max_items=500)),
+    ):
+        clock = FakeClock(1_000_000.0)
+        size = bytes_per_entry(
+            functools.partial(make, default_ttl_seconds=300, clock=clock)
+        )
+        clock = FakeClock(1_000_000.0)
+        cache = make(default_ttl_seconds=300, clock=clock)
+        fill(cache)
+        results[name] = (size, worst_pause_ms(cache, clock, cleanup, seconds=10))
+
+    print(f"\n{'cleanup':<24}{'bytes/entry':>14}{'worst pause ms':>16}")
+    for name, (size, pause) in results.items():
+        print(f"{name:<24}{size:>14,.1f}{pause:>16.2f}")
+
+    scan_size, scan_pause = results["datetime + full scan"]
+    wheel_size, wheel_pause = results["wheel cleanup_expired"]
+    assert wheel_pause * 5 < scan_pause
+    assert results["wheel reap(500)"][1] <= wheel_pause * 1.5
+    assert wheel_size < scan_size * 1.3
@@ -0,0 +1,97 @@
+import gc
+import math
+import os
+import random
+
+import pytest
+from cache import LFUCache, LRUCache
+
+BUDGET = 64 * 1024 * 1024
+NUM_OPS = 4_000
+NUM_KEYS = 2_000
+MIN_SIZE = 100
+MAX_SIZE = 5 * 1024 * 1024
+
+
+def rss_bytes() -> int:
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+def build_workload():
+    """Skewed keys whose payload sizes are log-uniform from 100 B to 5 MB."""
+    rng = random.Random(5)
+    sizes = [
+        int(math.exp(rng.uniform(math.log(MIN_SIZE), math.log(MAX_SIZE))))
+        for _ in range(NUM_KEYS)
+    ]
+    keys = [int(rng.paretovariate(0.7)) % NUM_KEYS for _ in range(NUM_OPS)]
+    return keys, sizes
+
+
+def run(cache, keys, sizes) -> dict:
+    gc.collect()
+    baseline = rss_bytes()
+    peak_rss = peak_weight = hits = 0
+    for i, key in enumerate(keys):
+        if cache.get(key) is None:
+            cache.put(key, b"\x01" * sizes[key])
+        else:
+            hits += 1
+        peak_weight = max(peak_weight, sum(sizes[k] for k in _keys(cache)))
+        if i % 100 == 0:
+            peak_rss = max(peak_rss, rss_bytes() - baseline)
+    result = {
+        "hit_ratio": hits / len(keys),
+        "peak_payload": peak_weight,
+        "peak_rss": max(peak_rss, rss_bytes() - baseline),
+    }
+    del cache
+    gc.collect()
+    return result
+
+
+def payload_weigher(key, value) -> int:
+    return len(value)
+
+
+def _keys(cache):
+    return cache.map if isinstance(cache, LRUCache) else cache.entries
+
+
+@pytest.mark.skipif(
+    not os.path.exists("/proc/self/statm"), reason="reads RSS from /proc"
+)
+def test_byte_budget_bounds_rss():
+    """
+    BENCHMARK: payload bytes and RSS growth under a mixed-size workload for
+    weighted LRU/LFU with a 64 MB budget, against a count-limited LRU sized
+    for the mean payload. The count limit overshoots the budget whenever the
+    large values cluster; the weighted caches stay within it.
+    """
+    keys, sizes = build_workload()
+    mean_size = sum(sizes) / len(sizes)
+
+    results = {
+        "weighted LRU": run(
+            LRUCache(max_weight=BUDGET, weigher=payload_weigher), keys, sizes
+        ),
+        "weighted LFU": run(
+            LFUCache(max_weight=BUDGET, weigher=payload_weigher), keys, sizes
+        ),
+        "count LRU": run(LRUCache(capacity=int(BUDGET / mean_size)), keys, sizes),
+    }
+
+    mb = 1024 * 1024
+    print(f"\n{'cache':<16}{'hit ratio':>10}{'peak payload MB':>17}{'peak RSS MB':>13}")
+    for name, result in results.items():
+        print(
+            f"{name:<16}{result['hit_ratio']:>10.3f}"
+            f"{result['peak_payload'] / mb:>17.1f}{result['peak_rss'] / mb:>13.1f}"
+        )
+
+    for name in ("weighted LRU", "weighted LFU"):
+        assert results[name]["peak_payload"] <= BUDGET
+        # Allocator slack on top of the payload, not a multiple of it
+        assert results[name]["peak_rss"] < BUDGET * 1.5
+    assert results["count LRU"]["peak_payload"] > BUDGET
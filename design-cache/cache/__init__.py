@@ -4,14 +4,42 @@ Cache System Design
 Implements various caching strategies and data structures.
 
 Key components:
-- LRU (Least Recently Used) Cache
-- LFU (Least Frequently Used) Cache
+- LRU (Least Recently Used) Cache, plus a lock-striped concurrent variant
+- LFU (Least Frequently Used) Cache, plus a Window-TinyLFU variant
 - TTL (Time To Live) Cache
-- Distributed cache considerations
+- Off-heap slab cache serving large byte payloads as zero-copy views
+- Weighted mode for LRU/LFU bounding total entry size (e.g. bytes)
+- Hit/miss/eviction/expiration counters on every cache, opt-in latency
+  histograms
+- @cached: single-flight memoization over any of the caches
+- Distributed cache considerations: a two-tier near cache (in-process L1,
+  shared Redis L2) with pub/sub invalidation, and a consistent-hashing
+  sharded client with hot-key replication
 """
 
-from .lru_cache import LRUCache
-from .lfu_cache import LFUCache
+from .lru_cache import ConcurrentLRUCache, LRUCache
+from .lfu_cache import LFUCache, WindowTinyLFUCache
 from .ttl_cache import TTLCache
+from .memoize import cached
+from .near_cache import LocalCacheServer, NearCache
+from .sharded_cache import HashRing, ShardedCache
+from .slab_cache import SlabCache
+from .stats import CacheStats, track_latency
+from .weigher import estimate_weight
 
-__all__ = ["LRUCache", "LFUCache", "TTLCache"]
+__all__ = [
+    "LRUCache",
+    "ConcurrentLRUCache",
+    "LFUCache",
+    "WindowTinyLFUCache",
+    "TTLCache",
+    "SlabCache",
+    "cached",
+    "NearCache",
+    "LocalCacheServer",
+    "HashRing",
+    "ShardedCache",
+    "estimate_weight",
+    "CacheStats",
+    "track_latency",
+]
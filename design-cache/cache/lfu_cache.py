@@ -1,10 +1,61 @@
 """
 LFU Cache Implementation
 
-Implements a Least Frequently Used cache.
+Implements a Least Frequently Used cache in O(1), plus a Window-TinyLFU
+variant that adapts to shifting workloads.
+
+``LFUCache`` keeps one insertion-ordered bucket per access count, so get,
+put, delete and eviction never search:
+
+- ``entries`` maps a key to its value and count bucket
+- Each bucket holds an OrderedDict of the keys accessed ``count`` times,
+  oldest first, which breaks frequency ties in LRU order
+- Non-empty buckets form a circular doubly linked list in ascending count
+  order behind a sentinel ``root``. An access moves a key to the bucket
+  right after its own (created if its count is not there yet), an empty
+  bucket is unlinked, and eviction takes from ``root.next``, so the lowest
+  count is always at hand without scanning the counts
+
+Plain LFU never forgets: keys that were hot yesterday keep out keys that are
+hot today. ``WindowTinyLFUCache`` fixes that with a small LRU admission
+window in front of a segmented-LRU main area. A key leaving the window only
+replaces the main area's victim if a count-min sketch says it has been seen
+more often recently. The sketch halves every counter periodically, so
+popularity decays.
+
+``LFUCache`` can also bound the total weight (e.g. bytes) of its entries
+with ``max_weight``; see ``lru_cache`` for the weighted mode.
 """
 
-from typing import Any, Optional
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+from .stats import CacheStats
+from .weigher import Weigher, check_limits, entry_weight_limit, estimate_weight
+
+
+class _Bucket:
+    """Keys sharing one access count; a node of the ascending bucket list."""
+
+    __slots__ = ("count", "keys", "prev", "next")
+
+    def __init__(self, count: int = 0):
+        self.count = count
+        self.keys: "OrderedDict[Hashable, None]" = OrderedDict()
+        self.prev: "_Bucket" = self
+        self.next: "_Bucket" = self
+
+
+class _Entry:
+    """Cached value with its count bucket and weight."""
+
+    __slots__ = ("value", "bucket", "weight")
+
+    def __init__(self, value: Any, bucket: _Bucket, weight: int = 0):
+        self.value = value
+        self.bucket = bucket
+        self.weight = weight
 
 
 class LFUCache:
@@ -15,19 +66,92 @@ class LFUCache:
     - Tracks access frequency
     - Evicts least frequently used items
     - Breaks ties with LRU policy
+    - O(1) get, put and eviction; thread-safe
+    - Optional weighted mode bounding the total weight (e.g. bytes) of entries
     """
 
-    def __init__(self, capacity: int):
+    def __init__(
+        self,
+        capacity: Optional[int] = None,
+        max_weight: Optional[int] = None,
+        weigher: Optional[Weigher] = None,
+        max_entry_weight: Optional[int] = None,
+    ):
         """
         Initialize the LFU cache with a given capacity.
 
         Args:
-            capacity: Maximum number of items to store
+            capacity: Maximum number of items to store; None for no count
+                limit, which requires max_weight
+            max_weight: Budget for the total weight of all entries; enables
+                weighted mode
+            weigher: weigher(key, value) -> int giving an entry's weight in
+                weighted mode (defaults to estimate_weight)
+            max_entry_weight: Heaviest entry cached in weighted mode
+                (default: max_weight // 8)
         """
+        check_limits(capacity, max_weight)
         self.capacity = capacity
-        # TODO: Initialize data structures
+        self.max_weight = max_weight
+        self.weigher = weigher if weigher is not None else estimate_weight
+        self.max_entry_weight = entry_weight_limit(max_weight, max_entry_weight)
+        # Total weight of all entries; always 0 without max_weight
+        self.weight = 0
+        self.entries: Dict[Hashable, _Entry] = {}
+        # Sentinel of the bucket list: root.next has the lowest count
+        self.root = _Bucket()
+        self.lock = threading.Lock()
+        self.stats = CacheStats()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        """Membership test that does not count as an access."""
+        return key in self.entries
+
+    def _bucket_after(self, bucket: _Bucket, count: int) -> _Bucket:
+        """The bucket for `count`, linked right after `bucket` if missing."""
+        following = bucket.next
+        if following.count == count:
+            return following
+        created = _Bucket(count)
+        created.prev = bucket
+        created.next = following
+        following.prev = created
+        bucket.next = created
+        return created
 
-    def get(self, key: int) -> Optional[Any]:
+    def _discard(self, key: Hashable, bucket: _Bucket) -> None:
+        """Take a key out of its bucket, unlinking the bucket if it empties."""
+        del bucket.keys[key]
+        if not bucket.keys:
+            bucket.prev.next = bucket.next
+            bucket.next.prev = bucket.prev
+
+    def _touch(self, key: Hashable, entry: _Entry) -> None:
+        """Move a key from its count bucket to the next one (lock held)."""
+        bucket = entry.bucket
+        following = self._bucket_after(bucket, bucket.count + 1)
+        following.keys[key] = None
+        entry.bucket = following
+        self._discard(key, bucket)
+
+    def _insert(self, key: Hashable, value: Any, weight: int = 0) -> None:
+        """Add a new key with an access count of 1 (lock held)."""
+        bucket = self._bucket_after(self.root, 1)
+        bucket.keys[key] = None
+        self.entries[key] = _Entry(value, bucket, weight)
+        self.weight += weight
+
+    def _evict(self, bucket: _Bucket) -> None:
+        """Evict the oldest key of a bucket (lock held)."""
+        victim = next(iter(bucket.keys))
+        self._discard(victim, bucket)
+        self.weight -= self.entries.pop(victim).weight
+        self.stats.evictions += 1
+
+    def get(self, key: Hashable) -> Optional[Any]:
         """
         Get value by key and increment frequency.
 
@@ -37,10 +161,16 @@ class LFUCache:
         Returns:
             The value if found, None otherwise
         """
-        # TODO: Implement get with frequency tracking
-        pass
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.stats.misses += 1
+                return None
+            self.stats.hits += 1
+            self._touch(key, entry)
+            return entry.value
 
-    def put(self, key: int, value: Any) -> None:
+    def put(self, key: Hashable, value: Any) -> None:
         """
         Put a key-value pair, evicting LFU item if at capacity.
 
@@ -48,5 +178,276 @@ class LFUCache:
             key: The key to store
             value: The value to store
         """
-        # TODO: Implement put with LFU eviction
-        pass
+        if self.max_weight is not None:
+            self._put_weighted(key, value)
+            return
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                entry.value = value
+                self._touch(key, entry)
+                return
+            if len(self.entries) >= self.capacity:
+                self._evict(self.root.next)
+            self._insert(key, value)
+
+    def _put_weighted(self, key: Hashable, value: Any) -> None:
+        """
+        Insert or update an entry, evicting until the budget holds.
+
+        An updated entry counts as an access and is the newest key of its
+        new bucket; eviction passes over it, so making room for its new
+        weight never evicts it.
+        """
+        weight = self.weigher(key, value)
+        with self.lock:
+            entry = self.entries.get(key)
+            if weight > self.max_entry_weight:
+                # Too large to cache; drop any previous value for the key
+                if entry is not None:
+                    self._unlink(key, entry)
+                self.stats.evictions += 1
+                return
+
+            if entry is None:
+                limit = self.capacity
+                while self.entries and (
+                    self.weight + weight > self.max_weight
+                    or (limit is not None and len(self.entries) >= limit)
+                ):
+                    self._evict(self.root.next)
+                self._insert(key, value, weight)
+                return
+
+            self._touch(key, entry)
+            entry.value = value
+            self.weight += weight - entry.weight
+            entry.weight = weight
+            # The entry fits on its own, so others remain while over budget
+            while self.weight > self.max_weight:
+                bucket = self.root.next
+                if bucket is entry.bucket and len(bucket.keys) == 1:
+                    bucket = bucket.next
+                self._evict(bucket)
+
+    def _unlink(self, key: Hashable, entry: _Entry) -> None:
+        """Remove an entry from the map and its bucket (lock held)."""
+        del self.entries[key]
+        self.weight -= entry.weight
+        self._discard(key, entry.bucket)
+
+    def delete(self, key: Hashable) -> bool:
+        """
+        Remove a key.
+
+        Args:
+            key: The key to remove
+
+        Returns:
+            True if the key was present, False otherwise
+        """
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return False
+            self._unlink(key, entry)
+            return True
+
+    def frequency(self, key: Hashable) -> int:
+        """Access count of a cached key (0 if absent)."""
+        entry = self.entries.get(key)
+        return 0 if entry is None else entry.bucket.count
+
+
+class FrequencySketch:
+    """
+    Count-min sketch of recent access frequencies with periodic decay.
+
+    Each key increments one saturating counter (max 15) in each of ``depth``
+    rows; its estimate is the minimum of those counters. After
+    ``sample_size`` increments every counter is halved, so the sketch tracks
+    recent popularity rather than all-time counts.
+
+    Args:
+        capacity: Expected number of cached entries; sizes the sketch
+        depth: Number of hash rows (default: 4)
+    """
+
+    MAX_COUNT = 15
+    # Odd 64-bit multipliers giving each row an independent hash
+    SEEDS = (
+        0x9E3779B97F4A7C15,
+        0xC2B2AE3D27D4EB4F,
+        0x165667B19E3779F9,
+        0xD6E8FEB86659FD93,
+        0xFF51AFD7ED558CCD,
+        0xC4CEB9FE1A85EC53,
+    )
+    # Byte translation table mapping every counter value to half of it
+    _HALVE = bytes(value >> 1 for value in range(256))
+
+    def __init__(self, capacity: int, depth: int = 4):
+        if not 1 <= depth <= len(self.SEEDS):
+            raise ValueError(f"depth must be between 1 and {len(self.SEEDS)}")
+        # About four counters per entry per row keeps collisions rare
+        width = 16
+        while width < 4 * capacity:
+            width *= 2
+        self.width = width
+        self.depth = depth
+        self.mask = width - 1
+        self.table = bytearray(width * depth)
+        self.sample_size = 10 * max(capacity, 1)
+        self.additions = 0
+
+    def _slots(self, key: Hashable):
+        h = hash(key) & 0xFFFFFFFFFFFFFFFF
+        width, mask = self.width, self.mask
+        for row in range(self.depth):
+            mixed = (h * self.SEEDS[row]) & 0xFFFFFFFFFFFFFFFF
+            yield row * width + ((mixed >> 32) & mask)
+
+    def increment(self, key: Hashable) -> None:
+        """Record one access to `key`, decaying all counters when due."""
+        table = self.table
+        for slot in self._slots(key):
+            if table[slot] < self.MAX_COUNT:
+                table[slot] += 1
+        self.additions += 1
+        if self.additions >= self.sample_size:
+            self.table = bytearray(table.translate(self._HALVE))
+            self.additions //= 2
+
+    def frequency(self, key: Hashable) -> int:
+        """Estimated recent access count of `key`."""
+        table = self.table
+        return min(table[slot] for slot in self._slots(key))
+
+
+class WindowTinyLFUCache:
+    """
+    Window-TinyLFU cache: LRU window + TinyLFU admission + segmented LRU main.
+
+    New keys enter a small LRU window. When the window overflows, its LRU
+    key becomes a candidate for the main area, which is a segmented LRU:
+    keys enter the probation segment and move to the protected segment on
+    their next hit. If the main area is full, the candidate is admitted only
+    if the frequency sketch rates it above the probation segment's LRU
+    victim; otherwise the candidate is dropped.
+
+    Args:
+        capacity: Maximum number of items to store
+        window_ratio: Share of capacity given to the admission window
+        protected_ratio: Share of the main area reserved for protected keys
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        window_ratio: float = 0.01,
+        protected_ratio: float = 0.8,
+    ):
+        if capacity < 2:
+            raise ValueError("capacity must be at least 2")
+        self.capacity = capacity
+        self.window_capacity = max(1, int(capacity * window_ratio))
+        self.main_capacity = capacity - self.window_capacity
+        self.protected_capacity = int(self.main_capacity * protected_ratio)
+        self.window: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self.probation: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self.protected: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self.sketch = FrequencySketch(capacity)
+        self.lock = threading.Lock()
+        self.stats = CacheStats()
+
+    def __len__(self) -> int:
+        return len(self.window) + len(self.probation) + len(self.protected)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self.window or key in self.probation or key in self.protected
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Get value by key and record the access in the frequency sketch.
+
+        Args:
+            key: The key to look up
+
+        Returns:
+            The value if found, None otherwise
+        """
+        with self.lock:
+            self.sketch.increment(key)
+            if key in self.window:
+                self.stats.hits += 1
+                self.window.move_to_end(key)
+                return self.window[key]
+            if key in self.protected:
+                self.stats.hits += 1
+                self.protected.move_to_end(key)
+                return self.protected[key]
+            if key in self.probation:
+                self.stats.hits += 1
+                value = self.probation.pop(key)
+                self._protect(key, value)
+                return value
+            self.stats.misses += 1
+            return None
+
+    def _protect(self, key: Hashable, value: Any) -> None:
+        """Promote a probation hit, demoting the protected LRU if full."""
+        self.protected[key] = value
+        if len(self.protected) > self.protected_capacity:
+            demoted, demoted_value = self.protected.popitem(last=False)
+            self.probation[demoted] = demoted_value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """
+        Put a key-value pair; new keys enter the admission window.
+
+        Args:
+            key: The key to store
+            value: The value to store
+        """
+        with self.lock:
+            self.sketch.increment(key)
+            for segment in (self.window, self.protected, self.probation):
+                if key in segment:
+                    segment[key] = value
+                    segment.move_to_end(key)
+                    return
+
+            self.window[key] = value
+            if len(self.window) > self.window_capacity:
+                candidate, candidate_value = self.window.popitem(last=False)
+                self._admit(candidate, candidate_value)
+
+    def _admit(self, candidate: Hashable, value: Any) -> None:
+        """Move a window evictee into the main area if TinyLFU allows it."""
+        if len(self.probation) + len(self.protected) < self.main_capacity:
+            self.probation[candidate] = value
+            return
+        victims = self.probation if self.probation else self.protected
+        victim = next(iter(victims))
+        # Either the victim or the rejected candidate leaves the cache
+        self.stats.evictions += 1
+        if self.sketch.frequency(candidate) > self.sketch.frequency(victim):
+            del victims[victim]
+            self.probation[candidate] = value
+
+    def delete(self, key: Hashable) -> bool:
+        """
+        Remove a key.
+
+        Args:
+            key: The key to remove
+
+        Returns:
+            True if the key was present, False otherwise
+        """
+        with self.lock:
+            for segment in (self.window, self.probation, self.protected):
+                if key in segment:
+                    del segment[key]
+                    return True
+            return False
@@ -2,9 +2,41 @@
 LRU Cache Implementation
 
 Implements a Least Recently Used cache with O(1) get and put operations.
+
+Entries live in a dict for lookup and in an intrusive, circular doubly linked
+list for recency order. List nodes use ``__slots__`` so each entry costs one
+small fixed-size object instead of an instance ``__dict__``. A sentinel root
+node removes every empty-list special case: the most recently used entry is
+``root.next`` and the least recently used one is ``root.prev``.
+
+``ConcurrentLRUCache`` splits the key space over independent, separately
+locked LRU segments so threads touching different keys rarely contend.
+
+Both caches can bound memory instead of (or as well as) the entry count:
+with ``max_weight``, each entry is weighed on insert and least recently used
+entries are evicted until the total weight fits the budget. Entries heavier
+than ``max_entry_weight`` are not cached at all, so a single huge value
+cannot flush everything else.
 """
 
-from typing import Any, Optional
+import threading
+from typing import Any, Dict, Hashable, Iterator, List, Optional, Tuple
+
+from .stats import CacheStats
+from .weigher import Weigher, check_limits, entry_weight_limit, estimate_weight
+
+
+class _Node:
+    """Doubly linked list node holding one cache entry."""
+
+    __slots__ = ("prev", "next", "key", "value", "weight")
+
+    def __init__(self, key: Hashable = None, value: Any = None):
+        self.prev: "_Node" = self
+        self.next: "_Node" = self
+        self.key = key
+        self.value = value
+        self.weight = 0
 
 
 class LRUCache:
@@ -15,19 +47,50 @@ class LRUCache:
     - O(1) get operation
     - O(1) put operation
     - Automatic eviction of least recently used items
+    - Thread-safe: every operation holds one lock for a few pointer updates
+    - Optional weighted mode bounding the total weight (e.g. bytes) of entries
     """
 
-    def __init__(self, capacity: int):
+    def __init__(
+        self,
+        capacity: Optional[int] = None,
+        max_weight: Optional[int] = None,
+        weigher: Optional[Weigher] = None,
+        max_entry_weight: Optional[int] = None,
+    ):
         """
         Initialize the LRU cache with a given capacity.
 
         Args:
-            capacity: Maximum number of items to store
+            capacity: Maximum number of items to store; None for no count
+                limit, which requires max_weight
+            max_weight: Budget for the total weight of all entries; enables
+                weighted mode
+            weigher: weigher(key, value) -> int giving an entry's weight in
+                weighted mode (defaults to estimate_weight)
+            max_entry_weight: Heaviest entry cached in weighted mode
+                (default: max_weight // 8)
         """
+        check_limits(capacity, max_weight)
         self.capacity = capacity
-        # TODO: Initialize data structures
+        self.max_weight = max_weight
+        self.weigher = weigher if weigher is not None else estimate_weight
+        self.max_entry_weight = entry_weight_limit(max_weight, max_entry_weight)
+        # Total weight of all entries; always 0 without max_weight
+        self.weight = 0
+        self.map: Dict[Hashable, _Node] = {}
+        self.root = _Node()
+        self.lock = threading.Lock()
+        self.stats = CacheStats()
+
+    def __len__(self) -> int:
+        return len(self.map)
 
-    def get(self, key: int) -> Optional[Any]:
+    def __contains__(self, key: Hashable) -> bool:
+        """Membership test that does not touch recency."""
+        return key in self.map
+
+    def get(self, key: Hashable) -> Optional[Any]:
         """
         Get value by key and mark as recently used.
 
@@ -37,10 +100,25 @@ class LRUCache:
         Returns:
             The value if found, None otherwise
         """
-        # TODO: Implement get with LRU update
-        pass
+        with self.lock:
+            node = self.map.get(key)
+            if node is None:
+                self.stats.misses += 1
+                return None
+            self.stats.hits += 1
+            # Unlink and move to the front (most recently used)
+            root = self.root
+            if node.prev is not root:
+                node.prev.next = node.next
+                node.next.prev = node.prev
+                first = root.next
+                node.prev = root
+                node.next = first
+                first.prev = node
+                root.next = node
+            return node.value
 
-    def put(self, key: int, value: Any) -> None:
+    def put(self, key: Hashable, value: Any) -> None:
         """
         Put a key-value pair, evicting LRU item if at capacity.
 
@@ -48,5 +126,246 @@ class LRUCache:
             key: The key to store
             value: The value to store
         """
-        # TODO: Implement put with LRU eviction
-        pass
+        if self.max_weight is not None:
+            self._put_weighted(key, value)
+            return
+        with self.lock:
+            root = self.root
+            node = self.map.get(key)
+            if node is not None:
+                node.value = value
+                node.prev.next = node.next
+                node.next.prev = node.prev
+            elif len(self.map) >= self.capacity:
+                # Reuse the evicted tail node for the new entry
+                node = root.prev
+                node.prev.next = root
+                root.prev = node.prev
+                del self.map[node.key]
+                self.stats.evictions += 1
+                node.key = key
+                node.value = value
+                self.map[key] = node
+            else:
+                node = _Node(key, value)
+                self.map[key] = node
+            first = root.next
+            node.prev = root
+            node.next = first
+            first.prev = node
+            root.next = node
+
+    def _put_weighted(self, key: Hashable, value: Any) -> None:
+        """Insert or update an entry, then evict until the budget holds."""
+        weight = self.weigher(key, value)
+        with self.lock:
+            node = self.map.get(key)
+            if node is not None:
+                node.prev.next = node.next
+                node.next.prev = node.prev
+                self.weight -= node.weight
+            if weight > self.max_entry_weight:
+                # Too large to cache; drop any previous value for the key
+                if node is not None:
+                    del self.map[key]
+                self.stats.evictions += 1
+                return
+            if node is None:
+                node = self.map[key] = _Node(key, value)
+            else:
+                node.value = value
+            node.weight = weight
+            self.weight += weight
+            root = self.root
+            first = root.next
+            node.prev = root
+            node.next = first
+            first.prev = node
+            root.next = node
+
+            # The new entry is at the front and fits on its own, so this
+            # never evicts it
+            limit = self.capacity
+            while self.weight > self.max_weight or (
+                limit is not None and len(self.map) > limit
+            ):
+                victim = root.prev
+                victim.prev.next = root
+                root.prev = victim.prev
+                del self.map[victim.key]
+                self.weight -= victim.weight
+                self.stats.evictions += 1
+
+    def delete(self, key: Hashable) -> bool:
+        """
+        Remove a key.
+
+        Args:
+            key: The key to remove
+
+        Returns:
+            True if the key was present, False otherwise
+        """
+        with self.lock:
+            node = self.map.pop(key, None)
+            if node is None:
+                return False
+            node.prev.next = node.next
+            node.next.prev = node.prev
+            self.weight -= node.weight
+            return True
+
+    def pop_lru(self) -> Optional[Tuple[Hashable, Any]]:
+        """
+        Remove the least recently used entry.
+
+        Lets an owner that manages resources behind the values (e.g. arena
+        blocks) evict on its own terms.
+
+        Returns:
+            The removed (key, value) pair, None if the cache is empty
+        """
+        with self.lock:
+            root = self.root
+            node = root.prev
+            if node is root:
+                return None
+            node.prev.next = root
+            root.prev = node.prev
+            del self.map[node.key]
+            self.weight -= node.weight
+            return node.key, node.value
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        with self.lock:
+            self.map.clear()
+            self.root.prev = self.root.next = self.root
+            self.weight = 0
+
+    def keys(self) -> List[Hashable]:
+        """Keys from most to least recently used."""
+        with self.lock:
+            return list(self._iter_keys())
+
+    def _iter_keys(self) -> Iterator[Hashable]:
+        node = self.root.next
+        while node is not self.root:
+            yield node.key
+            node = node.next
+
+
+class ConcurrentLRUCache:
+    """
+    Lock-striped LRU cache for multi-threaded servers.
+
+    Keys are hashed onto ``num_stripes`` independent LRUCache segments, each
+    with its own lock and ``capacity / num_stripes`` entries. Eviction is LRU
+    within a segment, which approximates global LRU closely once each segment
+    holds more than a few hundred entries. A weight budget is split across
+    segments the same way.
+
+    Args:
+        capacity: Maximum number of items to store across all segments
+        num_stripes: Number of independently locked segments (default: 16)
+        max_weight: Total weight budget across all segments
+        weigher: Entry weigher for weighted mode
+        max_entry_weight: Heaviest entry cached in weighted mode (default:
+            1/8 of a segment's budget)
+    """
+
+    def __init__(
+        self,
+        capacity: Optional[int] = None,
+        num_stripes: int = 16,
+        max_weight: Optional[int] = None,
+        weigher: Optional[Weigher] = None,
+        max_entry_weight: Optional[int] = None,
+    ):
+        if num_stripes < 1:
+            raise ValueError("num_stripes must be at least 1")
+        check_limits(capacity, max_weight)
+        if capacity is not None and capacity < num_stripes:
+            raise ValueError("capacity must be at least num_stripes")
+        if max_weight is not None and max_weight < num_stripes:
+            raise ValueError("max_weight must be at least num_stripes")
+        self.capacity = capacity
+        self.max_weight = max_weight
+        self.num_stripes = num_stripes
+        self.segments: List[LRUCache] = [
+            LRUCache(
+                _share(capacity, i, num_stripes),
+                _share(max_weight, i, num_stripes),
+                weigher,
+                max_entry_weight,
+            )
+            for i in range(num_stripes)
+        ]
+        self._stats = CacheStats(segment.stats for segment in self.segments)
+
+    def _segment(self, key: Hashable) -> LRUCache:
+        return self.segments[hash(key) % self.num_stripes]
+
+    def __len__(self) -> int:
+        return sum(len(segment) for segment in self.segments)
+
+    @property
+    def stats(self) -> CacheStats:
+        """Counters summed over all segments."""
+        self._stats.refresh()
+        return self._stats
+
+    @property
+    def weight(self) -> int:
+        """Total weight of all entries (0 without max_weight)."""
+        return sum(segment.weight for segment in self.segments)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._segment(key)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Get value by key and mark as recently used within its segment.
+
+        Args:
+            key: The key to look up
+
+        Returns:
+            The value if found, None otherwise
+        """
+        return self._segment(key).get(key)
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """
+        Put a key-value pair, evicting the segment's LRU item if it is full.
+
+        Args:
+            key: The key to store
+            value: The value to store
+        """
+        self._segment(key).put(key, value)
+
+    def delete(self, key: Hashable) -> bool:
+        """
+        Remove a key.
+
+        Args:
+            key: The key to remove
+
+        Returns:
+            True if the key was present, False otherwise
+        """
+        return self._segment(key).delete(key)
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        for segment in self.segments:
+            segment.clear()
+
+
+def _share(total: Optional[int], index: int, parts: int) -> Optional[int]:
+    """Part `index` of `total` split as evenly as possible into `parts`."""
+    if total is None:
+        return None
+    base, extra = divmod(total, parts)
+    return base + (1 if index < extra else 0)
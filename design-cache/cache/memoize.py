@@ -0,0 +1,237 @@
+"""
+Single-flight memoization over the cache engines.
+
+``@cached(cache=LRUCache(1000))`` memoizes a function in any cache exposing
+``get``, ``put`` and ``delete`` (LRUCache, LFUCache, TTLCache, ...), for both
+plain and ``async def`` functions:
+
+- Request coalescing: when a key is missing, one caller computes it and
+  every concurrent caller for the same key waits for that result instead of
+  hitting the backing store too. Exceptions reach all of them and nothing
+  is cached
+- Stale-while-revalidate: with ``stale_after``, a value older than that is
+  still served, while one background refresh recomputes it. The cache's own
+  eviction or TTL remains the hard limit on how stale a value can get
+
+Values are stored wrapped in a small record with their refresh deadline, so
+``None`` results are cached like any other value. Every computation is
+recorded with ``cache.stats.record_load`` when the cache keeps stats.
+"""
+
+import asyncio
+import functools
+import inspect
+import math
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Optional
+
+_KWARGS_MARK = object()
+_FAST_TYPES = frozenset({int, str})
+
+
+class _Record:
+    """Cached result with the time after which it should be refreshed."""
+
+    __slots__ = ("value", "stale_at")
+
+    def __init__(self, value: Any, stale_at: float):
+        self.value = value
+        self.stale_at = stale_at
+
+
+class _Call:
+    """An in-flight computation that concurrent callers wait on."""
+
+    __slots__ = ("done", "value", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+
+
+def make_key(*args: Any, **kwargs: Any) -> Hashable:
+    """
+    Default cache key: the positional arguments followed by the keyword
+    arguments. A single int or str argument is used as the key itself.
+    """
+    if not kwargs:
+        if len(args) == 1 and type(args[0]) in _FAST_TYPES:
+            return args[0]
+        return args
+    return args + (_KWARGS_MARK,) + tuple(kwargs.items())
+
+
+def cached(
+    cache: Any,
+    key: Callable[..., Hashable] = make_key,
+    stale_after: Optional[float] = None,
+    clock: Optional[Callable[[], float]] = None,
+) -> Callable[[Callable], Callable]:
+    """
+    Memoize a function in `cache` with request coalescing.
+
+    Args:
+        cache: Cache engine with get(key), put(key, value) and delete(key)
+        key: Builds the cache key from the call's arguments
+        stale_after: Seconds after which a cached value is refreshed in the
+            background while still being served; None disables
+            stale-while-revalidate
+        clock: Zero-argument callable returning the current time in seconds
+            (defaults to time.monotonic)
+
+    Returns:
+        Decorator producing a wrapper with the same signature. The wrapper
+        exposes ``cache`` and ``invalidate(*args, **kwargs)``
+    """
+    now = clock if clock is not None else time.monotonic
+    ttl = math.inf if stale_after is None else stale_after
+    stats = getattr(cache, "stats", None)
+    record_load = stats.record_load if stats is not None else None
+
+    def decorator(func: Callable) -> Callable:
+        if inspect.iscoroutinefunction(func):
+            wrapper = _async_wrapper(func, cache, key, ttl, now, record_load)
+        else:
+            wrapper = _sync_wrapper(func, cache, key, ttl, now, record_load)
+
+        def invalidate(*args: Any, **kwargs: Any) -> bool:
+            """Drop the cached value for these arguments."""
+            return cache.delete(key(*args, **kwargs))
+
+        wrapper.cache = cache
+        wrapper.invalidate = invalidate
+        return functools.update_wrapper(wrapper, func)
+
+    return decorator
+
+
+def _sync_wrapper(
+    func: Callable,
+    cache: Any,
+    key: Callable[..., Hashable],
+    ttl: float,
+    now: Callable[[], float],
+    record_load: Optional[Callable[[float], None]],
+) -> Callable:
+    calls: Dict[Hashable, _Call] = {}
+    lock = threading.Lock()
+    # Loads finished so far, bumped under `lock` after each one publishes
+    finished = 0
+
+    def load(cache_key: Hashable, call: _Call, args, kwargs) -> None:
+        """Compute a value as the leader of `call` and publish it."""
+        nonlocal finished
+        try:
+            start = time.perf_counter()
+            call.value = func(*args, **kwargs)
+            if record_load is not None:
+                record_load(time.perf_counter() - start)
+            cache.put(cache_key, _Record(call.value, now() + ttl))
+        except BaseException as error:
+            call.error = error
+        finally:
+            with lock:
+                del calls[cache_key]
+                finished += 1
+            call.done.set()
+
+    def refresh(cache_key: Hashable, args, kwargs) -> None:
+        """Start a background reload unless one is already running."""
+        with lock:
+            if cache_key in calls:
+                return
+            call = calls[cache_key] = _Call()
+        threading.Thread(
+            target=load,
+            args=(cache_key, call, args, kwargs),
+            name="cached-refresh",
+            daemon=True,
+        ).start()
+
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        cache_key = key(*args, **kwargs)
+        seen = finished
+        record = cache.get(cache_key)
+        if record is not None:
+            if record.stale_at <= now():
+                refresh(cache_key, args, kwargs)
+            return record.value
+
+        with lock:
+            call = calls.get(cache_key)
+            leader = call is None
+            if leader and finished != seen:
+                # A leader published its result and left since the lookup
+                # above; loaders put before deregistering, so looking again
+                # under the lock cannot miss it
+                record = cache.get(cache_key)
+                if record is not None:
+                    return record.value
+            if leader:
+                call = calls[cache_key] = _Call()
+        if leader:
+            load(cache_key, call, args, kwargs)
+        else:
+            call.done.wait()
+        if call.error is not None:
+            raise call.error
+        return call.value
+
+    return wrapper
+
+
+def _async_wrapper(
+    func: Callable,
+    cache: Any,
+    key: Callable[..., Hashable],
+    ttl: float,
+    now: Callable[[], float],
+    record_load: Optional[Callable[[float], None]],
+) -> Callable:
+    # One task per missing key; callers await it through shield() so a
+    # cancelled caller never cancels the load the others are waiting on
+    tasks: Dict[Hashable, "asyncio.Task[Any]"] = {}
+    # Loads finished so far, bumped after each one publishes
+    finished = 0
+
+    async def load(cache_key: Hashable, args, kwargs) -> Any:
+        nonlocal finished
+        try:
+            start = time.perf_counter()
+            value = await func(*args, **kwargs)
+            if record_load is not None:
+                record_load(time.perf_counter() - start)
+            cache.put(cache_key, _Record(value, now() + ttl))
+            return value
+        finally:
+            del tasks[cache_key]
+            finished += 1
+
+    def start(cache_key: Hashable, args, kwargs) -> "asyncio.Task[Any]":
+        task = tasks.get(cache_key)
+        if task is None:
+            task = tasks[cache_key] = asyncio.ensure_future(
+                load(cache_key, args, kwargs)
+            )
+            # Retrieve the exception so a refresh nobody awaits stays quiet
+            task.add_done_callback(lambda done: done.cancelled() or done.exception())
+        return task
+
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        cache_key = key(*args, **kwargs)
+        seen = finished
+        record = cache.get(cache_key)
+        if record is not None:
+            if record.stale_at <= now():
+                start(cache_key, args, kwargs)
+            return record.value
+        if finished != seen and cache_key not in tasks:
+            # Look again before leading: a load finished since the lookup
+            record = cache.get(cache_key)
+            if record is not None:
+                return record.value
+        return await asyncio.shield(start(cache_key, args, kwargs))
+
+    return wrapper
@@ -0,0 +1,428 @@
+"""
+Two-tier near cache: an in-process L1 in front of a shared L2.
+
+Every node keeps a small LRUCache (L1) of recently read entries in front of
+a Redis-protocol store (L2) shared by all nodes:
+
+- Reads try L1 and go to L2 only on a miss; ``get_many`` fetches all of its
+  L1 misses with a single ``MGET``
+- Writes go to L2, then publish the written keys on an invalidation channel.
+  Every other node's listener thread drops those keys from its L1, so the
+  next read there fetches the new value
+- Pub/sub is fire-and-forget, so a node can miss an invalidation (e.g. while
+  reconnecting). L1 entries therefore also expire ``l1_ttl`` seconds after
+  they were fetched, which bounds staleness even then
+- L1 never outlives L2: reads fetch each key's remaining TTL (``PTTL``) in
+  the same pipelined round trip and cap the L1 expiry at it, and writes cap
+  it at their own TTL
+
+A read that races with an invalidation could re-insert the old value it
+fetched just before. Each node counts the invalidations it has applied and
+only fills L1 if the count did not change during the L2 fetch.
+
+Without a Redis client the cache runs against :class:`LocalCacheServer`, an
+in-process stand-in for the GET/MGET/PTTL/SET/DEL/PUBLISH subset and
+pipelines, for tests and local development.
+"""
+
+import json
+import math
+import pickle
+import queue
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from .lru_cache import LRUCache
+
+
+class _PubSub:
+    """Subscription handle returned by LocalCacheServer.pubsub()."""
+
+    def __init__(self, server: "LocalCacheServer"):
+        self.server = server
+        self.messages: "queue.Queue[dict]" = queue.Queue()
+        self.channels: List[str] = []
+
+    def subscribe(self, *channels: str) -> None:
+        with self.server.lock:
+            for channel in channels:
+                self.server.subscribers.setdefault(channel, []).append(self)
+                self.channels.append(channel)
+
+    def get_message(self, timeout: float = 0.0) -> Optional[dict]:
+        """Next published message, or None after `timeout` seconds."""
+        try:
+            return self.messages.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self) -> None:
+        with self.server.lock:
+            for channel in self.channels:
+                self.server.subscribers[channel].remove(self)
+            self.channels = []
+
+
+class _Pipeline:
+    """Command buffer returned by LocalCacheServer.pipeline()."""
+
+    def __init__(self, server: "LocalCacheServer"):
+        self.server = server
+        self.commands: List[Tuple[Callable[..., Any], tuple]] = []
+
+    def get(self, key: str) -> "_Pipeline":
+        self.commands.append((self.server._read, (key,)))
+        return self
+
+    def mget(self, keys: Iterable[str]) -> "_Pipeline":
+        self.commands.append((self.server._read_many, (list(keys),)))
+        return self
+
+    def pttl(self, key: str) -> "_Pipeline":
+        self.commands.append((self.server._pttl, (key,)))
+        return self
+
+    def execute(self) -> List[Any]:
+        """Run the buffered commands in one round trip, atomically."""
+        commands, self.commands = self.commands, []
+        self.server._round_trip()
+        with self.server.lock:
+            return [command(*args) for command, args in commands]
+
+
+class LocalCacheServer:
+    """
+    In-process stand-in for the subset of the redis-py client the near cache
+    uses.
+
+    Commands run under one lock, like commands on the single-threaded Redis
+    server. An optional ``latency`` (seconds) is slept on every command to
+    emulate a network round trip.
+
+    Args:
+        latency: Simulated round-trip time per command (default: 0)
+    """
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        # key -> (value, expiry in time.monotonic() seconds or None)
+        self.store: Dict[str, Tuple[bytes, Optional[float]]] = {}
+        self.subscribers: Dict[str, List[_PubSub]] = {}
+        self.lock = threading.Lock()
+        self.commands = 0
+
+    def _round_trip(self) -> None:
+        self.commands += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def _read(self, key: str) -> Optional[bytes]:
+        entry = self.store.get(key)
+        if entry is None:
+            return None
+        if entry[1] is not None and entry[1] <= time.monotonic():
+            del self.store[key]
+            return None
+        return entry[0]
+
+    def _read_many(self, keys: Iterable[str]) -> List[Optional[bytes]]:
+        return [self._read(key) for key in keys]
+
+    def _pttl(self, key: str) -> int:
+        if self._read(key) is None:
+            return -2
+        expires_at = self.store[key][1]
+        if expires_at is None:
+            return -1
+        return max(0, math.ceil((expires_at - time.monotonic()) * 1000))
+
+    def get(self, key: str) -> Optional[bytes]:
+        self._round_trip()
+        with self.lock:
+            return self._read(key)
+
+    def mget(self, keys: Iterable[str]) -> List[Optional[bytes]]:
+        self._round_trip()
+        with self.lock:
+            return self._read_many(keys)
+
+    def pttl(self, key: str) -> int:
+        """Milliseconds until the key expires: -1 if never, -2 if missing."""
+        self._round_trip()
+        with self.lock:
+            return self._pttl(key)
+
+    def set(
+        self,
+        key: str,
+        value: bytes,
+        ex: Optional[int] = None,
+        px: Optional[int] = None,
+    ) -> bool:
+        """
+        Store a value with an optional expiry in seconds (ex) or ms (px).
+
+        Raises:
+            ValueError: If ex or px is not a positive int, which redis-py
+                (DataError) or the server rejects as well
+        """
+        for name, ttl in (("ex", ex), ("px", px)):
+            if ttl is not None and not isinstance(ttl, int):
+                raise ValueError(f"{name} must be datetime.timedelta or int")
+            if ttl is not None and ttl <= 0:
+                raise ValueError(f"invalid expire time in 'set' command: {ttl}")
+        self._round_trip()
+        expires_at = None
+        if ex is not None:
+            expires_at = time.monotonic() + ex
+        elif px is not None:
+            expires_at = time.monotonic() + px / 1000
+        with self.lock:
+            self.store[key] = (value, expires_at)
+        return True
+
+    def delete(self, *keys: str) -> int:
+        """Delete keys, returning how many existed."""
+        self._round_trip()
+        with self.lock:
+            return sum(self.store.pop(key, None) is not None for key in keys)
+
+    def publish(self, channel: str, message: str) -> int:
+        """Deliver a message to every subscriber, returning how many got it."""
+        self._round_trip()
+        data = message.encode()
+        with self.lock:
+            receivers = list(self.subscribers.get(channel, ()))
+        for subscriber in receivers:
+            subscriber.messages.put(
+                {"type": "message", "channel": channel.encode(), "data": data}
+            )
+        return len(receivers)
+
+    def pubsub(self, ignore_subscribe_messages: bool = True) -> _PubSub:
+        return _PubSub(self)
+
+    def pipeline(self, transaction: bool = True) -> _Pipeline:
+        return _Pipeline(self)
+
+
+class NearCache:
+    """
+    In-process LRU (L1) in front of a shared Redis-protocol store (L2).
+
+    Args:
+        redis_client: redis-py client for L2 (uses a LocalCacheServer if None)
+        l1_capacity: Entries kept in the in-process L1
+        l1_ttl: Seconds an L1 entry may be served without re-reading L2; the
+            staleness bound if an invalidation is lost. Entries with a
+            shorter remaining TTL in L2 expire from L1 with it
+        key_prefix: Namespace for keys in L2
+        channel: Pub/sub channel carrying invalidations
+        serializer: Turns values into bytes for L2 (default: pickle.dumps)
+        deserializer: Inverse of serializer (default: pickle.loads)
+        clock: Zero-argument callable returning the current time in seconds
+            (defaults to time.monotonic)
+    """
+
+    def __init__(
+        self,
+        redis_client=None,
+        l1_capacity: int = 1024,
+        l1_ttl: float = 5.0,
+        key_prefix: str = "cache:",
+        channel: str = "cache:invalidate",
+        serializer: Callable[[Any], bytes] = pickle.dumps,
+        deserializer: Callable[[bytes], Any] = pickle.loads,
+        clock: Optional[Callable[[], float]] = None,
+    ):
+        self.redis = redis_client if redis_client is not None else LocalCacheServer()
+        self.l1 = LRUCache(l1_capacity)
+        self.l1_ttl = l1_ttl
+        self.key_prefix = key_prefix
+        self.channel = channel
+        self.serializer = serializer
+        self.deserializer = deserializer
+        self.clock = clock if clock is not None else time.monotonic
+        self.node_id = uuid.uuid4().hex
+        # Invalidations applied to L1; a fetch only fills L1 if unchanged
+        self.invalidations = 0
+        self.l1_hits = 0
+        self.l2_hits = 0
+        self.l2_misses = 0
+        self.round_trips = 0
+
+        self.pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+        self.pubsub.subscribe(channel)
+        self._stopped = threading.Event()
+        self.listener = threading.Thread(
+            target=self._listen, name="near-cache-invalidations", daemon=True
+        )
+        self.listener.start()
+
+    def _listen(self) -> None:
+        while not self._stopped.is_set():
+            try:
+                message = self.pubsub.get_message(timeout=0.1)
+            except Exception:
+                # Lost connection: anything may have changed meanwhile
+                self.invalidations += 1
+                self.l1.clear()
+                time.sleep(0.1)
+                continue
+            if message is None or message.get("type") != "message":
+                continue
+            sender, keys = json.loads(message["data"])
+            if sender == self.node_id:
+                continue
+            self.invalidations += 1
+            for key in keys:
+                self.l1.delete(key)
+
+    def close(self) -> None:
+        """Stop the invalidation listener and unsubscribe."""
+        self._stopped.set()
+        self.listener.join()
+        self.pubsub.close()
+
+    def _l1_get(self, key: str, now: float) -> Any:
+        record = self.l1.get(key)
+        if record is None:
+            return None
+        if record[1] <= now:
+            self.l1.delete(key)
+            return None
+        self.l1_hits += 1
+        return record
+
+    def _l1_expiry(self, now: float, pttl: int) -> float:
+        """L1 expiry for a value fetched at `now` with `pttl` ms left in L2."""
+        if pttl >= 0:
+            return now + min(self.l1_ttl, pttl / 1000)
+        return now + self.l1_ttl
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Get a value, from L1 if possible.
+
+        Args:
+            key: The key to look up
+
+        Returns:
+            The value if found, None otherwise
+        """
+        now = self.clock()
+        record = self._l1_get(key, now)
+        if record is not None:
+            return record[0]
+
+        invalidations = self.invalidations
+        self.round_trips += 1
+        name = self.key_prefix + key
+        data, pttl = self.redis.pipeline().get(name).pttl(name).execute()
+        if data is None:
+            self.l2_misses += 1
+            return None
+        self.l2_hits += 1
+        value = self.deserializer(data)
+        if self.invalidations == invalidations:
+            self.l1.put(key, (value, self._l1_expiry(now, pttl)))
+        return value
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """
+        Get several values with at most one L2 round trip.
+
+        Args:
+            keys: Keys to look up
+
+        Returns:
+            Dictionary of the keys found and their values
+        """
+        now = self.clock()
+        found: Dict[str, Any] = {}
+        missing: List[str] = []
+        for key in keys:
+            record = self._l1_get(key, now)
+            if record is None:
+                missing.append(key)
+            else:
+                found[key] = record[0]
+        if not missing:
+            return found
+
+        invalidations = self.invalidations
+        self.round_trips += 1
+        names = [self.key_prefix + key for key in missing]
+        pipe = self.redis.pipeline().mget(names)
+        for name in names:
+            pipe.pttl(name)
+        values, *pttls = pipe.execute()
+        fill = self.invalidations == invalidations
+        for key, data, pttl in zip(missing, values, pttls):
+            if data is None:
+                self.l2_misses += 1
+                continue
+            self.l2_hits += 1
+            value = found[key] = self.deserializer(data)
+            if fill:
+                self.l1.put(key, (value, self._l1_expiry(now, pttl)))
+        return found
+
+    def put(self, key: str, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        """
+        Write a value to L2 and invalidate it in every other node's L1.
+
+        Args:
+            key: The key to store
+            value: The value to store
+            ttl_seconds: Expiry in L2, rounded up to whole milliseconds; None
+                keeps it until deleted. The L1 copy expires no later
+        """
+        # redis-py only takes integer expiries, so send fractions as ms
+        px = None if ttl_seconds is None else max(1, math.ceil(ttl_seconds * 1000))
+        l1_ttl = self.l1_ttl if ttl_seconds is None else min(self.l1_ttl, ttl_seconds)
+        self.round_trips += 2
+        self.redis.set(self.key_prefix + key, self.serializer(value), px=px)
+        self.l1.put(key, (value, self.clock() + l1_ttl))
+        self._publish([key])
+
+    def delete(self, key: str) -> bool:
+        """
+        Delete a key everywhere.
+
+        Args:
+            key: The key to remove
+
+        Returns:
+            True if the key existed in L2
+        """
+        self.round_trips += 2
+        existed = self.redis.delete(self.key_prefix + key) > 0
+        self.l1.delete(key)
+        self._publish([key])
+        return existed
+
+    def _publish(self, keys: List[str]) -> None:
+        self.redis.publish(self.channel, json.dumps([self.node_id, keys]))
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Get tier hit counts.
+
+        Returns:
+            Dictionary with l1_hits, l2_hits, misses, round_trips,
+            invalidations and l1_hit_ratio (share of reads never leaving the
+            process)
+        """
+        l1_hits = self.l1_hits
+        reads = l1_hits + self.l2_hits + self.l2_misses
+        return {
+            "l1_hits": l1_hits,
+            "l2_hits": self.l2_hits,
+            "misses": self.l2_misses,
+            "round_trips": self.round_trips,
+            "invalidations": self.invalidations,
+            "l1_hit_ratio": l1_hits / reads if reads else 0.0,
+        }
@@ -0,0 +1,365 @@
+"""
+Consistent-hashing client over several cache shards.
+
+``ShardedCache`` routes every key to one of several caches (local engines,
+NearCache instances, or anything with get/put/delete) through a
+``HashRing``:
+
+- Each shard owns ``virtual_nodes`` points on a 64-bit ring; a key belongs to
+  the first point at or after its hash. Many points per shard even out the
+  load, and adding or removing a shard only moves the keys on the arcs it
+  gains or loses (about 1/N of them)
+- Positions are BLAKE2b digests, not ``hash()``, so every process and every
+  restart routes a key to the same shard
+- ``get_many`` groups keys by shard and queries the shards in parallel on a
+  thread pool, using a shard's own ``get_many`` when it has one
+- Optional hot-key replication: keys a frequency sketch sees often are also
+  written to the next ``replicas`` shards on the ring, and reads of them are
+  spread over all copies. Writes of other keys delete any leftover copies,
+  so a key that cools down and heats up again never serves an old replica
+
+Requests take no lock. The ring points and the shard caches are published
+together as one immutable snapshot, so a request racing with add_shard or
+remove_shard routes with either the old membership or the new one, never a
+mix of both.
+"""
+
+import bisect
+import hashlib
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Tuple
+
+from .lfu_cache import FrequencySketch
+
+
+def ring_hash(value: str) -> int:
+    """Stable 64-bit ring position of a string."""
+    digest = hashlib.blake2b(value.encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
+def _owner(points: Tuple[Tuple[int, ...], Tuple[str, ...]], key: Hashable) -> str:
+    """Node owning a key on a (positions, owners) ring snapshot."""
+    positions, owners = points
+    if not owners:
+        raise LookupError("Hash ring has no nodes")
+    index = bisect.bisect(positions, ring_hash(str(key)))
+    return owners[index % len(owners)]
+
+
+def _owners(
+    points: Tuple[Tuple[int, ...], Tuple[str, ...]], key: Hashable, count: int
+) -> List[str]:
+    """
+    The key's owner followed by the next distinct nodes clockwise.
+
+    `count` should not exceed the number of distinct nodes, or the search
+    walks the whole ring.
+    """
+    positions, owners = points
+    if not owners:
+        raise LookupError("Hash ring has no nodes")
+    index = bisect.bisect(positions, ring_hash(str(key)))
+    nodes: List[str] = []
+    size = len(owners)
+    for step in range(size):
+        owner = owners[(index + step) % size]
+        if owner not in nodes:
+            nodes.append(owner)
+            if len(nodes) == count:
+                break
+    return nodes
+
+
+class HashRing:
+    """
+    Consistent-hash ring with virtual nodes.
+
+    Lookups take no lock. The sorted ring points are one immutable
+    (positions, owners) snapshot that add_node and remove_node rebuild and
+    publish with a single assignment, so a lookup racing with a change sees
+    either the old ring or the new one. Changes must be serialized by the
+    caller (ShardedCache holds its lock).
+
+    Args:
+        nodes: Initial node names
+        virtual_nodes: Ring points per node (per unit of weight)
+    """
+
+    def __init__(self, nodes: Iterable[str] = (), virtual_nodes: int = 160):
+        if virtual_nodes < 1:
+            raise ValueError("virtual_nodes must be at least 1")
+        self.virtual_nodes = virtual_nodes
+        # (sorted positions, owner of each position), replaced whole
+        self.points: Tuple[Tuple[int, ...], Tuple[str, ...]] = ((), ())
+        self.weights: Dict[str, int] = {}
+        for node in nodes:
+            self.add_node(node)
+
+    def __len__(self) -> int:
+        return len(self.weights)
+
+    def __contains__(self, node: str) -> bool:
+        return node in self.weights
+
+    def add_node(self, node: str, weight: int = 1) -> None:
+        """
+        Add a node owning `weight * virtual_nodes` ring points.
+
+        Raises:
+            ValueError: If the node is already on the ring
+        """
+        if node in self.weights:
+            raise ValueError(f"Node {node!r} is already on the ring")
+        positions, owners = self.points
+        added = [
+            (ring_hash(f"{node}#{replica}"), node)
+            for replica in range(weight * self.virtual_nodes)
+        ]
+        self._publish(sorted([*zip(positions, owners), *added]))
+        self.weights[node] = weight
+
+    def remove_node(self, node: str) -> None:
+        """
+        Remove a node and all of its ring points.
+
+        Raises:
+            KeyError: If the node is not on the ring
+        """
+        del self.weights[node]
+        positions, owners = self.points
+        self._publish(
+            [
+                (position, owner)
+                for position, owner in zip(positions, owners)
+                if owner != node
+            ]
+        )
+
+    def _publish(self, points: List[Tuple[int, str]]) -> None:
+        """Swap in a new sorted list of (position, owner) ring points."""
+        self.points = (
+            tuple(position for position, _ in points),
+            tuple(owner for _, owner in points),
+        )
+
+    def node_for(self, key: Hashable) -> str:
+        """
+        Node owning a key.
+
+        Raises:
+            LookupError: If the ring is empty
+        """
+        return _owner(self.points, key)
+
+    def nodes_for(self, key: Hashable, count: int) -> List[str]:
+        """
+        The key's owner followed by the next distinct nodes clockwise.
+
+        Args:
+            key: Key to place
+            count: Number of distinct nodes wanted
+
+        Returns:
+            Up to `count` node names, owner first
+        """
+        return _owners(self.points, key, min(count, len(self.weights)))
+
+
+class _Routes:
+    """Ring points and the shard cache of every node, published together."""
+
+    __slots__ = ("points", "shards")
+
+    def __init__(
+        self, points: Tuple[Tuple[int, ...], Tuple[str, ...]], shards: Dict[str, Any]
+    ):
+        self.points = points
+        self.shards = shards
+
+
+class ShardedCache:
+    """
+    Cache client spreading keys over shards with consistent hashing.
+
+    Args:
+        shards: Shard name -> cache with get/put/delete
+        virtual_nodes: Ring points per shard
+        replicas: Extra copies kept of hot keys (0 disables replication)
+        hot_threshold: Recent reads (per the frequency sketch) from which a
+            key counts as hot
+        max_workers: Threads used by get_many to query shards in parallel
+    """
+
+    def __init__(
+        self,
+        shards: Dict[str, Any],
+        virtual_nodes: int = 160,
+        replicas: int = 0,
+        hot_threshold: int = 8,
+        max_workers: Optional[int] = None,
+    ):
+        self.ring = HashRing(shards, virtual_nodes)
+        self.routes = _Routes(self.ring.points, dict(shards))
+        self.replicas = replicas
+        self.hot_threshold = hot_threshold
+        self.sketch = FrequencySketch(4096) if replicas else None
+        # Serializes membership changes; requests never take it
+        self.lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers or max(4, len(shards)),
+            thread_name_prefix="sharded-cache",
+        )
+
+    @property
+    def shards(self) -> Dict[str, Any]:
+        """Shard name -> cache in the current snapshot (do not modify)."""
+        return self.routes.shards
+
+    def add_shard(self, name: str, cache: Any, weight: int = 1) -> None:
+        """Add a shard; only the keys on the ring arcs it takes over move."""
+        with self.lock:
+            self.ring.add_node(name, weight)
+            self.routes = _Routes(self.ring.points, {**self.routes.shards, name: cache})
+
+    def remove_shard(self, name: str) -> Any:
+        """Remove a shard, returning its cache; its keys move to neighbors."""
+        with self.lock:
+            self.ring.remove_node(name)
+            shards = dict(self.routes.shards)
+            cache = shards.pop(name)
+            self.routes = _Routes(self.ring.points, shards)
+            return cache
+
+    def shard_for(self, key: Hashable) -> Any:
+        """Cache owning a key."""
+        routes = self.routes
+        return routes.shards[_owner(routes.points, key)]
+
+    def _placement(self, routes: _Routes, key: Hashable) -> List[str]:
+        """The key's owner and replica nodes in a routing snapshot."""
+        count = min(1 + self.replicas, len(routes.shards))
+        return _owners(routes.points, key, count)
+
+    def _is_hot(self, key: Hashable) -> bool:
+        return self.sketch.frequency(key) >= self.hot_threshold
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Get value by key from its shard, or from any copy if it is hot.
+
+        Args:
+            key: The key to look up
+
+        Returns:
+            The value if found, None otherwise
+        """
+        routes = self.routes
+        shards = routes.shards
+        if self.sketch is None:
+            return shards[_owner(routes.points, key)].get(key)
+
+        # Unlocked: a racing increment can be lost, which only makes the
+        # approximate count slightly lower, and counters cannot overflow
+        self.sketch.increment(key)
+        if not self._is_hot(key):
+            return shards[_owner(routes.points, key)].get(key)
+
+        nodes = self._placement(routes, key)
+        node = random.choice(nodes)
+        value = shards[node].get(key)
+        if value is None and node != nodes[0]:
+            # Replica not filled yet: read the owner and repair the copy
+            value = shards[nodes[0]].get(key)
+            if value is not None:
+                shards[node].put(key, value)
+        return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """
+        Store a value on its shard, and on its replicas if the key is hot.
+
+        Args:
+            key: The key to store
+            value: The value to store
+        """
+        routes = self.routes
+        shards = routes.shards
+        if self.sketch is None:
+            shards[_owner(routes.points, key)].put(key, value)
+            return
+
+        nodes = self._placement(routes, key)
+        shards[nodes[0]].put(key, value)
+        hot = self._is_hot(key)
+        for node in nodes[1:]:
+            if hot:
+                shards[node].put(key, value)
+            else:
+                shards[node].delete(key)
+
+    def delete(self, key: Hashable) -> bool:
+        """
+        Remove a key (and any replicas).
+
+        Args:
+            key: The key to remove
+
+        Returns:
+            True if the owning shard had the key, False otherwise
+        """
+        routes = self.routes
+        shards = routes.shards
+        if self.sketch is None:
+            return shards[_owner(routes.points, key)].delete(key)
+        nodes = self._placement(routes, key)
+        existed = shards[nodes[0]].delete(key)
+        for node in nodes[1:]:
+            shards[node].delete(key)
+        return existed
+
+    def get_many(self, keys: Iterable[Hashable]) -> Dict[Hashable, Any]:
+        """
+        Get several values, querying all involved shards in parallel.
+
+        Args:
+            keys: Keys to look up
+
+        Returns:
+            Dictionary of the keys found and their values
+        """
+        routes = self.routes
+        shards = routes.shards
+        groups: Dict[str, List[Hashable]] = {}
+        for key in keys:
+            groups.setdefault(_owner(routes.points, key), []).append(key)
+        if len(groups) == 1:
+            ((node, group),) = groups.items()
+            return self._get_group(shards[node], group)
+
+        futures = [
+            self.executor.submit(self._get_group, shards[node], group)
+            for node, group in groups.items()
+        ]
+        found: Dict[Hashable, Any] = {}
+        for future in futures:
+            found.update(future.result())
+        return found
+
+    @staticmethod
+    def _get_group(cache: Any, keys: List[Hashable]) -> Dict[Hashable, Any]:
+        get_many = getattr(cache, "get_many", None)
+        if get_many is not None:
+            return get_many(keys)
+        found = {}
+        for key in keys:
+            value = cache.get(key)
+            if value is not None:
+                found[key] = value
+        return found
+
+    def close(self) -> None:
+        """Shut down the get_many thread pool."""
+        self.executor.shutdown(wait=True)
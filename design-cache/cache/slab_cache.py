@@ -0,0 +1,364 @@
+"""
+Off-heap cache for large byte payloads.
+
+``SlabCache`` keeps values in one anonymous memory map instead of as Python
+``bytes`` objects:
+
+- The map is carved by a buddy allocator (``SlabArena``) into power-of-two
+  blocks of ``min_block`` bytes and up. A value takes the blocks matching the
+  binary digits of its size in ``min_block`` units, laid out contiguously,
+  so it wastes less than one ``min_block``; freed blocks merge with their
+  free buddies back into larger ones
+- ``get`` returns a read-only ``memoryview`` of the value inside the map,
+  so reads never copy the payload. ``put`` copies it in once
+- Which value goes when the arena is full is decided by an ``LRUCache``
+  index: least recently used values are evicted until an allocation fits.
+  Values with a TTL are also filed in a ``TimingWheel``, so expired values
+  are dropped on read and ``reap`` frees them in bounded batches
+
+The arena is a fixed-size mapping allocated up front; its pages become
+resident as they are first written and are reused from then on, so the
+process never holds more than ``arena_bytes`` of payload however the value
+sizes are mixed.
+
+A view returned by ``get`` points at the arena blocks, not at a snapshot:
+once its key is overwritten, deleted, evicted or expired, the blocks may be
+handed to another value. Consume views right away (write them to a socket,
+parse them) or copy them with ``bytes(view)`` to keep them.
+"""
+
+import math
+import mmap
+import threading
+import time
+from typing import Any, Callable, Hashable, List, Optional, Set
+
+from .lru_cache import LRUCache
+from .stats import CacheStats
+from .ttl_cache import TimingWheel
+
+
+class SlabArena:
+    """
+    Buddy allocator over an anonymous memory map.
+
+    The arena is carved into max_block blocks; a size that is not a multiple
+    of max_block ends in smaller blocks, one per set bit of the remainder,
+    which never merge past the end. Only a remainder below min_block is
+    unused.
+
+    Args:
+        size: Arena size in bytes, rounded down to a multiple of min_block
+        min_block: Smallest block in bytes (power of two)
+        max_block: Largest block in bytes (power-of-two multiple of
+            min_block); bounds the largest allocation
+    """
+
+    def __init__(self, size: int, min_block: int = 4096, max_block: int = 1 << 20):
+        if min_block < 1 or min_block & (min_block - 1):
+            raise ValueError("min_block must be a power of two")
+        if max_block < min_block or max_block & (max_block - 1):
+            raise ValueError("max_block must be a power of two >= min_block")
+        if size < max_block:
+            raise ValueError("size must be at least max_block")
+        self.min_block = min_block
+        self.max_block = max_block
+        self.max_order = (max_block // min_block).bit_length() - 1
+        self.size = size - size % min_block
+        self.buffer = mmap.mmap(-1, self.size)
+        # Block offsets free at each order (block size min_block << order)
+        self.free_lists: List[Set[int]] = [set() for _ in range(self.max_order + 1)]
+        whole = self.size - self.size % max_block
+        self.free_lists[self.max_order].update(range(0, whole, max_block))
+        # The tail: every block is aligned to its size, so its buddy lies past
+        # the end of the arena and is never free
+        offset = whole
+        for order in range(self.max_order - 1, -1, -1):
+            if (self.size - offset) >> order >= min_block:
+                self.free_lists[order].add(offset)
+                offset += min_block << order
+        self.free_bytes = self.size
+
+    def allocate(self, nbytes: int) -> Optional[int]:
+        """
+        Reserve contiguous space for `nbytes`.
+
+        Args:
+            nbytes: Bytes needed (at most max_block)
+
+        Returns:
+            Offset of the space in the arena, None if no free block is large
+            enough
+        """
+        units = max(1, -(-nbytes // self.min_block))
+        order = (units - 1).bit_length()
+        free_lists = self.free_lists
+        for found in range(order, self.max_order + 1):
+            if free_lists[found]:
+                break
+        else:
+            return None
+        offset = free_lists[found].pop()
+        # Split down to the order needed, freeing the upper halves
+        while found > order:
+            found -= 1
+            free_lists[found].add(offset + (self.min_block << found))
+        # Give back the tail the value does not reach: walk the block's
+        # halves, keeping the lower one whole while the value covers it
+        needed = units
+        start = offset
+        while needed < 1 << order:
+            order -= 1
+            half = 1 << order
+            if needed <= half:
+                free_lists[order].add(start + half * self.min_block)
+            else:
+                needed -= half
+                start += half * self.min_block
+        self.free_bytes -= units * self.min_block
+        return offset
+
+    def free(self, offset: int, nbytes: int) -> None:
+        """
+        Release space returned by allocate(nbytes).
+
+        Args:
+            offset: Offset returned by allocate
+            nbytes: The size passed to allocate
+        """
+        units = max(1, -(-nbytes // self.min_block))
+        self.free_bytes += units * self.min_block
+        # The allocation is one block per set bit of `units`, largest first
+        for order in range(units.bit_length() - 1, -1, -1):
+            if units >> order & 1:
+                self._release(offset, order)
+                offset += self.min_block << order
+
+    def _release(self, offset: int, order: int) -> None:
+        """Free one block, merging it with its free buddies."""
+        free_lists = self.free_lists
+        while order < self.max_order:
+            buddy = offset ^ (self.min_block << order)
+            if buddy not in free_lists[order]:
+                break
+            free_lists[order].remove(buddy)
+            offset = min(offset, buddy)
+            order += 1
+        free_lists[order].add(offset)
+
+    def close(self) -> None:
+        """
+        Unmap the arena.
+
+        Raises:
+            BufferError: If views of the arena are still referenced
+        """
+        self.buffer.close()
+
+
+class _Slot:
+    """Location of one value in the arena, with its expiry."""
+
+    __slots__ = ("offset", "length", "expires_at", "bucket", "level")
+
+    def __init__(self, offset: int, length: int, expires_at: float):
+        self.offset = offset
+        self.length = length
+        self.expires_at = expires_at
+        self.bucket = None
+        self.level = 0
+
+
+class SlabCache:
+    """
+    Byte-payload cache storing values in a memory-mapped arena.
+
+    Features:
+    - Zero-copy reads: get returns a read-only memoryview into the arena
+    - Memory bounded by the arena size, not by an estimate of object sizes
+    - LRU eviction when a value does not fit, optional TTL expiry
+    - Thread-safe
+
+    Args:
+        arena_bytes: Size of the memory map holding the values, rounded
+            down to a multiple of min_block (the usable size is arena.size)
+        max_value_bytes: Largest value cached (default: arena_bytes // 8);
+            larger values are refused like oversized entries of the
+            weighted caches. Its size in min_block units is rounded up to
+            a power of two, the largest block the arena hands out, which
+            must fit in arena_bytes
+        min_block: Allocation granularity in bytes (power of two)
+        default_ttl_seconds: Time to live of values put without one; None
+            keeps them until evicted
+        clock: Zero-argument callable returning the current time in seconds
+            (defaults to time.monotonic)
+        tick_seconds: Resolution of the expiry index
+    """
+
+    def __init__(
+        self,
+        arena_bytes: int = 64 * 1024 * 1024,
+        max_value_bytes: Optional[int] = None,
+        min_block: int = 4096,
+        default_ttl_seconds: Optional[float] = None,
+        clock: Optional[Callable[[], float]] = None,
+        tick_seconds: float = 1.0,
+    ):
+        if max_value_bytes is None:
+            max_value_bytes = max(1, arena_bytes // 8)
+        if max_value_bytes < 1 or max_value_bytes > arena_bytes:
+            raise ValueError("max_value_bytes must be between 1 and arena_bytes")
+        units = max(1, -(-max_value_bytes // min_block))
+        max_block = min_block << (units - 1).bit_length()
+        if max_block > arena_bytes:
+            raise ValueError(
+                f"max_value_bytes={max_value_bytes} needs {max_block}-byte "
+                f"blocks, more than arena_bytes={arena_bytes}"
+            )
+        self.arena = SlabArena(arena_bytes, min_block, max_block)
+        self.max_value_bytes = max_value_bytes
+        self.default_ttl = default_ttl_seconds
+        self.clock = clock if clock is not None else time.monotonic
+        # Recency order only; every entry takes at least one block, so the
+        # count limit never evicts on its own
+        self.index = LRUCache(self.arena.size // min_block)
+        self.wheel = TimingWheel(tick_seconds, self.clock())
+        self.view = memoryview(self.arena.buffer).toreadonly()
+        self.lock = threading.Lock()
+        # Total bytes of the stored values
+        self.weight = 0
+        self.stats = CacheStats()
+
+    def __len__(self) -> int:
+        """Number of stored values, including expired ones not yet reaped."""
+        return len(self.index)
+
+    def __contains__(self, key: Hashable) -> bool:
+        slot = self.index.map.get(key)
+        return slot is not None and slot.value.expires_at > self.clock()
+
+    def get(self, key: Hashable) -> Optional[memoryview]:
+        """
+        Get a view of a value and mark it as recently used.
+
+        Args:
+            key: The key to look up
+
+        Returns:
+            Read-only memoryview of the value in the arena if found and not
+            expired, None otherwise
+        """
+        with self.lock:
+            slot = self.index.get(key)
+            if slot is None:
+                self.stats.misses += 1
+                return None
+            if slot.expires_at != math.inf and slot.expires_at <= self.clock():
+                self._remove(key, slot)
+                self.stats.misses += 1
+                self.stats.expirations += 1
+                return None
+            self.stats.hits += 1
+            return self.view[slot.offset : slot.offset + slot.length]
+
+    def put(
+        self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None
+    ) -> None:
+        """
+        Copy a value into the arena, evicting LRU values until it fits.
+
+        Args:
+            key: The key to store
+            value: bytes or any other object supporting the buffer protocol
+            ttl_seconds: Custom TTL, uses the default if None
+        """
+        data = memoryview(value).cast("B")
+        length = data.nbytes
+        ttl = self.default_ttl if ttl_seconds is None else ttl_seconds
+        expires_at = math.inf if ttl is None else self.clock() + ttl
+        with self.lock:
+            previous = self.index.get(key)
+            if previous is not None:
+                self._remove(key, previous)
+            if length > self.max_value_bytes:
+                # Too large to cache; the previous value is gone either way
+                self.stats.evictions += 1
+                return
+            offset = self.arena.allocate(length)
+            while offset is None:
+                victim, slot = self.index.pop_lru()
+                self._free(victim, slot)
+                self.stats.evictions += 1
+                offset = self.arena.allocate(length)
+            self.arena.buffer[offset : offset + length] = data
+            slot = _Slot(offset, length, expires_at)
+            self.index.put(key, slot)
+            self.weight += length
+            if expires_at != math.inf:
+                self.wheel.schedule(key, slot)
+
+    def delete(self, key: Hashable) -> bool:
+        """
+        Remove a key and free its blocks.
+
+        Args:
+            key: The key to remove
+
+        Returns:
+            True if the key was present, False otherwise
+        """
+        with self.lock:
+            slot = self.index.map.get(key)
+            if slot is None:
+                return False
+            self._remove(key, slot.value)
+            return True
+
+    def _remove(self, key: Hashable, slot: _Slot) -> None:
+        self.index.delete(key)
+        self._free(key, slot)
+
+    def _free(self, key: Hashable, slot: _Slot) -> None:
+        """Release a slot already taken out of the index."""
+        self.wheel.remove(key, slot)
+        self.arena.free(slot.offset, slot.length)
+        self.weight -= slot.length
+
+    def reap(self, max_items: int = 1000) -> int:
+        """
+        Free expired values, visiting at most `max_items` of them.
+
+        Args:
+            max_items: Upper bound on the work done by this call
+
+        Returns:
+            Number of values removed
+        """
+        with self.lock:
+            due = self.wheel.advance(self.clock(), max_items)
+            for key, slot in due:
+                self.index.delete(key)
+                self.arena.free(slot.offset, slot.length)
+                self.weight -= slot.length
+            self.stats.expirations += len(due)
+            return len(due)
+
+    def clear(self) -> None:
+        """Remove every value."""
+        with self.lock:
+            while True:
+                entry = self.index.pop_lru()
+                if entry is None:
+                    return
+                self._free(*entry)
+
+    def close(self) -> None:
+        """
+        Release the arena.
+
+        Raises:
+            BufferError: If views returned by get are still referenced
+        """
+        with self.lock:
+            self.view.release()
+            self.arena.close()
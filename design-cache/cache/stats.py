@@ -0,0 +1,184 @@
+"""
+Cache instrumentation.
+
+Every cache carries a ``CacheStats`` in its ``stats`` attribute, updated
+under the cache's own lock (TTLCache hits are counted on its lock-free read
+path, so under heavy thread contention they are approximate):
+
+- ``hits`` / ``misses``: get calls that found / did not find a live value
+- ``evictions``: entries removed (or refused) to respect a size limit
+- ``expirations``: entries removed because their TTL passed
+- ``loads`` / ``load_time``: values computed by ``@cached`` and the total
+  seconds spent computing them
+
+Counting adds a few integer increments on a ``__slots__`` object to each
+operation; no per-call containers are created. Latency histograms need two
+clock reads per call, so they are opt-in: ``track_latency(cache)`` replaces
+the instance's get and put with timed versions, leaving untracked caches
+untouched.
+"""
+
+import time
+from array import array
+from typing import Any, Dict, Iterable, Optional
+
+NUM_BUCKETS = 48
+
+
+class LatencyHistogram:
+    """
+    Log2-bucketed latency histogram in nanoseconds.
+
+    Bucket ``i`` counts calls that took less than ``2**i`` ns (and at least
+    ``2**(i-1)``), so recording is one ``bit_length`` and one array store.
+    """
+
+    __slots__ = ("buckets", "count")
+
+    def __init__(self):
+        self.buckets = array("Q", bytes(8 * NUM_BUCKETS))
+        self.count = 0
+
+    def reset(self) -> None:
+        """Forget every recorded call."""
+        self.buckets = array("Q", bytes(8 * NUM_BUCKETS))
+        self.count = 0
+
+    def record(self, nanoseconds: int) -> None:
+        """Count one call that took `nanoseconds`."""
+        self.buckets[min(nanoseconds.bit_length(), NUM_BUCKETS - 1)] += 1
+        self.count += 1
+
+    def percentile(self, q: float) -> float:
+        """
+        Upper bound of the `q`-th percentile in microseconds.
+
+        Args:
+            q: Percentile between 0 and 100
+
+        Returns:
+            Bucket upper bound containing the percentile, 0.0 if empty
+        """
+        if not self.count:
+            return 0.0
+        rank = q / 100 * self.count
+        seen = 0
+        for index, count in enumerate(self.buckets):
+            seen += count
+            if seen >= rank and count:
+                return (1 << index) / 1000
+        return (1 << (NUM_BUCKETS - 1)) / 1000
+
+
+class CacheStats:
+    """
+    Operation counters of one cache.
+
+    Args:
+        parts: Counters of independent segments this object aggregates;
+            refresh() recomputes the totals from them and reset() resets them
+    """
+
+    __slots__ = (
+        "hits",
+        "misses",
+        "evictions",
+        "expirations",
+        "loads",
+        "load_time",
+        "latency",
+        "parts",
+    )
+
+    def __init__(self, parts: Iterable["CacheStats"] = ()):
+        self.parts = tuple(parts)
+        self.latency: Optional[Dict[str, LatencyHistogram]] = None
+        self.reset()
+
+    def reset(self) -> None:
+        """Zero every counter and histogram."""
+        for part in self.parts:
+            part.reset()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.loads = 0
+        self.load_time = 0.0
+        if self.latency is not None:
+            for histogram in self.latency.values():
+                histogram.reset()
+
+    def refresh(self) -> None:
+        """Recompute the counters as the sum of `parts`."""
+        parts = self.parts
+        self.hits = sum(part.hits for part in parts)
+        self.misses = sum(part.misses for part in parts)
+        self.evictions = sum(part.evictions for part in parts)
+        self.expirations = sum(part.expirations for part in parts)
+        self.loads = sum(part.loads for part in parts)
+        self.load_time = sum(part.load_time for part in parts)
+
+    def record_load(self, seconds: float) -> None:
+        """Count one value computed on a miss."""
+        self.loads += 1
+        self.load_time += seconds
+
+    def hit_ratio(self) -> float:
+        """Share of get calls that hit (0.0 before the first call)."""
+        requests = self.hits + self.misses
+        return self.hits / requests if requests else 0.0
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Current counters as a dictionary.
+
+        Returns:
+            Dictionary with hits, misses, hit_ratio, evictions, expirations,
+            loads, average_load_ms and, if tracked, p50/p99 latency per
+            operation in microseconds
+        """
+        result: Dict[str, Any] = {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hit_ratio(),
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "loads": self.loads,
+            "average_load_ms": (
+                self.load_time / self.loads * 1000 if self.loads else 0.0
+            ),
+        }
+        if self.latency is not None:
+            for name, histogram in self.latency.items():
+                result[f"{name}_p50_us"] = histogram.percentile(50)
+                result[f"{name}_p99_us"] = histogram.percentile(99)
+        return result
+
+
+def track_latency(cache: Any) -> Dict[str, LatencyHistogram]:
+    """
+    Record get and put latency of one cache instance.
+
+    Args:
+        cache: Any cache with a `stats` attribute
+
+    Returns:
+        Histograms keyed by operation name, also stored in cache.stats.latency
+    """
+    perf_counter_ns = time.perf_counter_ns
+    histograms = {"get": LatencyHistogram(), "put": LatencyHistogram()}
+    for name, histogram in histograms.items():
+        operation = getattr(cache, name)
+        record = histogram.record
+
+        def timed(*args, _operation=operation, _record=record, **kwargs):
+            start = perf_counter_ns()
+            try:
+                return _operation(*args, **kwargs)
+            finally:
+                _record(perf_counter_ns() - start)
+
+        setattr(cache, name, timed)
+    cache.stats.latency = histograms
+    return histograms
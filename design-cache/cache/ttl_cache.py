@@ -2,10 +2,183 @@
 TTL Cache Implementation
 
 Implements a cache with Time To Live expiration.
+
+Expiry times are monotonic floats rather than ``datetime`` objects: a float
+is a fraction of the size, compares in one step, and is immune to wall-clock
+adjustments. Expired entries are removed two ways:
+
+- Lazily: a read that finds an expired entry removes it and reports a miss
+- Incrementally: a hierarchical timing wheel indexes entries by expiry tick,
+  so ``reap`` visits only entries that are due, never the whole cache, and
+  a background reaper can bound the work it does on each pass
+
+The wheel has ``levels`` rings of ``slots`` buckets. Level 0 buckets cover
+one tick each, level 1 buckets cover ``slots`` ticks, and so on. An entry is
+filed in the finest level that can tell its expiry tick apart from the next
+tick; when the wheel reaches a coarse bucket, that bucket's entries cascade
+to finer levels.
+Scheduling, rescheduling and removal are O(1).
 """
 
-from typing import Any, Optional
-from datetime import datetime, timedelta
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+from .stats import CacheStats
+
+
+class _Entry:
+    """Cached value with its expiry time and its timing wheel bucket."""
+
+    __slots__ = ("value", "expires_at", "bucket", "level")
+
+    def __init__(self, value: Any, expires_at: float):
+        self.value = value
+        self.expires_at = expires_at
+        self.bucket: Optional[Dict[Hashable, "_Entry"]] = None
+        self.level = 0
+
+
+class TimingWheel:
+    """
+    Hierarchical timing wheel indexing entries by expiry tick.
+
+    Args:
+        tick: Seconds covered by one level-0 bucket
+        start: Current time of the owning cache's clock
+        slots: Buckets per level (power of two)
+        levels: Number of levels; entries beyond the top level's span wrap
+            around and are re-filed when their bucket comes up
+    """
+
+    def __init__(self, tick: float, start: float, slots: int = 64, levels: int = 4):
+        if tick <= 0:
+            raise ValueError("tick must be positive")
+        if slots < 2 or slots & (slots - 1):
+            raise ValueError("slots must be a power of two")
+        self.tick = tick
+        self.slots = slots
+        self.bits = slots.bit_length() - 1
+        self.levels = levels
+        self.wheels: List[List[Dict[Hashable, _Entry]]] = [
+            [{} for _ in range(slots)] for _ in range(levels)
+        ]
+        # Last tick whose level-0 bucket has been emptied
+        self.current = int(start // tick)
+        self.count = 0
+        # Entries filed per level, so the wheel can skip ticks with no work
+        self.sizes = [0] * levels
+
+    def __len__(self) -> int:
+        return self.count
+
+    def schedule(self, key: Hashable, entry: _Entry) -> None:
+        """File an entry in the bucket for its expiry tick."""
+        # The first tick starting after expires_at: every entry in a processed
+        # bucket has expired
+        base = self.current + 1
+        due = max(int(entry.expires_at // self.tick) + 1, base)
+        # Finest level whose coarser parent bucket holds both the next tick
+        # and the due tick, so the entry's bucket cascades before it is due
+        bits, mask = self.bits, self.slots - 1
+        level = 0
+        while level < self.levels - 1 and (due ^ base) >> (bits * (level + 1)):
+            level += 1
+        bucket = self.wheels[level][(due >> (bits * level)) & mask]
+        bucket[key] = entry
+        entry.bucket = bucket
+        entry.level = level
+        self.sizes[level] += 1
+        self.count += 1
+
+    def remove(self, key: Hashable, entry: _Entry) -> None:
+        """Unfile an entry."""
+        if entry.bucket is not None:
+            del entry.bucket[key]
+            entry.bucket = None
+            self.sizes[entry.level] -= 1
+            self.count -= 1
+
+    def _cascade(self, tick: int) -> None:
+        """Re-file coarse buckets that start at `tick` into finer levels."""
+        bits, mask = self.bits, self.slots - 1
+        for level in range(1, self.levels):
+            if tick & ((1 << (bits * level)) - 1):
+                return
+            wheel = self.wheels[level]
+            index = (tick >> (bits * level)) & mask
+            bucket = wheel[index]
+            if not bucket:
+                continue
+            wheel[index] = {}
+            self.sizes[level] -= len(bucket)
+            self.count -= len(bucket)
+            for key, entry in bucket.items():
+                self.schedule(key, entry)
+
+    def advance(self, now: float, max_items: int) -> List[Tuple[Hashable, _Entry]]:
+        """
+        Turn the wheel toward `now`, unfiling at most `max_items` due entries.
+
+        The wheel also turns at most `max_items` ticks per call, so a large
+        clock jump is worked off over several calls instead of one. Stretches
+        where no level has anything to cascade are skipped in a single step.
+        If either budget runs out, the next call resumes where this one
+        stopped.
+
+        Args:
+            now: Current time
+            max_items: Upper bound on the entries returned, and separately
+                on the ticks turned
+
+        Returns:
+            List of (key, entry) pairs whose expiry tick has passed
+        """
+        target = int(now // self.tick)
+        if not self.count:
+            self.current = max(self.current, target)
+            return []
+        due: List[Tuple[Hashable, _Entry]] = []
+        level0, mask, bits = self.wheels[0], self.slots - 1, self.bits
+        sizes = self.sizes
+        ticks = 0
+        while self.current < target:
+            if ticks >= max_items:
+                return due
+            ticks += 1
+            if not sizes[0]:
+                # Level 0 is empty: nothing happens before the next boundary
+                # of the finest non-empty level, so jump to the tick before it
+                level = 1
+                while level < self.levels - 1 and not sizes[level]:
+                    level += 1
+                boundary = ((self.current >> (bits * level)) + 1) << (bits * level)
+                if boundary - 1 > self.current:
+                    self.current = min(boundary - 1, target)
+                    continue
+            tick = self.current + 1
+            # Re-running the cascade when resuming a tick is cheap and picks up
+            # entries filed into its coarse buckets in the meantime
+            self._cascade(tick)
+            bucket = level0[tick & mask]
+            while bucket:
+                if len(due) >= max_items:
+                    # Out of budget: the next call resumes this tick
+                    return due
+                key = next(iter(bucket))
+                entry = bucket.pop(key)
+                entry.bucket = None
+                sizes[0] -= 1
+                self.count -= 1
+                due.append((key, entry))
+            self.current = tick
+            if not self.count:
+                self.current = target
+        return due
+
+    def behind(self, now: float) -> bool:
+        """Whether due entries may remain filed for ticks up to `now`."""
+        return self.count > 0 and self.current < int(now // self.tick)
 
 
 class TTLCache:
@@ -15,20 +188,44 @@ class TTLCache:
     Features:
     - Automatic expiration based on TTL
     - Lazy cleanup on access
-    - Optional background cleanup thread
+    - Incremental cleanup through a timing wheel, with an optional
+      background reaper doing bounded work per pass
+    - Thread-safe
     """
 
-    def __init__(self, default_ttl_seconds: int = 300):
+    def __init__(
+        self,
+        default_ttl_seconds: float = 300,
+        clock: Optional[Callable[[], float]] = None,
+        tick_seconds: float = 1.0,
+    ):
         """
         Initialize the TTL cache.
 
         Args:
             default_ttl_seconds: Default time to live in seconds
+            clock: Zero-argument callable returning the current time in
+                seconds (defaults to time.monotonic)
+            tick_seconds: Resolution of the expiry index. Reads always honor
+                exact expiry times; the reaper may lag by up to one tick
         """
         self.default_ttl = default_ttl_seconds
-        # TODO: Initialize data structures
+        self.clock = clock if clock is not None else time.monotonic
+        self.entries: Dict[Hashable, _Entry] = {}
+        self.wheel = TimingWheel(tick_seconds, self.clock())
+        self.lock = threading.Lock()
+        self.reaper: Optional[_ReaperThread] = None
+        self.stats = CacheStats()
+
+    def __len__(self) -> int:
+        """Number of stored entries, including expired ones not yet reaped."""
+        return len(self.entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        entry = self.entries.get(key)
+        return entry is not None and entry.expires_at > self.clock()
 
-    def get(self, key: str) -> Optional[Any]:
+    def get(self, key: Hashable) -> Optional[Any]:
         """
         Get value by key if not expired.
 
@@ -38,10 +235,26 @@ class TTLCache:
         Returns:
             The value if found and not expired, None otherwise
         """
-        # TODO: Implement get with expiration check
-        pass
+        stats = self.stats
+        entry = self.entries.get(key)
+        if entry is None:
+            stats.misses += 1
+            return None
+        if entry.expires_at > self.clock():
+            stats.hits += 1
+            return entry.value
+        with self.lock:
+            stats.misses += 1
+            # Re-check under the lock: a concurrent put may have refreshed it
+            if self.entries.get(key) is entry and entry.expires_at <= self.clock():
+                del self.entries[key]
+                self.wheel.remove(key, entry)
+                stats.expirations += 1
+        return None
 
-    def put(self, key: str, value: Any, ttl_seconds: Optional[int] = None) -> None:
+    def put(
+        self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None
+    ) -> None:
         """
         Put a key-value pair with optional custom TTL.
 
@@ -50,15 +263,107 @@ class TTLCache:
             value: The value to store
             ttl_seconds: Custom TTL, uses default if None
         """
-        # TODO: Implement put with TTL tracking
-        pass
+        ttl = self.default_ttl if ttl_seconds is None else ttl_seconds
+        expires_at = self.clock() + ttl
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                entry = self.entries[key] = _Entry(value, expires_at)
+            else:
+                self.wheel.remove(key, entry)
+                entry.value = value
+                entry.expires_at = expires_at
+            self.wheel.schedule(key, entry)
+
+    def delete(self, key: Hashable) -> bool:
+        """
+        Remove a key.
+
+        Args:
+            key: The key to remove
+
+        Returns:
+            True if the key was present and not expired, False otherwise
+        """
+        with self.lock:
+            entry = self.entries.pop(key, None)
+            if entry is None:
+                return False
+            self.wheel.remove(key, entry)
+            return entry.expires_at > self.clock()
+
+    def reap(self, max_items: int = 1000) -> int:
+        """
+        Remove expired entries, visiting at most `max_items` of them.
+
+        The timing wheel also turns at most `max_items` ticks, so the lock is
+        held for bounded time even after a large clock jump.
+
+        Args:
+            max_items: Upper bound on the work done by this call
+
+        Returns:
+            Number of entries removed
+        """
+        with self.lock:
+            due = self.wheel.advance(self.clock(), max_items)
+            for key, _ in due:
+                del self.entries[key]
+            self.stats.expirations += len(due)
+            return len(due)
 
     def cleanup_expired(self) -> int:
         """
         Remove all expired entries.
 
+        Works through the timing wheel in bounded batches, releasing the lock
+        between them, so it never scans live entries.
+
         Returns:
             Number of entries removed
         """
-        # TODO: Implement cleanup
-        pass
+        removed = 0
+        while True:
+            batch = self.reap()
+            removed += batch
+            if batch == 0 and not self.wheel.behind(self.clock()):
+                return removed
+
+    def start_reaper(self, interval: float = 1.0, max_items: int = 1000) -> None:
+        """
+        Start a daemon thread calling reap(max_items) every `interval` seconds.
+
+        Args:
+            interval: Seconds between passes
+            max_items: Upper bound on the entries removed per pass
+        """
+        if self.reaper is not None:
+            return
+        self.reaper = _ReaperThread(lambda: self.reap(max_items), interval)
+        self.reaper.start()
+
+    def stop_reaper(self) -> None:
+        """Stop the background reaper if it is running."""
+        if self.reaper is not None:
+            self.reaper.stop()
+            self.reaper = None
+
+
+class _ReaperThread(threading.Thread):
+    """Daemon thread calling a bounded cleanup step at a fixed interval."""
+
+    def __init__(self, step: Callable[[], int], interval: float):
+        super().__init__(name="ttl-cache-reaper", daemon=True)
+        self.step = step
+        self.interval = interval
+        self.stopped = threading.Event()
+        self.removed = 0
+
+    def run(self) -> None:
+        while not self.stopped.wait(self.interval):
+            self.removed += self.step()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Signal the thread to exit and wait for it."""
+        self.stopped.set()
+        self.join(timeout)
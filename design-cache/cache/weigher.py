@@ -0,0 +1,103 @@
+"""
+Entry weights for memory-budgeted caches.
+
+A weigher is any callable ``weigher(key, value) -> int`` returning the cost
+of an entry in arbitrary units, usually bytes. Caches built with
+``max_weight`` keep the total weight of their entries within that budget.
+
+``estimate_weight`` is the default. It is exact for flat values (bytes,
+str, numbers) and looks one level into containers, which is enough for
+typical cached rows and payloads while staying O(len) per entry. Objects
+with ``__slots__`` (like the records ``cached`` wraps results in) are
+weighed as their slots, each as if it were the value itself. Callers
+caching deep object graphs should pass their own weigher.
+"""
+
+import sys
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+Weigher = Callable[[Hashable, Any], int]
+
+_FLAT = (bytes, bytearray, str, int, float, bool, type(None))
+
+# type -> names of its slots, including inherited ones
+_SLOTS: Dict[type, Tuple[str, ...]] = {}
+
+
+def estimate_weight(key: Hashable, value: Any) -> int:
+    """
+    Approximate bytes held by an entry: the key plus the value and, for
+    lists, tuples, sets and dicts, their direct items.
+
+    Args:
+        key: Entry key
+        value: Entry value
+
+    Returns:
+        Estimated size in bytes
+    """
+    return sys.getsizeof(key) + _value_weight(value, unwrap=True)
+
+
+def _value_weight(value: Any, unwrap: bool = False) -> int:
+    """
+    Size of a value and its direct items.
+
+    With `unwrap`, an object with __slots__ also adds its slot values, each
+    weighed without unwrapping again, so linked slotted objects (list
+    nodes) cannot send the walk around a cycle.
+    """
+    size = sys.getsizeof(value)
+    if isinstance(value, _FLAT):
+        return size
+    if isinstance(value, memoryview):
+        return size + value.nbytes
+    if isinstance(value, dict):
+        getsizeof = sys.getsizeof
+        for item_key, item in value.items():
+            size += getsizeof(item_key) + getsizeof(item)
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        getsizeof = sys.getsizeof
+        for item in value:
+            size += getsizeof(item)
+    elif unwrap:
+        for name in _slot_names(type(value)):
+            size += _value_weight(getattr(value, name, None))
+    return size
+
+
+def _slot_names(cls: type) -> Tuple[str, ...]:
+    """Data slots declared by a class and its bases (empty without slots)."""
+    names = _SLOTS.get(cls)
+    if names is None:
+        found = []
+        for klass in cls.__mro__:
+            slots = klass.__dict__.get("__slots__", ())
+            if isinstance(slots, str):
+                slots = (slots,)
+            found.extend(
+                name for name in slots if name not in ("__dict__", "__weakref__")
+            )
+        names = _SLOTS[cls] = tuple(found)
+    return names
+
+
+def check_limits(capacity: Optional[int], max_weight: Optional[int]) -> None:
+    """Validate the size limits shared by the bounded caches."""
+    if capacity is None and max_weight is None:
+        raise ValueError("capacity or max_weight is required")
+    if capacity is not None and capacity < 1:
+        raise ValueError("capacity must be at least 1")
+    if max_weight is not None and max_weight < 1:
+        raise ValueError("max_weight must be at least 1")
+
+
+def entry_weight_limit(
+    max_weight: Optional[int], max_entry_weight: Optional[int]
+) -> int:
+    """Heaviest admissible entry; by default 1/8 of the budget."""
+    if max_weight is None:
+        return 0
+    if max_entry_weight is None:
+        return max(1, max_weight // 8)
+    return min(max_entry_weight, max_weight)
@@ -0,0 +1,176 @@
+"""
+Offline trace-replay simulator for cache policies.
+
+Replays a recorded key-access trace through LRU, LFU, W-TinyLFU and TTL
+caches at several sizes and prints the hit ratio of each, so a policy and
+capacity can be picked from real traffic:
+
+    python design-cache/trace_simulator.py trace.txt --capacities 1000,10000,100000
+
+Trace format: one access per line, either ``key`` or ``timestamp key`` with
+the timestamp in seconds. Blank lines and lines starting with ``#`` are
+skipped, and ``.gz`` files are decompressed on the fly. Traces without
+timestamps advance the TTL caches' clock by one second per access.
+
+The trace is streamed once and every cache is fed in lockstep, so memory
+use is the caches themselves regardless of the trace length. The unbounded
+TTL caches are reaped as the trace clock advances, so they only hold keys
+still inside their TTL.
+"""
+
+import argparse
+import gzip
+import itertools
+import sys
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from cache import LFUCache, LRUCache, TTLCache, WindowTinyLFUCache
+from cache.stats import CacheStats
+
+POLICIES: Dict[str, Callable[[int], object]] = {
+    "lru": LRUCache,
+    "lfu": LFUCache,
+    "tinylfu": WindowTinyLFUCache,
+}
+BAR_WIDTH = 40
+# Accesses between reaps of the TTL caches
+REAP_EVERY = 1024
+
+
+class TraceClock:
+    """Clock driven by the trace's timestamps."""
+
+    def __init__(self, now: float = 0.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def read_trace(path: str) -> Iterator[Tuple[Optional[float], str]]:
+    """
+    Stream (timestamp, key) accesses from a trace file.
+
+    Args:
+        path: Trace file, optionally gzip-compressed (.gz)
+
+    Returns:
+        Iterator of (timestamp or None, key)
+    """
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt") as lines:
+        for line in lines:
+            fields = line.split()
+            if not fields or fields[0].startswith("#"):
+                continue
+            if len(fields) == 1:
+                yield None, fields[0]
+            else:
+                yield float(fields[0]), fields[1]
+
+
+def replay(
+    trace: Iterable[Tuple[Optional[float], str]],
+    capacities: List[int],
+    policies: List[str],
+    ttls: List[float],
+) -> Dict[Tuple[str, float], CacheStats]:
+    """
+    Feed one pass over a trace to a cache per (policy, size).
+
+    Every miss is followed by a put, as a read-through cache would do.
+
+    Args:
+        trace: (timestamp or None, key) accesses
+        capacities: Cache sizes for the size-bounded policies
+        policies: Names from POLICIES to simulate
+        ttls: TTLs in seconds for unbounded TTL caches
+
+    Returns:
+        Stats keyed by (policy, capacity) or ("ttl", ttl)
+    """
+    # Start the clock at the first timestamp, so the TTL caches' timing
+    # wheels start there too rather than decades before an epoch trace
+    accesses = iter(trace)
+    head = list(itertools.islice(accesses, 1))
+    clock = TraceClock(head[0][0] if head and head[0][0] is not None else 0.0)
+    caches = {
+        (policy, capacity): POLICIES[policy](capacity)
+        for policy in policies
+        for capacity in capacities
+    }
+    ttl_caches = [TTLCache(ttl, clock=clock) for ttl in ttls]
+    for ttl, cache in zip(ttls, ttl_caches):
+        caches[("ttl", ttl)] = cache
+    operations = [(cache.get, cache.put) for cache in caches.values()]
+
+    tick = 0.0
+    for count, (timestamp, key) in enumerate(itertools.chain(head, accesses), 1):
+        tick += 1.0
+        clock.now = tick if timestamp is None else timestamp
+        for get, put in operations:
+            if get(key) is None:
+                put(key, True)
+        if count % REAP_EVERY == 0:
+            for cache in ttl_caches:
+                cache.cleanup_expired()
+    return {label: cache.stats for label, cache in caches.items()}
+
+
+def format_curves(results: Dict[Tuple[str, float], CacheStats]) -> str:
+    """Render hit ratio per policy and size as a table with bars."""
+    lines = [f"{'policy':<10}{'size':>12}{'hit ratio':>11}  "]
+    previous = None
+    for (policy, size), stats in results.items():
+        if previous is not None and policy != previous:
+            lines.append("")
+        previous = policy
+        ratio = stats.hit_ratio()
+        label = f"{size:g}s" if policy == "ttl" else f"{size:,}"
+        bar = "#" * round(ratio * BAR_WIDTH)
+        lines.append(f"{policy:<10}{label:>12}{ratio:>11.4f}  {bar}")
+    return "\n".join(lines)
+
+
+def _numbers(text: str, kind: Callable) -> List:
+    return [kind(value) for value in text.split(",") if value]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Replay a key-access trace through cache policies."
+    )
+    parser.add_argument("trace", help="trace file: 'key' or 'timestamp key' lines")
+    parser.add_argument(
+        "--capacities",
+        default="100,1000,10000",
+        help="comma-separated cache sizes (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--policies",
+        default=",".join(POLICIES),
+        help=f"comma-separated policies from {', '.join(POLICIES)} (default: all)",
+    )
+    parser.add_argument(
+        "--ttls",
+        default="",
+        help="comma-separated TTLs in seconds to also simulate TTLCache",
+    )
+    args = parser.parse_args(argv)
+
+    policies = [policy for policy in args.policies.split(",") if policy]
+    unknown = set(policies) - set(POLICIES)
+    if unknown:
+        parser.error(f"unknown policies: {', '.join(sorted(unknown))}")
+    results = replay(
+        read_trace(args.trace),
+        _numbers(args.capacities, int),
+        policies,
+        _numbers(args.ttls, float),
+    )
+    print(format_curves(results))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())